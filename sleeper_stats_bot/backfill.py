@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+Backfills the weeks 1..N of a league: fetches their matchups, stats
+and projections concurrently under a bounded rate limit, saves them in
+the permanent store and optionally renders every historical report in
+parallel worker processes. Its API calls are low priority, the first
+refused when the quota shared with the running bots gets tight.
+
+Usage:
+    python3 sleeper_stats_bot/backfill.py --weeks 10 [--render output]
+"""
+
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import bot
+from constants import (
+    BACKFILL_RATE_PER_SECOND,
+    SEASON_FETCH_WORKERS,
+    STORE_PATH,
+)
+from governor import LOW, low_priority, set_priority
+from sleeper_data import Players, RateLimiter, get_season_data
+from sleeper_wrapper import League
+from store import Store
+
+BACKFILL_REPORTS = {
+    "matchups": lambda league, season, week, logger: bot.get_matchups_report(
+        league, week, logger
+    ),
+    "scores": lambda league, season, week, logger: bot.get_scores_report(
+        league, week, "Week Scores", logger
+    ),
+    "best_and_worst": bot.get_best_and_worst_report,
+    "bench_beats_starters": bot.get_bench_beats_starters_report,
+}
+
+
+def backfill_weeks(
+    league, season, weeks, store, max_workers, rate_per_second, logger
+):
+    """
+    backfill_weeks Fetches the matchups, stats and projections of the
+                   weeks concurrently and saves them in the store.
+
+    :param league: Object league
+    :type league: sleeper_wrapper.League
+    :param season: Season year
+    :type season: str
+    :param weeks: Completed weeks to backfill
+    :type weeks: list
+    :param store: Permanent store
+    :type store: store.Store
+    :param max_workers: Maximum number of concurrent requests
+    :type max_workers: int
+    :param rate_per_second: Maximum number of requests per second
+    :type rate_per_second: float
+    :param logger: A logger object for logging debug
+    :type logger: logging.Logger
+    :return: Tuple of dicts (matchups, stats, projections) by week
+    :rtype: tuple
+    """
+    logger.debug("ENTERING BACKFILL_WEEKS FUNCTION")
+    weeks = list(weeks)
+
+    season_data = get_season_data(
+        league,
+        season,
+        weeks,
+        max(weeks) + 1,
+        store,
+        max_workers,
+        RateLimiter(rate_per_second),
+    )
+
+    # Warm the request cache with the identity maps and the players dump
+    # used by every report
+    league.get_users()
+    league.get_rosters()
+    Players().get_all_players()
+
+    logger.debug("LEAVING BACKFILL_WEEKS FUNCTION")
+
+    return season_data
+
+
+def render_week_report(league_id, season, week, report, output_dir):
+    """
+    render_week_report Renders a report of a past week into a PNG file.
+                       Runs in a worker process.
+
+    :param league_id: Sleeper league id
+    :type league_id: str
+    :param season: Season year
+    :type season: str
+    :param week: Week of the report
+    :type week: int
+    :param report: Key of BACKFILL_REPORTS
+    :type report: str
+    :param output_dir: Directory for the rendered reports
+    :type output_dir: str
+    :return: Path of the rendered report
+    :rtype: str
+    """
+    logger = logging.getLogger("backfill")
+    league = League(league_id)
+    photo = bot.render_image(
+        BACKFILL_REPORTS[report](league, season, week, logger)
+    )
+
+    path = os.path.join(
+        output_dir, "week_{:02d}".format(week), "{}.png".format(report)
+    )
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as report_file:
+        report_file.write(photo)
+
+    return path
+
+
+def init_render_worker():
+    bot.install_request_cache()
+    set_priority(LOW)
+
+
+def render_weeks(league_id, season, weeks, output_dir, max_workers, logger):
+    """
+    render_weeks Renders every report of the weeks in parallel worker
+                 processes.
+
+    :param league_id: Sleeper league id
+    :type league_id: str
+    :param season: Season year
+    :type season: str
+    :param weeks: Weeks to render
+    :type weeks: list
+    :param output_dir: Directory for the rendered reports
+    :type output_dir: str
+    :param max_workers: Number of worker processes
+    :type max_workers: int
+    :param logger: A logger object for logging debug
+    :type logger: logging.Logger
+    :return: List of rendered paths
+    :rtype: list
+    """
+    logger.debug("ENTERING RENDER_WEEKS FUNCTION")
+    jobs = [(week, report) for week in weeks for report in BACKFILL_REPORTS]
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=init_render_worker
+    ) as pool:
+        futures = [
+            pool.submit(
+                render_week_report,
+                league_id,
+                season,
+                week,
+                report,
+                output_dir,
+            )
+            for week, report in jobs
+        ]
+        paths = [future.result() for future in futures]
+
+    logger.debug("LEAVING RENDER_WEEKS FUNCTION")
+
+    return paths
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(
+        description="Backfill the weeks 1..N of a Sleeper league."
+    )
+    parser.add_argument(
+        "--weeks",
+        type=int,
+        required=True,
+        help="Last completed week to backfill.",
+    )
+    parser.add_argument(
+        "--league",
+        default=os.environ.get("LEAGUE_ID"),
+        help="Sleeper league id. Defaults to LEAGUE_ID.",
+    )
+    parser.add_argument(
+        "--season",
+        help="Season year. Defaults to the season of the league.",
+    )
+    parser.add_argument(
+        "--store",
+        default=os.environ.get("STORE_PATH", STORE_PATH),
+        help="Path of the permanent store. Defaults to STORE_PATH.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=SEASON_FETCH_WORKERS,
+        help="Concurrent requests and render processes.",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=BACKFILL_RATE_PER_SECOND,
+        help="Maximum number of requests per second.",
+    )
+    parser.add_argument(
+        "--render",
+        metavar="OUTPUT_DIR",
+        help="Render every report of the backfilled weeks into this "
+        "directory.",
+    )
+
+    return parser.parse_args(args)
+
+
+###############################################################################
+# Main Script for the backfill
+###############################################################################
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    logging.basicConfig(level="INFO", format="%(message)s")
+    backfill_logger = logging.getLogger("backfill")
+
+    start = time.monotonic()
+    bot.install_request_cache()
+    league = League(args.league)
+    season = args.season or league.get_league()["season"]
+    weeks = range(1, args.weeks + 1)
+
+    with low_priority():
+        backfill_weeks(
+            league,
+            season,
+            weeks,
+            Store(args.store),
+            args.workers,
+            args.rate,
+            backfill_logger,
+        )
+    backfill_logger.info(
+        "Backfilled weeks 1-%s of %s in %.1fs",
+        args.weeks,
+        season,
+        time.monotonic() - start,
+    )
+
+    if args.render:
+        paths = render_weeks(
+            args.league,
+            season,
+            weeks,
+            args.render,
+            args.workers,
+            backfill_logger,
+        )
+        backfill_logger.info(
+            "Rendered %s reports in %.1fs",
+            len(paths),
+            time.monotonic() - start,
+        )
@@ -1,52 +1,104 @@
 # -*- coding: utf-8 -*-
+import json
 import logging
 import os
 import subprocess
-import time
 from collections import defaultdict
-from pilmoji import Pilmoji
-from PIL import ImageFont, Image
 from io import BytesIO
-import pandas as pd
 import pendulum
 import requests
 import requests_cache
 import schedule
 from constants import (
-    BONUS_FUMBLE_FORCED_DEF,
-    BONUS_INT_QB,
-    BONUS_REC_FIRST_DOWN,
     BONUS_REC_TE,
     CLOSE_NUM,
+    CLOSE_WIN_PROBABILITY,
     DAILY_NIGHT_DRAFT_REMINDER_HOUR,
     DAY_IN_SECONDS,
     DAYS_BEFORE_DRAFT,
     HTTP_USER_AGENT,
     LEAGUE_NAME,
+    LOOP_SLEEP_SECONDS,
+    LUCK_PLAYERS_NUM,
+    METRICS_DUMP_INTERVAL_SECONDS,
     MONDAY_NIGHT_SCORES_HOUR,
-    SCORING_TYPE,
+    PHASES,
+    PREFETCH_LEAD_SECONDS,
+    QUOTA_PATH,
+    STORE_PATH,
     SUNDAY_NIGHT_CLOSE_GAMES_HOUR,
     SUNDAY_NIGHT_SCORES_HOUR,
     THURSDAY_NIGHT_SCORES_HOUR,
     THURSDAY_NIGHT_WEEK_MATCHUPS_HOUR,
     TIMEZONE,
+    TUESDAY_MORNING_BENCH_BEATS_STARTERS_HOUR,
     TUESDAY_MORNING_BEST_WORST_HOUR,
+    TUESDAY_MORNING_LUCK_HOUR,
     TUESDAY_MORNING_REPORT_HOUR,
     TUESDAY_MORNING_STANDINGS_HOUR,
     TUESDAY_MORNING_WEEK_SCORES_HOUR,
+    TRANSACTIONS_POLL_SECONDS,
     FONT_NAME,
     FONT_SIZE,
     IMAGE_WIDTH_PIXELS,
 )
+from broadcast import Broadcast
+from bundle import ReportBundle
+from clock import SystemClock
+from command_server import start_command_server
 from discord import Discord
+from draft_tracker import DraftTracker
+from governor import Governor, GovernedAdapter
 from group_me import GroupMe
-from prettytable import PrettyTable
-from requests_ratelimiter import LimiterAdapter
-from rich.logging import RichHandler
+from history import build_history_index
+from http_client import (
+    REVALIDATED_URLS,
+    install_sleeper_client,
+    refreshing,
+)
+from lazy import lazy_import
+from ledger import Ledger, get_content_hash, get_missed_jobs
+from log import (
+    TRACE,
+    configure_logging,
+    get_debug_sink_path,
+    get_log_level,
+    payload,
+)
+from luck import build_season_arrays, get_player_luck, get_team_luck
+from metrics import (
+    RENDER_SECONDS,
+    InstrumentedCachedSession,
+    start_file_dump,
+    start_http_server,
+    timed_job,
+    timed_report,
+)
+from prefetch import Prefetcher
+from profiling import profiled_job
+from renderers import RENDERERS, render_text
+from report import Report, Table
+from replay import Cassette, start_recording
+from roster_index import (
+    build_roster_index,
+    find_bench_beats_starters,
+    find_negative_starters,
+    get_bench_scores,
+    get_score_type,
+)
 from slack import Slack
-from sleeper_wrapper import League, Players, Stats
+from sleeper_data import Players, Stats, get_season_data
+from win_probability import get_close_games, get_matchup_win_probabilities
+from sleeper_wrapper import League
+from snapshot import load_snapshot, save_snapshot
+from store import Store
 from telegram import Telegram
-import numpy as nmp
+from transactions import TransactionIndex, TransactionPoller, get_faab_stats
+
+# Only needed by the reports, imported on first use to start faster
+Image = lazy_import("PIL.Image")
+ImageFont = lazy_import("PIL.ImageFont")
+nmp = lazy_import("numpy")
 
 
 def get_current_season(sportsdata_api_key, session, logger):
@@ -81,7 +133,7 @@ def get_current_season(sportsdata_api_key, session, logger):
         timeout=10,
     )
     response.raise_for_status()
-    logger.debug("CURRENT_SEASON_RESPONSE: " + str(response.text))
+    logger.debug("CURRENT_SEASON_RESPONSE: %s", response.text)
     current_season = response.text
 
     logger.debug("LEAVING GET_CURRENT_SEASON FUNCTION")
@@ -89,31 +141,34 @@ def get_current_season(sportsdata_api_key, session, logger):
     return current_season
 
 
-def get_welcome_string(season, logger):
+def get_welcome_report(season, logger):
     """
-    get_welcome_string Creates and returns the welcome message
+    get_welcome_report Creates and returns the welcome message
 
     :return: Welcome message
-    :rtype: str
+    :rtype: report.Report
     """
-    logger.debug("ENTERING GET WELCOME STRING FUNCTION")
-    welcome_message = "👋 Hello, I am the " + LEAGUE_NAME + " Stats Bot! \n\n"
-    welcome_message += "I am going to sent you some stats about the league \n"
-    welcome_message += "according to this schedule (CST): \n "
-    welcome_message += get_bot_message_schedule() + "\n \n"
-    welcome_message += "Welcome to the 🏈 {} season 🏈\n\n".format(season)
-    welcome_message += "🎉 Enjoy!\n"
-    welcome_message += "I'm still in dev mode, 🧑🏽‍💻 new features on the way 🚀"
-
-    size = get_table_size(
-        welcome_message, FONT_SIZE, FONT_NAME, IMAGE_WIDTH_PIXELS
+    logger.debug("ENTERING GET WELCOME REPORT FUNCTION")
+    welcome_report = Report(
+        "👋 Hello, I am the " + LEAGUE_NAME + " Stats Bot!",
+        [get_bot_message_schedule()],
+        [
+            "",
+            "Welcome to the 🏈 {} season 🏈".format(season),
+            "",
+            "🎉 Enjoy!",
+            "I'm still in dev mode, 🧑🏽‍💻 new features on the way 🚀",
+        ],
+        description=(
+            "\nI am going to sent you some stats about the league\n"
+            "according to this schedule (CST):"
+        ),
     )
-    print("SIZE: " + str(size))
 
-    logger.debug("LEAVING GET WELCOME STRING FUNCTION")
-    logger.debug("INIT_MESSAGE: " + welcome_message)
+    logger.debug("LEAVING GET WELCOME REPORT FUNCTION")
+    logger.debug("INIT_MESSAGE: %s", welcome_report.to_dict())
 
-    return welcome_message, size[0], size[1]
+    return welcome_report
 
 
 def get_season_week_date(
@@ -190,7 +245,7 @@ def get_current_week(sportsdata_api_key, session, logger):
 
     response = session.get(endpoint, headers=headers, timeout=10)
     response.raise_for_status()
-    logger.debug("CURRENT_WEEK_RESPONSE: " + str(response.text))
+    logger.debug("CURRENT_WEEK_RESPONSE: %s", response.text)
 
     current_week = response.json()
 
@@ -199,9 +254,51 @@ def get_current_week(sportsdata_api_key, session, logger):
     return current_week
 
 
-def get_draft_reminder_string(league, season, logger, days_until_draft):
+def get_games_over(season, week, sportsdata_api_key, session, logger):
+    """
+    get_games_over Gets the NFL teams whose game of the week is over.
+
+    :param season: Current season year
+    :type season: str
+    :param week: Week of the games
+    :type week: int
+    :param sportsdata_api_key: API Key from https://sportsdata.io
+    :type sportsdata_api_key: str
+    :param session: Requests session object
+    :type session: requests.Session
+    :param logger: A logger object for logging debug
+    :type logger: logging.Logger (bot_logger)
+    :return: Set of NFL teams, e.g. {"KC", "LV"}
+    :rtype: set
+    """
+    logger.debug("ENTERING GET_GAMES_OVER FUNCTION")
+    endpoint = (
+        "https://api.sportsdata.io/v3/nfl/scores/json/ScoresByWeek/"
+        "{}/{}".format(season, week)
+    )
+    headers = {
+        "User-Agent": HTTP_USER_AGENT,
+        "Ocp-Apim-Subscription-Key": sportsdata_api_key,
+    }
+
+    response = session.get(endpoint, headers=headers, timeout=10)
+    response.raise_for_status()
+
+    games_over = set()
+    for game in response.json() or []:
+        if game.get("IsOver"):
+            games_over.update([game["HomeTeam"], game["AwayTeam"]])
+    logger.debug("GAMES_OVER: %s", sorted(games_over))
+
+    logger.debug("LEAVING GET_GAMES_OVER FUNCTION")
+
+    return games_over
+
+
+@timed_report("draft_reminder")
+def get_draft_reminder_report(league, season, logger, days_until_draft):
     """
-    get_draft_reminder_string Gets a string of the current
+    get_draft_reminder_report Gets a string of the current
                                 season draft reminder.
 
     :param league: League object
@@ -212,20 +309,20 @@ def get_draft_reminder_string(league, season, logger, days_until_draft):
     :type logger: _type_
     :param days_until_draft: _description_
     :type days_until_draft: _type_
-    :return: _description_
-    :rtype: _type_
+    :return: Draft reminder
+    :rtype: report.Report
     """
-    logger.debug("ENTERING GET_DRAFT_REMINDER_STRING FUNCTION")
+    logger.debug("ENTERING GET_DRAFT_REMINDER_REPORT FUNCTION")
     draft_date = pendulum.from_timestamp(
         league.get_all_drafts()[0]["start_time"] / 1000, tz=TIMEZONE
     )
-    logger.debug("DRAFT_DATE: " + str(draft_date))
+    logger.debug("DRAFT_DATE: %s", draft_date)
 
     time_to_draft = draft_date - pendulum.now(tz=TIMEZONE)
-    logger.debug("TIME_TO_DRAFT_DATE: " + str(time_to_draft))
-    logger.debug("DAYS_TO_DRAFT_DATE: " + str(time_to_draft.days))
+    logger.debug("TIME_TO_DRAFT_DATE: %s", time_to_draft)
+    logger.debug("DAYS_TO_DRAFT_DATE: %s", time_to_draft.days)
 
-    final_table = PrettyTable()
+    final_table = Table()
     final_table.title = "Draft Reminder - {0} Season ".format(season)
     final_table.field_names = ["Days until Draft Day"]
     # final_message_string = "<pre>"
@@ -244,40 +341,291 @@ def get_draft_reminder_string(league, season, logger, days_until_draft):
         draft_reminder_string = (
             "Draft day is today! [ " + draft_date.format("HH:mm A") + " ]\n"
         )
-    logger.debug("DRAFT_REMINDER_STRING: " + str(draft_reminder_string))
+    logger.debug("DRAFT_REMINDER_STRING: %s", draft_reminder_string)
 
     final_table.add_row([draft_reminder_string])
-    final_message_string = final_table.get_string()
-    # final_message_string += "</pre>"
+    report = Report(final_table.title, [final_table])
+
+    logger.debug("FINAL_MESSAGE_STRING: %s", report.to_dict())
+    logger.debug("LEAVING GET_DRAFT_REMINDER_REPORT FUNCTION")
+
+    return report
+
+
+def get_pick_player(pick):
+    """
+    Formats the player of a draft pick.
+    :param pick: https://docs.sleeper.app/#get-all-picks-in-a-draft
+    :return: Player name, position and team, e.g. Justin Jefferson (WR MIN)
+    """
+    metadata = pick.get("metadata") or {}
+    name = " ".join(
+        filter(None, [metadata.get("first_name"), metadata.get("last_name")])
+    )
+    if not metadata.get("position"):
+        return name or str(pick.get("player_id", ""))
+    return "{} ({} {})".format(
+        name, metadata["position"], metadata.get("team") or "FA"
+    )
+
+
+def map_roster_id_to_team_name(league, logger):
+    """
+    :return: Dict {roster_id: team_name, ...}
+    """
+    owner_id_to_team_dict = map_users_to_team_name(league.get_users(), logger)
+    return {
+        str(roster_id): owner_id_to_team_dict.get(
+            owner_id, "Team name not available"
+        )
+        for roster_id, owner_id in map_roster_id_to_owner_id(league).items()
+    }
+
 
-    size = get_table_size(
-        final_message_string, FONT_SIZE, FONT_NAME, IMAGE_WIDTH_PIXELS
+@timed_report("draft_picks")
+def get_draft_picks_report(picks, team_names, logger):
+    """
+    Creates and returns a message announcing the new picks of a draft.
+    :param picks: New picks, https://docs.sleeper.app/#get-all-picks-in-a-draft
+    :param team_names: Dict {roster_id: team_name}
+    :return: Report of the picks.
+    """
+    logger.debug("ENTERING GET_DRAFT_PICKS_REPORT FUNCTION")
+    final_table = Table()
+    final_table.title = "Draft - Pick {}".format(picks[-1]["pick_no"])
+    final_table.field_names = ["Round", "Pick", "Team", "Player"]
+    for pick in picks:
+        final_table.add_row(
+            [
+                pick["round"],
+                pick["pick_no"],
+                team_names.get(
+                    str(pick.get("roster_id")), "Team name not available"
+                ),
+                get_pick_player(pick),
+            ]
+        )
+    report = Report(final_table.title, [final_table])
+
+    logger.debug("DRAFT_PICKS_STRING: %s", report.to_dict())
+    logger.debug("LEAVING GET_DRAFT_PICKS_REPORT FUNCTION")
+
+    return report
+
+
+@timed_report("draft_board")
+def get_draft_board_report(draft, picks, team_names, logger):
+    """
+    Creates and returns the board of a draft: the players picked by every
+    team, in draft order, round by round.
+    :param draft: https://docs.sleeper.app/#get-a-specific-draft
+    :param picks: Every pick made
+    :param team_names: Dict {roster_id: team_name}
+    :return: Report of the draft board.
+    """
+    logger.debug("ENTERING GET_DRAFT_BOARD_REPORT FUNCTION")
+    slots = sorted(
+        (draft.get("slot_to_roster_id") or {}).items(),
+        key=lambda slot: int(slot[0]),
     )
-    print("SIZE: " + str(size))
+    rounds = max([pick["round"] for pick in picks], default=0)
+    board = {(pick["round"], str(pick["draft_slot"])): pick for pick in picks}
+
+    final_table = Table()
+    final_table.title = "Draft Board - Round {}".format(rounds)
+    final_table.field_names = ["Round"] + [
+        team_names.get(str(roster_id), "Slot " + slot)
+        for slot, roster_id in slots
+    ]
+    for draft_round in range(1, rounds + 1):
+        row = [draft_round]
+        for slot, _ in slots:
+            pick = board.get((draft_round, slot))
+            row.append(get_pick_player(pick) if pick else "")
+        final_table.add_row(row)
+    report = Report(final_table.title, [final_table])
+
+    logger.debug("DRAFT_BOARD_STRING: %s", report.to_dict())
+    logger.debug("LEAVING GET_DRAFT_BOARD_REPORT FUNCTION")
+
+    return report
+
+
+def get_player_name(players, player_id):
+    """
+    Formats a player of the players dump.
+    :param players: Players().get_all_players() dictionary
+    :return: Player name and position, e.g. Justin Jefferson (WR)
+    """
+    player = players.get(player_id)
+    if not player:
+        return str(player_id)
+    return "{} {} ({})".format(
+        player.get("first_name", ""),
+        player.get("last_name", ""),
+        player.get("position") or "-",
+    ).strip()
+
+
+@timed_report("trades")
+def get_trades_report(trades, team_names, players, logger):
+    """
+    Creates and returns a message of the trades completed.
+    :param trades: https://docs.sleeper.app/#get-transactions
+    :param team_names: Dict {roster_id: team_name}
+    :param players: Players().get_all_players() dictionary
+    :return: Report of what every team of the trades gets.
+    """
+    logger.debug("ENTERING GET_TRADES_REPORT FUNCTION")
+    final_table = Table()
+    final_table.title = "Trades - Week {}".format(trades[0]["leg"])
+    final_table.field_names = ["Team", "Gets"]
+
+    for i, trade in enumerate(trades):
+        if i:
+            final_table.add_row(["------------", "------------"])
+        adds = trade.get("adds") or {}
+        for roster_id in trade.get("roster_ids") or []:
+            gets = [
+                get_player_name(players, player_id)
+                for player_id, to_roster_id in adds.items()
+                if to_roster_id == roster_id
+            ]
+            gets += [
+                "{} Round {} pick".format(pick["season"], pick["round"])
+                for pick in trade.get("draft_picks") or []
+                if pick.get("owner_id") == roster_id
+            ]
+            gets += [
+                "${} FAAB".format(budget["amount"])
+                for budget in trade.get("waiver_budget") or []
+                if budget.get("receiver") == roster_id
+            ]
+            final_table.add_row(
+                [
+                    team_names.get(str(roster_id), "Team name not available"),
+                    ", ".join(gets) or "-",
+                ]
+            )
+    report = Report(final_table.title, [final_table])
+
+    logger.debug("TRADES_STRING: %s", report.to_dict())
+    logger.debug("LEAVING GET_TRADES_REPORT FUNCTION")
+
+    return report
 
-    logger.debug("FINAL_MESSAGE_STRING: \n" + str(final_message_string))
-    logger.debug("LEAVING GET_DRAFT_REMINDER_STRING FUNCTION")
 
-    return final_message_string, size[0], size[1]
+@timed_report("faab")
+def get_faab_report(transactions, team_names, season, logger):
+    """
+    Creates and returns a message of the FAAB efficiency of every team
+    this season: the claims won and lost, the FAAB spent, the average
+    winning bid and the share of the claims won.
+    :param transactions: Transactions of the season, from the index
+    :param team_names: Dict {roster_id: team_name}
+    :return: Report of the FAAB efficiency.
+    """
+    logger.debug("ENTERING GET_FAAB_REPORT FUNCTION")
+    final_table = Table()
+    final_table.title = "FAAB Efficiency - {} Season".format(season)
+    final_table.field_names = [
+        "Team",
+        "Won",
+        "Lost",
+        "Spent",
+        "Avg Bid",
+        "Win %",
+    ]
+    faab_stats = get_faab_stats(transactions)
+    for roster_id, team in sorted(
+        faab_stats.items(), key=lambda item: -item[1]["spent"]
+    ):
+        claims = team["won"] + team["lost"]
+        final_table.add_row(
+            [
+                team_names.get(str(roster_id), "Team name not available"),
+                team["won"],
+                team["lost"],
+                team["spent"],
+                round(team["spent"] / team["won"], 1) if team["won"] else "-",
+                round(100 * team["won"] / claims) if claims else "-",
+            ]
+        )
+    report = Report(final_table.title, [final_table])
+
+    logger.debug("FAAB_STRING: %s", report.to_dict())
+    logger.debug("LEAVING GET_FAAB_REPORT FUNCTION")
+
+    return report
+
+
+@timed_report("waivers")
+def get_waivers_report(waivers, team_names, players, faab_report, logger):
+    """
+    Creates and returns a message of the waiver claims processed, won or
+    lost, with the FAAB efficiency of the season.
+    :param waivers: https://docs.sleeper.app/#get-transactions
+    :param team_names: Dict {roster_id: team_name}
+    :param players: Players().get_all_players() dictionary
+    :param faab_report: Report from get_faab_report
+    :return: Report of the waiver claims.
+    """
+    logger.debug("ENTERING GET_WAIVERS_REPORT FUNCTION")
+    final_table = Table()
+    final_table.title = "Waivers - Week {}".format(waivers[0]["leg"])
+    final_table.field_names = ["Team", "Player", "Bid", "Result", "Dropped"]
+
+    for waiver in waivers:
+        roster_id = (waiver.get("roster_ids") or [None])[0]
+        dropped = [
+            get_player_name(players, player_id)
+            for player_id in waiver.get("drops") or {}
+        ]
+        final_table.add_row(
+            [
+                team_names.get(str(roster_id), "Team name not available"),
+                ", ".join(
+                    get_player_name(players, player_id)
+                    for player_id in waiver.get("adds") or {}
+                ),
+                (waiver.get("settings") or {}).get("waiver_bid", "-"),
+                "Won" if waiver["status"] == "complete" else "Lost",
+                ", ".join(dropped) or "-",
+            ]
+        )
+    report = Report(final_table.title, [final_table] + faab_report.tables)
+
+    logger.debug("WAIVERS_STRING: %s", report.to_dict())
+    logger.debug("LEAVING GET_WAIVERS_REPORT FUNCTION")
 
+    return report
 
-def get_matchups_string(league, week, logger):
+
+@timed_report("matchups")
+def get_matchups_report(league, week, logger, history_index=None):
     """
     Creates and returns a message of the current week's matchups.
     :param league: Object league
-    :return: string message of the current week matchups.
+    :param history_index: HistoryIndex to show the all-time record of
+        Team A against Team B, None to skip it
+    :return: Report of the current week matchups.
     """
-    logger.debug("ENTERING GET_MATCHUPS_STRING FUNCTION")
+    logger.debug("ENTERING GET_MATCHUPS_REPORT FUNCTION")
     scoreboards = get_league_scoreboards(league, week)
-    logger.debug("SCOREBOARDS: " + str(scoreboards))
+    logger.debug("SCOREBOARDS: %s", payload(logger, scoreboards))
 
     # final_message_string = "<pre>"
-    final_table = PrettyTable()
+    final_table = Table()
     final_table.title = "Matchups - Week {}".format(week)
-    final_table.field_names = ["Match", "Team A", " ", "Team B"]
+    final_table.field_names = ["Match", "Team A", " ", "Team B"] + (
+        ["All-time"] if history_index is not None else []
+    )
 
     if scoreboards is None:
-        final_table.add_row(["No", "Scoreboards", "", "Found"])
+        final_table.add_row(
+            ["No", "Scoreboards", "", "Found"]
+            + ([""] if history_index is not None else [])
+        )
         # final_table.add_row(["N/A", "N/A", " ", "N/A"])
     else:
         data_dict = defaultdict(list)
@@ -286,21 +634,30 @@ def get_matchups_string(league, week, logger):
             for i in values:
                 data_dict[key].append(i[0])
 
-        for key, values in sorted(data_dict.items()):
-            final_table.add_row([key, values[0], "vs", values[1]])
+        owners_dict = defaultdict(list)
+        if history_index is not None:
+            roster_id_to_owner_id_dict = map_roster_id_to_owner_id(league)
+            # Same order as the scoreboards, built from the matchups list
+            for matchup in league.get_matchups(week):
+                owners_dict[matchup["matchup_id"]].append(
+                    roster_id_to_owner_id_dict.get(matchup["roster_id"])
+                )
 
-    final_message_string = final_table.get_string()
-    # final_message_string += "</pre>"
+        for key, values in sorted(data_dict.items()):
+            row = [key, values[0], "vs", values[1]]
+            if history_index is not None and len(owners_dict[key]) == 2:
+                record = history_index.get_record(*owners_dict[key])
+                row.append("{}-{}-{}".format(*record[:3]))
+            elif history_index is not None:
+                row.append("")
+            final_table.add_row(row)
 
-    size = get_table_size(
-        final_message_string, FONT_SIZE, FONT_NAME, IMAGE_WIDTH_PIXELS
-    )
-    print("SIZE: " + str(size))
+    report = Report(final_table.title, [final_table])
 
-    logger.debug("MATCHUP_TABLES: " + str(final_message_string))
-    logger.debug("LEAVING GET_MATCHUPS_STRING FUNCTION")
+    logger.debug("MATCHUP_TABLES: %s", report.to_dict())
+    logger.debug("LEAVING GET_MATCHUPS_REPORT FUNCTION")
 
-    return final_message_string, size[0], size[1]
+    return report
 
 
 def get_league_scoreboards(league, week):
@@ -321,17 +678,18 @@ def get_league_scoreboards(league, week):
     return scoreboards
 
 
-def get_scores_string(league, week, event_title, logger):
+@timed_report("scores")
+def get_scores_report(league, week, event_title, logger):
     """
     Creates and returns a message of the league's current
     scores for the current week.
     :param league: Object league
-    :return: string message of the current week's scores
+    :return: Report of the current week's scores
     """
-    logger.debug("ENTERING GET_SCORES_STRING FUNCTION")
+    logger.debug("ENTERING GET_SCORES_REPORT FUNCTION")
     scoreboards = get_league_scoreboards(league, week)
     data_dict = defaultdict(list)
-    final_table = PrettyTable()
+    final_table = Table()
     final_table.title = "{0} - Week {1}".format(event_title, week)
     final_table.field_names = ["Matchup", "Teams", "Points"]
 
@@ -351,71 +709,145 @@ def get_scores_string(league, week, event_title, logger):
             final_table.add_row([key, values[0], values[1]])
             final_table.add_row([key, values[2], values[3]])
 
-    final_message_string = final_table.get_string()
-    # final_message_string += "</pre>"
+    report = Report(final_table.title, [final_table])
 
-    size = get_table_size(
-        final_message_string, FONT_SIZE, FONT_NAME, IMAGE_WIDTH_PIXELS
-    )
-    print("SIZE: " + str(size))
+    logger.debug("SCORES_STRINGS: %s", report.to_dict())
+    logger.debug("LEAVING GET_SCORES_REPORT FUNCTION")
+
+    return report
+
+
+@timed_report("matchup")
+def get_matchup_report(league, week, team, logger):
+    """
+    Creates and returns a message of the current score of the matchup of
+    a team.
+    :param league: Object league
+    :param week: Int week of the matchup
+    :param team: Part of the team name, case insensitive
+    :param logger: A logger object for logging debug
+    :return: Report of the matchup
+    """
+    logger.debug("ENTERING GET_MATCHUP_REPORT FUNCTION")
+    scoreboards = get_league_scoreboards(league, week) or {}
+    final_table = Table()
+    final_table.title = "Matchup - Week {}".format(week)
+    final_table.field_names = ["Team", "Points"]
+
+    teams = None
+    for values in scoreboards.values():
+        if team and any(
+            team.casefold() in str(name).casefold() for name, _ in values
+        ):
+            teams = values
+            break
 
-    logger.debug("SCORES_STRINGS: " + str(final_message_string))
-    logger.debug("LEAVING GET_SCORES_STRING FUNCTION")
+    if teams is None:
+        final_table.add_row(["No matchup found for", team or "no team"])
+    else:
+        for name, points in teams:
+            final_table.add_row([name, points])
+
+    report = Report(final_table.title, [final_table])
 
-    return final_message_string, size[0], size[1]
+    logger.debug("MATCHUP_STRING: %s", report.to_dict())
+    logger.debug("LEAVING GET_MATCHUP_REPORT FUNCTION")
 
+    return report
 
-def get_close_games_string(league, week, close_num, logger):
+
+@timed_report("close_games")
+def get_close_games_report(
+    league,
+    season,
+    week,
+    close_num,
+    close_probability,
+    logger,
+    games_over=None,
+):
     """
     Creates and returns a message of the league's close games.
     :param league: Object league
-    :param close_num: Int point difference to considered a close game.
-    :return: string message of the current week's close games.
+    :param season: Current season year
+    :param week: Int week to get the close games of
+    :param close_num: Int point difference to considered a finished
+        game close.
+    :param close_probability: Float minimum win probability of the
+        underdog to considered a live game close.
+    :param games_over: Set of the NFL teams whose game is over, None
+        when unknown, their players counted as still playing
+    :return: Report of the current week's close games.
     """
-    logger.debug("ENTERING GET_CLOSE_GAMES_STRING FUNCTION")
-    scoreboards = get_league_scoreboards(league, week)
-    data_dict = defaultdict(list)
-    final_table = PrettyTable()
-    final_table.title = "Close Games - Week {0}".format(week)
-    final_table.field_names = ["Matchup", "Teams", "Points"]
-    # final_message_string = "<pre>"
-    # final_message_string = "Close Games - Week {0}\n".format(week)
+    logger.debug("ENTERING GET_CLOSE_GAMES_REPORT FUNCTION")
+    matchups = league.get_matchups(week)
+    users = league.get_users()
+    stats = Stats()
+    week_stats = stats.get_week_stats("regular", season, week)
+    week_projections = stats.get_week_projections("regular", season, week)
+    score_type = get_score_type(league.get_league().get("scoring_settings"))
+    player_teams = {
+        player_id: player.get("team")
+        for player_id, player in Players().get_all_players().items()
+        if player
+    }
 
-    if scoreboards is None:
-        final_table.add_row(["No", "Scoreboards", "Found"])
-        # final_table.add_row(["N/A", "N/A", "N/A"])
-    else:
-        close_games = league.get_close_games(scoreboards, close_num)
-        for key, values in close_games.items():
-            for i in values:
-                data_dict[key].append(i[0])
-                data_dict[key].append(i[1])
+    owner_id_to_team_dict = map_users_to_team_name(users, logger)
+    roster_id_to_owner_id_dict = map_roster_id_to_owner_id(league)
 
-        for key, values in sorted(data_dict.items()):
-            final_table.add_row([key, values[0], values[1]])
-            final_table.add_row([key, values[2], values[3]])
+    final_table = Table()
+    final_table.title = "Close Games - Week {0}".format(week)
+    final_table.field_names = ["Matchup", "Teams", "Points", "Proj", "Win %"]
 
-    final_message_string = final_table.get_string()
-    # final_message_string += "</pre>"
+    if not matchups:
+        final_table.add_row(["No", "Scoreboards", "Found", "", ""])
+    else:
+        win_probabilities = get_matchup_win_probabilities(
+            matchups,
+            week_stats,
+            week_projections,
+            score_type,
+            player_teams,
+            games_over,
+        )
+        close_games = get_close_games(
+            win_probabilities, close_probability, close_num
+        )
+        logger.debug("CLOSE_GAMES: %s", payload(logger, close_games))
+
+        for key, teams in sorted(close_games.items()):
+            for team in teams:
+                owner_id = roster_id_to_owner_id_dict.get(team["roster_id"])
+                if owner_id is None:
+                    team_name = "Team name not available"
+                else:
+                    team_name = owner_id_to_team_dict[owner_id]
+                final_table.add_row(
+                    [
+                        key,
+                        team_name,
+                        "{:.2f}".format(team["points"]),
+                        "{:.2f}".format(team["projected"]),
+                        "{:.0%}".format(team["win_probability"]),
+                    ]
+                )
 
-    size = get_table_size(
-        final_message_string, FONT_SIZE, FONT_NAME, IMAGE_WIDTH_PIXELS
-    )
-    print("SIZE: " + str(size))
+    report = Report(final_table.title, [final_table])
 
-    logger.debug("CLOSE_GAMES_STRINGS: " + str(final_message_string))
-    logger.debug("LEAVING GET_CLOSE_GAMES_STRING FUNCTION")
+    logger.debug("CLOSE_GAMES_STRINGS: %s", report.to_dict())
+    logger.debug("LEAVING GET_CLOSE_GAMES_REPORT FUNCTION")
 
-    return final_message_string, size[0], size[1]
+    return report
 
 
-def get_standings_string(league, week, playoff_line, logger):
+@timed_report("standings")
+def get_standings_report(league, week, playoff_line, logger):
     """
     Creates and returns a message of the league's standings.
     :param league: Object league
-    :return: string message of the leagues standings.
+    :return: Report of the leagues standings.
     """
-    logger.debug("ENTERING GET_STANDINGS_STRING FUNCTION")
+    logger.debug("ENTERING GET_STANDINGS_REPORT FUNCTION")
     rank_col = []
     team_col = []
     win_col = []
@@ -424,7 +856,7 @@ def get_standings_string(league, week, playoff_line, logger):
     rosters = league.get_rosters()
     users = league.get_users()
     standings = league.get_standings(rosters, users)
-    final_table = PrettyTable()
+    final_table = Table()
     final_table.title = "League Standings - Week {}".format(week)
     # final_message_string = "<pre>"
     # final_message_string = "League Standings - Week {} \n".format(week)
@@ -448,19 +880,12 @@ def get_standings_string(league, week, playoff_line, logger):
     final_table.add_column("Loss", loss_col)
     final_table.add_column("Points", points_col)
 
-    final_message_string = final_table.get_string()
-
-    # final_message_string += "</pre>"
-
-    size = get_table_size(
-        final_message_string, FONT_SIZE, FONT_NAME, IMAGE_WIDTH_PIXELS
-    )
-    print("SIZE: " + str(size))
+    report = Report(final_table.title, [final_table])
 
-    logger.debug("STANDINGS_STRINGS: " + str(final_message_string))
-    logger.debug("LEAVING GET_STANDINGS_STRING FUNCTION")
+    logger.debug("STANDINGS_STRINGS: %s", report.to_dict())
+    logger.debug("LEAVING GET_STANDINGS_REPORT FUNCTION")
 
-    return final_message_string, size[0], size[1]
+    return report
 
 
 def get_pdf_report_link(league_id, season, logger):
@@ -477,89 +902,185 @@ def get_pdf_report_link(league_id, season, logger):
     if os.path.exists(gdrive_message_path):
         os.remove(gdrive_message_path)
     else:
-        print("Before The file " + gdrive_message_path + " does not exist")
+        logger.debug("GDRIVE_MESSAGE_PATH: %s not found", gdrive_message_path)
 
     subprocess.Popen(
         "yes | python " + script_path + options, shell=True
     ).wait()
 
     if os.path.exists(gdrive_message_path):
-        print("File was found")
+        logger.debug("GDRIVE_MESSAGE_PATH: %s found", gdrive_message_path)
         file = open(gdrive_message_path, "r")
         return file.read()
     else:
-        print("The file " + gdrive_message_path + " does not exist")
+        logger.warning(
+            "GDRIVE_MESSAGE_PATH: %s not found", gdrive_message_path
+        )
 
     logger.debug("LEAVING GET_BENCH_POINTS FUNCTION")
 
 
-def get_best_and_worst_string(league, season, week, logger):
+@timed_report("best_and_worst")
+def get_best_and_worst_report(league, season, week, logger):
     """
     :param league: Object league
-    :return: String of the highest Scorer, lowest scorer,
+    :return: Report of the highest Scorer, lowest scorer,
             most points left on the bench, and Why bother section.
     """
-    logger.debug("ENTERING GET_BEST_AND_WORST_STRING FUNCTION")
-    highest_scorer_table = PrettyTable()
-    lowest_scorer_table = PrettyTable()
+    logger.debug("ENTERING GET_BEST_AND_WORST_REPORT FUNCTION")
+    highest_scorer_table = Table()
+    lowest_scorer_table = Table()
+    highlights = []
     # final_message_string = "<pre>"
 
+    # Fetched once for the four sections
+    scoreboards = get_league_scoreboards(league, week)
+    week_stats = Stats().get_week_stats("regular", season, week)
+
+    highest_score = get_highest_score(league, week, logger, scoreboards)
     highest_scorer_table.field_names = ["🏆🏆 Highest Scorer 🏆🏆"]
-    highest_scorer_table.add_row([get_highest_score(league, week, logger)[1]])
-    highest_scorer_table.add_row([get_highest_score(league, week, logger)[0]])
+    highest_scorer_table.add_row([highest_score[1]])
+    highest_scorer_table.add_row([highest_score[0]])
 
+    lowest_score = get_lowest_score(league, week, logger, scoreboards)
     lowest_scorer_table.field_names = ["😢😢 Lowest Scorer 😢😢"]
-    lowest_scorer_table.add_row([get_lowest_score(league, week, logger)[1]])
-    lowest_scorer_table.add_row([get_lowest_score(league, week, logger)[0]])
-
-    final_message_string = highest_scorer_table.get_string()
-    final_message_string += "\n"
-    final_message_string += lowest_scorer_table.get_string()
-    final_message_string += "\n"
+    lowest_scorer_table.add_row([lowest_score[1]])
+    lowest_scorer_table.add_row([lowest_score[0]])
 
     highest_bench_score_emojis = " 😂😂"
-    bench_points = get_bench_points(league, season, week, logger)
+    bench_points = get_bench_points(league, season, week, logger, week_stats)
 
     largest_scoring_bench = get_highest_bench_points(bench_points)
-    final_message_string += "{} Most points left on the bench:".format(
-        highest_bench_score_emojis
+    highlights.append(
+        "{} Most points left on the bench:".format(highest_bench_score_emojis)
+    )
+    highlights.append(
+        "{}\n{:.2f}\n".format(
+            largest_scoring_bench[0],
+            largest_scoring_bench[1],
+        )
     )
-    final_message_string += "\n{}\n{:.2f}\n\n".format(
-        largest_scoring_bench[0],
-        largest_scoring_bench[1],
+    negative_starters = get_negative_starters(
+        league, season, week, logger, week_stats
     )
-    negative_starters = get_negative_starters(league, season, week, logger)
     if negative_starters:
-        final_message_string += "🤔🤔Why bother?\n"
+        highlights.append("🤔🤔Why bother?")
 
     for key in negative_starters:
         negative_starters_list = negative_starters[key]
-        final_message_string += "{} Started:\n".format(key)
+        highlights.append("{} Started:".format(key))
         for negative_starter_tup in negative_starters_list:
-            final_message_string += "{} who sucks, and had {} points\n".format(
-                negative_starter_tup[0], negative_starter_tup[1]
+            highlights.append(
+                "{} who sucks, and had {} points".format(
+                    negative_starter_tup[0], negative_starter_tup[1]
+                )
             )
-        final_message_string += "\n"
+        highlights.append("")
+
+    report = Report(
+        "Best and Worst - Week {}".format(week),
+        [highest_scorer_table, lowest_scorer_table],
+        highlights,
+    )
+
+    logger.debug("FUN_FACTS_STRINGS: %s", report.to_dict())
+    logger.debug("LEAVING GET_BEST_AND_WORST_REPORT FUNCTION")
+
+    return report
+
+
+@timed_report("luck")
+def get_luck_report(league, season, week, store, logger):
+    """
+    Creates and returns a message of the season luck, the points
+    against projections and the wins against expected wins of every team,
+    plus the players that most over and under performed.
+    :param league: Object league
+    :param season: Current season year
+    :param week: Int last week to include
+    :param store: Permanent store for completed weeks
+    :param logger: A logger object for logging debug
+    :return: Report of the season luck
+    """
+    logger.debug("ENTERING GET_LUCK_REPORT FUNCTION")
+    users = league.get_users()
+    players_dict = Players().get_all_players()
+    owner_id_to_team_dict = map_users_to_team_name(users, logger)
+    roster_id_to_owner_id_dict = map_roster_id_to_owner_id(league)
 
-    size = get_table_size(
-        final_message_string, FONT_SIZE, FONT_NAME, IMAGE_WIDTH_PIXELS
+    matchups_by_week, stats_by_week, projections_by_week = get_season_data(
+        league, season, range(1, int(week) + 1), week, store
     )
-    print("SIZE: " + str(size))
+    season_arrays = build_season_arrays(
+        matchups_by_week,
+        stats_by_week,
+        projections_by_week,
+        league.get_league().get("scoring_settings"),
+    )
+
+    luck_table = Table()
+    luck_table.title = "Season Luck - Week {}".format(week)
+    luck_table.field_names = ["Team", "Pts", "Proj", "W", "xW", "Luck"]
+
+    for roster_id, points, projected, wins, expected_wins in get_team_luck(
+        season_arrays
+    ):
+        owner_id = roster_id_to_owner_id_dict.get(roster_id)
+        if owner_id is None:
+            team_name = "Team name not available"
+        else:
+            team_name = owner_id_to_team_dict[owner_id]
+        luck_table.add_row(
+            [
+                team_name,
+                "{:.2f}".format(points),
+                "{:.2f}".format(projected),
+                "{:g}".format(wins),
+                "{:.2f}".format(expected_wins),
+                "{:+.2f}".format(wins - expected_wins),
+            ]
+        )
+
+    players_table = Table()
+    players_table.field_names = ["Player", "Pts", "Proj", "+/-"]
+    player_luck = get_player_luck(season_arrays)
+
+    for player_id, points, projected in (
+        player_luck[:LUCK_PLAYERS_NUM] + player_luck[-LUCK_PLAYERS_NUM:]
+        if len(player_luck) > 2 * LUCK_PLAYERS_NUM
+        else player_luck
+    ):
+        player_info = players_dict.get(player_id, {})
+        players_table.add_row(
+            [
+                "{} {}".format(
+                    player_info.get("first_name", player_id),
+                    player_info.get("last_name", ""),
+                ).strip(),
+                "{:.2f}".format(points),
+                "{:.2f}".format(projected),
+                "{:+.2f}".format(points - projected),
+            ]
+        )
 
-    logger.debug("FUN_FACTS_STRINGS: " + str(final_message_string))
-    logger.debug("LEAVING GET_BEST_AND_WORST_STRING FUNCTION")
+    report = Report(luck_table.title, [luck_table, players_table])
 
-    return final_message_string, size[0], size[1]
+    logger.debug("LUCK_STRINGS: %s", report.to_dict())
+    logger.debug("LEAVING GET_LUCK_REPORT FUNCTION")
 
+    return report
 
-def get_highest_score(league, week, logger):
+
+def get_highest_score(league, week, logger, scoreboards=None):
     """
     Gets the highest score of the week
     :param league: Object league
+    :param scoreboards: Scoreboards of the week, fetched when None
     :return: List [score, team_name]
     """
     logger.debug("ENTERING GET_HIGHEST_SCORE FUNCTION")
-    scoreboards = get_league_scoreboards(league, week)
+    if scoreboards is None:
+        scoreboards = get_league_scoreboards(league, week)
     max_score = [0, None]
 
     if scoreboards is None:
@@ -585,14 +1106,16 @@ def get_highest_score(league, week, logger):
     return max_score
 
 
-def get_lowest_score(league, week, logger):
+def get_lowest_score(league, week, logger, scoreboards=None):
     """
     Gets the lowest score of the week
     :param league: Object league
+    :param scoreboards: Scoreboards of the week, fetched when None
     :return: List[score, team_name]
     """
     logger.debug("ENTERING GET_LOWEST_SCORE FUNCTION")
-    scoreboards = get_league_scoreboards(league, week)
+    if scoreboards is None:
+        scoreboards = get_league_scoreboards(league, week)
     min_score = [999, None]
 
     if scoreboards is None:
@@ -617,176 +1140,43 @@ def get_lowest_score(league, week, logger):
     return min_score
 
 
-def get_bench_points(league, season, week, logger):
+def get_bench_points(league, season, week, logger, week_stats=None):
     """
-
+    Sums the points left on the bench by every team, with the league
+    bonuses.
     :param league: Object league
+    :param week_stats: Week stats, fetched when None
     :return: List [(team_name, score), ...]
     """
     logger.debug("ENTERING GET_BENCH_POINTS FUNCTION")
 
     users = league.get_users()
     matchups = league.get_matchups(week)
+    if week_stats is None:
+        week_stats = Stats().get_week_stats("regular", season, week)
 
-    stats = Stats()
-    # WEEK STATS NEED TO BE FIXED
-    week_stats = stats.get_week_stats("regular", season, week)
-    print("TP: ", type(week_stats))
-
-    df_stats = pd.DataFrame.from_dict(week_stats)
-    if df_stats.empty:
-        logger.debug("EMPTY DF")
-        result_list = []
-    else:
-        logger.debug("NOT EMPTY DF")
-        df_stats = df_stats.fillna(0)
-        print("initial DF: " + str(df_stats.shape))
-        df_stats.to_csv(
-            r"/tmp/pandas.txt", header=True, index=True, sep=" ", mode="a"
-        )
-
-        total_points = df_stats.loc[["bonus_rec_te", "rec_fd", "ff"]].sum()
-        total_points.name = "total_points"
-
-        # print(total_points)
-        df_stats = df_stats.append(total_points.transpose())
-        print("Added column: " + str(df_stats.shape))
-        df_stats.to_csv(
-            r"/tmp/pandas2.txt", header=True, index=True, sep=" ", mode="a"
-        )
-
-        print("before : " + df_stats["total_points"])
-
-        # import pdb; pdb.set_trace()
-        df_stats = df_stats.T
-
-        print(df_stats["total_points"])
-
-        df_stats[SCORING_TYPE] = df_stats[SCORING_TYPE]
-        # - df_stats["pass_int"] )
-        df_stats["bonus_rec_te"] = df_stats["bonus_rec_te"].multiply(
-            BONUS_REC_TE
-        )
-        df_stats["rec_fd"] = df_stats["rec_fd"].multiply(BONUS_REC_FIRST_DOWN)
-        df_stats["ff"] = df_stats["ff"].multiply(BONUS_FUMBLE_FORCED_DEF)
-        df_stats["pass_int"] = df_stats["pass_int"].multiply(BONUS_INT_QB)
+    owner_id_to_team_dict = map_users_to_team_name(users, logger)
+    roster_id_to_owner_id_dict = map_roster_id_to_owner_id(league)
+    logger.debug(
+        "OWNER_ID_TO_TEAM_DICT: %s", payload(logger, owner_id_to_team_dict)
+    )
 
-        print("Transposed and with math operations: " + str(df_stats.shape))
+    sink_path = get_debug_sink_path("week_{}_stats.json".format(week))
+    if sink_path:
+        with open(sink_path, "w") as sink_file:
+            json.dump(week_stats, sink_file)
+
+    result_list = []
+    bench_scores = get_bench_scores(matchups, week_stats)
+    for i, (roster_id, score) in enumerate(bench_scores.items()):
+        owner_id = roster_id_to_owner_id_dict.get(roster_id)
+        if owner_id is None:
+            team_name = "Team name not available" + str(i)
+        else:
+            team_name = owner_id_to_team_dict[owner_id]
+        result_list.append((team_name, score))
 
-        owner_id_to_team_dict = map_users_to_team_name(users, logger)
-
-        print("OWNER_ID_TO_TEAM_DICT: " + str(owner_id_to_team_dict))
-        roster_id_to_owner_id_dict = map_roster_id_to_owner_id(league)
-        print("ROSTER_ID_TO_OWNER_ID_DICT: " + str(roster_id_to_owner_id_dict))
-        result_list = []
-
-        print(type(matchups))
-        df_matchups = pd.DataFrame(matchups)
-        print(df_matchups)
-
-        # df_matchups["bench"] = (set(df_matchups["players"])
-        #                        - set(df_matchups["starters"]))
-        # print(df_matchups[[x[0] in x[1] for x in zip(
-        #       set(df_matchups['players']),
-        #       set(df_matchups['starters']))]][['players', 'starters']])
-
-        df_stats = df_stats.T
-        df_stats = df_stats.round(2)
-
-        for index, row in df_matchups.iterrows():
-            # print(index)
-            all_roster = row["players"]
-            starters = row["starters"]
-            bench = set(all_roster) - set(starters)
-
-            # print(all_roster)
-            # print(starters)
-            print("BENCH: " + str(bench))
-            print(type(bench))
-
-            # df_stats.to_csv(r'/tmp/pandas.txt',
-            # header=True,
-            # index=True,
-            # sep=' ',
-            # mode='a')
-
-            # from tabulate import tabulate
-            # print(tabulate(df_stats, headers='keys', tablefmt='psql'))
-
-            print(df_stats.loc[:, tuple(bench)])
-
-            df_bench = df_stats.loc[:, tuple(bench)]
-
-            df_bench = df_bench.T
-
-            df_stats = df_stats.T
-
-            print(df_stats)
-
-            # player_points = 0
-            # bonus_rec_te_points = 0
-            # rec_fd_points = 0
-            for player in bench:
-
-                print("player in bench: " + player)
-                #
-                # print(df_stats.loc[:, [4218]])
-                print(df_stats.loc[:, [player]])
-                print(type(df_stats.loc[:, [player]]))
-                player_l = pd.Series(df_stats.loc[:, [player]])
-                print("player_series: " + player_l)
-
-                # player_points = player[SCORING_TYPE]
-                # print("pp: " + player_points)
-
-                # if BONUS_REC_TE:
-                #     bonus_rec_te_points = player["bonus_rec_te"]
-
-                # if BONUS_REC_FIRST_DOWN:
-                #     bonus_rec_fd_points = player["rec_fd"]
-
-                # if BONUS_FUMBLE_FORCED_DEF:
-                #     bonus_ff_def_points = player["ff"]
-
-                # if BONUS_INT_QB:
-                #     bonus_int_qb_points = player["pass_int"]
-
-                # print("pp: " + player_points)
-                # print("BON_REC_TE_P: " + bonus_rec_te_points)
-                # print(rec_fd_points)
-                # print(type(bonus_rec_te_points))
-
-                # total_points = ( player_points
-                # + bonus_rec_te_points
-                # + bonus_rec_fd_points
-                # + bonus_ff_def_points
-                # - bonus_int_qb_points )
-                # print("tp: " + total_points)
-
-        # for matchup in matchups:
-        #     starters = matchup["starters"]
-        #     all_players = matchup["players"]
-        #     bench = set(all_players) - set(starters)
-
-        #     std_points = 0
-        #     rec_fd = 0
-        #     bonus_rec_te = 0
-        #     total_points = 0
-        #     for player in bench:
-        #         try:
-        #             std_points += week_stats[str(player)]["pts_half_ppr"]
-        #             rec_fd += week_stats[str(player)]["rec_fd"] * 0.5
-        #             bonus_rec_te += week_stats[str(player)]["rec_fd"] * 0.5
-        #         except Exception:
-        #             continue
-        #     owner_id = roster_id_to_owner_id_dict[matchup["roster_id"]]
-        #     if owner_id is None:
-        #         team_name = "Team name not available"
-        #     else:
-        #         team_name = owner_id_to_team_dict[owner_id]
-        #     result_list.append((team_name, total_points))
-
-        result_list = []
+    logger.debug("BENCH_POINTS: %s", payload(logger, result_list))
     logger.debug("LEAVING GET_BENCH_POINTS FUNCTION")
 
     return result_list
@@ -807,50 +1197,45 @@ def get_highest_bench_points(bench_points):
     return max_tup
 
 
-def get_negative_starters(league, season, week, logger):
+def get_negative_starters(league, season, week, logger, week_stats=None):
     """
     Finds all of the players that scores negative points in standard and
     :param league: Object league
+    :param week_stats: Week stats, fetched when None
     :return: Dict { "owner_name":[("player_name", std_score), ...],
                     "owner_name":...}
     """
     users = league.get_users()
     matchups = league.get_matchups(week)
+    if week_stats is None:
+        week_stats = Stats().get_week_stats("regular", season, week)
 
-    stats = Stats()
-    # WEEK STATS NEED TO BE FIXED
-    week_stats = stats.get_week_stats("regular", season, week)
+    negative_starters = find_negative_starters(matchups, week_stats)
+    if not negative_starters:
+        return {}
 
-    players = Players()
-    players_dict = players.get_all_players()
+    # The players dump is only loaded when there are names to show
+    players_dict = Players().get_all_players()
     owner_id_to_team_dict = map_users_to_team_name(users, logger)
     roster_id_to_owner_id_dict = map_roster_id_to_owner_id(league)
 
     result_dict = {}
 
-    for i, matchup in enumerate(matchups):
-        starters = matchup["starters"]
+    for i, (roster_id, starters) in enumerate(negative_starters.items()):
         negative_players = []
-        for starter_id in starters:
-            try:
-                std_pts = week_stats[str(starter_id)]["pts_half_ppr"]
-            except KeyError:
-                std_pts = 0
-            if std_pts < 0:
-                player_info = players_dict[starter_id]
-                player_name = "{} {}".format(
-                    player_info["first_name"], player_info["last_name"]
-                )
-                negative_players.append((player_name, std_pts))
-
-        if len(negative_players) > 0:
-            owner_id = roster_id_to_owner_id_dict[matchup["roster_id"]]
+        for starter_id, std_pts in starters:
+            player_info = players_dict[starter_id]
+            player_name = "{} {}".format(
+                player_info["first_name"], player_info["last_name"]
+            )
+            negative_players.append((player_name, std_pts))
 
-            if owner_id is None:
-                team_name = "Team name not available" + str(i)
-            else:
-                team_name = owner_id_to_team_dict[owner_id]
-            result_dict[team_name] = negative_players
+        owner_id = roster_id_to_owner_id_dict[roster_id]
+        if owner_id is None:
+            team_name = "Team name not available" + str(i)
+        else:
+            team_name = owner_id_to_team_dict[owner_id]
+        result_dict[team_name] = negative_players
     return result_dict
 
 
@@ -895,9 +1280,35 @@ def map_roster_id_to_owner_id(league):
 #   MemoryQueueBucket,
 # )
 
-requests_cache.install_cache(
-    cache_name="api_cache", backend="sqlite", expire_after=DAY_IN_SECONDS
-)
+
+def install_request_cache(backend="sqlite", governor=None):
+    """
+    install_request_cache Caches every request of the process for a day,
+                          the refreshable Sleeper endpoints revalidated
+                          more often, recording the HTTP metrics, and
+                          routes the Sleeper calls through a new pooled
+                          client using the cache and the API quota.
+
+    :param backend: requests_cache backend, "memory" for a cache lost on
+        restart
+    :type backend: str
+    :param governor: Quota governor of the calls, defaults to the one of
+        QUOTA_PATH, shared with the other processes
+    :type governor: governor.Governor
+    :return: The quota governor
+    :rtype: governor.Governor
+    """
+    requests_cache.install_cache(
+        cache_name="api_cache",
+        backend=backend,
+        expire_after=DAY_IN_SECONDS,
+        urls_expire_after=REVALIDATED_URLS,
+        session_factory=InstrumentedCachedSession,
+    )
+    if governor is None:
+        governor = Governor(os.environ.get("QUOTA_PATH", QUOTA_PATH))
+    install_sleeper_client(governor=governor)
+    return governor
 
 
 def make_roster_dict(starters_list, bench_list, season, week):
@@ -967,7 +1378,7 @@ def check_starters_and_bench(lineup_dict):
 
 
 def get_bot_message_schedule():
-    x = PrettyTable()
+    x = Table()
 
     x.add_column(
         "Message",
@@ -979,6 +1390,8 @@ def get_bot_message_schedule():
             "Monday Night Scores",
             "Week Scores",
             "Standings",
+            "Bench Beats Starters",
+            "Season Luck",
             "PDF Report",
             "Draft Reminder",
         ],
@@ -994,6 +1407,8 @@ def get_bot_message_schedule():
             "Tuesday",
             "Tuesday",
             "Tuesday",
+            "Tuesday",
+            "Tuesday",
             "Daily",
         ],
     )
@@ -1007,12 +1422,14 @@ def get_bot_message_schedule():
             MONDAY_NIGHT_SCORES_HOUR,
             TUESDAY_MORNING_WEEK_SCORES_HOUR,
             TUESDAY_MORNING_STANDINGS_HOUR,
+            TUESDAY_MORNING_BENCH_BEATS_STARTERS_HOUR,
+            TUESDAY_MORNING_LUCK_HOUR,
             TUESDAY_MORNING_REPORT_HOUR,
             DAILY_NIGHT_DRAFT_REMINDER_HOUR,
         ],
     )
 
-    return x.get_string()
+    return x
 
 
 def send_any_string(string_to_send):
@@ -1034,25 +1451,64 @@ def get_playoff_bracket_string(league):
     return bracket
 
 
-def get_bench_beats_starters_string(league, week):
+@timed_report("bench_beats_starters")
+def get_bench_beats_starters_report(league, season, week, logger):
     """
     Gets all bench players that outscored starters at their position.
     :param league: Object league
-    :return: String teams which had bench players outscore their
-            starters in a position.
+    :param season: Current season year
+    :param week: Int week to get the bench players of
+    :param logger: A logger object for logging debug
+    :return: Report of the teams which had bench players outscore
+            their starters in a position.
     """
+    logger.debug("ENTERING GET_BENCH_BEATS_STARTERS_REPORT FUNCTION")
+    users = league.get_users()
     matchups = league.get_matchups(week)
+    week_stats = Stats().get_week_stats("regular", season, week)
+    players_dict = Players().get_all_players()
+
+    owner_id_to_team_dict = map_users_to_team_name(users, logger)
+    roster_id_to_owner_id_dict = map_roster_id_to_owner_id(league)
+
+    final_table = Table()
+    final_table.title = "Bench Beats Starters - Week {}".format(week)
+    final_table.field_names = ["Team", "Pos", "Bench", "Starter"]
+
+    roster_index = build_roster_index(
+        matchups or [],
+        players_dict,
+        week_stats,
+        roster_positions=league.get_league().get("roster_positions"),
+    )
+    bench_beats_starters = find_bench_beats_starters(roster_index)
+
+    if not bench_beats_starters:
+        final_table.add_row(["No", "bench", "beat any", "starter"])
+
+    for roster_id, rows in bench_beats_starters.items():
+        owner_id = roster_id_to_owner_id_dict.get(roster_id)
+        if owner_id is None:
+            team_name = "Team name not available"
+        else:
+            team_name = owner_id_to_team_dict[owner_id]
+
+        for position, bench_player, starter in rows:
+            final_table.add_row(
+                [
+                    team_name,
+                    position,
+                    "{} ({:.2f})".format(bench_player[1], bench_player[0]),
+                    "{} ({:.2f})".format(starter[1], starter[0]),
+                ]
+            )
 
-    final_message_string = "________________________________\n"
-    final_message_string += "Worst of the week💩💩\n"
-    final_message_string += "________________________________\n\n"
+    report = Report(final_table.title, [final_table])
 
-    for matchup in matchups:
-        starters = matchup["starters"]
-        all_players = matchup["players"]
-        bench = set(all_players) - set(starters)
+    logger.debug("BENCH_BEATS_STARTERS_STRINGS: %s", report.to_dict())
+    logger.debug("LEAVING GET_BENCH_BEATS_STARTERS_REPORT FUNCTION")
 
-    return bench
+    return report
 
 
 # def get_api_subscription_limits(monthly_limit):
@@ -1065,114 +1521,773 @@ def get_bench_beats_starters_string(league, week):
 
 
 def get_table_size(text, font_size, font_name, table_size):
+    logger = logging.getLogger("bot")
     font = ImageFont.truetype(font_name, font_size)
-    initial_size = font.getsize(text)
-    print("INITIAL_SIZE: " + str(initial_size))
+    # getsize was removed in Pillow 10, getbbox returns the same extent
+    initial_size = font.getbbox(text)[2:]
+    logger.debug("INITIAL_SIZE: %s", initial_size)
 
     size_width = int(nmp.ceil(initial_size[0] / table_size))
-    print("SIZE_WIDTH: " + str(size_width))
+    logger.debug("SIZE_WIDTH: %s", size_width)
 
     size_height = int(nmp.ceil((1.5 * initial_size[1] * size_width) + 50))
-    print("SIZE_HEIGHT: " + str(size_height))
+    logger.debug("SIZE_HEIGHT: %s", size_height)
 
     return table_size, size_height
 
 
 def create_image_from_string(text, width, height):
+    from pilmoji import Pilmoji
 
     byte_io = BytesIO()
 
-    with Image.new("RGB", (width, height), "white") as image:
-        font = ImageFont.truetype(FONT_NAME, FONT_SIZE)
-
-    with Pilmoji(image) as pilmoji:
-        pilmoji.text((10, 10), text.strip(), "black", font)
+    with RENDER_SECONDS.time():
+        with Image.new("RGB", (width, height), "white") as image:
+            font = ImageFont.truetype(FONT_NAME, FONT_SIZE)
 
-    image.save(byte_io, "PNG")
-    byte_io.seek(0)
+        with Pilmoji(image) as pilmoji:
+            pilmoji.text((10, 10), text.strip(), "black", font)
 
-    image.show()
+        image.save(byte_io, "PNG")
+        byte_io.seek(0)
 
     return byte_io
 
 
+def render_image(report):
+    """
+    render_image Renders a report as a PNG image of its text.
+
+    :param report: The report
+    :type report: report.Report
+    :return: PNG bytes
+    :rtype: bytes
+    """
+    text = render_text(report)
+    size = get_table_size(text, FONT_SIZE, FONT_NAME, IMAGE_WIDTH_PIXELS)
+    return create_image_from_string(text, *size).getvalue()
+
+
+def render_report(report, output_formats):
+    """
+    render_report Renders a report once in every output format, the
+                  image only when a platform posts it.
+
+    :param report: The report
+    :type report: report.Report
+    :param output_formats: Formats of the platforms, "photo" or a key of
+        renderers.RENDERERS
+    :type output_formats: set
+    :return: Dict {output format: content}, the PNG bytes of the photo
+    :rtype: dict
+    """
+    rendered = {}
+    for output_format in output_formats:
+        if output_format == "photo":
+            rendered["photo"] = render_image(report)
+        else:
+            rendered[output_format] = RENDERERS[output_format](report)
+    return rendered
+
+
+def send_report(job, report, logger, bundled=True):
+    """
+    send_report Renders and sends a report to every platform, unless the
+                ledger already has the same content for the job, league
+                and week, and records the delivery. When some platforms
+                failed, the ones delivered are recorded as job@platform
+                and skipped the next time. With a bundle, the report is
+                added to it instead.
+
+    :param job: Ledger key of the job, e.g. scores:Week Scores
+    :type job: str
+    :param report: The report
+    :type report: report.Report
+    :param logger: A logger object for logging debug
+    :type logger: logging.Logger
+    :param bundled: False to send the report now even with a bundle, for
+        the callers retrying the reports not delivered
+    :type bundled: bool
+    :return: False when the report could not be delivered
+    :rtype: bool
+    """
+    content_hash = report.get_content_hash()
+    if ledger.was_sent(job, league.league_id, week, content_hash):
+        logger.info("%s already sent for week %s, skipped", job, week)
+        return True
+    if bundle is not None and bundled:
+        bundle.add(job, report, content_hash)
+        return True
+
+    return deliver_to_platforms(
+        job,
+        lambda: render_report(report, bot.output_formats),
+        content_hash,
+        logger,
+    )
+
+
+def deliver_to_platforms(job, render, content_hash, logger, any_content=False):
+    """
+    deliver_to_platforms Sends a report or a note to the platforms that do
+                         not have it yet and records the delivery. When
+                         some platforms failed, the ones delivered are
+                         recorded as job@platform and skipped the next
+                         time; the job is recorded once every platform
+                         has it.
+
+    :param job: Ledger key of the job, e.g. scores:Week Scores
+    :type job: str
+    :param render: Function without arguments returning the rendered
+        report, or the note, called only when a platform needs it
+    :type render: callable
+    :param content_hash: Fingerprint of the content for the ledger
+    :type content_hash: str
+    :param logger: A logger object for logging debug
+    :type logger: logging.Logger
+    :param any_content: True when a platform with any content of the job
+        for the week is skipped, e.g. another link to the same report
+    :type any_content: bool
+    :return: False when some platform could not be delivered
+    :rtype: bool
+    """
+    sent = {
+        platform
+        for platform in bot.platforms
+        if ledger.was_sent(
+            "{}@{}".format(job, platform),
+            league.league_id,
+            week,
+            None if any_content else content_hash,
+        )
+    }
+    delivered = set()
+    if sent != bot.platforms:
+        delivered = bot.deliver_report(render(), skip=sent)
+    if sent | delivered != bot.platforms:
+        for platform in delivered:
+            ledger.record(
+                "{}@{}".format(job, platform),
+                league.league_id,
+                week,
+                content_hash,
+            )
+        logger.error(
+            "%s could not be delivered to %s for week %s",
+            job,
+            ", ".join(sorted(bot.platforms - sent - delivered)),
+            week,
+        )
+        return False
+    ledger.record(job, league.league_id, week, content_hash)
+    return True
+
+
+def send_bundle(report_bundle, logger):
+    """
+    send_bundle Sends the reports of a bundle to every platform and
+                records the ones delivered.
+
+    :param report_bundle: The bundle
+    :type report_bundle: bundle.ReportBundle
+    :param logger: A logger object for logging debug
+    :type logger: logging.Logger
+    :return: None
+    """
+    logger.info("Sending a bundle of %s reports", len(report_bundle))
+    for job, content_hash, delivered in report_bundle.send(bot):
+        if not delivered:
+            logger.error("%s could not be delivered for week %s", job, week)
+            continue
+        ledger.record(job, league.league_id, week, content_hash)
+
+
+@timed_job("welcome")
+@profiled_job("welcome")
 def send_welcome_photo_to_telegram(logger):
     logger.debug("ENTERING SEND_WELCOME_PHOTO_TO_TELEGRAM FUNCTION")
-    photo = create_image_from_string(*get_welcome_string(season, bot_logger))
-    print("ARRAY: " + str(photo))
-    bot.send("", photo)
+    send_report("welcome", get_welcome_report(season, bot_logger), logger)
     logger.debug("LEAVING SEND_WELCOME_PHOTO_TO_TELEGRAM FUNCTION")
 
 
+@timed_job("draft_reminder")
+@profiled_job("draft_reminder")
 def send_draft_reminder_photo_to_telegram():
-    photo = create_image_from_string(
-        *get_draft_reminder_string(
+    send_report(
+        "draft_reminder",
+        get_draft_reminder_report(
             league, season, bot_logger, DAYS_BEFORE_DRAFT
-        )
+        ),
+        bot_logger,
     )
-    print("ARRAY: " + str(photo))
-    bot.send("", photo)
 
 
+@timed_job("week_matchups")
+@profiled_job("week_matchups")
 def send_week_matchups_photo_to_telegram():
-    photo = create_image_from_string(
-        *get_matchups_string(league, week, bot_logger)
+    history_index = build_history_index(league, week, store)
+    send_report(
+        "week_matchups",
+        get_matchups_report(league, week, bot_logger, history_index),
+        bot_logger,
     )
-    print("ARRAY: " + str(photo))
-    bot.send("", photo)
 
 
+@timed_job("scores")
+@profiled_job("scores")
 def send_scores_photo_to_telegram(title, logger):
     logger.debug("ENTERING SEND_SCORES_PHOTO_TO_TELEGRAM FUNCTION")
-    photo = create_image_from_string(
-        *get_scores_string(league, week, title, bot_logger)
+    send_report(
+        "scores:" + title,
+        get_scores_report(league, week, title, bot_logger),
+        logger,
     )
-    print("ARRAY: " + str(photo))
-    logger.debug("BEFORE SEND THE PHOTO")
-    bot.send("", photo)
     logger.debug("LEAVING SEND_SCORES_PHOTO_TO_TELEGRAM FUNCTION")
 
 
+@timed_job("close_games")
+@profiled_job("close_games")
 def send_close_games_photo_to_telegram(logger):
     logger.debug("ENTERING SEND_CLOSE_GAMES_PHOTO_TO_TELEGRAM FUNCTION")
-    photo = create_image_from_string(
-        *get_close_games_string(league, week, int(close_num), bot_logger)
+    try:
+        games_over = get_games_over(
+            season, week, sportsdata_api_key, requests.Session(), bot_logger
+        )
+    except requests.exceptions.RequestException:
+        logger.warning("Games of week %s not available", week, exc_info=True)
+        games_over = None
+    send_report(
+        "close_games",
+        get_close_games_report(
+            league,
+            season,
+            week,
+            int(close_num),
+            float(close_probability),
+            bot_logger,
+            games_over,
+        ),
+        logger,
     )
-    print("ARRAY: " + str(photo))
-    logger.debug("BEFORE SEND THE PHOTO")
-    bot.send("", photo)
     logger.debug("LEAVING SEND_CLOSE_GAMES_PHOTO_TO_TELEGRAM FUNCTION")
 
 
+@timed_job("standings")
+@profiled_job("standings")
 def send_standings_photo_to_telegram(logger):
     logger.debug("ENTERING SEND_STANDINGS_PHOTO_TO_TELEGRAM FUNCTION")
-    photo = create_image_from_string(
-        *get_standings_string(league, week, playoff_line, bot_logger)
+    send_report(
+        "standings",
+        get_standings_report(league, week, playoff_line, bot_logger),
+        logger,
     )
-    print("ARRAY: " + str(photo))
-    logger.debug("BEFORE SEND THE PHOTO")
-    bot.send("", photo)
     logger.debug("LEAVING SEND_STANDINGS_PHOTO_TO_TELEGRAM FUNCTION")
 
 
+@timed_job("best_and_worst")
+@profiled_job("best_and_worst")
 def send_best_and_worst_photo_to_telegram(logger):
     logger.debug("ENTERING SEND_BEST_AND_WORST_PHOTO_TO_TELEGRAM FUNCTION")
-    photo = create_image_from_string(
-        *get_best_and_worst_string(league, season, week, bot_logger)
+    send_report(
+        "best_and_worst",
+        get_best_and_worst_report(league, season, week, bot_logger),
+        logger,
     )
-    print("ARRAY: " + str(photo))
-    logger.debug("BEFORE SEND THE PHOTO")
-    bot.send("", photo)
     logger.debug("LEAVING SEND_BEST_AND_WORST_PHOTO_TO_TELEGRAM FUNCTION")
 
 
-###############################################################################
-# Main Script for the bot
-###############################################################################
+@timed_job("bench_beats_starters")
+@profiled_job("bench_beats_starters")
+def send_bench_beats_starters_photo_to_telegram(logger):
+    logger.debug(
+        "ENTERING SEND_BENCH_BEATS_STARTERS_PHOTO_TO_TELEGRAM FUNCTION"
+    )
+    send_report(
+        "bench_beats_starters",
+        get_bench_beats_starters_report(league, season, week, bot_logger),
+        logger,
+    )
+    logger.debug(
+        "LEAVING SEND_BENCH_BEATS_STARTERS_PHOTO_TO_TELEGRAM FUNCTION"
+    )
 
-if __name__ == "__main__":
+
+@timed_job("luck")
+@profiled_job("luck")
+def send_luck_photo_to_telegram(logger):
+    logger.debug("ENTERING SEND_LUCK_PHOTO_TO_TELEGRAM FUNCTION")
+    send_report(
+        "luck",
+        get_luck_report(league, season, week, store, bot_logger),
+        logger,
+    )
+    logger.debug("LEAVING SEND_LUCK_PHOTO_TO_TELEGRAM FUNCTION")
+
+
+@timed_job("draft_picks")
+@profiled_job("draft_picks")
+def send_draft_picks(draft, new_picks, picks):
     """
-    _Initialize variables_
+    send_draft_picks Announces the new picks of the live draft, and
+                     posts its board once a round is complete.
+
+    :param draft: https://docs.sleeper.app/#get-a-specific-draft
+    :type draft: dict
+    :param new_picks: Picks made since the last announcement
+    :type new_picks: list
+    :param picks: Every pick made
+    :type picks: list
+    :return: False when a report could not be delivered, the picks are
+        announced again at the next poll
+    :rtype: bool
+    """
+    team_names = map_roster_id_to_team_name(league, bot_logger)
+    delivered = send_report(
+        "draft_picks:{}".format(new_picks[-1]["pick_no"]),
+        get_draft_picks_report(new_picks, team_names, bot_logger),
+        bot_logger,
+        bundled=False,
+    )
+
+    teams = int((draft.get("settings") or {}).get("teams") or 0)
+    completed_rounds = [
+        pick["round"]
+        for pick in new_picks
+        if teams and pick["pick_no"] % teams == 0
+    ]
+    if delivered and completed_rounds:
+        delivered = send_report(
+            "draft_board:{}".format(completed_rounds[-1]),
+            get_draft_board_report(draft, picks, team_names, bot_logger),
+            bot_logger,
+            bundled=False,
+        )
+    return delivered
+
+
+@timed_job("transactions")
+@profiled_job("transactions")
+def send_transactions(transactions_week, transactions):
+    """
+    send_transactions Posts the new trades and waiver results of a week,
+                      the waivers with the FAAB efficiency of the season.
+
+    :param transactions_week: Week of the transactions
+    :type transactions_week: int
+    :param transactions: New transactions, from the poller, not in its
+        index yet
+    :type transactions: list
+    :return: False when a report could not be delivered, the
+        transactions are announced again at the next poll
+    :rtype: bool
+    """
+    trades = [
+        transaction
+        for transaction in transactions
+        if transaction["type"] == "trade"
+        and transaction["status"] == "complete"
+    ]
+    waivers = [
+        transaction
+        for transaction in transactions
+        if transaction["type"] == "waiver"
+    ]
+    if not trades and not waivers:
+        return True
+
+    team_names = map_roster_id_to_team_name(league, bot_logger)
+    players = Players().get_all_players()
+    delivered = True
+    if trades:
+        delivered = send_report(
+            "trades:{}".format(transactions_week),
+            get_trades_report(trades, team_names, players, bot_logger),
+            bot_logger,
+            bundled=False,
+        )
+    if delivered and waivers:
+        faab_report = get_faab_report(
+            transactions_poller.index.get_season() + waivers,
+            team_names,
+            season,
+            bot_logger,
+        )
+        delivered = send_report(
+            "waivers:{}".format(transactions_week),
+            get_waivers_report(
+                waivers, team_names, players, faab_report, bot_logger
+            ),
+            bot_logger,
+            bundled=False,
+        )
+    return delivered
+
+
+@timed_job("pdf_report")
+@profiled_job("pdf_report")
+def send_pdf_report_link(logger):
+    # The report is generated once a week, checked before running it
+    if ledger.was_sent("pdf_report", league.league_id, week):
+        logger.info("pdf_report already sent for week %s, skipped", week)
+        return
+
+    link = get_pdf_report_link(league.league_id, season, logger)
+    if not link:
+        return
+    if bundle is not None:
+        bundle.add("pdf_report", link, get_content_hash(link))
+        return
+    deliver_to_platforms(
+        "pdf_report",
+        lambda: link,
+        get_content_hash(link),
+        logger,
+        any_content=True,
+    )
+
+
+def fetch_drafts():
+    league.get_all_drafts()
+
+
+def fetch_week_data():
+    league.get_matchups(week)
+    league.get_users()
+    league.get_rosters()
+
+
+def fetch_week_stats():
+    fetch_week_data()
+    stats = Stats()
+    stats.get_week_stats("regular", season, week)
+    stats.get_week_projections("regular", season, week)
+    Players().get_all_players()
+
+
+def fetch_week_history():
+    fetch_week_data()
+    build_history_index(league, week, store)
+
+
+def fetch_season_data():
+    fetch_week_stats()
+    get_season_data(league, season, range(1, int(week) + 1), week, store)
+
+
+# Data fetched by every job, by name, prefetched before it runs
+JOB_FETCHES = {
+    "draft_reminder": fetch_drafts,
+    "week_matchups": fetch_week_history,
+    "scores": fetch_week_data,
+    "close_games": fetch_week_stats,
+    "standings": fetch_week_data,
+    "best_and_worst": fetch_week_stats,
+    "bench_beats_starters": fetch_week_stats,
+    "luck": fetch_season_data,
+}
+
+
+# The answers are rendered from fresh payloads, the render cache of the
+# command server being their only freshness window
+def answer_scores(argument):
+    with refreshing():
+        return render_text(
+            get_scores_report(league, week, "Scores", bot_logger)
+        )
+
+
+def answer_standings(argument):
+    with refreshing():
+        return render_text(
+            get_standings_report(league, week, playoff_line, bot_logger)
+        )
+
+
+def answer_matchup(argument):
+    with refreshing():
+        return render_text(
+            get_matchup_report(league, week, argument, bot_logger)
+        )
+
+
+def answer_faab(argument):
+    if transactions_poller is None:
+        return "The transactions are not followed, set TRANSACTIONS=true."
+    return render_text(
+        get_faab_report(
+            transactions_poller.index.get_season(),
+            map_roster_id_to_team_name(league, bot_logger),
+            season,
+            bot_logger,
+        )
+    )
+
+
+# Commands answered on demand, by name, called with their argument
+COMMANDS = {
+    "scores": answer_scores,
+    "standings": answer_standings,
+    "matchup": answer_matchup,
+    "faab": answer_faab,
+}
+
+
+###############################################################################
+# Main Script for the bot
+###############################################################################
+
+
+def schedule_jobs(schedulers):
+    """
+    schedule_jobs Schedules the messages of every phase, tagged with the
+                  ledger key of their deliveries.
+
+    :param schedulers: Schedulers by phase
+    :type schedulers: dict
+    :return: None
+    """
+    pre_season_scheduler = schedulers["pre_season"]
+    season_scheduler = schedulers["season"]
+
+    # Draft Reminder
+    # Send a message during pre_season, DAYS_BEFORE_DRAFT days before the draft
+    # at DAILY_NIGHT_DRAFT_REMINDER_HOUR
+    pre_season_scheduler.every().day.at(DAILY_NIGHT_DRAFT_REMINDER_HOUR).do(
+        send_draft_reminder_photo_to_telegram
+    ).tag("draft_reminder")
+
+    # Week Matchups:
+    # Send a message during the season to know the matchups for the week
+    # every Thursday at THURSDAY_NIGHT_WEEK_MATCHUPS_HOUR
+    season_scheduler.every().thursday.at(THURSDAY_NIGHT_WEEK_MATCHUPS_HOUR).do(
+        send_week_matchups_photo_to_telegram
+    ).tag("week_matchups")
+
+    # Thursday Night Scores:
+    # Send a message during the season to know the Thursday Night Scores
+    # every Thursday at THURSDAY_NIGHT_SCORES_HOUR
+    season_scheduler.every().thursday.at(THURSDAY_NIGHT_SCORES_HOUR).do(
+        send_scores_photo_to_telegram,
+        title="Thursday Night Scores",
+        logger=bot_logger,
+    ).tag("scores:Thursday Night Scores")
+
+    # Sunday Night Scores:
+    # Send a message during the season to know the Sunday Night Scores
+    # every Sunday at SUNDAY_NIGHT_SCORES_HOUR
+    season_scheduler.every().sunday.at(SUNDAY_NIGHT_SCORES_HOUR).do(
+        send_scores_photo_to_telegram,
+        title="Sunday Night Scores",
+        logger=bot_logger,
+    ).tag("scores:Sunday Night Scores")
+
+    # Sunday Night Close Games:
+    # Send a message during the season to know the Sunday Night Close Games
+    # every Sunday at SUNDAY_NIGHT_CLOSE_GAMES_HOUR
+    season_scheduler.every().sunday.at(SUNDAY_NIGHT_CLOSE_GAMES_HOUR).do(
+        send_close_games_photo_to_telegram, logger=bot_logger
+    ).tag("close_games")
+
+    # Monday Night Scores:
+    # Send a message during the season to know the Monday Night Scores
+    # every Sunday at MONDAY_NIGHT_SCORES_HOUR
+    season_scheduler.every().monday.at(MONDAY_NIGHT_SCORES_HOUR).do(
+        send_scores_photo_to_telegram,
+        title="Monday Night Scores",
+        logger=bot_logger,
+    ).tag("scores:Monday Night Scores")
+
+    # Tuesday Morning Week Scores:
+    # Send a message during the season to know the Tuesday Morning Week Scores
+    # every Tuesday at TUESDAY_MORNING_WEEK_SCORES_HOUR
+    season_scheduler.every().tuesday.at(TUESDAY_MORNING_WEEK_SCORES_HOUR).do(
+        send_scores_photo_to_telegram, title="Week Scores", logger=bot_logger
+    ).tag("scores:Week Scores")
+
+    # Tuesday Morning Standings:
+    # Send a message during the season to know the League Standings
+    # every Tuesday at TUESDAY_MORNING_STANDINGS_HOUR
+    season_scheduler.every().tuesday.at(TUESDAY_MORNING_STANDINGS_HOUR).do(
+        send_standings_photo_to_telegram, logger=bot_logger
+    ).tag("standings")
+
+    # Tuesday Morning Best and Worst:
+    # Send a message during the season to know the Best and Worst Players
+    # every Tuesday at TUESDAY_MORNING_BEST_WORST_HOUR
+    season_scheduler.every().tuesday.at(TUESDAY_MORNING_BEST_WORST_HOUR).do(
+        send_best_and_worst_photo_to_telegram, logger=bot_logger
+    ).tag("best_and_worst")
+
+    # Tuesday Morning Bench Beats Starters:
+    # Send a message during the season with the bench players that
+    # outscored a starter at their position
+    # every Tuesday at TUESDAY_MORNING_BENCH_BEATS_STARTERS_HOUR
+    season_scheduler.every().tuesday.at(
+        TUESDAY_MORNING_BENCH_BEATS_STARTERS_HOUR
+    ).do(send_bench_beats_starters_photo_to_telegram, logger=bot_logger).tag(
+        "bench_beats_starters"
+    )
+
+    # Tuesday Morning Luck:
+    # Send a message during the season with the points against projections
+    # and the wins against expected wins of every team
+    # every Tuesday at TUESDAY_MORNING_LUCK_HOUR
+    season_scheduler.every().tuesday.at(TUESDAY_MORNING_LUCK_HOUR).do(
+        send_luck_photo_to_telegram, logger=bot_logger
+    ).tag("luck")
+
+    # Tuesday Morning PDF Report
+    # Send a message during the season with a League Report in a PDF format
+    # every Tuesday at TUESDAY_MORNING_REPORT_HOUR
+    season_scheduler.every().tuesday.at(TUESDAY_MORNING_REPORT_HOUR).do(
+        send_pdf_report_link, logger=bot_logger
+    ).tag("pdf_report")
+
+
+def create_bot(bot_type):
+    """
+    create_bot Creates the bot of the platforms of BOT_TYPE, a comma
+               separated list broadcasting to all of them.
+
+    :param bot_type: groupme, slack, discord and/or telegram
+    :type bot_type: str
+    :return: The bot
+    :rtype: bot_interface.BotInterface
+    """
+    bots = []
+    for platform in bot_type.split(","):
+        platform = platform.strip()
+        if platform == "groupme":
+            bots.append(GroupMe(os.environ["BOT_ID"]))
+        elif platform == "slack":
+            bots.append(Slack(os.environ["SLACK_WEBHOOK"]))
+        elif platform == "discord":
+            bots.append(Discord(os.environ["DISCORD_WEBHOOK"]))
+        elif platform == "telegram":
+            bots.append(Telegram(os.environ["TELEGRAM_WEBHOOK"]))
+        else:
+            raise ValueError("Unknown BOT_TYPE: {}".format(platform))
+    if len(bots) == 1:
+        return bots[0]
+    return Broadcast(bots)
+
+
+def create_session(cache_backend, logger):
+    """
+    create_session Installs the request cache and the governor of the API
+                   quotas, and creates the sportsdata.io session.
+
+    :param cache_backend: Backend of the request cache
+    :type cache_backend: str
+    :param logger: A logger object for logging debug
+    :type logger: logging.Logger
+    :return: The session, governed by the sportsdata.io quota
+    :rtype: requests.Session
+    """
+    governor = install_request_cache(cache_backend)
+    session = requests.Session()
+    adapter = GovernedAdapter(governor, "sportsdata")
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    logger.debug("REQUESTS_SESSION_OBJECT: %s", session)
+    for provider in governor.budgets:
+        logger.info(
+            "API quota left for %s: %s",
+            provider,
+            governor.remaining(provider),
+        )
+    return session
+
+
+def create_store(logger):
+    """
+    create_store Opens the permanent store at STORE_PATH.
+
+    :param logger: A logger object for logging debug
+    :type logger: logging.Logger
+    :return: The store
+    :rtype: store.Store
+    """
+    store = Store(os.environ.get("STORE_PATH", STORE_PATH))
+    logger.debug("STORE_PATH: %s", store.path)
+    return store
+
+
+def start_metrics(logger):
+    """
+    start_metrics Serves the metrics at
+                  http://127.0.0.1:METRICS_PORT/metrics and/or dumps them
+                  to METRICS_FILE every METRICS_DUMP_INTERVAL seconds,
+                  and records every API response into HTTP_RECORD_PATH,
+                  to replay them offline with simulate.py.
+
+    :param logger: A logger object for logging debug
+    :type logger: logging.Logger
+    :return: None
+    """
+    if os.environ.get("METRICS_PORT"):
+        start_http_server(os.environ["METRICS_PORT"])
+        logger.debug("METRICS_PORT: %s", os.environ["METRICS_PORT"])
+
+    if os.environ.get("METRICS_FILE"):
+        start_file_dump(
+            os.environ["METRICS_FILE"],
+            float(
+                os.environ.get(
+                    "METRICS_DUMP_INTERVAL", METRICS_DUMP_INTERVAL_SECONDS
+                )
+            ),
+        )
+        logger.debug("METRICS_FILE: %s", os.environ["METRICS_FILE"])
+
+    if os.environ.get("HTTP_RECORD_PATH"):
+        start_recording(
+            Cassette(os.environ["HTTP_RECORD_PATH"]), SystemClock()
+        )
+        logger.debug("HTTP_RECORD_PATH: %s", os.environ["HTTP_RECORD_PATH"])
+
+
+def start_commands(logger):
+    """
+    start_commands Answers /scores, /standings, /matchup <team> and /faab
+                   at http://0.0.0.0:COMMAND_PORT/telegram (webhook) and
+                   /slack (slash commands), when COMMAND_PORT is set.
+
+    :param logger: A logger object for logging debug
+    :type logger: logging.Logger
+    :return: The running server, None when it was not started
+    :rtype: command_server.CommandServer
+    """
+    if not os.environ.get("COMMAND_PORT"):
+        return None
+    logger.debug("COMMAND_PORT: %s", os.environ["COMMAND_PORT"])
+    return start_command_server(
+        os.environ["COMMAND_PORT"],
+        COMMANDS,
+        logger,
+        telegram_secret=os.environ.get("TELEGRAM_WEBHOOK_SECRET"),
+        slack_signing_secret=os.environ.get("SLACK_SIGNING_SECRET"),
+        telegram_token=os.environ.get("TELEGRAM_BOT_TOKEN"),
+    )
+
+
+def init(cache_backend="sqlite"):
+    """
+    init Reads the settings, initializes the bot, the league and the
+         season dates, and schedules the jobs. The jobs read the module
+         globals set here.
+
+    :param cache_backend: Backend of the request cache
+    :type cache_backend: str
+    :return: Tuple (schedulers, dates), both by phase
+    :rtype: tuple
+    """
+    global bot, bot_logger, bundle, close_num, close_probability, league
+    global draft_tracker, ledger, playoff_line, season, sportsdata_api_key
+    global store, transactions_poller, week
+
+    """
+    _Initialize variables_
     """
     bot = None
     bot_type = os.environ["BOT_TYPE"]
@@ -1185,6 +2300,13 @@ if __name__ == "__main__":
     except Exception:
         close_num = CLOSE_NUM
 
+    # Check if the user specified the close_probability variable.
+    # Default is CLOSE_WIN_PROBABILITY.
+    try:
+        close_probability = os.environ["CLOSE_WIN_PROBABILITY"]
+    except Exception:
+        close_probability = CLOSE_WIN_PROBABILITY
+
     # Check if the user specified the init_message flag. Default is True
     try:
         init_message = os.environ["INIT_MESSAGE"]
@@ -1197,11 +2319,9 @@ if __name__ == "__main__":
     except Exception:
         playoff_line = 8
 
-    # Check if the user specified the debug flag. Default is True
-    try:
-        show_debug = os.environ["DEBUG"]
-    except Exception:
-        show_debug = True
+    # Check if the user specified the debug flag, "true", "false" or
+    # "trace" to log the whole payloads. Default is False
+    log_level = get_log_level(os.environ.get("DEBUG"))
 
     """
     _Initialize Different Schedulers for every time frame_
@@ -1211,76 +2331,62 @@ if __name__ == "__main__":
     Post-season
     Off-season
     """
-    pre_season_scheduler = schedule.Scheduler()
-    post_draft_scheduler = schedule.Scheduler()
-    season_scheduler = schedule.Scheduler()
-    post_season_scheduler = schedule.Scheduler()
-    off_season_scheduler = schedule.Scheduler()
+    schedulers = {phase: schedule.Scheduler() for phase in PHASES}
 
     """
     _Initialize Logger_
     """
-    if show_debug:
-        logging.basicConfig(
-            level="DEBUG",
-            format="%(message)s",
-            datefmt="[%X]",
-            handlers=[RichHandler()],
-        )
-    else:
-        logging.basicConfig(
-            level="INFO",
-            format="%(message)s",
-            datefmt="[%X]",
-            handlers=[RichHandler()],
-        )
+    configure_logging(log_level)
 
     # Define loggers
-    schedule_logger = logging.getLogger("schedule")
     bot_logger = logging.getLogger("bot")
 
     """
     _Define bot type_
     """
-    if bot_type == "groupme":
-        bot_id = os.environ["BOT_ID"]
-        bot = GroupMe(bot_id)
-    elif bot_type == "slack":
-        webhook = os.environ["SLACK_WEBHOOK"]
-        bot = Slack(webhook)
-    elif bot_type == "discord":
-        webhook = os.environ["DISCORD_WEBHOOK"]
-        bot = Discord(webhook)
-    elif bot_type == "telegram":
-        webhook = os.environ["TELEGRAM_WEBHOOK"]
-        bot = Telegram(webhook)
-    bot_logger.debug("BOT_TYPE: " + bot_type)
+    bot = create_bot(bot_type)
+    bot_logger.debug("BOT_TYPE: %s", bot_type)
+    bundle = None
+    if bot.bundle_seconds > 0:
+        bundle = ReportBundle(
+            bot.bundle_seconds,
+            lambda report: render_report(report, bot.output_formats),
+        )
 
     """
-    _Initialize Request Session_
+    _Initialize Request Cache and Session_
     """
-    session = requests.Session()
-    adapter = LimiterAdapter(per_month=1000)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    bot_logger.debug("REQUESTS_SESSION_OBJECT: " + str(session))
+    session = create_session(cache_backend, bot_logger)
+
+    """
+    _Initialize Permanent Store_
+    """
+    store = create_store(bot_logger)
+
+    """
+    _Initialize Metrics and HTTP Recording_
+    """
+    start_metrics(bot_logger)
 
     """
     _Initialize Season_
+    The calendar and the current week are read from the warm snapshot
+    of the last boot while they are current, sparing the sportsdata.io
+    quota and the startup time
     """
-    season = get_current_season(sportsdata_api_key, session, bot_logger)
-    bot_logger.debug("CURRENT_SEASON: " + str(season))
+    now = pendulum.now(TIMEZONE)
+    snapshot = load_snapshot(store, league_id, now)
+    if snapshot is not None:
+        season = snapshot["season"]
+        bot_logger.debug("WARM_SNAPSHOT: %s", snapshot)
+    else:
+        season = get_current_season(sportsdata_api_key, session, bot_logger)
+    bot_logger.debug("CURRENT_SEASON: %s", season)
 
     # NOT USED
     # session = requests_cache.CachedSession()
     # print(str(session.cache.urls))
 
-    #####
-    # Initial message to send
-    #####
-    if init_message is True:
-        send_welcome_photo_to_telegram(bot_logger)
-
     """
     _Initialize League Dates_
     get the following dates:
@@ -1291,32 +2397,94 @@ if __name__ == "__main__":
     off_season_start_date
     """
     league = League(league_id)
-    draft_date = pendulum.from_timestamp(
+    if snapshot is not None:
+        dates = dict(snapshot["dates"])
+    else:
+        dates = {
+            "pre_season": get_season_week_date(
+                season, "PRE", 0, sportsdata_api_key, session, bot_logger
+            ),
+            "season": get_season_week_date(
+                season, "", 0, sportsdata_api_key, session, bot_logger
+            ),
+            "post_season": get_season_week_date(
+                season, "", 240, sportsdata_api_key, session, bot_logger
+            ),
+            "off_season": get_season_week_date(
+                season, "", 303, sportsdata_api_key, session, bot_logger
+            ),
+        }
+    # The draft can be rescheduled, it is never read from the snapshot
+    dates["draft"] = pendulum.from_timestamp(
         league.get_all_drafts()[0]["start_time"] / 1000, tz=TIMEZONE
     )
-    bot_logger.debug("DRAFT_DATE: " + str(draft_date))
+    bot_logger.debug("DATES: %s", dates)
 
-    pre_season_start_date = get_season_week_date(
-        season, "PRE", 0, sportsdata_api_key, session, bot_logger
+    if snapshot is not None and snapshot["week"] is not None:
+        week = snapshot["week"]
+    else:
+        week = get_current_week(sportsdata_api_key, session, bot_logger)
+    save_snapshot(
+        store,
+        league_id,
+        season,
+        {phase: date for phase, date in dates.items() if phase != "draft"},
+        week,
+        now,
     )
-    bot_logger.debug("PRE_SEASON_START_DATE: " + str(pre_season_start_date))
 
-    season_start_date = get_season_week_date(
-        season, "", 0, sportsdata_api_key, session, bot_logger
-    )
-    bot_logger.debug("SEASON_START_DATE: " + str(season_start_date))
+    """
+    _Initialize Ledger_
+    Deliveries of the jobs, to post every report once across restarts
+    """
+    ledger = Ledger(store.path)
 
-    post_season_start_date = get_season_week_date(
-        season, "", 240, sportsdata_api_key, session, bot_logger
-    )
-    bot_logger.debug("POST_SEASON_START_DATE: " + str(post_season_start_date))
+    """
+    _Initialize Draft Tracker_
+    With DRAFT_TRACKER=true, follow the draft live: every pick announced
+    as it is made and the board posted after every round
+    """
+    draft_tracker = None
+    if os.environ.get("DRAFT_TRACKER", "").lower() == "true":
+        draft_tracker = DraftTracker(
+            league.get_all_drafts()[0]["draft_id"],
+            send_draft_picks,
+            bot_logger,
+            store,
+        )
+        bot_logger.debug("DRAFT_ID: %s", draft_tracker.draft_id)
 
-    off_season_start_date = get_season_week_date(
-        season, "", 303, sportsdata_api_key, session, bot_logger
-    )
-    bot_logger.debug("OFF_SEASON_START_DATE: " + str(off_season_start_date))
+    """
+    _Initialize Transactions_
+    With TRANSACTIONS=true, poll the transactions of the league into the
+    local index of the store: new trades and waiver results posted as
+    they are processed, the FAAB efficiency computed from the index
+    """
+    transactions_poller = None
+    if os.environ.get("TRANSACTIONS", "").lower() == "true":
+        transactions_poller = TransactionPoller(
+            league_id,
+            TransactionIndex(store, league_id, season),
+            lambda: week,
+            send_transactions,
+            bot_logger,
+            float(
+                os.environ.get(
+                    "TRANSACTIONS_POLL_SECONDS", TRANSACTIONS_POLL_SECONDS
+                )
+            ),
+        )
 
-    week = get_current_week(sportsdata_api_key, session, bot_logger)
+    """
+    _Initialize Commands_
+    """
+    start_commands(bot_logger)
+
+    #####
+    # Initial message to send
+    #####
+    if init_message is True:
+        send_welcome_photo_to_telegram(bot_logger)
 
     # For testing
     # send_draft_reminder_photo_to_telegram()
@@ -1330,201 +2498,183 @@ if __name__ == "__main__":
     # bot.send(get_pdf_report_link, league_id, season, bot_logger)
     # time.sleep(10)
 
-    # Draft Reminder
-    # Send a message during pre_season, DAYS_BEFORE_DRAFT days before the draft
-    # at DAILY_NIGHT_DRAFT_REMINDER_HOUR
-    pre_season_scheduler.every().day.at(DAILY_NIGHT_DRAFT_REMINDER_HOUR).do(
-        send_draft_reminder_photo_to_telegram
-    )
+    schedule_jobs(schedulers)
 
-    # Week Matchups:
-    # Send a message during the season to know the matchups for the week
-    # every Thursday at THURSDAY_NIGHT_WEEK_MATCHUPS_HOUR
-    season_scheduler.every().thursday.at(THURSDAY_NIGHT_WEEK_MATCHUPS_HOUR).do(
-        send_week_matchups_photo_to_telegram
-    )
+    return schedulers, dates
 
-    # Thursday Night Scores:
-    # Send a message during the season to know the Thursday Night Scores
-    # every Thursday at THURSDAY_NIGHT_SCORES_HOUR
-    season_scheduler.every().thursday.at(THURSDAY_NIGHT_SCORES_HOUR).do(
-        send_scores_photo_to_telegram,
-        title="Thursday Night Scores",
-        logger=bot_logger,
-    )
 
-    # Sunday Night Scores:
-    # Send a message during the season to know the Sunday Night Scores
-    # every Sunday at SUNDAY_NIGHT_SCORES_HOUR
-    season_scheduler.every().sunday.at(SUNDAY_NIGHT_SCORES_HOUR).do(
-        send_scores_photo_to_telegram,
-        title="Sunday Night Scores",
-        logger=bot_logger,
-    )
-
-    # Sunday Night Close Games:
-    # Send a message during the season to know the Sunday Night Close Games
-    # every Sunday at SUNDAY_NIGHT_CLOSE_GAMES_HOUR
-    season_scheduler.every().sunday.at(SUNDAY_NIGHT_CLOSE_GAMES_HOUR).do(
-        send_close_games_photo_to_telegram, logger=bot_logger
-    )
+def get_phase(today, dates):
+    """
+    get_phase Returns the phase of the season of a day.
 
-    # Monday Night Scores:
-    # Send a message during the season to know the Monday Night Scores
-    # every Sunday at MONDAY_NIGHT_SCORES_HOUR
-    season_scheduler.every().monday.at(MONDAY_NIGHT_SCORES_HOUR).do(
-        send_scores_photo_to_telegram,
-        title="Monday Night Scores",
-        logger=bot_logger,
-    )
+    :param today: Day to check
+    :type today: pendulum.DateTime
+    :param dates: Start date by phase, from init
+    :type dates: dict
+    :return: Phase, None outside of them
+    :rtype: str
+    """
+    if dates["pre_season"] <= today <= dates["draft"]:
+        return "pre_season"
+    elif dates["draft"] <= today <= dates["season"]:
+        return "post_draft"
+    elif dates["season"] <= today <= dates["post_season"]:
+        return "season"
+    elif dates["post_season"] <= today <= dates["off_season"]:
+        return "post_season"
+    elif dates["off_season"] <= today <= dates["pre_season"].add(days=365):
+        return "off_season"
+    return None
+
+
+def run_missed_jobs(scheduler, ledger, logger):
+    """
+    run_missed_jobs Runs the jobs of a scheduler missed by less than
+                    JOB_CATCH_UP_SECONDS, e.g. during a restart.
 
-    # Tuesday Morning Week Scores:
-    # Send a message during the season to know the Tuesday Morning Week Scores
-    # every Tuesday at TUESDAY_MORNING_WEEK_SCORES_HOUR
-    season_scheduler.every().tuesday.at(TUESDAY_MORNING_WEEK_SCORES_HOUR).do(
-        send_scores_photo_to_telegram, title="Week Scores", logger=bot_logger
-    )
+    :param scheduler: Scheduler of the current phase
+    :type scheduler: schedule.Scheduler
+    :param ledger: Ledger of the deliveries
+    :type ledger: ledger.Ledger
+    :param logger: A logger object for logging debug
+    :type logger: logging.Logger
+    :return: None
+    """
+    for job in get_missed_jobs(scheduler, ledger, league.league_id):
+        logger.info("Catching up the missed job %s", min(job.tags))
+        job.run()
 
-    # Tuesday Morning Standings:
-    # Send a message during the season to know the League Standings
-    # every Tuesday at TUESDAY_MORNING_STANDINGS_HOUR
-    season_scheduler.every().tuesday.at(TUESDAY_MORNING_STANDINGS_HOUR).do(
-        send_standings_photo_to_telegram, logger=bot_logger
-    )
 
-    # Tuesday Morning Best and Worst:
-    # Send a message during the season to know the Best and Worst Players
-    # every Tuesday at TUESDAY_MORNING_BEST_WORST_HOUR
-    season_scheduler.every().tuesday.at(TUESDAY_MORNING_BEST_WORST_HOUR).do(
-        send_best_and_worst_photo_to_telegram, logger=bot_logger
+def get_sleep_seconds(
+    scheduler, prefetcher=None, draft_tracker=None, transactions_poller=None
+):
+    """
+    get_sleep_seconds Returns how long the phase loop sleeps: up to
+                      LOOP_SLEEP_SECONDS, waking up for the next job, the
+                      next prefetch and the next polls of the draft and
+                      the transactions, so the messages land on time.
+
+    :param scheduler: Scheduler of the current phase, None out of them
+    :type scheduler: schedule.Scheduler
+    :param prefetcher: Prefetcher of the job data, if any
+    :type prefetcher: prefetch.Prefetcher
+    :param draft_tracker: Tracker of the live draft, if any
+    :type draft_tracker: draft_tracker.DraftTracker
+    :param transactions_poller: Poller of the transactions, if any
+    :type transactions_poller: transactions.TransactionPoller
+    :return: Seconds to sleep
+    :rtype: float
+    """
+    wake_ups = []
+    if scheduler is not None:
+        wake_ups.append(scheduler.idle_seconds)
+        if prefetcher is not None:
+            wake_ups.append(prefetcher.idle_seconds(scheduler))
+    if draft_tracker is not None:
+        wake_ups.append(draft_tracker.idle_seconds())
+    if transactions_poller is not None:
+        wake_ups.append(transactions_poller.idle_seconds())
+    return min(
+        [LOOP_SLEEP_SECONDS]
+        + [max(seconds, 0) for seconds in wake_ups if seconds is not None]
     )
 
-    # Tuesday Morning PDF Report
-    # Send a message during the season with a League Report in a PDF format
-    # every Tuesday at TUESDAY_MORNING_REPORT_HOUR
-    season_scheduler.every().tuesday.at(TUESDAY_MORNING_REPORT_HOUR).do(
-        bot.send, get_pdf_report_link, league_id, season, bot_logger
-    )
 
-    while True:
-        bot_logger.debug("ENTERING WHILE LOOP")
-
-        my_days = 0
-        today = pendulum.today(TIMEZONE).add(days=my_days)
-        now = pendulum.now(TIMEZONE)
-        bot_logger.debug("NOW IS: " + str(now))
-
-        bot_logger.debug(
-            "\n"
-            + "PRE_SEASON_START_DATE: "
-            + str(pre_season_start_date)
-            + "\n"
-            + "DRAFT_START_DATE: "
-            + str(draft_date)
-            + "\n"
-            + "SEASON_START_DATE: "
-            + str(season_start_date)
-            + "\n"
-            + "POST_SEASON_START_DATE: "
-            + str(post_season_start_date)
-            + "\n"
-            + "OFF_SEASON_START_DATE: "
-            + str(off_season_start_date)
-            + "\n"
-            + "TODAY: "
-            + str(today)
-            + "\n"
+def run_phase_loop(
+    schedulers,
+    dates,
+    logger,
+    clock=None,
+    until=None,
+    ledger=None,
+    prefetcher=None,
+    bundle=None,
+    draft_tracker=None,
+    transactions_poller=None,
+):
+    """
+    run_phase_loop Runs the pending jobs of the current phase on time,
+                   after the ones missed during the restart when there is
+                   a ledger, prefetching their data when there is a
+                   prefetcher.
+
+    :param schedulers: Schedulers by phase, from init
+    :type schedulers: dict
+    :param dates: Start date by phase, from init
+    :type dates: dict
+    :param logger: A logger object for logging debug
+    :type logger: logging.Logger (bot_logger)
+    :param clock: Clock driving the loop, the system clock by default
+    :type clock: clock.SystemClock or clock.VirtualClock
+    :param until: Stop time, None to run forever
+    :type until: pendulum.DateTime
+    :param ledger: Ledger of the deliveries, None to not catch up
+    :type ledger: ledger.Ledger
+    :param prefetcher: Prefetcher of the job data, None to not prefetch
+    :type prefetcher: prefetch.Prefetcher
+    :param bundle: Bundle of the reports of the jobs, sent once due
+    :type bundle: bundle.ReportBundle
+    :param draft_tracker: Tracker of the live draft, polled when due
+    :type draft_tracker: draft_tracker.DraftTracker
+    :param transactions_poller: Poller of the transactions, polled when
+        due
+    :type transactions_poller: transactions.TransactionPoller
+    :return: None
+    """
+    clock = clock or SystemClock()
+    last_phase = None
+
+    while until is None or clock.now() < until:
+        logger.log(TRACE, "NOW IS: %s", clock.now())
+
+        today = clock.today()
+        phase = get_phase(today, dates)
+        # Logged when it changes only, not on every tick
+        scheduler = schedulers.get(phase)
+        if phase != last_phase:
+            logger.info("PHASE: %s TODAY: %s", phase, today)
+            if scheduler is not None and ledger is not None:
+                run_missed_jobs(scheduler, ledger, logger)
+            last_phase = phase
+        if scheduler is not None:
+            scheduler.run_pending()
+            if prefetcher is not None:
+                prefetcher.run_due(scheduler)
+        if draft_tracker is not None:
+            draft_tracker.run_due()
+        if transactions_poller is not None:
+            transactions_poller.run_due()
+        if bundle is not None and bundle.is_due(scheduler):
+            send_bundle(bundle, logger)
+
+        clock.sleep(
+            get_sleep_seconds(
+                scheduler, prefetcher, draft_tracker, transactions_poller
+            ),
+            scheduler,
         )
 
-        # Start sending Messages between pre-season and season
-        if pre_season_start_date <= today <= draft_date:
-            bot_logger.debug("PRE-SEASON - DRAFT DAY PERIOD")
-            bot_logger.debug(
-                "\n"
-                + "PRE_SEASON_START_DATE: "
-                + str(pre_season_start_date)
-                + "\n"
-                + "TODAY: "
-                + str(today)
-                + "\n"
-                + "DRAFT_START_DATE: "
-                + str(draft_date)
-                + "\n"
-            )
-            pre_season_scheduler.run_pending()
-
-        elif draft_date <= today <= season_start_date:
-            bot_logger.debug("DRAFT DAY - REGULAR-SEASON PERIOD")
-            bot_logger.debug(
-                "\n"
-                + "DRAFT_START_DATE: "
-                + str(draft_date)
-                + "\n"
-                + "TODAY: "
-                + str(today)
-                + "\n"
-                + "SEASON_START_DATE: "
-                + str(season_start_date)
-                + "\n"
-            )
-            post_draft_scheduler.run_pending()
-
-        elif season_start_date <= today <= post_season_start_date:
-            bot_logger.debug("REGULAR-SEASON - POST-SEASON PERIOD")
-            bot_logger.debug(
-                "\n"
-                + "SEASON_START_DATE: "
-                + str(season_start_date)
-                + "\n"
-                + "TODAY: "
-                + str(today)
-                + "\n"
-                + "POST_SEASON_START_DATE: "
-                + str(post_season_start_date)
-                + "\n"
-            )
-            season_scheduler.run_pending()
-
-        elif post_season_start_date <= today <= off_season_start_date:
-            bot_logger.debug("POST-SEASON - OFF-SEASON PERIOD")
-            bot_logger.debug(
-                "\n"
-                + "POST_SEASON_START_DATE: "
-                + str(post_season_start_date)
-                + "\n"
-                + "TODAY: "
-                + str(today)
-                + "\n"
-                + "OFF_SEASON_START_DATE: "
-                + str(off_season_start_date)
-                + "\n"
-            )
-            post_season_scheduler.run_pending()
 
-        elif (
-            off_season_start_date
-            <= today
-            <= pre_season_start_date.add(days=365)
-        ):
-            bot_logger.debug("OFF-SEASON and NEXT-YEAR-PRE-SEASON PERIOD")
-            bot_logger.debug(
-                "\n"
-                + str(off_season_start_date)
-                + " = off_season_start_date\n"
-                + str(today)
-                + " = today\n"
-                + str(pre_season_start_date.add(days=365))
-                + " = pre_season_start_date_next_year"
-                + "OFF_SEASON_START_DATE: "
-                + str(off_season_start_date)
-                + "\n"
-                + "TODAY: "
-                + str(today)
-                + "\n"
-                + "NEXT_YEAR_PRE_SEASON_START_DATE: "
-                + str(pre_season_start_date.add(days=365))
-                + "\n"
-            )
-            off_season_scheduler.run_pending()
+def main():
+    schedulers, dates = init()
+    # Seconds the data of a job is fetched before it runs, 0 to disable
+    lead_seconds = float(
+        os.environ.get("PREFETCH_LEAD_SECONDS", PREFETCH_LEAD_SECONDS)
+    )
+    prefetcher = None
+    if lead_seconds > 0:
+        prefetcher = Prefetcher(JOB_FETCHES, bot_logger, lead_seconds)
+    run_phase_loop(
+        schedulers,
+        dates,
+        bot_logger,
+        ledger=ledger,
+        prefetcher=prefetcher,
+        bundle=bundle,
+        draft_tracker=draft_tracker,
+        transactions_poller=transactions_poller,
+    )
 
-        time.sleep(50)
+
+if __name__ == "__main__":
+    main()
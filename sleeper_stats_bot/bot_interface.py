@@ -1,11 +1,35 @@
 # -*- coding: utf-8 -*-
-from constants import GITHUB_REPOSITORY
+import logging
+import time
+
+import requests
+from constants import (
+    GITHUB_REPOSITORY,
+    SEND_RETRY_ATTEMPTS,
+    SEND_RETRY_BACKOFF_SECONDS,
+)
+from metrics import SEND_RETRIES
 
 
 class BotInterface:
+    # Format of the reports posted to the platform, "photo" or a key of
+    # renderers.RENDERERS
+    output_format = "text"
+    # Seconds the reports due in the same window are collected to be
+    # posted together, 0 to post every one on time
+    bundle_seconds = 0
+
     def __init__(self, bot_id):
         self.bot_id = bot_id
 
+    @property
+    def output_formats(self):
+        return {self.output_format}
+
+    @property
+    def platforms(self):
+        return {type(self).__name__.lower()}
+
     def send_message(self, message):
         """
         Will be implemented in each derived class differently.
@@ -45,3 +69,98 @@ class BotInterface:
                 )
             )
             message += "Please report it at " + GITHUB_REPOSITORY + "/issues"
+
+    def deliver(self, content):
+        """
+        Posts a rendered report, in the output format of the platform.
+        :param content: The rendered report
+        :return: None
+        """
+        if self.output_format == "photo":
+            self.send_photo(content)
+        else:
+            self.send_message(content)
+
+    def send_with_retries(self, deliver, *args, attempts=SEND_RETRY_ATTEMPTS):
+        """
+        Calls a delivery, retrying it with an exponential backoff when it
+        fails.
+        :param deliver: The delivery, e.g. self.send_message
+        :param args: The arguments to the delivery
+        :param attempts: Maximum number of calls
+        :return: True when it was delivered
+        """
+        platform = type(self).__name__.lower()
+        for attempt in range(attempts):
+            if attempt:
+                SEND_RETRIES.inc(platform=platform)
+                time.sleep(SEND_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+            try:
+                deliver(*args)
+                return True
+            except requests.exceptions.RequestException:
+                logging.getLogger("bot").warning(
+                    "Delivery %s/%s to %s failed",
+                    attempt + 1,
+                    attempts,
+                    platform,
+                    exc_info=True,
+                )
+        return False
+
+    def send_report(self, rendered, attempts=SEND_RETRY_ATTEMPTS):
+        """
+        Posts a report in the output format of the platform, retrying the
+        failed deliveries with an exponential backoff. A report rendered
+        as several messages is posted message by message, and stops at
+        the first one that could not be delivered.
+        :param rendered: Dict {output format: content} of the report
+        :param attempts: Maximum number of deliveries of every message
+        :return: True when it was delivered
+        """
+        content = rendered[self.output_format]
+        messages = content if isinstance(content, list) else [content]
+        return all(
+            self.send_with_retries(self.deliver, message, attempts=attempts)
+            for message in messages
+        )
+
+    def deliver_report(self, rendered, skip=(), attempts=SEND_RETRY_ATTEMPTS):
+        """
+        Posts a report or a note to the platforms not skipped.
+        :param rendered: Dict {output format: content} of the report, or
+            a note, a string like the link to the PDF report
+        :param skip: Platforms that already have the report
+        :param attempts: Maximum number of deliveries of every message
+        :return: Set of the platforms the report was delivered to
+        """
+        platforms = self.platforms - set(skip)
+        if not platforms:
+            return set()
+        if isinstance(rendered, dict):
+            delivered = self.send_report(rendered, attempts=attempts)
+        else:
+            delivered = self.send_with_retries(
+                self.send_message, rendered, attempts=attempts
+            )
+        return platforms if delivered else set()
+
+    def send_bundle(self, items, attempts=SEND_RETRY_ATTEMPTS):
+        """
+        Posts the reports and the notes due in the same window, one by one
+        unless the platform bundles them.
+        :param items: Rendered reports, dicts {output format: content},
+            and notes, strings like the link to the PDF report
+        :param attempts: Maximum number of deliveries of every item
+        :return: List with True for every item delivered
+        """
+        return [
+            (
+                self.send_report(item, attempts=attempts)
+                if isinstance(item, dict)
+                else self.send_with_retries(
+                    self.send_message, item, attempts=attempts
+                )
+            )
+            for item in items
+        ]
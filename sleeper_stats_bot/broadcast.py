@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+from concurrent.futures import ThreadPoolExecutor
+
+from bot_interface import BotInterface
+
+
+class Broadcast(BotInterface):
+    """
+    Bot posting to several platforms of the same league at once. Every
+    report is rendered once by output format of the targets, then
+    delivered to all of them concurrently, each one with its own retries.
+    """
+
+    def __init__(self, targets):
+        self.targets = list(targets)
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(self.targets), thread_name_prefix="broadcast"
+        )
+
+    @property
+    def output_formats(self):
+        return set().union(*(target.output_formats for target in self.targets))
+
+    @property
+    def platforms(self):
+        return set().union(*(target.platforms for target in self.targets))
+
+    @property
+    def bundle_seconds(self):
+        return max(target.bundle_seconds for target in self.targets)
+
+    def send(self, callback, *args):
+        """
+        Sends a message to every target.
+        :param callback: The callback function to call
+        :param args: The arguments to the callback function
+        :return: None
+        """
+        for future in [
+            self._executor.submit(target.send, callback, *args)
+            for target in self.targets
+        ]:
+            future.result()
+
+    def send_report(self, rendered, **kwargs):
+        """
+        Posts a report to every target in its output format.
+        :param rendered: Dict {output format: content} of the report
+        :return: True when it was delivered to every target
+        """
+        return self.deliver_report(rendered, **kwargs) == self.platforms
+
+    def deliver_report(self, rendered, skip=(), **kwargs):
+        """
+        Posts a report or a note to the targets not skipped, the reports
+        in their output format.
+        :param rendered: Dict {output format: content} of the report, or
+            a note
+        :param skip: Platforms that already have the report
+        :return: Set of the platforms the report was delivered to
+        """
+        delivered = [
+            self._executor.submit(
+                target.deliver_report, rendered, skip=skip, **kwargs
+            )
+            for target in self.targets
+        ]
+        return set().union(*[future.result() for future in delivered])
+
+    def send_bundle(self, items, **kwargs):
+        """
+        Posts the reports and the notes due in the same window to every
+        target, bundled by the ones that can.
+        :param items: Rendered reports and notes
+        :return: List with True for every item delivered to every target
+        """
+        delivered = [
+            self._executor.submit(target.send_bundle, items, **kwargs)
+            for target in self.targets
+        ]
+        return [all(item) for item in zip(*[f.result() for f in delivered])]
+
+    def close(self):
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import schedule
+from constants import BUNDLE_RENDER_WORKERS
+
+
+class ReportBundle:
+    """
+    Reports of the jobs due in the same window, e.g. the Tuesday morning
+    ones, collected to be posted together once the last of them ran. The
+    window opens with the first report; the reports are rendered in
+    parallel when the bundle is sent.
+    """
+
+    def __init__(self, window_seconds, render, workers=BUNDLE_RENDER_WORKERS):
+        self.window = datetime.timedelta(seconds=window_seconds)
+        self.render = render
+        self.workers = workers
+        self._items = []
+        self._opened = None
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, job, content, content_hash):
+        """
+        add Adds a report or a note to the bundle.
+
+        :param job: Ledger key of the job, e.g. scores:Week Scores
+        :type job: str
+        :param content: The report, or a note like the link to the PDF
+        :type content: report.Report or str
+        :param content_hash: Fingerprint of the content for the ledger
+        :type content_hash: str
+        :return: None
+        """
+        if not self._items:
+            self._opened = schedule.datetime.datetime.now()
+        self._items.append((job, content, content_hash))
+
+    def is_due(self, scheduler):
+        """
+        is_due Checks whether the bundle is sent: its window closed or no
+               other job runs before it closes.
+
+        :param scheduler: Scheduler of the current phase, None out of them
+        :type scheduler: schedule.Scheduler
+        :return: True when the bundle has to be sent now
+        :rtype: bool
+        """
+        if not self._items:
+            return False
+        closes = self._opened + self.window
+        next_run = scheduler.next_run if scheduler is not None else None
+        return (
+            schedule.datetime.datetime.now() >= closes
+            or next_run is None
+            or next_run > closes
+        )
+
+    def send(self, bot):
+        """
+        send Renders the reports in parallel, posts them with the notes,
+             and empties the bundle.
+
+        :param bot: The bot posting the bundle
+        :type bot: bot_interface.BotInterface
+        :return: List of (job, content hash, delivered) of every item
+        :rtype: list
+        """
+        items, self._items = self._items, []
+        reports = [
+            content for _, content, _ in items if not isinstance(content, str)
+        ]
+        with ThreadPoolExecutor(
+            max_workers=max(min(len(reports), self.workers), 1),
+            thread_name_prefix="bundle",
+        ) as executor:
+            rendered = iter(list(executor.map(self.render, reports)))
+
+        delivered = bot.send_bundle(
+            [
+                content if isinstance(content, str) else next(rendered)
+                for _, content, _ in items
+            ]
+        )
+        return [
+            (job, content_hash, sent)
+            for (job, _, content_hash), sent in zip(items, delivered)
+        ]
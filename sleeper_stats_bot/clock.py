@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+import datetime
+import time
+import types
+
+import pendulum
+import schedule
+from constants import TIMEZONE
+
+
+class SystemClock:
+    """
+    Wall clock driving the phase loop of the bot.
+    """
+
+    def now(self):
+        return pendulum.now(TIMEZONE)
+
+    def today(self):
+        return pendulum.today(TIMEZONE)
+
+    def sleep(self, seconds, scheduler=None):
+        time.sleep(seconds)
+
+
+class VirtualClock:
+    """
+    Simulated clock for running the bot offline. While entered,
+    pendulum.now, pendulum.today and the schedule clock follow it.
+    sleep() advances it instantly, up to the next job of the scheduler or
+    the next midnight, when the phases change, and never less than the
+    requested seconds.
+    """
+
+    def __init__(self, start):
+        self._now = pendulum.instance(start).in_timezone(TIMEZONE)
+        self._originals = None
+
+    def now(self):
+        return self._now
+
+    def today(self):
+        return self._now.start_of("day")
+
+    def set(self, when):
+        self._now = pendulum.instance(when).in_timezone(TIMEZONE)
+
+    def sleep(self, seconds, scheduler=None):
+        target = self._now.add(seconds=seconds)
+        idle_seconds = scheduler.idle_seconds if scheduler else None
+        if idle_seconds is not None and idle_seconds > seconds:
+            next_midnight = self.today().add(days=1)
+            target = max(
+                target,
+                min(self._now.add(seconds=idle_seconds), next_midnight),
+            )
+        self.set(target)
+
+    def _pendulum_now(self, tz=None):
+        return self._now.in_timezone(tz) if tz else self._now
+
+    def _pendulum_today(self, tz=None):
+        return self._pendulum_now(tz).start_of("day")
+
+    def _get_schedule_datetime(self):
+        clock = self
+
+        class VirtualDatetime(datetime.datetime):
+            @classmethod
+            def now(cls, tz=None):
+                now = clock.now()
+                if tz is not None:
+                    return now.astimezone(tz)
+                # schedule works with naive local times
+                return datetime.datetime(
+                    now.year,
+                    now.month,
+                    now.day,
+                    now.hour,
+                    now.minute,
+                    now.second,
+                    now.microsecond,
+                )
+
+        module = types.SimpleNamespace(**vars(datetime))
+        module.datetime = VirtualDatetime
+        return module
+
+    def __enter__(self):
+        self._originals = (schedule.datetime, pendulum.now, pendulum.today)
+        schedule.datetime = self._get_schedule_datetime()
+        pendulum.now = self._pendulum_now
+        pendulum.today = self._pendulum_today
+        return self
+
+    def __exit__(self, *exc_info):
+        schedule.datetime, pendulum.now, pendulum.today = self._originals
+        self._originals = None
@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import requests
+from constants import (
+    COMMAND_CACHE_SECONDS,
+    COMMAND_MAX_BODY_BYTES,
+    COMMAND_RATE_PER_MINUTE,
+    SLACK_REQUEST_MAX_AGE_SECONDS,
+)
+from metrics import COMMANDS
+from renderers import render_telegram_pre
+from single_flight import SingleFlight
+
+RATE_LIMITED_MESSAGE = "Too many commands, try again in a minute."
+ERROR_MESSAGE = "The answer is not available right now, try again later."
+
+
+class RenderCache:
+    """
+    Rendered answers of the commands, reused for ttl_seconds. Concurrent
+    requests of an expired answer build it once.
+    """
+
+    def __init__(self, ttl_seconds=COMMAND_CACHE_SECONDS, now=time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.now = now
+        self._lock = threading.Lock()
+        self._answers = {}
+        self._flights = SingleFlight("command")
+
+    def get(self, key, build):
+        """
+        get Returns the cached answer, or builds and caches it.
+
+        :param key: Hashable key of the answer, e.g. (command, argument)
+        :type key: tuple
+        :param build: Function without arguments building the answer
+        :type build: callable
+        :return: The answer
+        :rtype: str
+        """
+        with self._lock:
+            answer = self._answers.get(key)
+        if answer is not None and self.now() - answer[0] < self.ttl_seconds:
+            return answer[1]
+        return self._flights.do(key, lambda: self._build(key, build))
+
+    def _build(self, key, build):
+        text = build()
+        now = self.now()
+        with self._lock:
+            self._answers = {
+                cached_key: answer
+                for cached_key, answer in self._answers.items()
+                if now - answer[0] < self.ttl_seconds
+            }
+            self._answers[key] = (now, text)
+        return text
+
+
+class ChatRateLimiter:
+    """
+    Allows at most per_minute commands by chat in any minute.
+    """
+
+    def __init__(self, per_minute=COMMAND_RATE_PER_MINUTE, now=time.monotonic):
+        self.per_minute = per_minute
+        self.now = now
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def allow(self, chat_id):
+        """
+        allow Checks a command of a chat against its limit and counts it.
+
+        :param chat_id: Id of the chat or channel
+        :type chat_id: str
+        :return: True when the command can be answered
+        :rtype: bool
+        """
+        now = self.now()
+        with self._lock:
+            calls = self._calls.setdefault(chat_id, deque())
+            while calls and now - calls[0] >= 60:
+                calls.popleft()
+            if len(calls) >= self.per_minute:
+                return False
+            calls.append(now)
+            return True
+
+
+class CommandHandler:
+    """
+    Answers the commands of the members, e.g. /scores or /matchup Team,
+    from the render cache, within the rate limit of their chat.
+    """
+
+    def __init__(self, commands, logger, cache=None, limiter=None):
+        self.commands = commands
+        self.logger = logger
+        self.cache = cache or RenderCache()
+        self.limiter = limiter or ChatRateLimiter()
+
+    def get_help(self):
+        return "Commands: " + ", ".join(
+            "/" + name for name in sorted(self.commands)
+        )
+
+    def handle(self, chat_id, text):
+        """
+        handle Answers a message.
+
+        :param chat_id: Id of the chat or channel of the message
+        :type chat_id: str
+        :param text: Text of the message, e.g. /matchup@StatsBot Team
+        :type text: str
+        :return: The answer, None for a message that is not a command
+        :rtype: str
+        """
+        if not text or not text.startswith("/"):
+            return None
+        name, _, argument = text[1:].partition(" ")
+        # Telegram appends the bot name in group chats
+        name = name.split("@")[0].lower()
+        argument = argument.strip()
+        if name != "help" and name not in self.commands:
+            return None
+
+        if not self.limiter.allow(str(chat_id)):
+            COMMANDS.inc(command=name, result="limited")
+            return RATE_LIMITED_MESSAGE
+        if name == "help":
+            COMMANDS.inc(command=name, result="answered")
+            return self.get_help()
+
+        try:
+            answer = self.cache.get(
+                (name, argument.casefold()),
+                lambda: self.commands[name](argument),
+            )
+        except Exception:
+            self.logger.warning("Command %s failed", text, exc_info=True)
+            COMMANDS.inc(command=name, result="error")
+            return ERROR_MESSAGE
+        COMMANDS.inc(command=name, result="answered")
+        return answer
+
+
+def is_slack_signature_valid(secret, headers, body, now=None):
+    """
+    is_slack_signature_valid Checks the signature of a Slack request,
+                             https://api.slack.com/authentication/verifying-requests-from-slack
+
+    :param secret: Signing secret of the Slack app
+    :type secret: str
+    :param headers: Headers of the request
+    :type headers: email.message.Message
+    :param body: Raw body of the request
+    :type body: bytes
+    :param now: Current timestamp, defaults to time.time()
+    :type now: float
+    :return: True for a recent request signed with the secret
+    :rtype: bool
+    """
+    timestamp = headers.get("X-Slack-Request-Timestamp", "")
+    if not timestamp.isdigit():
+        return False
+    now = time.time() if now is None else now
+    if abs(now - int(timestamp)) > SLACK_REQUEST_MAX_AGE_SECONDS:
+        return False
+
+    base = b"v0:" + timestamp.encode("ascii") + b":" + body
+    expected = (
+        "v0="
+        + hmac.new(secret.encode("utf-8"), base, hashlib.sha256).hexdigest()
+    )
+    return hmac.compare_digest(expected, headers.get("X-Slack-Signature", ""))
+
+
+class CommandRequestHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = self.headers.get("Content-Length", "0")
+        if not length.isdigit():
+            self.send_error(400)
+            return
+        if int(length) > COMMAND_MAX_BODY_BYTES:
+            self.send_error(413)
+            return
+        body = self.rfile.read(int(length))
+        if self.path == "/telegram":
+            status, answer = self.server.answer_telegram(self.headers, body)
+        elif self.path == "/slack":
+            status, answer = self.server.answer_slack(self.headers, body)
+        else:
+            self.send_error(404)
+            return
+
+        content = b"" if answer is None else json.dumps(answer).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CommandServer(ThreadingHTTPServer):
+    """
+    Endpoint of the Telegram webhook, POST /telegram, and of the Slack
+    slash commands, POST /slack, answering in the response itself so no
+    other call to the platform is needed. A Telegram answer longer than
+    a message is sent message by message with the bot token instead.
+    Requests are handled concurrently. An endpoint without its secret
+    refuses every request.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        handler,
+        telegram_secret=None,
+        slack_signing_secret=None,
+        telegram_token=None,
+    ):
+        self.handler = handler
+        self.telegram_secret = telegram_secret
+        self.slack_signing_secret = slack_signing_secret
+        self.telegram_token = telegram_token
+        super().__init__(address, CommandRequestHandler)
+
+    def send_telegram(self, chat_id, message):
+        requests.post(
+            "https://api.telegram.org/bot{}/sendMessage".format(
+                self.telegram_token
+            ),
+            data={"chat_id": chat_id, "text": message, "parse_mode": "HTML"},
+        ).raise_for_status()
+
+    def answer_telegram(self, headers, body):
+        if not self.telegram_secret or not hmac.compare_digest(
+            headers.get("X-Telegram-Bot-Api-Secret-Token", ""),
+            self.telegram_secret,
+        ):
+            return 403, None
+
+        try:
+            update = json.loads(body or b"{}")
+            message = update.get("message") or {}
+            chat_id = message.get("chat", {}).get("id")
+        except (ValueError, AttributeError):
+            return 400, None
+        answer = self.handler.handle(chat_id, message.get("text"))
+        if answer is None:
+            return 200, None
+        messages = render_telegram_pre(answer)
+        if len(messages) > 1 and self.telegram_token:
+            try:
+                for message in messages:
+                    self.send_telegram(chat_id, message)
+            except requests.exceptions.RequestException:
+                self.handler.logger.warning(
+                    "Answer to %s could not be sent", chat_id, exc_info=True
+                )
+            return 200, None
+        if len(messages) > 1:
+            self.handler.logger.warning(
+                "Answer to %s cut to its first message without "
+                "TELEGRAM_BOT_TOKEN",
+                chat_id,
+            )
+        return 200, {
+            "method": "sendMessage",
+            "chat_id": chat_id,
+            "text": messages[0],
+            "parse_mode": "HTML",
+        }
+
+    def answer_slack(self, headers, body):
+        if not self.slack_signing_secret or not is_slack_signature_valid(
+            self.slack_signing_secret, headers, body
+        ):
+            return 403, None
+
+        try:
+            form = parse_qs(body.decode("utf-8"))
+        except ValueError:
+            return 400, None
+        command = form.get("command", [""])[0]
+        text = form.get("text", [""])[0]
+        answer = self.handler.handle(
+            form.get("channel_id", [""])[0], "{} {}".format(command, text)
+        )
+        if answer is None:
+            return 200, None
+        return 200, {
+            "response_type": "in_channel",
+            "text": "```\n{}\n```".format(answer),
+        }
+
+
+def start_command_server(
+    port,
+    commands,
+    logger=None,
+    host="0.0.0.0",
+    telegram_secret=None,
+    slack_signing_secret=None,
+    telegram_token=None,
+):
+    """
+    start_command_server Serves the commands at http://host:port from a
+                         daemon thread, unless no endpoint has its secret.
+
+    :param port: Port to listen on, 0 for a random one
+    :type port: int
+    :param commands: Functions answering the commands, by name, called
+        with the argument of the command
+    :type commands: dict
+    :param logger: A logger object for logging debug
+    :type logger: logging.Logger
+    :param host: Address to listen on
+    :type host: str
+    :param telegram_secret: Secret token set on the Telegram webhook
+    :type telegram_secret: str
+    :param slack_signing_secret: Signing secret of the Slack app
+    :type slack_signing_secret: str
+    :param telegram_token: Token of the Telegram bot, sending the answers
+        longer than a message
+    :type telegram_token: str
+    :return: The running server, None when it was not started
+    :rtype: CommandServer
+    """
+    logger = logger or logging.getLogger("bot")
+    secrets = {
+        "/telegram": ("TELEGRAM_WEBHOOK_SECRET", telegram_secret),
+        "/slack": ("SLACK_SIGNING_SECRET", slack_signing_secret),
+    }
+    for path, (name, secret) in secrets.items():
+        if not secret:
+            logger.warning("%s refuses the commands without %s", path, name)
+    if not telegram_secret and not slack_signing_secret:
+        logger.warning("Command server not started, no secret is set")
+        return None
+
+    handler = CommandHandler(commands, logger)
+    server = CommandServer(
+        (host, int(port)),
+        handler,
+        telegram_secret,
+        slack_signing_secret,
+        telegram_token,
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
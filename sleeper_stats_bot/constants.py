@@ -3,6 +3,11 @@
 GITHUB_REPOSITORY = "https://github.com/luiscachog/sleeper-stats-bot"
 LEAGUE_NAME = "Nerd Football League"
 CLOSE_NUM = 10
+# A live game is close while the underdog keeps at least this win
+# probability. Remaining players are projected with a standard
+# deviation of WIN_PROBABILITY_STDDEV_RATIO times their projection.
+CLOSE_WIN_PROBABILITY = 0.3
+WIN_PROBABILITY_STDDEV_RATIO = 0.5
 TIMEZONE = "America/Chicago"
 HTTP_USER_AGENT = (
     "Mozilla/5.0 (Macintosh; "
@@ -11,6 +16,38 @@ HTTP_USER_AGENT = (
     "Chrome/50.0.2661.102 Safari/537.36"
 )
 DAY_IN_SECONDS = 86400
+SLEEPER_API_URL = "https://api.sleeper.app/v1"
+
+# Permanent store for immutable payloads (completed weeks, past seasons)
+STORE_PATH = "sleeper_store.sqlite"
+SEASON_FETCH_WORKERS = 8
+# Connections kept alive to the Sleeper API, one by fetch worker, and
+# the (connect, read) timeouts of its requests
+SLEEPER_POOL_SIZE = SEASON_FETCH_WORKERS
+SLEEPER_TIMEOUT_SECONDS = (3.05, 30)
+# Users, rosters, league settings, drafts and the players dump are cached
+# for a day but revalidated, If-None-Match / If-Modified-Since, once
+# older than this
+SLEEPER_REVALIDATE_SECONDS = 60
+# The states of the NFL games of the week, read by the live win
+# probabilities, are cached this long
+GAME_STATE_SECONDS = 60
+# Sleeper asks to stay under 1000 API calls per minute
+BACKFILL_RATE_PER_SECOND = 10
+
+# Budgets of the API calls reaching the network, shared by every process
+# through the QUOTA_PATH file: {provider: {window: (calls, seconds)}}
+QUOTA_PATH = "api_quota.sqlite"
+API_BUDGETS = {
+    "sportsdata": {"month": (1000, 30 * DAY_IN_SECONDS)},
+    "sleeper": {"minute": (900, 60)},
+}
+# Share of every budget the low priority calls cannot use
+QUOTA_LOW_PRIORITY_RESERVE = 0.2
+# Longest wait for a budget to refill before refusing a call
+QUOTA_MAX_WAIT_SECONDS = 30
+# Used for past leagues without playoff_week_start in their settings
+DEFAULT_PLAYOFF_WEEK_START = 15
 
 # pts_std = Standard
 # pts_ppr = PPR
@@ -29,12 +66,64 @@ MONDAY_NIGHT_SCORES_HOUR = "22:30"
 TUESDAY_MORNING_WEEK_SCORES_HOUR = "11:00"
 TUESDAY_MORNING_STANDINGS_HOUR = "11:10"
 TUESDAY_MORNING_BEST_WORST_HOUR = "11:11"
+TUESDAY_MORNING_BENCH_BEATS_STARTERS_HOUR = "11:12"
+TUESDAY_MORNING_LUCK_HOUR = "11:13"
 TUESDAY_MORNING_REPORT_HOUR = "11:15"
 DAILY_NIGHT_DRAFT_REMINDER_HOUR = "17:00"
 
 DAYS_BEFORE_DRAFT = 20
 
+# Live draft tracker: the draft is polled DRAFT_POLLS_PER_PICK times by
+# pick clock, at most every DRAFT_POLL_MIN_SECONDS, so even with its
+# picks it takes under 30 calls a minute of the Sleeper budget; before
+# the start at most every DRAFT_IDLE_POLL_SECONDS
+DRAFT_POLLS_PER_PICK = 6
+DRAFT_POLL_MIN_SECONDS = 5
+DRAFT_POLL_MAX_SECONDS = 60
+DRAFT_IDLE_POLL_SECONDS = 3600
+# Trades and waivers are checked this often, a 304 most of the time
+TRANSACTIONS_POLL_SECONDS = 120
+
+# Deliveries of a report to a platform, retried after 1, 2, 4... seconds
+SEND_RETRY_ATTEMPTS = 3
+SEND_RETRY_BACKOFF_SECONDS = 1
+
+# Reports of a bundle rendered at the same time
+BUNDLE_RENDER_WORKERS = 4
+
+# On-demand commands: answers reused for COMMAND_CACHE_SECONDS, at most
+# COMMAND_RATE_PER_MINUTE commands by chat
+COMMAND_CACHE_SECONDS = 60
+COMMAND_RATE_PER_MINUTE = 6
+SLACK_REQUEST_MAX_AGE_SECONDS = 300
+# Largest body of a command request, the updates are a few KB
+COMMAND_MAX_BODY_BYTES = 64 * 1024
+
 FONT_NAME = "/app/.fonts/Fira_Code_Medium_Nerd_Font_Complete.ttf"
 FONT_SIZE = 14
 
 IMAGE_WIDTH_PIXELS = 550
+
+# Number of most over and under performing players in the luck report
+LUCK_PLAYERS_NUM = 3
+
+# Seconds between dumps of the metrics to METRICS_FILE
+METRICS_DUMP_INTERVAL_SECONDS = 60
+
+# Profiles of the jobs when PROFILE_JOBS is enabled
+PROFILE_DIR = "profiles"
+PROFILE_KEEP = 10
+PROFILE_TOP_STATS = 30
+
+# Phases of the season, each one with its scheduler
+PHASES = ["pre_season", "post_draft", "season", "post_season", "off_season"]
+LOOP_SLEEP_SECONDS = 50
+# A job missed by less than this, e.g. during a restart, runs on boot
+JOB_CATCH_UP_SECONDS = 3600
+# The data of a job is fetched this long before it runs, so it only
+# renders and sends at its time
+PREFETCH_LEAD_SECONDS = 120
+
+# Size of the bulk payloads logged at DEBUG, the whole ones at TRACE
+LOG_PAYLOAD_ITEMS = 3
+LOG_PAYLOAD_STRING_CHARS = 80
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+import json
+from typing import Dict, Optional, TypedDict
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Fields of the players dump and of the stat sheets read by the reports,
+# the rest is dropped when decoding
+PLAYER_FIELDS = ("first_name", "last_name", "position", "team")
+STAT_FIELDS = (
+    "pts_half_ppr",
+    "pts_ppr",
+    "pts_std",
+    "bonus_rec_te",
+    "rec_fd",
+    "ff",
+    "pass_int",
+    "gp",
+)
+
+
+def loads(data):
+    """
+    loads Decodes a JSON document with orjson when it is installed.
+
+    :param data: JSON document
+    :type data: bytes or str
+    :return: Decoded document
+    :rtype: object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class RecordsDecoder:
+    """
+    Decoder of the JSON objects {id: {field: value}} returned by Sleeper,
+    keeping only the given fields of every record. With msgspec the
+    values are type checked and the other fields skipped without being
+    materialized, otherwise the document is decoded with loads and the
+    records trimmed.
+    """
+
+    def __init__(self, name, fields, field_type):
+        self.fields = fields
+        self._decoder = None
+        if msgspec is not None:
+            record_type = TypedDict(
+                name,
+                {field: Optional[field_type] for field in fields},
+                total=False,
+            )
+            self._decoder = msgspec.json.Decoder(
+                Dict[str, Optional[record_type]]
+            )
+
+    def decode(self, data):
+        """
+        decode Decodes the records of a JSON document.
+
+        :param data: JSON document
+        :type data: bytes
+        :return: Dict {id: {field: value}} with the known fields only,
+            null records stay None
+        :rtype: dict
+        """
+        if self._decoder is not None:
+            return self._decoder.decode(data)
+
+        fields = self.fields
+        return {
+            key: (
+                None
+                if record is None
+                else {
+                    field: record[field] for field in fields if field in record
+                }
+            )
+            for key, record in loads(data).items()
+        }
+
+
+PLAYERS_DECODER = RecordsDecoder("PlayerRecord", PLAYER_FIELDS, str)
+STATS_DECODER = RecordsDecoder("StatsRecord", STAT_FIELDS, float)
@@ -3,8 +3,15 @@ from bot_interface import BotInterface
 
 
 class Discord(BotInterface):
+    output_format = "discord_embeds"
+
     def __init__(self, webhook):
         self.webhook = webhook
 
     def send_message(self, message):
-        requests.post(self.webhook, json={"content": message})
+        requests.post(
+            self.webhook, json={"content": message}
+        ).raise_for_status()
+
+    def deliver(self, content):
+        requests.post(self.webhook, json=content).raise_for_status()
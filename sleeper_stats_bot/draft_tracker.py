@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+import time
+
+from constants import (
+    DRAFT_IDLE_POLL_SECONDS,
+    DRAFT_POLL_MAX_SECONDS,
+    DRAFT_POLL_MIN_SECONDS,
+    DRAFT_POLLS_PER_PICK,
+    SLEEPER_API_URL,
+)
+from http_client import get_client
+from metrics import timed_job
+
+
+def get_poll_seconds(draft, now):
+    """
+    get_poll_seconds Returns the seconds until the next poll of a draft:
+                     a fraction of the pick clock while drafting, until
+                     the start before it, None once completed.
+
+    :param draft: https://docs.sleeper.app/#get-a-specific-draft
+    :type draft: dict
+    :param now: Current timestamp
+    :type now: float
+    :return: Seconds, None to stop polling
+    :rtype: float
+    """
+    status = draft.get("status")
+    if status == "complete":
+        return None
+    if status == "drafting":
+        pick_timer = (draft.get("settings") or {}).get("pick_timer")
+        if not pick_timer:
+            return DRAFT_POLL_MAX_SECONDS
+        return min(
+            max(pick_timer / DRAFT_POLLS_PER_PICK, DRAFT_POLL_MIN_SECONDS),
+            DRAFT_POLL_MAX_SECONDS,
+        )
+    if status == "pre_draft" and draft.get("start_time"):
+        until_start = draft["start_time"] / 1000 - now
+        return min(
+            max(until_start, DRAFT_POLL_MIN_SECONDS), DRAFT_IDLE_POLL_SECONDS
+        )
+    # Paused, or without a start time yet
+    return DRAFT_POLL_MAX_SECONDS
+
+
+@timed_job("draft_poll")
+def _fetch(url):
+    payload = get_client().fetch(url, refresh=True)
+    # sleeper_wrapper contract, the HTTPError is returned
+    if isinstance(payload, Exception):
+        raise payload
+    return payload
+
+
+class DraftTracker:
+    """
+    Follows a live draft. Every poll revalidates the draft, a payload of
+    the same small size all along; the picks are fetched only once it
+    has a new one, and only the picks after the cursor, the number of
+    the last one announced, are handed to on_picks. The cursor moves
+    only when on_picks delivered them, and is kept in the store, so a
+    restart does not announce the picks again. Started during the draft
+    without a cursor, the picks made so far are not announced.
+
+    The polls follow the pick clock, DRAFT_POLLS_PER_PICK by pick but
+    never closer than DRAFT_POLL_MIN_SECONDS, so a whole draft stays far
+    below the Sleeper budget. A failed poll backs off up to
+    DRAFT_POLL_MAX_SECONDS.
+    """
+
+    def __init__(self, draft_id, on_picks, logger, store=None, now=time.time):
+        self.draft_id = draft_id
+        self.on_picks = on_picks
+        self.logger = logger
+        self.store = store
+        self.now = now
+        self.draft = None
+        # None until the first poll sets it
+        self.cursor = None
+        if store is not None:
+            self.cursor = store.get("draft_cursor", draft_id)
+        self._last_picked = None
+        self._failures = 0
+        self._next_poll = now()
+
+    @property
+    def url(self):
+        return "{}/draft/{}".format(SLEEPER_API_URL, self.draft_id)
+
+    @property
+    def done(self):
+        return self.draft is not None and self.draft["status"] == "complete"
+
+    def _move_cursor(self, cursor):
+        self.cursor = cursor
+        if self.store is not None:
+            self.store.put("draft_cursor", self.draft_id, cursor)
+
+    def poll(self):
+        """
+        poll Checks the draft and hands its new picks to on_picks.
+
+        :return: The new picks announced, by pick number
+        :rtype: list
+        """
+        self.draft = _fetch(self.url)
+        last_picked = self.draft.get("last_picked")
+        if self.cursor is None and not last_picked:
+            # Every pick is announced
+            self._move_cursor(0)
+        if not last_picked or last_picked == self._last_picked:
+            return []
+
+        picks = _fetch(self.url + "/picks")
+        if self.cursor is None:
+            # Started during the draft, the picks made so far are skipped
+            self._move_cursor(
+                max((pick["pick_no"] for pick in picks), default=0)
+            )
+            self._last_picked = last_picked
+            return []
+
+        new_picks = sorted(
+            (pick for pick in picks if pick["pick_no"] > self.cursor),
+            key=lambda pick: pick["pick_no"],
+        )
+        if new_picks:
+            if not self.on_picks(self.draft, new_picks, picks):
+                self.logger.warning(
+                    "Picks %s to %s of the draft %s not delivered, "
+                    "announced again at the next poll",
+                    new_picks[0]["pick_no"],
+                    new_picks[-1]["pick_no"],
+                    self.draft_id,
+                )
+                return []
+            self._move_cursor(new_picks[-1]["pick_no"])
+        self._last_picked = last_picked
+        return new_picks
+
+    def run_due(self):
+        """
+        run_due Polls the draft when the next poll is due.
+
+        :return: The new picks
+        :rtype: list
+        """
+        if self.done or self.now() < self._next_poll:
+            return []
+
+        try:
+            new_picks = self.poll()
+        except Exception:
+            self._failures += 1
+            seconds = min(
+                DRAFT_POLL_MIN_SECONDS * 2**self._failures,
+                DRAFT_POLL_MAX_SECONDS,
+            )
+            self.logger.warning(
+                "Poll of the draft %s failed, retried in %ss",
+                self.draft_id,
+                seconds,
+                exc_info=True,
+            )
+            self._next_poll = self.now() + seconds
+            return []
+
+        self._failures = 0
+        seconds = get_poll_seconds(self.draft, self.now())
+        if seconds is None:
+            self.logger.info("Draft %s completed", self.draft_id)
+        else:
+            self._next_poll = self.now() + seconds
+        return new_picks
+
+    def idle_seconds(self):
+        """
+        idle_seconds Returns the seconds until the next poll.
+
+        :return: Seconds, None once the draft completed
+        :rtype: float
+        """
+        if self.done:
+            return None
+        return max(self._next_poll - self.now(), 0)
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+import contextvars
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+from constants import (
+    API_BUDGETS,
+    QUOTA_LOW_PRIORITY_RESERVE,
+    QUOTA_MAX_WAIT_SECONDS,
+)
+from metrics import QUOTA_REFUSED, QUOTA_REMAINING
+from single_flight import CoalescingAdapter
+
+NORMAL = "normal"
+LOW = "low"
+
+_priority = contextvars.ContextVar("quota_priority", default=NORMAL)
+
+
+class QuotaExceeded(requests.exceptions.RequestException):
+    """
+    Raised instead of sending a call its provider budget cannot afford.
+    """
+
+
+@contextmanager
+def low_priority():
+    """
+    low_priority Marks the calls made in the block, and in the workers
+                 started from it, as low priority: they are the first
+                 refused when a budget gets tight.
+    """
+    token = set_priority(LOW)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def get_priority():
+    return _priority.get()
+
+
+def set_priority(priority):
+    """
+    set_priority Sets the priority of the calls of the current context.
+
+    :param priority: NORMAL or LOW
+    :type priority: str
+    :return: Token to reset the previous priority
+    :rtype: contextvars.Token
+    """
+    return _priority.set(priority)
+
+
+class Governor:
+    """
+    API quota governor shared by every process using the same SQLite
+    file. Every provider has token buckets, one by budget window, holding
+    up to limit calls and refilled at limit / period calls per second. A
+    call takes a token of every bucket of its provider.
+
+    When a bucket is short, the call waits for the refill if it comes
+    within max_wait seconds, otherwise it is refused with QuotaExceeded.
+    Low priority calls leave reserve of every bucket to the others.
+    """
+
+    def __init__(
+        self,
+        path,
+        budgets=API_BUDGETS,
+        reserve=QUOTA_LOW_PRIORITY_RESERVE,
+        max_wait=QUOTA_MAX_WAIT_SECONDS,
+        now=time.time,
+        sleep=time.sleep,
+    ):
+        self.path = path
+        self.budgets = budgets
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self._now = now
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        # Transactions are opened explicitly, BEGIN IMMEDIATE locks the
+        # file against the other processes
+        self._connection = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            "provider TEXT NOT NULL, "
+            "window TEXT NOT NULL, "
+            "tokens REAL NOT NULL, "
+            "updated_at REAL NOT NULL, "
+            "PRIMARY KEY (provider, window))"
+        )
+
+    def _read_buckets(self, provider, now):
+        # Tokens of every window of the provider, refilled up to now
+        rows = {
+            window: (tokens, updated_at)
+            for window, tokens, updated_at in self._connection.execute(
+                "SELECT window, tokens, updated_at FROM buckets "
+                "WHERE provider = ?",
+                (provider,),
+            )
+        }
+        buckets = {}
+        for window, (limit, period) in self.budgets[provider].items():
+            tokens, updated_at = rows.get(window, (limit, now))
+            refilled = tokens + max(now - updated_at, 0) * limit / period
+            buckets[window] = min(refilled, limit)
+        return buckets
+
+    def _take(self, provider, priority):
+        """
+        _take Takes a token of every bucket of the provider if all of them
+              can afford it.
+
+        :return: 0 when taken, otherwise the seconds until they can
+        :rtype: float
+        """
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                now = self._now()
+                buckets = self._read_buckets(provider, now)
+                wait = 0.0
+                for window, tokens in buckets.items():
+                    limit, period = self.budgets[provider][window]
+                    needed = 1.0
+                    if priority == LOW:
+                        needed += limit * self.reserve
+                    if tokens < needed:
+                        wait = max(wait, (needed - tokens) * period / limit)
+                if wait == 0.0:
+                    buckets = {
+                        window: tokens - 1
+                        for window, tokens in buckets.items()
+                    }
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO buckets "
+                    "(provider, window, tokens, updated_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    [
+                        (provider, window, tokens, now)
+                        for window, tokens in buckets.items()
+                    ],
+                )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+
+        for window, tokens in buckets.items():
+            QUOTA_REMAINING.set(tokens, provider=provider, window=window)
+        return wait
+
+    def acquire(self, provider, priority=None):
+        """
+        acquire Takes the quota of a call to the provider, waiting for it
+                if needed.
+
+        :param provider: Provider of the call, a key of the budgets
+        :type provider: str
+        :param priority: NORMAL or LOW, defaults to the priority of the
+            current context
+        :type priority: str
+        :return: None
+        :raises QuotaExceeded: When the quota does not refill within
+            max_wait seconds
+        """
+        if provider not in self.budgets:
+            return
+        priority = priority or get_priority()
+
+        waited = 0.0
+        while True:
+            wait = self._take(provider, priority)
+            if wait == 0.0:
+                return
+            if waited + wait > self.max_wait:
+                QUOTA_REFUSED.inc(provider=provider, priority=priority)
+                raise QuotaExceeded(
+                    "{} quota exhausted for a {} priority call, "
+                    "refilled in {:.0f}s".format(provider, priority, wait)
+                )
+            self._sleep(wait)
+            waited += wait
+
+    def remaining(self, provider):
+        """
+        remaining Returns the calls left to a provider.
+
+        :param provider: Provider, a key of the budgets
+        :type provider: str
+        :return: Dict {window: calls left}
+        :rtype: dict
+        """
+        with self._lock:
+            buckets = self._read_buckets(provider, self._now())
+        return {window: int(tokens) for window, tokens in buckets.items()}
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class GovernedAdapter(CoalescingAdapter):
+    """
+    HTTPAdapter taking the quota of every call it sends from a governor.
+    Mounted under the request cache, so the cache hits are free, and the
+    concurrent identical calls are sent and charged once.
+    """
+
+    def __init__(self, governor, provider, **kwargs):
+        self.governor = governor
+        self.provider = provider
+        super().__init__(**kwargs)
+
+    def send_once(self, request, **kwargs):
+        self.governor.acquire(self.provider)
+        return super().send_once(request, **kwargs)
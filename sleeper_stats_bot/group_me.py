@@ -4,6 +4,8 @@ from bot_interface import BotInterface
 
 
 class GroupMe(BotInterface):
+    output_format = "groupme_text"
+
     def __init__(self, bot_id):
         self.bot_id = bot_id
 
@@ -11,4 +13,4 @@ class GroupMe(BotInterface):
         requests.post(
             "https://api.groupme.com/v3/bots/post",
             data={"text": message, "bot_id": self.bot_id},
-        )
+        ).raise_for_status()
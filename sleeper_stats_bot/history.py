@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+from collections import defaultdict
+
+from constants import DEFAULT_PLAYOFF_WEEK_START, SEASON_FETCH_WORKERS
+from sleeper_data import get_payload, get_week_matchups, get_weeks
+from sleeper_wrapper import League
+
+
+def get_league_chain(league, store=None):
+    """
+    get_league_chain Walks the previous_league_id chain of a league.
+                     Past leagues never change, so the chain is saved in
+                     the store and only walked once.
+
+    :param league: Object league of the current season
+    :type league: sleeper_wrapper.League
+    :param store: Permanent store
+    :type store: store.Store
+    :return: List of past leagues payloads, newest first
+    :rtype: list
+    """
+    chain = []
+    previous_league_id = league.get_league().get("previous_league_id")
+
+    while previous_league_id and previous_league_id != "0":
+        past_league = get_payload(
+            "league",
+            previous_league_id,
+            True,
+            lambda: League(previous_league_id).get_league(),
+            store,
+        )
+        chain.append(past_league)
+        previous_league_id = past_league.get("previous_league_id")
+
+    return chain
+
+
+def get_regular_season_weeks(league_payload):
+    """
+    get_regular_season_weeks Returns the regular season weeks of a league.
+
+    :param league_payload: https://docs.sleeper.app/#get-a-specific-league
+    :type league_payload: dict
+    :return: List of weeks
+    :rtype: list
+    """
+    playoff_week_start = (league_payload.get("settings") or {}).get(
+        "playoff_week_start"
+    ) or DEFAULT_PLAYOFF_WEEK_START
+    return list(range(1, int(playoff_week_start)))
+
+
+def get_season_games(matchups_by_week, roster_id_to_owner_id_dict):
+    """
+    get_season_games Flattens the matchups of a season into games between
+                     owners.
+
+    :param matchups_by_week: Dict {week: matchups}
+    :type matchups_by_week: dict
+    :param roster_id_to_owner_id_dict: Dict {roster_id: owner_id}
+    :type roster_id_to_owner_id_dict: dict
+    :return: List [[week, owner_a, points_a, owner_b, points_b], ...]
+    :rtype: list
+    """
+    games = []
+
+    for week, matchups in sorted(matchups_by_week.items()):
+        teams_by_matchup = defaultdict(list)
+        for matchup in matchups or []:
+            if matchup.get("matchup_id") is None:
+                continue
+            teams_by_matchup[matchup["matchup_id"]].append(
+                (
+                    roster_id_to_owner_id_dict.get(str(matchup["roster_id"])),
+                    float(matchup.get("points") or 0),
+                )
+            )
+
+        for teams in teams_by_matchup.values():
+            if len(teams) != 2 or None in (teams[0][0], teams[1][0]):
+                continue
+            games.append(
+                [week, teams[0][0], teams[0][1], teams[1][0], teams[1][1]]
+            )
+
+    return games
+
+
+def get_past_season(league_payload):
+    """
+    get_past_season Fetches the games of a past season. Every week is
+                    fetched concurrently.
+
+    :param league_payload: https://docs.sleeper.app/#get-a-specific-league
+    :type league_payload: dict
+    :return: Dict {"season", "league_id", "games"}
+    :rtype: dict
+    """
+    league = League(league_payload["league_id"])
+    roster_id_to_owner_id_dict = {
+        str(roster["roster_id"]): roster["owner_id"]
+        for roster in league.get_rosters()
+    }
+    matchups_by_week = get_weeks(
+        league.get_matchups,
+        get_regular_season_weeks(league_payload),
+        SEASON_FETCH_WORKERS,
+    )
+
+    return {
+        "season": league_payload.get("season"),
+        "league_id": league_payload["league_id"],
+        "games": get_season_games(
+            matchups_by_week, roster_id_to_owner_id_dict
+        ),
+    }
+
+
+def get_past_seasons(league, store=None):
+    """
+    get_past_seasons Returns the games of every past season of the league
+                     chain. Seasons missing from the store are fetched
+                     concurrently and saved permanently.
+
+    :param league: Object league of the current season
+    :type league: sleeper_wrapper.League
+    :param store: Permanent store
+    :type store: store.Store
+    :return: List of the seasons returned by get_past_season
+    :rtype: list
+    """
+    chain = {
+        league_payload["league_id"]: league_payload
+        for league_payload in get_league_chain(league, store)
+    }
+
+    return list(
+        get_weeks(
+            lambda league_id: get_payload(
+                "history",
+                league_id,
+                True,
+                lambda: get_past_season(chain[league_id]),
+                store,
+            ),
+            chain,
+            SEASON_FETCH_WORKERS,
+        ).values()
+    )
+
+
+class HistoryIndex:
+    """
+    All-time head-to-head records between owners and the franchise
+    history of every owner, built once and queried in O(1).
+    """
+
+    def __init__(self):
+        # (owner_id, opponent_owner_id): [wins, losses, ties, pf, pa]
+        self.head_to_head = defaultdict(lambda: [0, 0, 0, 0.0, 0.0])
+        # owner_id: {season: [wins, losses, ties, pf]}
+        self.franchises = defaultdict(
+            lambda: defaultdict(lambda: [0, 0, 0, 0.0])
+        )
+
+    def add_game(self, season, owner_a, points_a, owner_b, points_b):
+        for owner, opponent, points_for, points_against in (
+            (owner_a, owner_b, points_a, points_b),
+            (owner_b, owner_a, points_b, points_a),
+        ):
+            if points_for > points_against:
+                result = 0
+            elif points_for < points_against:
+                result = 1
+            else:
+                result = 2
+
+            record = self.head_to_head[(owner, opponent)]
+            record[result] += 1
+            record[3] += points_for
+            record[4] += points_against
+
+            franchise_season = self.franchises[owner][season]
+            franchise_season[result] += 1
+            franchise_season[3] += points_for
+
+    def add_season(self, season_payload):
+        for _, owner_a, points_a, owner_b, points_b in season_payload["games"]:
+            self.add_game(
+                season_payload["season"], owner_a, points_a, owner_b, points_b
+            )
+
+    def get_record(self, owner_id, opponent_owner_id):
+        """
+        get_record Returns the all-time record of an owner against
+                   another one.
+
+        :param owner_id: Sleeper user id
+        :type owner_id: str
+        :param opponent_owner_id: Sleeper user id of the opponent
+        :type opponent_owner_id: str
+        :return: List [wins, losses, ties, points_for, points_against]
+        :rtype: list
+        """
+        return self.head_to_head.get(
+            (owner_id, opponent_owner_id), [0, 0, 0, 0.0, 0.0]
+        )
+
+    def get_franchise(self, owner_id):
+        """
+        get_franchise Returns the season by season history of an owner.
+
+        :param owner_id: Sleeper user id
+        :type owner_id: str
+        :return: Dict {season: [wins, losses, ties, points_for]}
+        :rtype: dict
+        """
+        return dict(self.franchises.get(owner_id, {}))
+
+
+def build_history_index(league, current_week, store=None):
+    """
+    build_history_index Builds the history index with every past season
+                        of the league chain plus the completed weeks of
+                        the current season.
+
+    :param league: Object league of the current season
+    :type league: sleeper_wrapper.League
+    :param current_week: Current week of the season
+    :type current_week: int
+    :param store: Permanent store
+    :type store: store.Store
+    :return: The history index
+    :rtype: HistoryIndex
+    """
+    history_index = HistoryIndex()
+
+    for season_payload in get_past_seasons(league, store):
+        history_index.add_season(season_payload)
+
+    league_payload = league.get_league()
+    roster_id_to_owner_id_dict = {
+        str(roster["roster_id"]): roster["owner_id"]
+        for roster in league.get_rosters()
+    }
+    completed_weeks = [
+        week
+        for week in get_regular_season_weeks(league_payload)
+        if week < int(current_week)
+    ]
+    matchups_by_week = get_weeks(
+        lambda week: get_week_matchups(league, week, current_week, store),
+        completed_weeks,
+    )
+    history_index.add_season(
+        {
+            "season": league_payload.get("season"),
+            "games": get_season_games(
+                matchups_by_week, roster_id_to_owner_id_dict
+            ),
+        }
+    )
+
+    return history_index
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+import contextvars
+import re
+import threading
+from contextlib import contextmanager
+
+import requests
+import urllib3
+from constants import (
+    GAME_STATE_SECONDS,
+    HTTP_USER_AGENT,
+    SLEEPER_POOL_SIZE,
+    SLEEPER_REVALIDATE_SECONDS,
+    SLEEPER_TIMEOUT_SECONDS,
+)
+from decoding import loads
+from governor import GovernedAdapter
+from single_flight import CoalescingAdapter, SingleFlight
+from sleeper_wrapper.base_api import BaseApi
+from urllib3.util.retry import Retry
+
+# Every encoding urllib3 can decode here: gzip and deflate, plus br and
+# zstd when brotli and zstandard are installed
+ACCEPT_ENCODING = urllib3.util.make_headers(accept_encoding=True)[
+    "accept-encoding"
+]
+
+# Endpoints rarely changing but checked by most jobs, and the live ones
+# of the current week, the request cache revalidates them with the ETag
+# / Last-Modified of the cached response and a 304 refreshes it without
+# downloading the body. Glob patterns match the URLs without scheme and
+# their sub-paths.
+REVALIDATED_URLS = {
+    re.compile(r"api\.sleeper\.app/v1/league/\d+$"): (
+        SLEEPER_REVALIDATE_SECONDS
+    ),
+    "api.sleeper.app/v1/league/*/users": SLEEPER_REVALIDATE_SECONDS,
+    "api.sleeper.app/v1/league/*/rosters": SLEEPER_REVALIDATE_SECONDS,
+    "api.sleeper.app/v1/league/*/drafts": SLEEPER_REVALIDATE_SECONDS,
+    "api.sleeper.app/v1/league/*/matchups": SLEEPER_REVALIDATE_SECONDS,
+    "api.sleeper.app/v1/league/*/transactions": SLEEPER_REVALIDATE_SECONDS,
+    "api.sleeper.app/v1/draft/": SLEEPER_REVALIDATE_SECONDS,
+    "api.sleeper.app/v1/players/nfl": SLEEPER_REVALIDATE_SECONDS,
+    "api.sportsdata.io/v3/nfl/scores/json/ScoresByWeek": GAME_STATE_SECONDS,
+}
+
+
+class SleeperClient:
+    """
+    Pooled HTTP client for the Sleeper API: one session keeping its
+    connections alive, accepting compressed responses, with timeouts and
+    at most pool_size connections open, the other requests waiting for a
+    free one. The calls reaching the network take the "sleeper" quota of
+    the governor, if any. The concurrent fetches of the same URL share
+    one request and its decoded payload.
+
+    The session is created on first use, after the request cache is
+    installed, so it is a cached session as well.
+    """
+
+    def __init__(
+        self,
+        pool_size=SLEEPER_POOL_SIZE,
+        timeout=SLEEPER_TIMEOUT_SECONDS,
+        governor=None,
+    ):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.governor = governor
+        self._session = None
+        self._lock = threading.Lock()
+        self._flights = SingleFlight("sleeper")
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                self._session = self._create_session()
+            return self._session
+
+    def _create_session(self):
+        session = requests.Session()
+        adapter_kwargs = dict(
+            pool_connections=1,
+            pool_maxsize=self.pool_size,
+            pool_block=True,
+            max_retries=Retry(
+                total=2,
+                connect=2,
+                read=0,
+                status=0,
+                backoff_factor=0.5,
+            ),
+        )
+        if self.governor is not None:
+            adapter = GovernedAdapter(
+                self.governor, "sleeper", **adapter_kwargs
+            )
+        else:
+            adapter = CoalescingAdapter(**adapter_kwargs)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(
+            {
+                "Accept": "application/json",
+                "Accept-Encoding": ACCEPT_ENCODING,
+                "Connection": "keep-alive",
+                "User-Agent": HTTP_USER_AGENT,
+            }
+        )
+        return session
+
+    def get(self, url, **kwargs):
+        """
+        get Sends a GET request through the pool.
+
+        :param url: URL of the request
+        :type url: str
+        :return: The response
+        :rtype: requests.Response
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def fetch(self, url, decode=loads, refresh=False):
+        """
+        fetch Fetches and decodes a payload, sharing the call in flight
+              for the same URL and decoder, if any. The payload is shared
+              by the callers, which do not modify it.
+
+        :param url: URL of the payload
+        :type url: str
+        :param decode: Decoder of the response body
+        :type decode: callable
+        :param refresh: Revalidate a cached response however recent, a
+            304 refreshing it without downloading the body
+        :type refresh: bool
+        :return: The decoded payload, or the HTTPError like sleeper_wrapper
+        :rtype: object
+        """
+        return self._flights.do(
+            (url, decode, refresh),
+            lambda: self._fetch(url, decode, refresh),
+        )
+
+    def _fetch(self, url, decode, refresh=False):
+        headers = {"Cache-Control": "must-revalidate"} if refresh else None
+        response = self.get(url, headers=headers)
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError as error:
+            return error
+
+        return decode(response.content)
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+_client = SleeperClient()
+
+
+def get_client():
+    """
+    get_client Returns the client of the Sleeper API of the process.
+
+    :return: The installed client
+    :rtype: SleeperClient
+    """
+    return _client
+
+
+# Set by refreshing() for the calls of the current context
+_refresh = contextvars.ContextVar("sleeper_refresh", default=False)
+
+
+@contextmanager
+def refreshing():
+    """
+    refreshing Revalidates the sleeper_wrapper calls made in the block
+               however recent their cached response, e.g. for the
+               answers of the commands, fresh as of their render.
+    """
+    token = _refresh.set(True)
+    try:
+        yield
+    finally:
+        _refresh.reset(token)
+
+
+def _call(api, url):
+    # Same contract as sleeper_wrapper: the HTTPError is returned
+    return _client.fetch(url, refresh=_refresh.get())
+
+
+def install_sleeper_client(
+    pool_size=SLEEPER_POOL_SIZE, timeout=SLEEPER_TIMEOUT_SECONDS, governor=None
+):
+    """
+    install_sleeper_client Routes every call of sleeper_wrapper through a
+                           new pooled client, replacing the previous one.
+                           Installed after the request cache, so the
+                           client session caches the responses.
+
+    :param pool_size: Maximum number of connections to the API
+    :type pool_size: int
+    :param timeout: Seconds to connect and to read, or a tuple of both
+    :type timeout: float or tuple
+    :param governor: Quota governor of the calls, None for no quota
+    :type governor: governor.Governor
+    :return: The installed client
+    :rtype: SleeperClient
+    """
+    global _client
+
+    _client.close()
+    _client = SleeperClient(pool_size, timeout, governor)
+    BaseApi._call = _call
+    return _client
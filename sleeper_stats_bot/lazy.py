@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+import importlib
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Placeholder of a module imported on the first attribute access, so
+    the heavy dependencies of the reports are not loaded at startup.
+    """
+
+    def __getattr__(self, attribute):
+        module = importlib.import_module(self.__name__)
+        # The next lookups hit the module attributes directly
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attribute)
+
+
+def lazy_import(name):
+    """
+    lazy_import Returns a module imported on first use.
+
+    :param name: Module name, e.g. "pandas" or "PIL.Image"
+    :type name: str
+    :return: The lazy module
+    :rtype: LazyModule
+    """
+    return LazyModule(name)
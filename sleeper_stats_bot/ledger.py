@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+import datetime
+import hashlib
+import sqlite3
+import threading
+
+import pendulum
+import schedule
+from constants import JOB_CATCH_UP_SECONDS
+
+
+def get_content_hash(content):
+    """
+    get_content_hash Returns the fingerprint of a message.
+
+    :param content: Text or bytes of the message
+    :type content: str or bytes
+    :return: SHA-256 hex digest
+    :rtype: str
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+class Ledger:
+    """
+    Persisted deliveries of the jobs: job, league, week, content hash and
+    sent-at time. Checked before posting and for the jobs missed during a
+    restart, so every report is posted exactly once.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS deliveries ("
+            "job TEXT NOT NULL, "
+            "league_id TEXT NOT NULL, "
+            "week INTEGER NOT NULL, "
+            "content_hash TEXT NOT NULL, "
+            "sent_at REAL NOT NULL, "
+            "PRIMARY KEY (job, league_id, week, content_hash))"
+        )
+        self._connection.commit()
+
+    def was_sent(self, job, league_id, week, content_hash=None):
+        """
+        was_sent Checks if a job already posted for a league and week.
+
+        :param job: Ledger key of the job, e.g. scores:Week Scores
+        :type job: str
+        :param league_id: Sleeper league id
+        :type league_id: str
+        :param week: Week of the post, None out of the season
+        :type week: int
+        :param content_hash: Hash of the content, None for any content
+        :type content_hash: str
+        :return: True when it was sent
+        :rtype: bool
+        """
+        query = (
+            "SELECT 1 FROM deliveries "
+            "WHERE job = ? AND league_id = ? AND week = ?"
+        )
+        parameters = (job, str(league_id), int(week or 0))
+        if content_hash is not None:
+            query += " AND content_hash = ?"
+            parameters += (content_hash,)
+
+        with self._lock:
+            row = self._connection.execute(query, parameters).fetchone()
+        return row is not None
+
+    def record(self, job, league_id, week, content_hash, sent_at=None):
+        """
+        record Saves a delivery.
+
+        :param job: Ledger key of the job
+        :type job: str
+        :param league_id: Sleeper league id
+        :type league_id: str
+        :param week: Week of the post
+        :type week: int
+        :param content_hash: Hash of the content
+        :type content_hash: str
+        :param sent_at: Timestamp of the delivery, defaults to now
+        :type sent_at: float
+        :return: None
+        """
+        if sent_at is None:
+            sent_at = pendulum.now().timestamp()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO deliveries "
+                "(job, league_id, week, content_hash, sent_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (job, str(league_id), int(week or 0), content_hash, sent_at),
+            )
+            self._connection.commit()
+
+    def last_sent_at(self, job, league_id):
+        """
+        last_sent_at Returns the time of the last delivery of a job.
+
+        :param job: Ledger key of the job
+        :type job: str
+        :param league_id: Sleeper league id
+        :type league_id: str
+        :return: Timestamp, None when it was never sent
+        :rtype: float
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT MAX(sent_at) FROM deliveries "
+                "WHERE job = ? AND league_id = ?",
+                (job, str(league_id)),
+            ).fetchone()
+        return row[0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def get_missed_jobs(
+    scheduler, ledger, league_id, grace_seconds=JOB_CATCH_UP_SECONDS
+):
+    """
+    get_missed_jobs Returns the jobs whose last run time passed less than
+                    grace_seconds ago without a delivery, i.e. missed
+                    while the bot was restarting. The jobs are tagged
+                    with their ledger key.
+
+    :param scheduler: Scheduler of the current phase
+    :type scheduler: schedule.Scheduler
+    :param ledger: Ledger of the deliveries
+    :type ledger: Ledger
+    :param league_id: Sleeper league id
+    :type league_id: str
+    :param grace_seconds: Longest delay to run a missed job
+    :type grace_seconds: float
+    :return: List of schedule.Job
+    :rtype: list
+    """
+    # schedule runs on naive local times, pendulum on aware ones
+    schedule_now = schedule.datetime.datetime.now()
+    now = pendulum.now().timestamp()
+
+    missed = []
+    for job in scheduler.jobs:
+        if not job.tags or job.next_run is None:
+            continue
+        period = datetime.timedelta(**{job.unit: job.interval})
+        since_last_run = (
+            period - (job.next_run - schedule_now)
+        ).total_seconds()
+        if not 0 <= since_last_run <= grace_seconds:
+            continue
+        last_sent_at = ledger.last_sent_at(min(job.tags), league_id)
+        if last_sent_at is None or last_sent_at < now - since_last_run:
+            missed.append(job)
+    return missed
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+import logging
+import os
+import reprlib
+
+from constants import LOG_PAYLOAD_ITEMS, LOG_PAYLOAD_STRING_CHARS
+
+# Messages are formatted lazily with %-style arguments, and the bulk
+# payloads summarized at DEBUG, logged whole at TRACE
+TRACE = 5
+logging.addLevelName(TRACE, "TRACE")
+
+_summary = reprlib.Repr()
+_summary.maxlevel = 3
+_summary.maxlist = _summary.maxtuple = _summary.maxset = LOG_PAYLOAD_ITEMS
+_summary.maxdict = LOG_PAYLOAD_ITEMS
+_summary.maxstring = _summary.maxother = LOG_PAYLOAD_STRING_CHARS
+
+
+class Payload:
+    """
+    Bulk value of a log record, rendered only if the record is emitted:
+    whole when the logger is enabled for TRACE, summarized otherwise.
+    """
+
+    __slots__ = ("logger", "value")
+
+    def __init__(self, logger, value):
+        self.logger = logger
+        self.value = value
+
+    def __str__(self):
+        if self.logger.isEnabledFor(TRACE):
+            return str(self.value)
+        summary = _summary.repr(self.value)
+        if hasattr(self.value, "__len__"):
+            summary += " ({} items)".format(len(self.value))
+        return summary
+
+
+def payload(logger, value):
+    """
+    payload Wraps a bulk value logged by logger.
+
+    :param logger: Logger of the record
+    :type logger: logging.Logger
+    :param value: Payload to log
+    :type value: object
+    :return: Lazy rendering of the value
+    :rtype: Payload
+    """
+    return Payload(logger, value)
+
+
+def get_log_level(debug):
+    """
+    get_log_level Returns the log level for the DEBUG setting.
+
+    :param debug: "true"/"false", or "trace" to log the whole payloads
+    :type debug: str
+    :return: Log level
+    :rtype: int
+    """
+    debug = (debug or "").strip().lower()
+    if debug == "trace":
+        return TRACE
+    if debug in ("1", "true", "yes"):
+        return logging.DEBUG
+    return logging.INFO
+
+
+def configure_logging(level):
+    """
+    configure_logging Logs to the console at level.
+
+    :param level: Log level
+    :type level: int
+    :return: None
+    """
+    from rich.logging import RichHandler
+
+    logging.basicConfig(
+        level=level,
+        format="%(message)s",
+        datefmt="[%X]",
+        handlers=[RichHandler()],
+    )
+
+
+def get_debug_sink_path(name):
+    """
+    get_debug_sink_path Returns the path to dump a debug file to, when
+                        DEBUG_SINK_DIR is set.
+
+    :param name: File name
+    :type name: str
+    :return: Path of the file, None when the sink is disabled
+    :rtype: str
+    """
+    sink_dir = os.environ.get("DEBUG_SINK_DIR")
+    if not sink_dir:
+        return None
+    os.makedirs(sink_dir, exist_ok=True)
+    return os.path.join(sink_dir, name)
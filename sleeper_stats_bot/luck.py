@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+from constants import SCORING_TYPE
+from lazy import lazy_import
+from roster_index import EMPTY_SLOT, get_league_score, get_player_score
+
+nmp = lazy_import("numpy")
+
+
+def build_season_arrays(
+    matchups_by_week,
+    stats_by_week,
+    projections_by_week,
+    scoring_settings=None,
+    score_type=SCORING_TYPE,
+):
+    """
+    build_season_arrays Builds the teams by weeks arrays of actual and
+                        projected points and the flat arrays of every
+                        started player of the season. With the scoring
+                        settings of the league, the actual points of the
+                        teams are the ones of the matchups, like the
+                        results and the standings, and the projections
+                        are scored with the same settings; without them,
+                        the actual and projected points are both scored
+                        with score_type.
+
+    :param matchups_by_week: Dict {week: matchups}
+    :type matchups_by_week: dict
+    :param stats_by_week: Dict {week: week_stats}
+    :type stats_by_week: dict
+    :param projections_by_week: Dict {week: week_projections}
+    :type projections_by_week: dict
+    :param scoring_settings: league["scoring_settings"], None to score
+                             the players with score_type
+    :type scoring_settings: dict
+    :param score_type: Scoring column to read, e.g. pts_half_ppr
+    :type score_type: str
+    :return: Dict with roster_ids, weeks, actual, projected, opponent,
+             player_ids, player_actual and player_projected
+    :rtype: dict
+    """
+    weeks = sorted(matchups_by_week)
+    roster_ids = sorted(
+        {
+            matchup["roster_id"]
+            for week in weeks
+            for matchup in matchups_by_week[week] or []
+        }
+    )
+    roster_index = {
+        roster_id: index for index, roster_id in enumerate(roster_ids)
+    }
+
+    actual = nmp.zeros((len(roster_ids), len(weeks)))
+    projected = nmp.zeros((len(roster_ids), len(weeks)))
+    opponent = nmp.full((len(roster_ids), len(weeks)), -1, dtype=int)
+    player_ids = []
+    player_actual = []
+    player_projected = []
+
+    if scoring_settings:
+
+        def score(week_stats, player_id):
+            return get_league_score(week_stats, player_id, scoring_settings)
+
+    else:
+
+        def score(week_stats, player_id):
+            return get_player_score(week_stats, player_id, score_type)
+
+    for week_index, week in enumerate(weeks):
+        week_stats = stats_by_week.get(week) or {}
+        week_projections = projections_by_week.get(week) or {}
+        teams_by_matchup = {}
+
+        for matchup in matchups_by_week[week] or []:
+            team_index = roster_index[matchup["roster_id"]]
+            players_points = matchup.get("players_points") or {}
+            for player_id in matchup["starters"] or []:
+                if player_id == EMPTY_SLOT:
+                    continue
+                player_ids.append(player_id)
+                if scoring_settings and player_id in players_points:
+                    player_actual.append(float(players_points[player_id]))
+                else:
+                    player_actual.append(score(week_stats, player_id))
+                player_projected.append(score(week_projections, player_id))
+                actual[team_index, week_index] += player_actual[-1]
+                projected[team_index, week_index] += player_projected[-1]
+            if scoring_settings:
+                actual[team_index, week_index] = float(
+                    matchup.get("points") or 0
+                )
+
+            if matchup.get("matchup_id") is not None:
+                teams_by_matchup.setdefault(matchup["matchup_id"], []).append(
+                    team_index
+                )
+
+        for teams in teams_by_matchup.values():
+            if len(teams) == 2:
+                opponent[teams[0], week_index] = teams[1]
+                opponent[teams[1], week_index] = teams[0]
+
+    return {
+        "roster_ids": roster_ids,
+        "weeks": weeks,
+        "actual": actual,
+        "projected": projected,
+        "opponent": opponent,
+        "player_ids": nmp.array(player_ids, dtype=object),
+        "player_actual": nmp.array(player_actual),
+        "player_projected": nmp.array(player_projected),
+    }
+
+
+def get_expected_wins(actual, opponent):
+    """
+    get_expected_wins Returns the expected wins of every team, the
+                      fraction of the league each team outscored every
+                      week it played.
+
+    :param actual: Teams by weeks array of actual points
+    :type actual: numpy.ndarray
+    :param opponent: Teams by weeks array of opponent indexes, -1 when
+                     the team did not play
+    :type opponent: numpy.ndarray
+    :return: Array of expected wins by team
+    :rtype: numpy.ndarray
+    """
+    played = opponent >= 0
+    teams_played = played.sum(axis=0)
+
+    # teams x teams x weeks comparison, ties count as half a win
+    beats = (actual[:, None, :] > actual[None, :, :]).astype(float)
+    beats += 0.5 * (actual[:, None, :] == actual[None, :, :])
+    beats *= played[None, :, :]
+    beats = beats.sum(axis=1) - 0.5 * played
+
+    rivals = nmp.maximum(teams_played - 1, 1)
+    return (beats / rivals * played).sum(axis=1)
+
+
+def get_wins(actual, opponent):
+    """
+    get_wins Returns the actual wins of every team, ties count as half
+             a win.
+
+    :param actual: Teams by weeks array of actual points
+    :type actual: numpy.ndarray
+    :param opponent: Teams by weeks array of opponent indexes
+    :type opponent: numpy.ndarray
+    :return: Array of wins by team
+    :rtype: numpy.ndarray
+    """
+    played = opponent >= 0
+    weeks = nmp.arange(actual.shape[1])[None, :]
+    opponent_points = actual[nmp.where(played, opponent, 0), weeks]
+
+    wins = (actual > opponent_points) + 0.5 * (actual == opponent_points)
+    return (wins * played).sum(axis=1)
+
+
+def get_team_luck(season_arrays):
+    """
+    get_team_luck Returns the over/under performance and the luck of
+                  every team of the season.
+
+    :param season_arrays: Dict returned by build_season_arrays
+    :type season_arrays: dict
+    :return: List [(roster_id, points, projected, wins, expected_wins),
+                   ...] sorted by luck, wins minus expected wins
+    :rtype: list
+    """
+    actual = season_arrays["actual"]
+    projected = season_arrays["projected"]
+    opponent = season_arrays["opponent"]
+
+    points = actual.sum(axis=1)
+    projected_points = projected.sum(axis=1)
+    wins = get_wins(actual, opponent)
+    expected_wins = get_expected_wins(actual, opponent)
+
+    result_list = list(
+        zip(
+            season_arrays["roster_ids"],
+            points.tolist(),
+            projected_points.tolist(),
+            wins.tolist(),
+            expected_wins.tolist(),
+        )
+    )
+    result_list.sort(key=lambda team: team[3] - team[4], reverse=True)
+
+    return result_list
+
+
+def get_player_luck(season_arrays):
+    """
+    get_player_luck Returns the season over/under performance of every
+                    started player.
+
+    :param season_arrays: Dict returned by build_season_arrays
+    :type season_arrays: dict
+    :return: List [(player_id, points, projected), ...] sorted by points
+             minus projected
+    :rtype: list
+    """
+    if not len(season_arrays["player_ids"]):
+        return []
+
+    player_ids, inverse = nmp.unique(
+        season_arrays["player_ids"].astype(str), return_inverse=True
+    )
+    points = nmp.bincount(inverse, weights=season_arrays["player_actual"])
+    projected = nmp.bincount(
+        inverse, weights=season_arrays["player_projected"]
+    )
+    order = nmp.argsort(projected - points)
+
+    return [
+        (player_ids[i], float(points[i]), float(projected[i])) for i in order
+    ]
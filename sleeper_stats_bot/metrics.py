@@ -0,0 +1,464 @@
+# -*- coding: utf-8 -*-
+import contextvars
+import functools
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from requests_cache import CachedSession
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+SPORTSDATA_HOST = "api.sportsdata.io"
+
+# Numeric path segments (league ids, seasons, weeks) are collapsed so the
+# endpoint label keeps a bounded number of values.
+ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+_current_job = contextvars.ContextVar("current_job", default="")
+
+
+def _format_labels(label_names, label_values, extra=()):
+    pairs = list(zip(label_names, label_values)) + list(extra)
+    if not pairs:
+        return ""
+    return (
+        "{"
+        + ",".join(
+            '{}="{}"'.format(
+                name, str(value).replace("\\", "\\\\").replace('"', '\\"')
+            )
+            for name, value in pairs
+        )
+        + "}"
+    )
+
+
+class Counter:
+    def __init__(self, name, documentation, label_names=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def render(self):
+        lines = [
+            "# HELP {} {}".format(self.name, self.documentation),
+            "# TYPE {} counter".format(self.name),
+        ]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(
+                    "{}{} {}".format(
+                        self.name,
+                        _format_labels(self.label_names, key),
+                        value,
+                    )
+                )
+        return lines
+
+
+class Gauge:
+    def __init__(self, name, documentation, label_names=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def set(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            self._values[key] = value
+
+    def get(self, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            return self._values.get(key)
+
+    def render(self):
+        lines = [
+            "# HELP {} {}".format(self.name, self.documentation),
+            "# TYPE {} gauge".format(self.name),
+        ]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(
+                    "{}{} {}".format(
+                        self.name,
+                        _format_labels(self.label_names, key),
+                        value,
+                    )
+                )
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            # [bucket counts, sum, count]
+            series = self._values.setdefault(
+                key, [[0] * len(self.buckets), 0.0, 0]
+            )
+            for index, bucket in enumerate(self.buckets):
+                if value <= bucket:
+                    series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def get_count(self, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            return self._values.get(key, [None, 0.0, 0])[2]
+
+    def render(self):
+        lines = [
+            "# HELP {} {}".format(self.name, self.documentation),
+            "# TYPE {} histogram".format(self.name),
+        ]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                for bucket, bucket_count in zip(
+                    self.buckets + ("+Inf",), counts + [count]
+                ):
+                    lines.append(
+                        "{}_bucket{} {}".format(
+                            self.name,
+                            _format_labels(
+                                self.label_names, key, [("le", bucket)]
+                            ),
+                            bucket_count,
+                        )
+                    )
+                labels = _format_labels(self.label_names, key)
+                lines.append("{}_sum{} {}".format(self.name, labels, total))
+                lines.append("{}_count{} {}".format(self.name, labels, count))
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name, documentation, label_names=()):
+        metric = Counter(name, documentation, label_names)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name, documentation, label_names=()):
+        metric = Gauge(name, documentation, label_names)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS
+    ):
+        metric = Histogram(name, documentation, label_names, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """
+        render Returns every metric in the Prometheus text format.
+
+        :return: Prometheus text exposition
+        :rtype: str
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+JOB_SECONDS = REGISTRY.histogram(
+    "sleeper_bot_job_duration_seconds",
+    "Duration of the scheduled jobs.",
+    ["job"],
+)
+JOB_ERRORS = REGISTRY.counter(
+    "sleeper_bot_job_errors_total",
+    "Scheduled jobs that raised an exception.",
+    ["job"],
+)
+REPORT_SECONDS = REGISTRY.histogram(
+    "sleeper_bot_report_build_duration_seconds",
+    "Duration of the report builders, data assembly and formatting.",
+    ["report"],
+)
+RENDER_SECONDS = REGISTRY.histogram(
+    "sleeper_bot_render_duration_seconds",
+    "Duration of the report image rendering.",
+)
+HTTP_REQUESTS = REGISTRY.counter(
+    "sleeper_bot_http_requests_total",
+    "HTTP calls by job, host, endpoint and status, cache hits included.",
+    ["job", "host", "endpoint", "status"],
+)
+HTTP_SECONDS = REGISTRY.histogram(
+    "sleeper_bot_http_request_duration_seconds",
+    "Duration of the HTTP calls.",
+    ["host", "endpoint"],
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "sleeper_bot_cache_requests_total",
+    "HTTP calls served by the request cache (hit), the network (miss) or"
+    " the cache after a 304 (revalidated).",
+    ["host", "result"],
+)
+UPLOADED_BYTES = REGISTRY.counter(
+    "sleeper_bot_uploaded_bytes_total",
+    "Bytes sent in HTTP request bodies.",
+    ["host"],
+)
+SEND_RETRIES = REGISTRY.counter(
+    "sleeper_bot_send_retries_total",
+    "Retried message deliveries.",
+    ["platform"],
+)
+SPORTSDATA_QUOTA = REGISTRY.counter(
+    "sleeper_bot_sportsdata_calls_total",
+    "sportsdata.io calls that reached the network and used quota.",
+)
+QUOTA_REMAINING = REGISTRY.gauge(
+    "sleeper_bot_quota_remaining_calls",
+    "API calls left in the budget windows of the providers.",
+    ["provider", "window"],
+)
+QUOTA_REFUSED = REGISTRY.counter(
+    "sleeper_bot_quota_refused_total",
+    "API calls refused by the quota governor.",
+    ["provider", "priority"],
+)
+COMMANDS = REGISTRY.counter(
+    "sleeper_bot_commands_total",
+    "On-demand commands answered, rate limited or failed.",
+    ["command", "result"],
+)
+COALESCED_CALLS = REGISTRY.counter(
+    "sleeper_bot_coalesced_calls_total",
+    "Calls served by an identical call already in flight.",
+    ["flight"],
+)
+
+
+def get_current_job():
+    return _current_job.get()
+
+
+def get_endpoint(url):
+    """
+    get_endpoint Returns the host and the path of an URL with the
+                 numeric segments collapsed.
+
+    :param url: Request URL
+    :type url: str
+    :return: Tuple (host, endpoint)
+    :rtype: tuple
+    """
+    parts = urlsplit(url)
+    path = ID_SEGMENT.sub("/:id", parts.path)
+    # Telegram puts the bot token in the path
+    if path.startswith("/bot"):
+        path = "/bot:token/" + path.rsplit("/", 1)[-1]
+    return parts.netloc, path
+
+
+def record_http_call(request, response, seconds):
+    host, endpoint = get_endpoint(request.url)
+    from_cache = bool(getattr(response, "from_cache", False))
+
+    HTTP_REQUESTS.inc(
+        job=get_current_job(),
+        host=host,
+        endpoint=endpoint,
+        status=response.status_code,
+    )
+    HTTP_SECONDS.observe(seconds, host=host, endpoint=endpoint)
+    if getattr(response, "revalidated", False):
+        cache_result = "revalidated"
+    else:
+        cache_result = "hit" if from_cache else "miss"
+    CACHE_REQUESTS.inc(host=host, result=cache_result)
+
+    if request.body:
+        UPLOADED_BYTES.inc(len(request.body), host=host)
+    if host == SPORTSDATA_HOST and not from_cache:
+        SPORTSDATA_QUOTA.inc()
+
+
+class InstrumentedCachedSession(CachedSession):
+    """
+    CachedSession recording the HTTP metrics of every call. Installed
+    with requests_cache.install_cache(session_factory=...) so the calls
+    made by sleeper_wrapper and the bot adapters are recorded as well.
+    """
+
+    def send(self, request, **kwargs):
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        record_http_call(request, response, time.perf_counter() - start)
+        return response
+
+
+def timed_job(name):
+    """
+    timed_job Decorator recording the duration and errors of a job. HTTP
+              calls made while the job runs are labelled with its name.
+
+    :param name: Job name
+    :type name: str
+    :return: Decorator
+    :rtype: callable
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            token = _current_job.set(name)
+            try:
+                with JOB_SECONDS.time(job=name):
+                    return func(*args, **kwargs)
+            except Exception:
+                JOB_ERRORS.inc(job=name)
+                raise
+            finally:
+                _current_job.reset(token)
+
+        return wrapper
+
+    return decorator
+
+
+def timed_report(name):
+    """
+    timed_report Decorator recording the duration of a report builder.
+
+    :param name: Report name
+    :type name: str
+    :return: Decorator
+    :rtype: callable
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with REPORT_SECONDS.time(report=name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server(port, host="127.0.0.1"):
+    """
+    start_http_server Serves the metrics at http://host:port/metrics from
+                      a daemon thread.
+
+    :param port: Port to listen on, 0 for a random one
+    :type port: int
+    :param host: Address to listen on
+    :type host: str
+    :return: The running server
+    :rtype: http.server.ThreadingHTTPServer
+    """
+    server = ThreadingHTTPServer((host, int(port)), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def dump_to_file(path):
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "w") as metrics_file:
+        metrics_file.write(REGISTRY.render())
+    os.replace(temporary_path, path)
+
+
+def start_file_dump(path, interval):
+    """
+    start_file_dump Writes the metrics to a file every interval seconds
+                    from a daemon thread.
+
+    :param path: Metrics file path
+    :type path: str
+    :param interval: Seconds between dumps
+    :type interval: float
+    :return: The dump thread
+    :rtype: threading.Thread
+    """
+
+    def dump_forever():
+        while True:
+            time.sleep(interval)
+            dump_to_file(path)
+
+    thread = threading.Thread(target=dump_forever, daemon=True)
+    thread.start()
+    return thread
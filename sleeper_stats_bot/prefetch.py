@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+from concurrent.futures import ThreadPoolExecutor
+
+import schedule
+from constants import PREFETCH_LEAD_SECONDS
+from metrics import timed_job
+
+
+def get_job_name(job):
+    """
+    get_job_name Returns the name of a job from its ledger key tag, e.g.
+                 scores for scores:Week Scores.
+
+    :param job: Scheduled job
+    :type job: schedule.Job
+    :return: Job name, None for an untagged job
+    :rtype: str
+    """
+    if not job.tags:
+        return None
+    return min(job.tags).split(":")[0]
+
+
+@timed_job("prefetch")
+def _run_fetch(fetch):
+    fetch()
+
+
+class Prefetcher:
+    """
+    Fetches the data of the scheduled jobs lead_seconds before they run,
+    in a background thread, into the request cache and the store. At its
+    time a job only assembles, renders and sends; a fetch still in flight
+    is shared with the job instead of being sent twice.
+    """
+
+    def __init__(self, fetches, logger, lead_seconds=PREFETCH_LEAD_SECONDS):
+        self.fetches = fetches
+        self.logger = logger
+        self.lead_seconds = lead_seconds
+        self._started = set()
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="prefetch"
+        )
+
+    def _get_seconds_until_jobs(self, scheduler):
+        now = schedule.datetime.datetime.now()
+        for job in scheduler.jobs:
+            name = get_job_name(job)
+            if name not in self.fetches or job.next_run is None:
+                continue
+            yield job, (job.next_run - now).total_seconds()
+
+    def run_due(self, scheduler):
+        """
+        run_due Starts the fetches of the jobs running in lead_seconds or
+                less, once by run of every job.
+
+        :param scheduler: Scheduler of the current phase
+        :type scheduler: schedule.Scheduler
+        :return: Names of the jobs whose fetches started
+        :rtype: list
+        """
+        started = []
+        for job, seconds in self._get_seconds_until_jobs(scheduler):
+            run = (min(job.tags), job.next_run)
+            if not 0 < seconds <= self.lead_seconds or run in self._started:
+                continue
+            self._started.add(run)
+            name = get_job_name(job)
+            self._executor.submit(self._prefetch, name)
+            started.append(name)
+
+        # The runs already passed are not checked again
+        now = schedule.datetime.datetime.now()
+        self._started = {run for run in self._started if run[1] > now}
+        return started
+
+    def _prefetch(self, name):
+        self.logger.info("Prefetching the data of %s", name)
+        try:
+            _run_fetch(self.fetches[name])
+        except Exception:
+            # The job fetches what is missing itself
+            self.logger.warning("Prefetch of %s failed", name, exc_info=True)
+
+    def idle_seconds(self, scheduler):
+        """
+        idle_seconds Returns the seconds until the next fetch starts.
+
+        :param scheduler: Scheduler of the current phase
+        :type scheduler: schedule.Scheduler
+        :return: Seconds, None without a fetch to start
+        :rtype: float
+        """
+        idle = [
+            seconds - self.lead_seconds
+            for job, seconds in self._get_seconds_until_jobs(scheduler)
+            if seconds > self.lead_seconds
+        ]
+        return min(idle, default=None)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+import cProfile
+import datetime
+import functools
+import glob
+import io
+import itertools
+import os
+import pstats
+import time
+import tracemalloc
+
+from constants import PROFILE_DIR, PROFILE_KEEP, PROFILE_TOP_STATS
+
+# Numbers the runs of the process, two runs in the same microsecond do
+# not overwrite each other
+_runs = itertools.count()
+
+
+def is_profiling_enabled():
+    """
+    is_profiling_enabled Checks the PROFILE_JOBS environment variable.
+                         It is read on every job, so profiling can be
+                         turned on and off without a new build.
+
+    :return: True when the jobs must be profiled
+    :rtype: bool
+    """
+    return os.environ.get("PROFILE_JOBS", "").lower() in ("1", "true", "yes")
+
+
+def rotate_profiles(profile_dir, name, keep):
+    """
+    rotate_profiles Removes the oldest profiles of a job, keeping the
+                    newest keep runs.
+
+    :param profile_dir: Profiles directory
+    :type profile_dir: str
+    :param name: Job name
+    :type name: str
+    :param keep: Number of runs to keep
+    :type keep: int
+    :return: None
+    """
+    runs = sorted(glob.glob(os.path.join(profile_dir, name + "-*.prof")))
+    for run in runs[: max(len(runs) - keep, 0)]:
+        for path in (run, run[: -len(".prof")] + ".txt"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def write_profile(profile_dir, name, profiler, snapshot, peak, seconds):
+    """
+    write_profile Writes the cProfile stats of a job run, loadable with
+                  pstats or snakeviz, and a text summary with the top
+                  functions by cumulative time and the top allocations.
+
+    :param profile_dir: Profiles directory
+    :type profile_dir: str
+    :param name: Job name
+    :type name: str
+    :param profiler: Profiler of the run
+    :type profiler: cProfile.Profile
+    :param snapshot: tracemalloc snapshot taken at the end of the run
+    :type snapshot: tracemalloc.Snapshot
+    :param peak: Peak traced memory in bytes
+    :type peak: int
+    :param seconds: Duration of the run
+    :type seconds: float
+    :return: Path of the text summary
+    :rtype: str
+    """
+    os.makedirs(profile_dir, exist_ok=True)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    run = os.path.join(
+        profile_dir,
+        "{}-{}-{:06d}".format(
+            name, now.strftime("%Y%m%d-%H%M%S-%f"), next(_runs)
+        ),
+    )
+    profiler.dump_stats(run + ".prof")
+
+    summary = io.StringIO()
+    summary.write(
+        "{} took {:.3f}s, peak traced memory {:.1f} MiB\n\n".format(
+            name, seconds, peak / 1024 / 1024
+        )
+    )
+    pstats.Stats(profiler, stream=summary).sort_stats(
+        "cumulative"
+    ).print_stats(PROFILE_TOP_STATS)
+    summary.write("Top {} allocations:\n".format(PROFILE_TOP_STATS))
+    for stat in snapshot.statistics("lineno")[:PROFILE_TOP_STATS]:
+        summary.write("{}\n".format(stat))
+
+    with open(run + ".txt", "w") as summary_file:
+        summary_file.write(summary.getvalue())
+
+    return run + ".txt"
+
+
+def profiled_job(name):
+    """
+    profiled_job Decorator running a job under cProfile and tracemalloc
+                 when PROFILE_JOBS is enabled. Every run is written to
+                 PROFILE_DIR, keeping the last PROFILE_KEEP runs by job.
+
+    :param name: Job name
+    :type name: str
+    :return: Decorator
+    :rtype: callable
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not is_profiling_enabled():
+                return func(*args, **kwargs)
+
+            profile_dir = os.environ.get("PROFILE_DIR", PROFILE_DIR)
+            keep = int(os.environ.get("PROFILE_KEEP", PROFILE_KEEP))
+            was_tracing = tracemalloc.is_tracing()
+            if not was_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+
+            profiler = cProfile.Profile()
+            start = time.perf_counter()
+            profiler.enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.disable()
+                seconds = time.perf_counter() - start
+                snapshot = tracemalloc.take_snapshot()
+                peak = tracemalloc.get_traced_memory()[1]
+                if not was_tracing:
+                    tracemalloc.stop()
+                write_profile(
+                    profile_dir, name, profiler, snapshot, peak, seconds
+                )
+                rotate_profiles(profile_dir, name, keep)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+import html
+
+from prettytable import PrettyTable
+
+# Longest text of a Slack section, of a Discord embed description, of a
+# Telegram message, of a Telegram caption and of a GroupMe message
+SLACK_SECTION_CHARS = 3000
+DISCORD_DESCRIPTION_CHARS = 4096
+TELEGRAM_MESSAGE_CHARS = 4096
+CAPTION_CHARS = 1024
+GROUPME_MESSAGE_CHARS = 1000
+# Most blocks of a Slack message, most embeds of a Discord message and
+# longest text of all of them
+SLACK_MESSAGE_BLOCKS = 50
+DISCORD_MESSAGE_EMBEDS = 10
+DISCORD_MESSAGE_CHARS = 6000
+
+
+def get_table_string(table, title=True):
+    """
+    get_table_string Formats a table of a report as monospaced text.
+
+    :param table: Table of the report
+    :type table: report.Table
+    :param title: Whether to include the title of the table
+    :type title: bool
+    :return: The text table
+    :rtype: str
+    """
+    pretty_table = PrettyTable()
+    if title and table.title:
+        pretty_table.title = table.title
+    pretty_table.field_names = table.field_names
+    for row in table.rows:
+        pretty_table.add_row(row)
+    return pretty_table.get_string()
+
+
+def _split(text, limit, opening="", closing=""):
+    """
+    _split Splits a text at its line breaks into chunks of at most limit
+           characters, every chunk wrapped like the text, e.g. in a code
+           block. Only a line longer than a chunk is cut.
+
+    :param text: The text
+    :type text: str
+    :param limit: Longest chunk
+    :type limit: int
+    :param opening: Text opening every chunk, e.g. <pre>
+    :type opening: str
+    :param closing: Text closing every chunk, e.g. </pre>
+    :type closing: str
+    :return: The chunks
+    :rtype: list
+    """
+    room = limit - len(opening) - len(closing)
+    lines = []
+    for line in text.split("\n"):
+        for start in range(0, max(len(line), 1), room):
+            end = start + room
+            lines.append(line[start:end])
+
+    chunks = [[]]
+    size = -1
+    for line in lines:
+        if chunks[-1] and size + 1 + len(line) > room:
+            chunks.append([])
+            size = -1
+        chunks[-1].append(line)
+        size += 1 + len(line)
+    return [opening + "\n".join(chunk) + closing for chunk in chunks]
+
+
+def _pack(parts, limit):
+    """
+    _pack Joins the parts, in order, into as few texts of at most limit
+          characters as possible.
+
+    :param parts: Parts no longer than limit
+    :type parts: list
+    :param limit: Longest text
+    :type limit: int
+    :return: The texts
+    :rtype: list
+    """
+    texts = []
+    for part in parts:
+        if texts and len(texts[-1]) + 1 + len(part) <= limit:
+            texts[-1] += "\n" + part
+        else:
+            texts.append(part)
+    return texts
+
+
+def _escape_mrkdwn(text):
+    # The control characters of Slack, escaped even in code blocks
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _get_tables(report, title):
+    # The title of the report is shown apart by the rich platforms
+    return [
+        get_table_string(table, title or table.title != report.title)
+        for table in report.tables
+    ]
+
+
+def render_text(report, limit=None):
+    """
+    render_text Renders a report as plain text, the tables monospaced,
+                for the platforms without formatting and for the images.
+
+    :param report: The report
+    :type report: report.Report
+    :param limit: Longest message of the platform, None for one text
+    :type limit: int
+    :return: The text, the messages split between their lines past the
+             limit when there is one
+    :rtype: str or list
+    """
+    parts = []
+    # Shown by the first table otherwise
+    if not report.tables or report.tables[0].title != report.title:
+        parts.append(report.title)
+    if report.description:
+        parts.append(report.description)
+    parts += _get_tables(report, title=True)
+    parts += report.highlights
+    if limit is None:
+        return "\n".join(parts)
+    return _pack(
+        [chunk for part in parts for chunk in _split(part, limit)], limit
+    )
+
+
+def render_groupme_text(report):
+    """
+    render_groupme_text Renders a report as GroupMe plain text messages.
+
+    :param report: The report
+    :type report: report.Report
+    :return: The messages
+    :rtype: list
+    """
+    return render_text(report, GROUPME_MESSAGE_CHARS)
+
+
+def render_telegram_pre(text):
+    """
+    render_telegram_pre Renders a text, e.g. the answer of a command, as
+                        preformatted Telegram HTML messages.
+
+    :param text: The text
+    :type text: str
+    :return: The HTML messages
+    :rtype: list
+    """
+    return _split(html.escape(text), TELEGRAM_MESSAGE_CHARS, "<pre>", "</pre>")
+
+
+def render_telegram_html(report):
+    """
+    render_telegram_html Renders a report as Telegram HTML messages, the
+                         tables split between their rows past the length
+                         limit.
+
+    :param report: The report
+    :type report: report.Report
+    :return: The HTML messages
+    :rtype: list
+    """
+    parts = ["<b>{}</b>".format(html.escape(report.title))]
+    if report.description:
+        parts += _split(
+            html.escape(report.description), TELEGRAM_MESSAGE_CHARS
+        )
+    for table in _get_tables(report, title=False):
+        parts += _split(
+            html.escape(table), TELEGRAM_MESSAGE_CHARS, "<pre>", "</pre>"
+        )
+    for highlight in report.highlights:
+        parts += _split(html.escape(highlight), TELEGRAM_MESSAGE_CHARS)
+    return _pack(parts, TELEGRAM_MESSAGE_CHARS)
+
+
+def render_slack_blocks(report):
+    """
+    render_slack_blocks Renders a report as Slack Block Kit messages, the
+                        tables split into several sections past the
+                        length limit.
+
+    :param report: The report
+    :type report: report.Report
+    :return: The message payloads, with the text shown in notifications
+    :rtype: list
+    """
+    sections = []
+    if report.description:
+        sections += _split(
+            _escape_mrkdwn(report.description), SLACK_SECTION_CHARS
+        )
+    for table in _get_tables(report, False):
+        sections += _split(
+            _escape_mrkdwn(table), SLACK_SECTION_CHARS, "```", "```"
+        )
+    if report.highlights:
+        sections += _split(
+            _escape_mrkdwn("\n".join(report.highlights)), SLACK_SECTION_CHARS
+        )
+
+    blocks = [
+        {
+            "type": "header",
+            "text": {"type": "plain_text", "text": report.title[:150]},
+        }
+    ]
+    blocks += [
+        {"type": "section", "text": {"type": "mrkdwn", "text": section}}
+        for section in sections
+    ]
+    messages = []
+    for start in range(0, len(blocks), SLACK_MESSAGE_BLOCKS):
+        end = start + SLACK_MESSAGE_BLOCKS
+        messages.append({"text": report.title, "blocks": blocks[start:end]})
+    return messages
+
+
+def render_discord_embeds(report):
+    """
+    render_discord_embeds Renders a report as Discord embed messages, the
+                          tables split into several embeds past the
+                          length limit.
+
+    :param report: The report
+    :type report: report.Report
+    :return: The message payloads
+    :rtype: list
+    """
+    # The title counts in the length of the first message
+    limit = min(
+        DISCORD_DESCRIPTION_CHARS, DISCORD_MESSAGE_CHARS - len(report.title)
+    )
+    parts = []
+    if report.description:
+        parts += _split(report.description, limit)
+    for table in _get_tables(report, False):
+        parts += _split(table, limit, "```\n", "\n```")
+    for highlight in report.highlights:
+        parts += _split(highlight, limit)
+
+    embeds = [
+        {"description": description}
+        for description in _pack(parts, limit) or [""]
+    ]
+    embeds[0]["title"] = report.title
+    messages = [[]]
+    size = 0
+    for embed in embeds:
+        length = len(embed.get("title", "")) + len(embed["description"])
+        if messages[-1] and (
+            len(messages[-1]) == DISCORD_MESSAGE_EMBEDS
+            or size + length > DISCORD_MESSAGE_CHARS
+        ):
+            messages.append([])
+            size = 0
+        messages[-1].append(embed)
+        size += length
+    return [{"embeds": message} for message in messages]
+
+
+def render_caption(report):
+    """
+    render_caption Renders the caption of the image of a report: the
+                   title and the highlights, the tables being the image.
+
+    :param report: The report
+    :type report: report.Report
+    :return: The caption
+    :rtype: str
+    """
+    return "\n".join([report.title] + report.highlights)[:CAPTION_CHARS]
+
+
+# Renderers by output format of the platforms, the images are rendered
+# by the bot
+RENDERERS = {
+    "text": render_text,
+    "groupme_text": render_groupme_text,
+    "telegram_html": render_telegram_html,
+    "slack_blocks": render_slack_blocks,
+    "discord_embeds": render_discord_embeds,
+    "caption": render_caption,
+}
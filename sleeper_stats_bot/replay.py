@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+import base64
+import bisect
+import io
+import json
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.response import HTTPResponse
+
+# Messaging platforms are never recorded, their URLs carry the tokens, and
+# are answered by a FakeMessenger when replaying
+MESSAGING_HOSTS = (
+    "api.telegram.org",
+    "api.groupme.com",
+    "hooks.slack.com",
+    "discord.com",
+    "discordapp.com",
+)
+
+RECORDED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control")
+
+
+class ReplayError(requests.exceptions.ConnectionError):
+    """
+    Raised when a replayed request was never recorded.
+    """
+
+
+def is_messaging_request(url):
+    return urlsplit(url).hostname in MESSAGING_HOSTS
+
+
+class Cassette:
+    """
+    HTTP responses recorded over time, in a JSON lines file with one
+    interaction per line. A request is replayed with the last response
+    recorded at or before the current time, or the first one recorded.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._interactions = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        cassette = cls(path)
+        with open(path) as cassette_file:
+            for line in cassette_file:
+                if line.strip():
+                    cassette._index(json.loads(line))
+        return cassette
+
+    def _index(self, interaction):
+        key = (interaction["method"], interaction["url"])
+        # Parallel lists of timestamps and interactions, sorted by time
+        times, interactions = self._interactions.setdefault(key, ([], []))
+        position = bisect.bisect_right(times, interaction["recorded_at"])
+        times.insert(position, interaction["recorded_at"])
+        interactions.insert(position, interaction)
+
+    def add(self, method, url, status, headers, body, recorded_at):
+        """
+        add Adds an interaction, appended to the cassette file if any.
+
+        :param method: HTTP method
+        :type method: str
+        :param url: Request URL
+        :type url: str
+        :param status: Response status code
+        :type status: int
+        :param headers: Response headers
+        :type headers: dict
+        :param body: Response body
+        :type body: bytes
+        :param recorded_at: Timestamp of the response
+        :type recorded_at: float
+        :return: The interaction
+        :rtype: dict
+        """
+        try:
+            body, encoding = body.decode("utf-8"), "utf-8"
+        except UnicodeDecodeError:
+            body, encoding = base64.b64encode(body).decode("ascii"), "base64"
+
+        interaction = {
+            "recorded_at": recorded_at,
+            "method": method,
+            "url": url,
+            "status": status,
+            "headers": {
+                name: headers[name]
+                for name in RECORDED_HEADERS
+                if name in headers
+            },
+            "body": body,
+            "encoding": encoding,
+        }
+
+        with self._lock:
+            self._index(interaction)
+            if self.path is not None:
+                with open(self.path, "a") as cassette_file:
+                    cassette_file.write(json.dumps(interaction) + "\n")
+
+        return interaction
+
+    def find(self, method, url, at):
+        """
+        find Returns the interaction to replay for a request.
+
+        :param method: HTTP method
+        :type method: str
+        :param url: Request URL
+        :type url: str
+        :param at: Current timestamp
+        :type at: float
+        :return: The interaction, None when the request was never recorded
+        :rtype: dict
+        """
+        if (method, url) not in self._interactions:
+            return None
+        times, interactions = self._interactions[(method, url)]
+        position = bisect.bisect_right(times, at)
+        return interactions[max(position - 1, 0)]
+
+
+def build_response(request, status, headers, body):
+    raw = HTTPResponse(
+        body=io.BytesIO(body),
+        headers=headers,
+        status=status,
+        preload_content=False,
+        decode_content=False,
+    )
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.raw = raw
+    response._content = body
+    response.url = request.url
+    response.request = request
+    response.reason = "OK" if status < 400 else "Error"
+    return response
+
+
+def is_not_modified(request, interaction):
+    """
+    is_not_modified Checks if a conditional request matches the validators
+                    of the recorded response.
+
+    :param request: Replayed request
+    :type request: requests.PreparedRequest
+    :param interaction: Recorded response
+    :type interaction: dict
+    :return: True when the response is answered with a 304
+    :rtype: bool
+    """
+    headers = interaction["headers"]
+    etag = request.headers.get("If-None-Match")
+    if etag is not None:
+        return etag == headers.get("ETag")
+    modified_since = request.headers.get("If-Modified-Since")
+    return modified_since is not None and (
+        modified_since == headers.get("Last-Modified")
+    )
+
+
+def get_body(interaction):
+    if interaction["encoding"] == "base64":
+        return base64.b64decode(interaction["body"])
+    return interaction["body"].encode("utf-8")
+
+
+class FakeMessenger:
+    """
+    Answers the messaging platforms calls while replaying, keeping every
+    delivery.
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.deliveries = []
+        self._lock = threading.Lock()
+
+    def send(self, request):
+        body = request.body or b""
+        with self._lock:
+            self.deliveries.append(
+                {
+                    "at": self.clock.now(),
+                    "host": urlsplit(request.url).hostname,
+                    "bytes": len(body),
+                }
+            )
+        return build_response(
+            request,
+            200,
+            {"Content-Type": "application/json"},
+            b'{"ok": true}',
+        )
+
+
+def install_transport(handler):
+    """
+    install_transport Replaces the transport of every requests session,
+                      under the request cache, the rate limiters and the
+                      metrics.
+
+    :param handler: Function (original_send, adapter, request, **kwargs)
+        returning the response
+    :type handler: callable
+    :return: Function restoring the original transport
+    :rtype: callable
+    """
+    original_send = HTTPAdapter.send
+
+    def send(adapter, request, **kwargs):
+        return handler(original_send, adapter, request, **kwargs)
+
+    HTTPAdapter.send = send
+
+    def uninstall():
+        HTTPAdapter.send = original_send
+
+    return uninstall
+
+
+def start_recording(cassette, clock):
+    """
+    start_recording Records every response of the live APIs into the
+                    cassette, except the messaging platforms.
+
+    :param cassette: Cassette to record into
+    :type cassette: Cassette
+    :param clock: Clock timestamping the responses
+    :type clock: clock.SystemClock
+    :return: Function stopping the recording
+    :rtype: callable
+    """
+
+    def record(original_send, adapter, request, **kwargs):
+        response = original_send(adapter, request, **kwargs)
+        # A 304 has no body, the last recorded response is still current
+        if response.status_code != 304 and not is_messaging_request(
+            request.url
+        ):
+            cassette.add(
+                request.method,
+                request.url,
+                response.status_code,
+                response.headers,
+                response.content,
+                clock.now().timestamp(),
+            )
+        return response
+
+    return install_transport(record)
+
+
+def start_replaying(cassette, clock, messenger):
+    """
+    start_replaying Serves every request from the cassette, at the time
+                    of the clock, and the messaging platforms from the
+                    messenger. Nothing reaches the network.
+
+    :param cassette: Recorded responses
+    :type cassette: Cassette
+    :param clock: Clock of the replay
+    :type clock: clock.VirtualClock
+    :param messenger: Fake messaging endpoints
+    :type messenger: FakeMessenger
+    :return: Function stopping the replay
+    :rtype: callable
+    """
+
+    def replay(original_send, adapter, request, **kwargs):
+        if is_messaging_request(request.url):
+            return messenger.send(request)
+
+        interaction = cassette.find(
+            request.method, request.url, clock.now().timestamp()
+        )
+        if interaction is None:
+            raise ReplayError(
+                "No recorded response for {} {}".format(
+                    request.method, request.url
+                ),
+                request=request,
+            )
+        if is_not_modified(request, interaction):
+            return build_response(request, 304, interaction["headers"], b"")
+        return build_response(
+            request,
+            interaction["status"],
+            interaction["headers"],
+            get_body(interaction),
+        )
+
+    return install_transport(replay)
+
+
+@contextmanager
+def recording(cassette, clock):
+    stop = start_recording(cassette, clock)
+    try:
+        yield cassette
+    finally:
+        stop()
+
+
+@contextmanager
+def replaying(cassette, clock, messenger):
+    stop = start_replaying(cassette, clock, messenger)
+    try:
+        yield messenger
+    finally:
+        stop()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+import json
+
+from ledger import get_content_hash
+
+
+class Table:
+    """
+    Table of a report: title, column names and rows of cells. Built like
+    a PrettyTable, rendered by every platform its own way.
+    """
+
+    def __init__(self, title=None, field_names=()):
+        self.title = title
+        self.field_names = list(field_names)
+        self.rows = []
+
+    def add_row(self, row):
+        self.rows.append(list(row))
+
+    def add_column(self, field_name, column):
+        if not self.rows:
+            self.rows = [[] for _ in column]
+        self.field_names.append(field_name)
+        for row, cell in zip(self.rows, column):
+            row.append(cell)
+
+    def to_dict(self):
+        return {
+            "title": self.title,
+            "field_names": self.field_names,
+            "rows": self.rows,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        table = cls(data["title"], data["field_names"])
+        for row in data["rows"]:
+            table.add_row(row)
+        return table
+
+
+class Report:
+    """
+    Content of a message, built once by a report builder: a title, an
+    optional description, tables and highlight lines. The renderers turn
+    it into the text, HTML, blocks, embeds or image of every platform.
+    """
+
+    def __init__(self, title, tables=(), highlights=(), description=None):
+        self.title = title
+        self.tables = list(tables)
+        self.highlights = list(highlights)
+        self.description = description
+
+    def to_dict(self):
+        return {
+            "title": self.title,
+            "description": self.description,
+            "tables": [table.to_dict() for table in self.tables],
+            "highlights": self.highlights,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data["title"],
+            [Table.from_dict(table) for table in data["tables"]],
+            data["highlights"],
+            data["description"],
+        )
+
+    def __eq__(self, other):
+        return isinstance(other, Report) and self.to_dict() == other.to_dict()
+
+    def get_content_hash(self):
+        """
+        get_content_hash Returns the fingerprint of the content, the same
+                         for every platform it is rendered to.
+
+        :return: SHA-256 hex digest
+        :rtype: str
+        """
+        return get_content_hash(
+            json.dumps(
+                self.to_dict(), sort_keys=True, ensure_ascii=False, default=str
+            )
+        )
+
+    def diff(self, previous):
+        """
+        diff Returns the rows of every table that are not in the previous
+             version of the report, e.g. the scores that changed.
+
+        :param previous: Previous version, None for an empty one
+        :type previous: Report
+        :return: List of (table title, row)
+        :rtype: list
+        """
+        previous_rows = set()
+        for table in previous.tables if previous is not None else []:
+            previous_rows.update(
+                (table.title, json.dumps(row, default=str))
+                for row in table.rows
+            )
+        return [
+            (table.title, row)
+            for table in self.tables
+            for row in table.rows
+            if (table.title, json.dumps(row, default=str)) not in previous_rows
+        ]
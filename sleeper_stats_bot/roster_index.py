@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+from collections import defaultdict
+
+from constants import (
+    BONUS_FUMBLE_FORCED_DEF,
+    BONUS_INT_QB,
+    BONUS_REC_FIRST_DOWN,
+    BONUS_REC_TE,
+    SCORING_TYPE,
+)
+
+EMPTY_SLOT = "0"
+
+# Scoring column of every points by reception setting of a league
+SCORE_TYPES = {0.0: "pts_std", 0.5: "pts_half_ppr", 1.0: "pts_ppr"}
+
+# Positions eligible to every flexible roster slot, the other slots take
+# the position of their name
+FLEX_SLOTS = {
+    "FLEX": {"RB", "WR", "TE"},
+    "WRRB_FLEX": {"RB", "WR"},
+    "REC_FLEX": {"WR", "TE"},
+    "SUPER_FLEX": {"QB", "RB", "WR", "TE"},
+    "IDP_FLEX": {"DL", "LB", "DB"},
+}
+
+# League bonuses by stat, on top of the scoring type, interceptions
+# thrown are a penalty
+BONUS_STATS = (
+    ("bonus_rec_te", BONUS_REC_TE),
+    ("rec_fd", BONUS_REC_FIRST_DOWN),
+    ("ff", BONUS_FUMBLE_FORCED_DEF),
+    ("pass_int", -BONUS_INT_QB),
+)
+
+
+def get_score_type(scoring_settings):
+    """
+    get_score_type Returns the scoring column of the points by reception
+                   of a league.
+
+    :param scoring_settings: league["scoring_settings"]
+    :type scoring_settings: dict
+    :return: Scoring column, SCORING_TYPE for the other settings
+    :rtype: str
+    """
+    try:
+        return SCORE_TYPES.get(float(scoring_settings["rec"]), SCORING_TYPE)
+    except (KeyError, TypeError, ValueError):
+        return SCORING_TYPE
+
+
+def get_player_score(week_stats, player_id, score_type=SCORING_TYPE):
+    """
+    get_player_score Returns the week score of a player, 0 when the
+                     player has no stats for the week.
+
+    :param week_stats: Week stats returned by Stats().get_week_stats
+    :type week_stats: dict
+    :param player_id: Sleeper player id
+    :type player_id: str
+    :param score_type: Scoring column to read, e.g. pts_half_ppr
+    :type score_type: str
+    :return: Player score
+    :rtype: float
+    """
+    try:
+        return float(week_stats[str(player_id)][score_type])
+    except (KeyError, TypeError, ValueError):
+        return 0.0
+
+
+def get_bonus_score(week_stats, player_id, score_type=SCORING_TYPE):
+    """
+    get_bonus_score Returns the week score of a player with the league
+                    bonuses, 0 when the player has no stats for the week.
+
+    :param week_stats: Week stats returned by Stats().get_week_stats
+    :type week_stats: dict
+    :param player_id: Sleeper player id
+    :type player_id: str
+    :param score_type: Scoring column to read, e.g. pts_half_ppr
+    :type score_type: str
+    :return: Player score with the bonuses
+    :rtype: float
+    """
+    player_stats = week_stats.get(str(player_id)) or {}
+    score = float(player_stats.get(score_type) or 0)
+    for stat, bonus in BONUS_STATS:
+        score += float(player_stats.get(stat) or 0) * bonus
+    return score
+
+
+def get_league_score(week_stats, player_id, scoring_settings):
+    """
+    get_league_score Returns the week score of a player with the scoring
+                     settings of the league, the points of every stat
+                     like Sleeper scores the matchups, 0 when the player
+                     has no stats for the week.
+
+    :param week_stats: Week stats returned by Stats().get_week_stats
+    :type week_stats: dict
+    :param player_id: Sleeper player id
+    :type player_id: str
+    :param scoring_settings: league["scoring_settings"], {stat: points}
+    :type scoring_settings: dict
+    :return: Player score
+    :rtype: float
+    """
+    player_stats = week_stats.get(str(player_id)) or {}
+    score = 0.0
+    for stat, points in scoring_settings.items():
+        try:
+            score += float(player_stats.get(stat) or 0) * float(points)
+        except (TypeError, ValueError):
+            continue
+    return score
+
+
+def get_bench_scores(matchups, week_stats, score_type=SCORING_TYPE):
+    """
+    get_bench_scores Sums the scores left on the bench by every roster.
+
+    :param matchups: https://docs.sleeper.app/#getting-matchups-in-a-league
+    :type matchups: list
+    :param week_stats: Week stats returned by Stats().get_week_stats
+    :type week_stats: dict
+    :param score_type: Scoring column to read, e.g. pts_half_ppr
+    :type score_type: str
+    :return: Dict {roster_id: bench_score}
+    :rtype: dict
+    """
+    result_dict = {}
+
+    for matchup in matchups:
+        bench = set(matchup["players"] or []) - set(matchup["starters"] or [])
+        result_dict[matchup["roster_id"]] = round(
+            sum(
+                get_bonus_score(week_stats, player_id, score_type)
+                for player_id in bench
+            ),
+            2,
+        )
+
+    return result_dict
+
+
+def find_negative_starters(matchups, week_stats, score_type=SCORING_TYPE):
+    """
+    find_negative_starters Finds the starters that scored negative points.
+
+    :param matchups: https://docs.sleeper.app/#getting-matchups-in-a-league
+    :type matchups: list
+    :param week_stats: Week stats returned by Stats().get_week_stats
+    :type week_stats: dict
+    :param score_type: Scoring column to read, e.g. pts_half_ppr
+    :type score_type: str
+    :return: Dict {roster_id: [(player_id, score), ...]}, only the
+        rosters with negative starters
+    :rtype: dict
+    """
+    result_dict = {}
+
+    for matchup in matchups:
+        negative_starters = []
+        for player_id in matchup["starters"] or []:
+            if player_id == EMPTY_SLOT:
+                continue
+            score = get_player_score(week_stats, player_id, score_type)
+            if score < 0:
+                negative_starters.append((player_id, score))
+        if negative_starters:
+            result_dict[matchup["roster_id"]] = negative_starters
+
+    return result_dict
+
+
+def get_player_positions(player):
+    """
+    get_player_positions Returns every position a player is eligible to.
+
+    :param player: Player of Players().get_all_players()
+    :type player: dict
+    :return: Set of positions, empty for the players without position
+    :rtype: set
+    """
+    positions = set(player.get("fantasy_positions") or [])
+    if player.get("position"):
+        positions.add(player["position"])
+    return positions
+
+
+def get_slot_positions(slot):
+    """
+    get_slot_positions Returns the positions eligible to a roster slot.
+
+    :param slot: Slot of league["roster_positions"], e.g. FLEX
+    :type slot: str
+    :return: Set of positions
+    :rtype: set
+    """
+    return FLEX_SLOTS.get(slot, {slot})
+
+
+def build_roster_index(
+    matchups,
+    players,
+    week_stats,
+    score_type=SCORING_TYPE,
+    roster_positions=None,
+):
+    """
+    build_roster_index Builds an index keyed by (roster_id, slot) with
+                       the starters and bench scores of every roster
+                       sorted in ascending order. With the roster
+                       positions of the league, every starter is keyed
+                       on the slot it fills, e.g. FLEX, and every bench
+                       player on each slot of the roster it is eligible
+                       to; without them, the slot is the position of
+                       the player.
+
+    :param matchups: https://docs.sleeper.app/#getting-matchups-in-a-league
+    :type matchups: list
+    :param players: Players().get_all_players() dictionary
+    :type players: dict
+    :param week_stats: Week stats returned by Stats().get_week_stats
+    :type week_stats: dict
+    :param score_type: Scoring column to read, e.g. pts_half_ppr
+    :type score_type: str
+    :param roster_positions: league["roster_positions"], the starter
+                             slots in the order of the starters
+    :type roster_positions: list
+    :return: Dict {(roster_id, slot): {"starters": [(score, name)],
+                                       "bench": [(score, name)]}}
+    :rtype: dict
+    """
+    index = defaultdict(lambda: {"starters": [], "bench": []})
+    slots = [slot for slot in roster_positions or [] if slot != "BN"]
+
+    def get_entry(player_id):
+        player = players.get(player_id)
+        if player is None or not player.get("position"):
+            return None
+        player_name = "{} {}".format(
+            player.get("first_name", ""), player.get("last_name", "")
+        ).strip()
+        return player, (
+            get_player_score(week_stats, player_id, score_type),
+            player_name,
+        )
+
+    for matchup in matchups:
+        roster_id = matchup["roster_id"]
+        starters = matchup["starters"] or []
+        bench = set(matchup["players"] or []) - set(starters)
+
+        for slot_index, player_id in enumerate(starters):
+            entry = get_entry(player_id) if player_id != EMPTY_SLOT else None
+            if entry is None:
+                continue
+            player, score = entry
+            if slot_index < len(slots):
+                slot = slots[slot_index]
+            else:
+                slot = player["position"]
+            index[(roster_id, slot)]["starters"].append(score)
+
+        for player_id in bench:
+            entry = get_entry(player_id)
+            if entry is None:
+                continue
+            player, score = entry
+            if slots:
+                positions = get_player_positions(player)
+                player_slots = {
+                    slot
+                    for slot in slots
+                    if positions & get_slot_positions(slot)
+                }
+            else:
+                player_slots = {player["position"]}
+            for slot in player_slots:
+                index[(roster_id, slot)]["bench"].append(score)
+
+    for entry in index.values():
+        entry["starters"].sort()
+        entry["bench"].sort()
+
+    return dict(index)
+
+
+def merge_bench_beats_starters(starters, bench):
+    """
+    merge_bench_beats_starters Finds every (bench, starter) pair where the
+                               bench player outscored the starter with a
+                               single merge over both sorted lists.
+
+    :param starters: Starters [(score, name)] sorted in ascending order
+    :type starters: list
+    :param bench: Bench players [(score, name)] sorted in ascending order
+    :type bench: list
+    :return: List [((bench_score, bench_name),
+                    (starter_score, starter_name)), ...]
+    :rtype: list
+    """
+    result_list = []
+    beaten = 0
+
+    for bench_player in bench:
+        # Starters are sorted, so every bench player beats a prefix of
+        # them and that prefix only grows while walking up the bench.
+        while beaten < len(starters) and starters[beaten][0] < bench_player[0]:
+            beaten += 1
+        for starter in starters[:beaten]:
+            result_list.append((bench_player, starter))
+
+    return result_list
+
+
+def find_bench_beats_starters(roster_index):
+    """
+    find_bench_beats_starters Finds all bench players that outscored a
+                              starter of a slot they are eligible to.
+
+    :param roster_index: Index returned by build_roster_index
+    :type roster_index: dict
+    :return: Dict {roster_id: [(slot, (bench_score, bench_name),
+                                (starter_score, starter_name)), ...]}
+    :rtype: dict
+    """
+    result_dict = defaultdict(list)
+
+    for (roster_id, slot), entry in sorted(roster_index.items()):
+        for bench_player, starter in merge_bench_beats_starters(
+            entry["starters"], entry["bench"]
+        ):
+            result_dict[roster_id].append((slot, bench_player, starter))
+
+    return dict(result_dict)
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+Runs the bot offline over a period of virtual time: the API responses
+are replayed from a cassette recorded with HTTP_RECORD_PATH, the
+messaging platforms are faked, and a virtual clock drives the phase loop
+and the schedulers. The bot is restarted every virtual day with an empty
+request cache, like the daily restart of a Heroku dyno.
+
+The jobs run with their latency are reported, so a season run doubles
+as an end-to-end throughput and latency benchmark.
+
+Usage:
+    python3 sleeper_stats_bot/simulate.py --cassette season.jsonl \\
+        --start 2022-09-01 --end 2023-01-10
+"""
+
+import argparse
+import functools
+import logging
+import os
+import tempfile
+import time
+from unittest import mock
+
+import bot
+import pendulum
+import requests
+from clock import VirtualClock
+from constants import TIMEZONE
+from prettytable import PrettyTable
+from replay import Cassette, FakeMessenger, replaying
+
+SIMULATION_ENVIRON = {
+    "BOT_TYPE": "telegram",
+    "TELEGRAM_WEBHOOK": "simulation",
+    "TELEGRAM_BOT_TOKEN": "simulation",
+    "TELEGRAM_CHAT_ID": "simulation",
+    "API_KEY": "simulation",
+}
+
+
+def get_simulated_pdf_report_link(league_id, season, logger):
+    # The PDF report runs weekly-report/main.py, out of the replay
+    return "PDF report of the {} season".format(season)
+
+
+def track_jobs(schedulers, clock, runs):
+    """
+    track_jobs Wraps every scheduled job to record its latency and its
+               error, if any, instead of stopping the simulation.
+
+    :param schedulers: Schedulers by phase, from bot.init
+    :type schedulers: dict
+    :param clock: Virtual clock of the simulation
+    :type clock: clock.VirtualClock
+    :param runs: List receiving a dict by job run
+    :type runs: list
+    :return: None
+    """
+
+    def run_job(job_func):
+        name = getattr(job_func, "func", job_func).__name__
+        start = time.perf_counter()
+        error = None
+        try:
+            job_func()
+        except Exception as job_error:
+            error = "{}: {}".format(type(job_error).__name__, job_error)
+        runs.append(
+            {
+                "at": clock.now(),
+                "job": name,
+                "seconds": time.perf_counter() - start,
+                "error": error,
+            }
+        )
+
+    for scheduler in schedulers.values():
+        for job in scheduler.jobs:
+            job.job_func = functools.partial(run_job, job.job_func)
+
+
+def simulate(cassette, start, end, logger):
+    """
+    simulate Runs the bot from start to end against the cassette.
+
+    :param cassette: Recorded API responses
+    :type cassette: replay.Cassette
+    :param start: Start of the simulation
+    :type start: pendulum.DateTime
+    :param end: End of the simulation
+    :type end: pendulum.DateTime
+    :param logger: A logger object for logging debug
+    :type logger: logging.Logger
+    :return: Dict with the job runs, the deliveries and the wall seconds
+    :rtype: dict
+    """
+    clock = VirtualClock(start)
+    messenger = FakeMessenger(clock)
+    runs = []
+    wall_start = time.perf_counter()
+
+    pdf_report_patch = mock.patch.object(
+        bot, "get_pdf_report_link", get_simulated_pdf_report_link
+    )
+    # Restored afterwards, the request cache replaces the requests sessions
+    session_factory = requests.Session
+    try:
+        with clock, replaying(cassette, clock, messenger), pdf_report_patch:
+            while clock.now() < end:
+                restart = min(clock.today().add(days=1), end)
+                schedulers, dates = bot.init(cache_backend="memory")
+                track_jobs(schedulers, clock, runs)
+                bot.run_phase_loop(
+                    schedulers,
+                    dates,
+                    logger,
+                    clock,
+                    restart,
+                    bot.ledger,
+                    bundle=bot.bundle,
+                )
+    finally:
+        requests.Session = requests.sessions.Session = session_factory
+
+    return {
+        "runs": runs,
+        "deliveries": messenger.deliveries,
+        "wall_seconds": time.perf_counter() - wall_start,
+    }
+
+
+def format_report(result, start, end):
+    table = PrettyTable()
+    table.field_names = ["Job", "Runs", "Errors", "Mean (ms)", "Max (ms)"]
+    table.align["Job"] = "l"
+
+    by_job = {}
+    for run in result["runs"]:
+        by_job.setdefault(run["job"], []).append(run)
+    for name, runs in sorted(by_job.items()):
+        seconds = [run["seconds"] for run in runs]
+        table.add_row(
+            [
+                name,
+                len(runs),
+                sum(1 for run in runs if run["error"]),
+                "{:.1f}".format(sum(seconds) / len(seconds) * 1000),
+                "{:.1f}".format(max(seconds) * 1000),
+            ]
+        )
+
+    wall_seconds = result["wall_seconds"]
+    return "{}\n{} jobs and {} deliveries over {} days in {:.1f}s".format(
+        table.get_string(),
+        len(result["runs"]),
+        len(result["deliveries"]),
+        (end - start).in_days(),
+        wall_seconds,
+    ) + " ({:.1f} jobs/s)".format(len(result["runs"]) / wall_seconds)
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(
+        description="Run the bot offline against recorded API responses."
+    )
+    parser.add_argument(
+        "--cassette",
+        required=True,
+        help="Responses recorded with HTTP_RECORD_PATH.",
+    )
+    parser.add_argument(
+        "--start", required=True, help="Start date, e.g. 2022-09-01."
+    )
+    parser.add_argument(
+        "--end", required=True, help="End date, e.g. 2023-01-10."
+    )
+    parser.add_argument(
+        "--league",
+        default=os.environ.get("LEAGUE_ID"),
+        help="Sleeper league id of the recording. Defaults to LEAGUE_ID.",
+    )
+    parser.add_argument(
+        "--store",
+        help="Path of the permanent store. Defaults to a temporary one.",
+    )
+    parser.add_argument(
+        "--show-errors",
+        action="store_true",
+        help="List the errors of the failed jobs.",
+    )
+
+    return parser.parse_args(args)
+
+
+###############################################################################
+# Main Script for the simulation
+###############################################################################
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    logging.basicConfig(level="INFO", format="%(message)s")
+    simulation_logger = logging.getLogger("simulation")
+
+    for name, value in SIMULATION_ENVIRON.items():
+        os.environ.setdefault(name, value)
+    os.environ["LEAGUE_ID"] = args.league
+    simulation_dir = tempfile.mkdtemp()
+    os.environ["STORE_PATH"] = args.store or os.path.join(
+        simulation_dir, "simulation_store.sqlite"
+    )
+    # The quota of the live bots is left alone
+    os.environ["QUOTA_PATH"] = os.path.join(
+        simulation_dir, "simulation_quota.sqlite"
+    )
+
+    start = pendulum.parse(args.start, tz=TIMEZONE)
+    end = pendulum.parse(args.end, tz=TIMEZONE)
+
+    result = simulate(
+        Cassette.load(args.cassette), start, end, simulation_logger
+    )
+
+    print(format_report(result, start, end))
+    if args.show_errors:
+        for run in result["runs"]:
+            if run["error"]:
+                print("{} {}: {}".format(run["at"], run["job"], run["error"]))
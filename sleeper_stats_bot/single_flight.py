@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+import threading
+
+from metrics import COALESCED_CALLS
+from requests import Response
+from requests.adapters import HTTPAdapter
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces the concurrent calls with the same key: the first one runs,
+    the others wait for it and share its result, or its exception. The
+    shared results are the same objects, to be treated as read-only.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def do(self, key, function):
+        """
+        do Runs function, unless a call with the same key is in flight.
+
+        :param key: Hashable key of the call, e.g. its URL
+        :type key: object
+        :param function: Function without arguments making the call
+        :type function: callable
+        :return: The result of the call in flight or of this one
+        :rtype: object
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            COALESCED_CALLS.inc(flight=self.name)
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = function()
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+
+class CoalescingAdapter(HTTPAdapter):
+    """
+    HTTPAdapter sending the concurrent identical GET requests once. The
+    body of the response is read before it is shared, and every caller
+    receives its own copy of it. Subclasses override send_once.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.flights = SingleFlight("http")
+        super().__init__(*args, **kwargs)
+
+    def send_once(self, request, **kwargs):
+        return super().send(request, **kwargs)
+
+    def send(self, request, **kwargs):
+        if request.method != "GET" or kwargs.get("stream"):
+            return self.send_once(request, **kwargs)
+
+        key = (request.url, tuple(sorted(request.headers.items())))
+        return _copy_response(
+            self.flights.do(key, lambda: self._send_read(request, **kwargs))
+        )
+
+    def _send_read(self, request, **kwargs):
+        response = self.send_once(request, **kwargs)
+        # The stream can be read once, the followers share the bytes
+        response.content
+        return response
+
+
+def _copy_response(response):
+    """
+    _copy_response Returns a copy of a read response, with its own
+                   headers, that the caller can change.
+
+    :param response: Response with its content read
+    :type response: requests.Response
+    :return: Copy of the response
+    :rtype: requests.Response
+    """
+    # copy.copy goes through the pickling state, which drops the raw
+    # response read by the cache
+    duplicate = Response()
+    duplicate.__dict__.update(response.__dict__)
+    duplicate.headers = response.headers.copy()
+    duplicate.history = list(response.history)
+    return duplicate
@@ -3,8 +3,13 @@ from bot_interface import BotInterface
 
 
 class Slack(BotInterface):
+    output_format = "slack_blocks"
+
     def __init__(self, webhook):
         self.webhook = webhook
 
     def send_message(self, message):
-        requests.post(self.webhook, json={"text": message})
+        requests.post(self.webhook, json={"text": message}).raise_for_status()
+
+    def deliver(self, content):
+        requests.post(self.webhook, json=content).raise_for_status()
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import sleeper_wrapper
+from constants import SEASON_FETCH_WORKERS, SLEEPER_API_URL
+from decoding import PLAYERS_DECODER, STATS_DECODER
+from http_client import get_client
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter spacing calls by at least 1 / per_second
+    seconds, shared by every worker of a concurrent fetch.
+    """
+
+    def __init__(self, per_second):
+        self.interval = 1.0 / per_second
+        self._lock = threading.Lock()
+        self._next_call = 0.0
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_call - now
+            self._next_call = max(now, self._next_call) + self.interval
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+def fetch_records(url, decoder):
+    """
+    fetch_records Fetches a Sleeper payload of records and decodes only
+                  the fields used by the bot.
+
+    :param url: Endpoint of the payload
+    :type url: str
+    :param decoder: Decoder of the records
+    :type decoder: decoding.RecordsDecoder
+    :return: Dict {id: {field: value}}, or the HTTPError like
+        sleeper_wrapper
+    :rtype: dict
+    """
+    return get_client().fetch(url, decoder.decode)
+
+
+class Players(sleeper_wrapper.Players):
+    """
+    sleeper_wrapper Players decoding only the names and positions of the
+    players dump.
+    """
+
+    def get_all_players(self, sport="nfl"):
+        return fetch_records(
+            "{}/players/{}".format(SLEEPER_API_URL, sport), PLAYERS_DECODER
+        )
+
+
+class Stats(sleeper_wrapper.Stats):
+    """
+    sleeper_wrapper Stats decoding only the points and the bonus stats of
+    the week stat sheets.
+    """
+
+    def get_week_stats(self, season_type, season, week):
+        return fetch_records(
+            "{}/stats/nfl/{}/{}/{}".format(
+                SLEEPER_API_URL, season_type, season, week
+            ),
+            STATS_DECODER,
+        )
+
+    def get_week_projections(self, season_type, season, week):
+        return fetch_records(
+            "{}/projections/nfl/{}/{}/{}".format(
+                SLEEPER_API_URL, season_type, season, week
+            ),
+            STATS_DECODER,
+        )
+
+
+def is_week_final(week, current_week):
+    """
+    is_week_final Checks if a week is completed, its data will not
+                  change anymore.
+
+    :param week: Week to check
+    :type week: int
+    :param current_week: Current week of the season
+    :type current_week: int
+    :return: True when the week is before the current week
+    :rtype: bool
+    """
+    return int(week) < int(current_week)
+
+
+def get_payload(namespace, key, is_final, fetch, store=None):
+    """
+    get_payload Returns a payload from the permanent store when it is
+                final and already stored, otherwise fetches it and
+                stores it if it is final.
+
+    :param namespace: Store namespace of the payload
+    :type namespace: str
+    :param key: Store key of the payload
+    :type key: str
+    :param is_final: True when the payload will not change anymore
+    :type is_final: bool
+    :param fetch: Function without arguments fetching the payload
+    :type fetch: callable
+    :param store: Permanent store, None to always fetch
+    :type store: store.Store
+    :return: The payload
+    :rtype: object
+    """
+    if is_final and store is not None:
+        payload = store.get(namespace, key)
+        if payload is not None:
+            return payload
+
+    payload = fetch()
+
+    # sleeper_wrapper returns the HTTPError instead of raising it
+    if isinstance(payload, Exception):
+        raise payload
+
+    if is_final and store is not None and payload:
+        store.put(namespace, key, payload)
+
+    return payload
+
+
+def get_week_stats(season, week, current_week, store=None):
+    """
+    get_week_stats Returns the regular season stats of a week.
+
+    :param season: Season year
+    :type season: str
+    :param week: Week to get the stats of
+    :type week: int
+    :param current_week: Current week of the season
+    :type current_week: int
+    :param store: Permanent store for completed weeks
+    :type store: store.Store
+    :return: Dict {player_id: {stat: value}}
+    :rtype: dict
+    """
+    return get_payload(
+        "week_stats",
+        "{}:{}".format(season, week),
+        is_week_final(week, current_week),
+        lambda: Stats().get_week_stats("regular", season, week),
+        store,
+    )
+
+
+def get_week_projections(season, week, current_week, store=None):
+    """
+    get_week_projections Returns the regular season projections of a
+                         week.
+
+    :param season: Season year
+    :type season: str
+    :param week: Week to get the projections of
+    :type week: int
+    :param current_week: Current week of the season
+    :type current_week: int
+    :param store: Permanent store for completed weeks
+    :type store: store.Store
+    :return: Dict {player_id: {stat: value}}
+    :rtype: dict
+    """
+    return get_payload(
+        "week_projections",
+        "{}:{}".format(season, week),
+        is_week_final(week, current_week),
+        lambda: Stats().get_week_projections("regular", season, week),
+        store,
+    )
+
+
+def get_week_matchups(league, week, current_week, store=None):
+    """
+    get_week_matchups Returns the matchups of a week of the league.
+
+    :param league: Object league
+    :type league: sleeper_wrapper.League
+    :param week: Week to get the matchups of
+    :type week: int
+    :param current_week: Current week of the season
+    :type current_week: int
+    :param store: Permanent store for completed weeks
+    :type store: store.Store
+    :return: https://docs.sleeper.app/#getting-matchups-in-a-league
+    :rtype: list
+    """
+    return get_payload(
+        "matchups:{}".format(league.league_id),
+        str(week),
+        is_week_final(week, current_week),
+        lambda: league.get_matchups(week),
+        store,
+    )
+
+
+def get_weeks(
+    fetch_week, weeks, max_workers=SEASON_FETCH_WORKERS, rate_limiter=None
+):
+    """
+    get_weeks Fetches several weeks concurrently.
+
+    :param fetch_week: Function receiving a week and returning its payload
+    :type fetch_week: callable
+    :param weeks: Weeks to fetch
+    :type weeks: list
+    :param max_workers: Maximum number of concurrent requests
+    :type max_workers: int
+    :param rate_limiter: Limiter acquired before fetching every week
+    :type rate_limiter: RateLimiter
+    :return: Dict {week: payload}
+    :rtype: dict
+    """
+    weeks = list(weeks)
+    if not weeks:
+        return {}
+
+    def fetch(week):
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        return fetch_week(week)
+
+    # Workers run in the caller context so metrics keep the job label
+    context = contextvars.copy_context()
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(weeks))) as pool:
+        return dict(
+            zip(
+                weeks,
+                pool.map(lambda week: context.copy().run(fetch, week), weeks),
+            )
+        )
+
+
+def get_season_data(
+    league,
+    season,
+    weeks,
+    current_week,
+    store=None,
+    max_workers=SEASON_FETCH_WORKERS,
+    rate_limiter=None,
+):
+    """
+    get_season_data Fetches the matchups, stats and projections of
+                    several weeks concurrently.
+
+    :param league: Object league
+    :type league: sleeper_wrapper.League
+    :param season: Season year
+    :type season: str
+    :param weeks: Weeks to fetch
+    :type weeks: list
+    :param current_week: Current week of the season
+    :type current_week: int
+    :param store: Permanent store for completed weeks
+    :type store: store.Store
+    :param max_workers: Maximum number of concurrent requests
+    :type max_workers: int
+    :param rate_limiter: Limiter acquired before every request
+    :type rate_limiter: RateLimiter
+    :return: Tuple of dicts (matchups, stats, projections) by week
+    :rtype: tuple
+    """
+    weeks = list(weeks)
+    fetchers = [
+        lambda week: get_week_matchups(league, week, current_week, store),
+        lambda week: get_week_stats(season, week, current_week, store),
+        lambda week: get_week_projections(season, week, current_week, store),
+    ]
+    jobs = [(index, week) for index in range(len(fetchers)) for week in weeks]
+    payloads = get_weeks(
+        lambda job: fetchers[job[0]](job[1]), jobs, max_workers, rate_limiter
+    )
+
+    return tuple(
+        {week: payloads[(index, week)] for week in weeks}
+        for index in range(len(fetchers))
+    )
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import pendulum
+from constants import TIMEZONE
+
+SNAPSHOT_NAMESPACE = "warm_snapshot"
+
+
+def get_week_expiry(now):
+    """
+    get_week_expiry Returns until when the fetched current week is reused.
+                    sportsdata.io moves CurrentWeek at no fixed time, so it
+                    is reused by the restarts of the same day only.
+
+    :param now: Time the week was fetched
+    :type now: pendulum.DateTime
+    :return: Start of the next day
+    :rtype: pendulum.DateTime
+    """
+    return now.in_timezone(TIMEZONE).start_of("day").add(days=1)
+
+
+def save_snapshot(store, league_id, season, dates, week, now):
+    """
+    save_snapshot Saves the calendar and the current week of the league,
+                  read on the next boot instead of calling sportsdata.io.
+
+    :param store: Permanent store
+    :type store: store.Store
+    :param league_id: Sleeper league id
+    :type league_id: str
+    :param season: Current season year
+    :type season: str
+    :param dates: Start date by phase
+    :type dates: dict
+    :param week: Current week
+    :type week: int
+    :param now: Current time
+    :type now: pendulum.DateTime
+    :return: None
+    """
+    store.put(
+        SNAPSHOT_NAMESPACE,
+        league_id,
+        {
+            "season": season,
+            "dates": {
+                phase: date.to_iso8601_string()
+                for phase, date in dates.items()
+            },
+            "week": week,
+            "week_expires_at": get_week_expiry(now).to_iso8601_string(),
+        },
+    )
+
+
+def load_snapshot(store, league_id, now):
+    """
+    load_snapshot Returns the saved calendar of the league while its
+                  season lasts, with its week while it is current.
+
+    :param store: Permanent store
+    :type store: store.Store
+    :param league_id: Sleeper league id
+    :type league_id: str
+    :param now: Current time
+    :type now: pendulum.DateTime
+    :return: Dict with the season, the dates by phase and the week, None
+        for an expired week, or None without a current calendar
+    :rtype: dict
+    """
+    snapshot = store.get(SNAPSHOT_NAMESPACE, league_id)
+    if snapshot is None:
+        return None
+
+    dates = {
+        phase: pendulum.parse(date, tz=TIMEZONE)
+        for phase, date in snapshot["dates"].items()
+    }
+    # The next season starts a new calendar
+    if now >= dates["off_season"]:
+        return None
+
+    week = snapshot["week"]
+    if now >= pendulum.parse(snapshot["week_expires_at"]):
+        week = None
+
+    return {"season": snapshot["season"], "dates": dates, "week": week}
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+import json
+import sqlite3
+import threading
+
+
+class Store:
+    """
+    Permanent SQLite store for immutable payloads, such as the stats,
+    projections and matchups of completed weeks or past seasons.
+    Payloads are saved as JSON under a (namespace, key) pair and never
+    expire.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS payloads ("
+            "namespace TEXT NOT NULL, "
+            "key TEXT NOT NULL, "
+            "data TEXT NOT NULL, "
+            "PRIMARY KEY (namespace, key))"
+        )
+        self._connection.commit()
+
+    def get(self, namespace, key):
+        """
+        get Returns a stored payload.
+
+        :param namespace: Payload kind, e.g. week_stats
+        :type namespace: str
+        :param key: Payload key inside the namespace, e.g. 2022:3
+        :type key: str
+        :return: The decoded payload or None when it is not stored
+        :rtype: object
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM payloads WHERE namespace = ? AND key = ?",
+                (namespace, str(key)),
+            ).fetchone()
+
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def put(self, namespace, key, payload):
+        """
+        put Saves a payload, replacing any previous value.
+
+        :param namespace: Payload kind, e.g. week_stats
+        :type namespace: str
+        :param key: Payload key inside the namespace, e.g. 2022:3
+        :type key: str
+        :param payload: JSON serializable payload
+        :type payload: object
+        :return: None
+        """
+        data = json.dumps(payload, separators=(",", ":"))
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO payloads (namespace, key, data) "
+                "VALUES (?, ?, ?)",
+                (namespace, str(key), data),
+            )
+            self._connection.commit()
+
+    def keys(self, namespace):
+        """
+        keys Returns the stored keys of a namespace.
+
+        :param namespace: Payload kind, e.g. week_stats
+        :type namespace: str
+        :return: List of keys
+        :rtype: list
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key FROM payloads WHERE namespace = ? ORDER BY key",
+                (namespace,),
+            ).fetchall()
+
+        return [row[0] for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
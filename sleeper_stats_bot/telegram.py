@@ -1,38 +1,130 @@
 # -*- coding: utf-8 -*-
+import json
 import os
 
 import requests
 from bot_interface import BotInterface
+from constants import SEND_RETRY_ATTEMPTS
+from renderers import CAPTION_CHARS
 
-telegram_bot_token = os.environ["TELEGRAM_BOT_TOKEN"]
-telegram_chat_id = os.environ["TELEGRAM_CHAT_ID"]
+# Photos of an album, at most
+MEDIA_GROUP_SIZE = 10
 
 
 class Telegram(BotInterface):
     def __init__(self, webhook):
         self.webhook = webhook
+        self.bot_token = os.environ["TELEGRAM_BOT_TOKEN"]
+        self.chat_id = os.environ["TELEGRAM_CHAT_ID"]
+        # The reports are images by default, "html" for formatted text
+        if os.environ.get("TELEGRAM_FORMAT") == "html":
+            self.output_format = "telegram_html"
+        else:
+            self.output_format = "photo"
+            # The images due in the same window are posted as one album
+            self.bundle_seconds = float(
+                os.environ.get("TELEGRAM_BUNDLE_SECONDS", 0)
+            )
 
-    def send_photo(self, photo):
+    @property
+    def output_formats(self):
+        if self.bundle_seconds > 0:
+            return {self.output_format, "caption"}
+        return {self.output_format}
+
+    def send_photo(self, photo, caption=None):
         url = (
             "https://api.telegram.org/bot"
-            + telegram_bot_token
+            + self.bot_token
             + "/sendPhoto?chat_id="
-            + telegram_chat_id
+            + self.chat_id
         )
         files = {"photo": photo}
-        requests.post(url, files=files)
-
-    def send_message(self, message):
+        data = {"caption": caption} if caption else None
+        requests.post(url, data=data, files=files).raise_for_status()
 
+    def send_media_group(self, photos, captions):
         url = (
-            "https://api.telegram.org/bot"
-            + telegram_bot_token
-            + "/sendMessage?chat_id="
-            + telegram_chat_id
-            + "&text="
-            + message
-            + "&parse_mode=HTML"
-            + "&disable_notification=true"
+            "https://api.telegram.org/bot" + self.bot_token + "/sendMediaGroup"
         )
+        media = [
+            {
+                "type": "photo",
+                "media": "attach://photo{}".format(index),
+                "caption": caption,
+            }
+            for index, caption in enumerate(captions)
+        ]
+        files = {
+            "photo{}".format(index): photo
+            for index, photo in enumerate(photos)
+        }
+        requests.post(
+            url,
+            data={"chat_id": self.chat_id, "media": json.dumps(media)},
+            files=files,
+        ).raise_for_status()
+
+    def send_message(self, message):
+
+        url = "https://api.telegram.org/bot" + self.bot_token + "/sendMessage"
+        # Sent in the body, the HTML of the reports is not URL safe
+        requests.post(
+            url,
+            data={
+                "chat_id": self.chat_id,
+                "text": message,
+                "parse_mode": "HTML",
+                "disable_notification": "true",
+            },
+        ).raise_for_status()
+
+    def send_bundle(self, items, attempts=SEND_RETRY_ATTEMPTS):
+        """
+        Posts the images due in the same window as albums of up to 10
+        photos, every one captioned with its report, the notes in the
+        caption of the first one.
+        :param items: Rendered reports, dicts {output format: content},
+            and notes, strings like the link to the PDF report
+        :param attempts: Maximum number of deliveries of every album
+        :return: List with True for every item delivered
+        """
+        photos = [
+            (index, item)
+            for index, item in enumerate(items)
+            if isinstance(item, dict)
+        ]
+        if self.output_format != "photo" or not photos:
+            return super().send_bundle(items, attempts=attempts)
+
+        notes = [item for item in items if not isinstance(item, dict)]
+        captions = [item["caption"] for _, item in photos]
+        captions[0] = "\n".join(notes + [captions[0]])[:CAPTION_CHARS]
+
+        delivered = [False] * len(items)
+        for start in range(0, len(photos), MEDIA_GROUP_SIZE):
+            end = start + MEDIA_GROUP_SIZE
+            album = photos[start:end]
+            album_captions = captions[start:end]
+            if len(album) == 1:
+                sent = self.send_with_retries(
+                    self.send_photo,
+                    album[0][1]["photo"],
+                    album_captions[0],
+                    attempts=attempts,
+                )
+            else:
+                sent = self.send_with_retries(
+                    self.send_media_group,
+                    [item["photo"] for _, item in album],
+                    album_captions,
+                    attempts=attempts,
+                )
+            for index, _ in album:
+                delivered[index] = sent
 
-        requests.post(url)
+        # The notes went with the first album
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                delivered[index] = delivered[photos[0][0]]
+        return delivered
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+import time
+from collections import defaultdict
+
+from constants import SLEEPER_API_URL, TRANSACTIONS_POLL_SECONDS
+from http_client import get_client
+from metrics import timed_job
+
+# Transactions done, the pending ones change until they are processed
+FINAL_STATUSES = ("complete", "failed")
+
+
+def get_status_updated(transaction):
+    return transaction.get("status_updated") or 0
+
+
+class TransactionIndex:
+    """
+    Local index of the transactions of a league season, in the store by
+    week, each one with its high water mark: the last status_updated
+    processed. Only the transactions from the mark on are processed
+    again, and a week is closed, never fetched again, once it is over.
+    """
+
+    def __init__(self, store, league_id, season):
+        self.store = store
+        self.league_id = league_id
+        self.season = season
+
+    def _get_key(self, week):
+        return "{}:{}:{}".format(self.league_id, self.season, week)
+
+    def get_week(self, week):
+        """
+        get_week Returns the index of a week.
+
+        :param week: Week of the transactions
+        :type week: int
+        :return: Dict {"mark", "closed", "transactions": {id: transaction}},
+            None when the week was never fetched
+        :rtype: dict
+        """
+        return self.store.get("transactions", self._get_key(week))
+
+    def get_weeks(self):
+        """
+        get_weeks Returns the weeks in the index.
+
+        :return: Sorted list of weeks
+        :rtype: list
+        """
+        prefix = self._get_key("")
+        return sorted(
+            int(key.replace(prefix, "", 1))
+            for key in self.store.keys("transactions")
+            if key.startswith(prefix)
+        )
+
+    def get_new(self, week, transactions):
+        """
+        get_new Returns the final transactions of a week past its high
+                water mark and not in the index yet, without adding them.
+
+        :param week: Week of the transactions
+        :type week: int
+        :param transactions: https://docs.sleeper.app/#get-transactions
+        :type transactions: list
+        :return: The new transactions, by status_updated
+        :rtype: list
+        """
+        indexed = self.get_week(week) or {"mark": 0, "transactions": {}}
+        return sorted(
+            (
+                transaction
+                for transaction in transactions
+                if get_status_updated(transaction) >= indexed["mark"]
+                and transaction.get("status") in FINAL_STATUSES
+                and transaction["transaction_id"]
+                not in indexed["transactions"]
+            ),
+            key=get_status_updated,
+        )
+
+    def add(self, week, new, closed=False):
+        """
+        add Adds new transactions of a week to the index and moves its
+            high water mark past them.
+
+        :param week: Week of the transactions
+        :type week: int
+        :param new: New transactions, from get_new
+        :type new: list
+        :param closed: True when the week is over, not fetched anymore
+        :type closed: bool
+        :return: None
+        """
+        indexed = self.get_week(week) or {"mark": 0, "transactions": {}}
+        for transaction in new:
+            indexed["transactions"][
+                transaction["transaction_id"]
+            ] = transaction
+            indexed["mark"] = max(
+                indexed["mark"], get_status_updated(transaction)
+            )
+        indexed["closed"] = closed
+        self.store.put("transactions", self._get_key(week), indexed)
+
+    def get_season(self):
+        """
+        get_season Returns every transaction indexed for the season.
+
+        :return: List of transactions, by week and status_updated
+        :rtype: list
+        """
+        transactions = []
+        for week in self.get_weeks():
+            transactions += sorted(
+                self.get_week(week)["transactions"].values(),
+                key=get_status_updated,
+            )
+        return transactions
+
+
+def get_faab_stats(transactions):
+    """
+    get_faab_stats Computes the FAAB efficiency of every team from the
+                   waiver claims of the index.
+
+    :param transactions: Transactions of the season, from the index
+    :type transactions: list
+    :return: Dict {roster_id: {"won", "lost", "spent", "bids"}}, the
+        claims won and lost, the FAAB spent and bid in total
+    :rtype: dict
+    """
+    stats = defaultdict(lambda: {"won": 0, "lost": 0, "spent": 0, "bids": 0})
+    for transaction in transactions:
+        if transaction.get("type") != "waiver":
+            continue
+        bid = (transaction.get("settings") or {}).get("waiver_bid") or 0
+        for roster_id in transaction.get("roster_ids") or []:
+            team = stats[roster_id]
+            team["bids"] += bid
+            if transaction["status"] == "complete":
+                team["won"] += 1
+                team["spent"] += bid
+            else:
+                team["lost"] += 1
+    return dict(stats)
+
+
+@timed_job("transactions")
+def _fetch(url):
+    payload = get_client().fetch(url, refresh=True)
+    # sleeper_wrapper contract, the HTTPError is returned
+    if isinstance(payload, Exception):
+        raise payload
+    return payload
+
+
+class TransactionPoller:
+    """
+    Polls the transactions of the league every poll_seconds into the
+    index, handing the new ones to on_transactions. They are added to
+    the index only once on_transactions delivered them, so the ones not
+    delivered are announced again at the next poll. The weeks over are
+    fetched once more and closed; on the very first poll the index is
+    filled with the season so far without announcing it.
+    """
+
+    def __init__(
+        self,
+        league_id,
+        index,
+        get_week,
+        on_transactions,
+        logger,
+        poll_seconds=TRANSACTIONS_POLL_SECONDS,
+        now=time.time,
+    ):
+        self.league_id = league_id
+        self.index = index
+        self.get_week = get_week
+        self.on_transactions = on_transactions
+        self.logger = logger
+        self.poll_seconds = poll_seconds
+        self.now = now
+        self._next_poll = now()
+
+    def get_url(self, week):
+        return "{}/league/{}/transactions/{}".format(
+            SLEEPER_API_URL, self.league_id, week
+        )
+
+    def poll(self):
+        """
+        poll Fetches the weeks not closed up to the current one.
+
+        :return: The new transactions announced, by week
+        :rtype: dict
+        """
+        current_week = max(int(self.get_week() or 1), 1)
+        announce = bool(self.index.get_weeks())
+        announced = {}
+        for week in range(1, current_week + 1):
+            indexed = self.index.get_week(week)
+            if indexed is not None and indexed.get("closed"):
+                continue
+            new = self.index.get_new(week, _fetch(self.get_url(week)))
+            if new and announce:
+                if not self.on_transactions(week, new):
+                    self.logger.warning(
+                        "Transactions of week %s not delivered, announced "
+                        "again at the next poll",
+                        week,
+                    )
+                    continue
+                announced[week] = new
+            self.index.add(week, new, closed=week < current_week)
+        return announced
+
+    def run_due(self):
+        """
+        run_due Polls the transactions when the next poll is due.
+
+        :return: The new transactions announced, by week
+        :rtype: dict
+        """
+        if self.now() < self._next_poll:
+            return {}
+        self._next_poll = self.now() + self.poll_seconds
+        try:
+            return self.poll()
+        except Exception:
+            # The weeks not added to the index are polled again next time
+            self.logger.warning(
+                "Poll of the transactions failed", exc_info=True
+            )
+            return {}
+
+    def idle_seconds(self):
+        """
+        idle_seconds Returns the seconds until the next poll.
+
+        :return: Seconds
+        :rtype: float
+        """
+        return max(self._next_poll - self.now(), 0)
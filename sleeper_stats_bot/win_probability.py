@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+import math
+from collections import defaultdict
+
+from constants import SCORING_TYPE, WIN_PROBABILITY_STDDEV_RATIO
+from roster_index import EMPTY_SLOT, get_player_score
+
+
+def get_game_state(week_stats, player_id, team=None, games_over=None):
+    """
+    get_game_state Returns the state of the game of a player this week.
+
+    :param week_stats: Week stats returned by Stats().get_week_stats
+    :type week_stats: dict
+    :param player_id: Sleeper player id
+    :type player_id: str
+    :param team: NFL team of the player, e.g. KC
+    :type team: str
+    :param games_over: NFL teams whose game is over, None when unknown
+    :type games_over: set
+    :return: "pending" before the game, "live" while it is played or
+        when it is not known to be over, "final" once it is over
+    :rtype: str
+    """
+    player_stats = week_stats.get(str(player_id))
+    if not player_stats or not player_stats.get("gp", 1):
+        return "pending"
+    if games_over is not None and team in games_over:
+        return "final"
+    return "live"
+
+
+def get_team_distribution(
+    starters,
+    points,
+    week_stats,
+    week_projections,
+    score_type=SCORING_TYPE,
+    player_teams=None,
+    games_over=None,
+):
+    """
+    get_team_distribution Returns the current points of a team and the
+                          mean and variance of its final score.
+
+    The current points are the ones of the league. Starters whose game is
+    over add nothing; the ones still playing add what is left of their
+    projection, and the ones yet to play their whole projection, each
+    with a standard deviation of WIN_PROBABILITY_STDDEV_RATIO times what
+    they add.
+
+    :param starters: List of starters player ids
+    :type starters: list
+    :param points: Points of the team, matchup["points"]
+    :type points: float
+    :param week_stats: Week stats returned by Stats().get_week_stats
+    :type week_stats: dict
+    :param week_projections: Week projections returned by
+                             Stats().get_week_projections
+    :type week_projections: dict
+    :param score_type: Scoring column to read, e.g. pts_half_ppr
+    :type score_type: str
+    :param player_teams: Dict {player_id: NFL team}
+    :type player_teams: dict
+    :param games_over: NFL teams whose game is over, None when unknown
+    :type games_over: set
+    :return: Tuple (points, mean, variance, players_remaining)
+    :rtype: tuple
+    """
+    points = float(points or 0)
+    player_teams = player_teams or {}
+    remaining_mean = 0.0
+    remaining_variance = 0.0
+    players_remaining = 0
+
+    for player_id in starters or []:
+        if player_id == EMPTY_SLOT:
+            continue
+        state = get_game_state(
+            week_stats, player_id, player_teams.get(player_id), games_over
+        )
+        if state == "final":
+            continue
+        projection = get_player_score(week_projections, player_id, score_type)
+        if state == "live":
+            projection -= get_player_score(week_stats, player_id, score_type)
+        projection = max(projection, 0)
+        remaining_mean += projection
+        remaining_variance += (WIN_PROBABILITY_STDDEV_RATIO * projection) ** 2
+        players_remaining += 1
+
+    return (
+        points,
+        points + remaining_mean,
+        remaining_variance,
+        players_remaining,
+    )
+
+
+def win_probability(mean_a, variance_a, mean_b, variance_b):
+    """
+    win_probability Returns the probability of team A beating team B
+                    assuming both final scores are normally distributed.
+
+    :param mean_a: Mean final score of team A
+    :type mean_a: float
+    :param variance_a: Variance of the final score of team A
+    :type variance_a: float
+    :param mean_b: Mean final score of team B
+    :type mean_b: float
+    :param variance_b: Variance of the final score of team B
+    :type variance_b: float
+    :return: Probability between 0 and 1
+    :rtype: float
+    """
+    difference = mean_a - mean_b
+    variance = variance_a + variance_b
+
+    if variance <= 0:
+        if difference > 0:
+            return 1.0
+        if difference < 0:
+            return 0.0
+        return 0.5
+
+    return 0.5 * (1 + math.erf(difference / math.sqrt(2 * variance)))
+
+
+def get_matchup_win_probabilities(
+    matchups,
+    week_stats,
+    week_projections,
+    score_type=SCORING_TYPE,
+    player_teams=None,
+    games_over=None,
+):
+    """
+    get_matchup_win_probabilities Returns the live win probability of
+                                  every team of the week.
+
+    :param matchups: https://docs.sleeper.app/#getting-matchups-in-a-league
+    :type matchups: list
+    :param week_stats: Week stats returned by Stats().get_week_stats
+    :type week_stats: dict
+    :param week_projections: Week projections returned by
+                             Stats().get_week_projections
+    :type week_projections: dict
+    :param score_type: Scoring column to read, e.g. pts_half_ppr
+    :type score_type: str
+    :param player_teams: Dict {player_id: NFL team}
+    :type player_teams: dict
+    :param games_over: NFL teams whose game is over, None when unknown
+    :type games_over: set
+    :return: Dict {matchup_id: [{"roster_id", "points", "projected",
+                                 "variance", "players_remaining",
+                                 "win_probability"}, ...]}
+    :rtype: dict
+    """
+    teams_dict = defaultdict(list)
+
+    for matchup in matchups or []:
+        if matchup.get("matchup_id") is None:
+            continue
+        points, projected, variance, players_remaining = get_team_distribution(
+            matchup["starters"],
+            matchup.get("points"),
+            week_stats,
+            week_projections,
+            score_type,
+            player_teams,
+            games_over,
+        )
+        teams_dict[matchup["matchup_id"]].append(
+            {
+                "roster_id": matchup["roster_id"],
+                "points": points,
+                "projected": projected,
+                "variance": variance,
+                "players_remaining": players_remaining,
+            }
+        )
+
+    for teams in teams_dict.values():
+        if len(teams) != 2:
+            for team in teams:
+                team["win_probability"] = None
+            continue
+        team_a, team_b = teams
+        team_a["win_probability"] = win_probability(
+            team_a["projected"],
+            team_a["variance"],
+            team_b["projected"],
+            team_b["variance"],
+        )
+        team_b["win_probability"] = 1 - team_a["win_probability"]
+
+    return dict(teams_dict)
+
+
+def get_close_games(win_probabilities, close_probability, close_num):
+    """
+    get_close_games Returns the matchups where the underdog still has at
+                    least close_probability chances to win. Matchups
+                    without players remaining fall back to the final
+                    margin against close_num.
+
+    :param win_probabilities: Dict returned by
+                              get_matchup_win_probabilities
+    :type win_probabilities: dict
+    :param close_probability: Minimum underdog win probability
+    :type close_probability: float
+    :param close_num: Point difference to consider a finished game close
+    :type close_num: float
+    :return: Dict of the close matchups
+    :rtype: dict
+    """
+    close_games_dict = {}
+
+    for matchup_id, teams in win_probabilities.items():
+        if len(teams) != 2:
+            continue
+        team_a, team_b = teams
+        if team_a["players_remaining"] or team_b["players_remaining"]:
+            underdog = min(
+                team_a["win_probability"], team_b["win_probability"]
+            )
+            is_close = underdog >= close_probability
+        else:
+            is_close = abs(team_a["points"] - team_b["points"]) < close_num
+
+        if is_close:
+            close_games_dict[matchup_id] = teams
+
+    return close_games_dict
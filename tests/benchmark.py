@@ -0,0 +1,421 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks of the report builders, the scoring computations and the
+image rendering over synthetic leagues or a recorded fixture.
+
+    python -m tests.benchmark --font FONT.ttf            # print timings
+    python -m tests.benchmark --font FONT.ttf --save     # new baseline
+    python -m tests.benchmark --font FONT.ttf --compare  # exit 1 on
+                                                         # regressions
+    python -m tests.benchmark --record LEAGUE_ID --weeks 14 \\
+        --fixture league.json                            # record a league
+
+Run it from the repository root. Baselines depend on the machine, save
+one before comparing on a new host.
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from unittest import mock
+
+from prettytable import PrettyTable
+
+from tests.league_fixtures import (
+    FixtureLeague,
+    FixturePlayers,
+    FixtureStats,
+    generate_payloads,
+    load_fixture,
+    record_fixture,
+)
+
+BASELINE_PATH = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "benchmark_baseline.json"
+)
+DEFAULT_TEAMS = [8, 12, 32]
+DEFAULT_REPEAT = 5
+# Allowed slowdown against the baseline before failing, and the absolute
+# difference under which timings are noise
+DEFAULT_TOLERANCE = 0.25
+NOISE_SECONDS = 0.002
+PLAYOFF_LINE = 6
+
+logger = logging.getLogger("benchmark")
+
+
+def bench_matchups(bot, context):
+    return bot.get_matchups_report(context.league, context.week, logger)
+
+
+def bench_scores(bot, context):
+    return bot.get_scores_report(
+        context.league, context.week, "Final Scores", logger
+    )
+
+
+def bench_standings(bot, context):
+    return bot.get_standings_report(
+        context.league, context.week, PLAYOFF_LINE, logger
+    )
+
+
+def bench_best_and_worst(bot, context):
+    return bot.get_best_and_worst_report(
+        context.league, context.season, context.week, logger
+    )
+
+
+def bench_bench_beats_starters(bot, context):
+    week_payloads = context.payloads["weeks"][str(context.week)]
+    roster_index = bot.build_roster_index(
+        week_payloads["matchups"],
+        context.payloads["players"],
+        week_payloads["stats"],
+        "pts_half_ppr",
+    )
+    return bot.find_bench_beats_starters(roster_index)
+
+
+def bench_win_probability(bot, context):
+    week_payloads = context.payloads["weeks"][str(context.week)]
+    win_probabilities = bot.get_matchup_win_probabilities(
+        week_payloads["matchups"],
+        week_payloads["stats"],
+        week_payloads["projections"],
+    )
+    return bot.get_close_games(win_probabilities, 0.3, 20)
+
+
+def bench_luck(bot, context):
+    weeks = context.payloads["weeks"]
+    arrays = bot.build_season_arrays(
+        {int(week): weeks[week]["matchups"] for week in weeks},
+        {int(week): weeks[week]["stats"] for week in weeks},
+        {int(week): weeks[week]["projections"] for week in weeks},
+    )
+    return bot.get_team_luck(arrays)
+
+
+def bench_render(bot, context):
+    return bot.render_image(context.standings)
+
+
+def bench_decode(bot, context):
+    from sleeper_stats_bot import decoding
+
+    players_json, stats_json = context.documents
+    return (
+        decoding.PLAYERS_DECODER.decode(players_json),
+        decoding.STATS_DECODER.decode(stats_json),
+    )
+
+
+BENCHMARKS = {
+    "matchups": bench_matchups,
+    "scores": bench_scores,
+    "standings": bench_standings,
+    "best_and_worst": bench_best_and_worst,
+    "bench_beats_starters": bench_bench_beats_starters,
+    "win_probability": bench_win_probability,
+    "luck": bench_luck,
+    "render": bench_render,
+    "decode": bench_decode,
+}
+
+
+class Context:
+    def __init__(self, payloads):
+        self.payloads = payloads
+        self.league = FixtureLeague(payloads)
+        self.season = payloads["season"]
+        self.week = payloads["week"]
+        self.standings = None
+        self.documents = None
+
+
+@contextlib.contextmanager
+def patched_bot(bot, payloads, font_name):
+    """
+    patched_bot Serves the payloads to the Stats and Players used by the
+                bot, and renders with font_name.
+    """
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(
+            mock.patch.object(bot, "Stats", lambda: FixtureStats(payloads))
+        )
+        stack.enter_context(
+            mock.patch.object(bot, "Players", lambda: FixturePlayers(payloads))
+        )
+        stack.enter_context(mock.patch.object(bot, "FONT_NAME", font_name))
+        yield
+
+
+def time_benchmark(func, repeat):
+    """
+    time_benchmark Runs func once to warm up, tracing its peak memory,
+                   and repeat more times.
+
+    :return: Dict with the min and median seconds and the peak bytes, or
+        the error
+    :rtype: dict
+    """
+    try:
+        tracemalloc.start()
+        try:
+            func()
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+    except Exception as error:
+        return {"error": "{}: {}".format(type(error).__name__, error)}
+
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "peak_bytes": peak_bytes,
+    }
+
+
+def run_benchmarks(payloads_list, names, repeat, font_name):
+    """
+    run_benchmarks Times the benchmarks over every league.
+
+    :param payloads_list: List of (label, payloads)
+    :type payloads_list: list
+    :param names: Benchmark names, keys of BENCHMARKS
+    :type names: list
+    :param repeat: Timed runs by benchmark
+    :type repeat: int
+    :param font_name: TrueType font used to size and render the images
+    :type font_name: str
+    :return: Dict {"name/label": {"min": s, "median": s} or {"error": e}}
+    :rtype: dict
+    """
+    from sleeper_stats_bot import bot
+
+    results = {}
+    for label, payloads in payloads_list:
+        context = Context(payloads)
+        with patched_bot(bot, payloads, font_name):
+            if "render" in names:
+                # The largest report is the one rendered
+                context.standings = bench_standings(bot, context)
+            if "decode" in names:
+                # The players dump and the stats of a week, as served
+                context.documents = (
+                    json.dumps(payloads["players"]).encode("utf-8"),
+                    json.dumps(
+                        payloads["weeks"][str(context.week)]["stats"]
+                    ).encode("utf-8"),
+                )
+            for name in names:
+                results["{}/{}".format(name, label)] = time_benchmark(
+                    lambda: BENCHMARKS[name](bot, context), repeat
+                )
+
+    return results
+
+
+def compare_results(results, baseline, tolerance):
+    """
+    compare_results Compares the min timings against the baseline.
+
+    :param results: Results of run_benchmarks
+    :type results: dict
+    :param baseline: Results saved as baseline
+    :type baseline: dict
+    :param tolerance: Allowed slowdown, 0.25 for 25%
+    :type tolerance: float
+    :return: List of (key, message) regressions
+    :rtype: list
+    """
+    regressions = []
+    for key, base in sorted(baseline.items()):
+        current = results.get(key)
+        if current is None or "error" in base:
+            continue
+        if "error" in current:
+            regressions.append((key, current["error"]))
+        elif (
+            current["min"] > base["min"] * (1 + tolerance)
+            and current["min"] - base["min"] > NOISE_SECONDS
+        ):
+            regressions.append(
+                (
+                    key,
+                    "{:.4f}s against {:.4f}s (+{:.0%})".format(
+                        current["min"],
+                        base["min"],
+                        current["min"] / base["min"] - 1,
+                    ),
+                )
+            )
+    return regressions
+
+
+def format_results(results, baseline):
+    table = PrettyTable()
+    table.field_names = [
+        "Benchmark",
+        "Min (ms)",
+        "Median (ms)",
+        "Peak (MiB)",
+        "Baseline",
+    ]
+    table.align["Benchmark"] = "l"
+    for key, result in sorted(results.items()):
+        base = baseline.get(key, {})
+        if "error" in result:
+            table.add_row([key, "error", result["error"][:40], "", ""])
+            continue
+        table.add_row(
+            [
+                key,
+                "{:.2f}".format(result["min"] * 1000),
+                "{:.2f}".format(result["median"] * 1000),
+                "{:.1f}".format(result["peak_bytes"] / 2**20),
+                "{:.2f}".format(base["min"] * 1000) if "min" in base else "",
+            ]
+        )
+    return table.get_string()
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as baseline_file:
+        return json.load(baseline_file)["results"]
+
+
+def save_baseline(path, results):
+    with open(path, "w") as baseline_file:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": {
+                    key: {
+                        name: (
+                            round(value, 6)
+                            if isinstance(value, float)
+                            else value
+                        )
+                        for name, value in result.items()
+                    }
+                    for key, result in results.items()
+                },
+            },
+            baseline_file,
+            indent=2,
+            sort_keys=True,
+        )
+        baseline_file.write("\n")
+
+
+def get_parser():
+    from sleeper_stats_bot.constants import FONT_NAME
+
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the report builders and the rendering."
+    )
+    parser.add_argument(
+        "--teams",
+        type=int,
+        nargs="+",
+        default=DEFAULT_TEAMS,
+        help="Synthetic league sizes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--fixture",
+        help="Recorded league payloads, benchmarked instead of the "
+        "synthetic leagues (written with --record)",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="LEAGUE_ID",
+        help="Record the payloads of a live league into --fixture",
+    )
+    parser.add_argument(
+        "--weeks", type=int, default=14, help="Weeks to record or generate"
+    )
+    parser.add_argument(
+        "--benchmarks",
+        nargs="+",
+        choices=sorted(BENCHMARKS),
+        default=list(BENCHMARKS),
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument(
+        "--font", default=os.environ.get("FONT_NAME", FONT_NAME)
+    )
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--save", action="store_true", help="Save the results as baseline"
+    )
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="Exit with an error when a benchmark regresses",
+    )
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    return parser
+
+
+def main(argv=None):
+    parser = get_parser()
+    args = parser.parse_args(argv)
+
+    if args.record:
+        if not args.fixture:
+            parser.error("--record needs --fixture")
+        record_fixture(args.record, args.weeks, args.fixture)
+        return 0
+
+    if not os.path.exists(args.font):
+        parser.error("font {} not found, use --font".format(args.font))
+
+    if args.fixture:
+        payloads_list = [("fixture", load_fixture(args.fixture))]
+    else:
+        payloads_list = [
+            (
+                "{}teams".format(teams),
+                generate_payloads(teams=teams, weeks=args.weeks),
+            )
+            for teams in args.teams
+        ]
+
+    results = run_benchmarks(
+        payloads_list, args.benchmarks, args.repeat, args.font
+    )
+    baseline = load_baseline(args.baseline)
+    print(format_results(results, baseline))
+
+    if args.save:
+        save_baseline(args.baseline, results)
+        print("Baseline saved to {}".format(args.baseline))
+
+    if args.compare:
+        regressions = compare_results(results, baseline, args.tolerance)
+        for key, message in regressions:
+            print("REGRESSION {}: {}".format(key, message))
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+from tests import benchmark
+from tests.league_fixtures import generate_payloads
+
+
+def test_compare_results():
+    """
+    Tests that only slowdowns over the tolerance and new errors fail
+    :return:
+    """
+    baseline = {
+        "scores/8teams": {"min": 0.010, "median": 0.011},
+        "render/8teams": {"min": 0.040, "median": 0.041},
+        "luck/8teams": {"min": 0.001, "median": 0.001},
+        "standings/8teams": {"min": 0.005, "median": 0.005},
+        "best_and_worst/8teams": {"error": "KeyError: 'total_points'"},
+    }
+    results = {
+        "scores/8teams": {"min": 0.020, "median": 0.021},
+        "render/8teams": {"min": 0.045, "median": 0.046},
+        # Over the tolerance but under the noise floor
+        "luck/8teams": {"min": 0.0015, "median": 0.0015},
+        "standings/8teams": {"error": "ValueError: boom"},
+        "best_and_worst/8teams": {"error": "KeyError: 'total_points'"},
+    }
+
+    regressions = benchmark.compare_results(results, baseline, 0.25)
+
+    assert [key for key, _ in regressions] == [
+        "scores/8teams",
+        "standings/8teams",
+    ]
+
+
+def test_run_benchmarks():
+    """
+    Tests the scoring benchmarks over a small synthetic league
+    :return:
+    """
+    payloads = generate_payloads(
+        teams=8, weeks=2, players_num=500, stats_num=200
+    )
+
+    results = benchmark.run_benchmarks(
+        [("8teams", payloads)],
+        ["bench_beats_starters", "win_probability", "luck"],
+        2,
+        "unused.ttf",
+    )
+
+    assert sorted(results) == [
+        "bench_beats_starters/8teams",
+        "luck/8teams",
+        "win_probability/8teams",
+    ]
+    for result in results.values():
+        assert 0 < result["min"] <= result["median"]
+        assert result["peak_bytes"] > 0
@@ -1,71 +1,513 @@
 # -*- coding: utf-8 -*-
-import pytest
+import json
+import logging
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
 
-from sleeper_stats_bot import bot
+import pendulum
+import requests
 
+from sleeper_stats_bot import bot, bot_interface
+from sleeper_stats_bot.bot_interface import BotInterface
+from sleeper_stats_bot.broadcast import Broadcast
+from sleeper_stats_bot.ledger import Ledger
+from sleeper_stats_bot.report import Report
+from sleeper_stats_bot.replay import Cassette
+from tests.league_fixtures import build_cassette, generate_payloads
 
-def test_get_matchups_string():
+logger = logging.getLogger("bot_test")
+
+REPO_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+# From the import of the bot to the first tick of the phase loop, the API
+# responses replayed
+STARTUP_BUDGET_SECONDS = 1.0
+LAZY_MODULES = ["numpy", "pandas", "pilmoji", "PIL.Image"]
+COLD_START_SCRIPT = """
+import json
+import sys
+import time
+
+import sleeper_stats_bot
+import pendulum
+from clock import VirtualClock
+from replay import Cassette, FakeMessenger, replaying
+
+cassette = Cassette.load(sys.argv[1])
+clock = VirtualClock(pendulum.parse(sys.argv[2]))
+with clock, replaying(cassette, clock, FakeMessenger(clock)):
+    start = time.perf_counter()
+    import bot
+    import metrics
+
+    imported = [name for name in sys.argv[3:] if name in sys.modules]
+    schedulers, dates = bot.init(cache_backend="memory")
+    bot.run_phase_loop(
+        schedulers,
+        dates,
+        bot.bot_logger,
+        clock,
+        clock.now().add(seconds=1),
+        bot.ledger,
+    )
+    seconds = time.perf_counter() - start
+
+print(
+    json.dumps(
+        {
+            "seconds": seconds,
+            "imported": imported,
+            "sportsdata_calls": metrics.SPORTSDATA_QUOTA.get(),
+        }
+    )
+)
+"""
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+        self.text = str(payload)
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class FakeSession:
+    def __init__(self, payload):
+        self.payload = payload
+        self.urls = []
+
+    def get(self, url, **kwargs):
+        self.urls.append(url)
+        return FakeResponse(self.payload)
+
+
+def test_get_matchups_report(fixture_league):
     """
     Tests the get_matchups method
     :return:
     """
-    matchups_string = bot.get_matchups_string(442724598706860032)
-    print(matchups_string)
-    assert isinstance(matchups_string, str)
+    report = bot.get_matchups_report(fixture_league, 2, logger)
+    matchups_string = bot.render_text(report)
+    assert "Matchups - Week 2" in matchups_string
+    assert matchups_string.count(" vs ") == 4
+    assert report.title == "Matchups - Week 2"
+    assert len(report.tables[0].rows) == 4
 
 
-def test_get_scores():
-    scores_string = bot.get_scores_string(442724598706860032)
-    print(scores_string)
-    assert isinstance(scores_string, str)
+def test_get_scores(fixture_league):
+    scores_string = bot.render_text(
+        bot.get_scores_report(fixture_league, 2, "Final Scores", logger)
+    )
+    assert "Final Scores - Week 2" in scores_string
+    for user in fixture_league.get_users():
+        team_name = user.get("metadata", {}).get("team_name")
+        assert (team_name or user["display_name"]) in scores_string
 
 
-def test_get_standings():
+def test_get_matchup_report(fixture_league):
+    """
+    Tests that the matchup of a team is found by part of its name
+    :return:
+    """
+    user = fixture_league.get_users()[0]
+    team_name = user.get("metadata", {}).get("team_name")
+    team_name = team_name or user["display_name"]
+
+    matchup_string = bot.render_text(
+        bot.get_matchup_report(
+            fixture_league, 2, team_name[1:].upper(), logger
+        )
+    )
+    assert "Matchup - Week 2" in matchup_string
+    assert team_name in matchup_string
+    assert matchup_string.count("\n|") == 4
+
+    missing_string = bot.render_text(
+        bot.get_matchup_report(fixture_league, 2, "nobody", logger)
+    )
+    assert "No matchup found for" in missing_string
+
+
+def test_get_standings(fixture_league):
     """
     Tests the get_standings method
     :return:
     """
-    standings_string = bot.get_standings_string(442724598706860032)
-    print(standings_string)
-    assert isinstance(standings_string, str)
+    standings_string = bot.render_text(
+        bot.get_standings_report(fixture_league, 3, 4, logger)
+    )
+    assert "League Standings - Week 3" in standings_string
+    assert "------------" in standings_string
 
 
-@pytest.mark.skip(
-    reason="no way of currently testing this. Should be easier next season"
-)
-def test_get_close_games():
+def test_get_close_games(fixture_league):
     """
     Tests the get_close_games method
     :return:
     """
-    close_game_string = bot.get_close_games_string(355526480094113792, 20)
-    assert isinstance(close_game_string, str)
+    close_game_string = bot.render_text(
+        bot.get_close_games_report(
+            fixture_league, "2022", 3, 1000, 0.3, logger
+        )
+    )
+    assert "Close Games - Week 3" in close_game_string
+    assert "Win %" in close_game_string
 
 
-@pytest.mark.skip(
-    reason="no way of currently testing this. Should be easier next season"
-)
-def test_get_highest_score():
+def test_get_highest_score(fixture_league):
     """
     Tests the get_highest_score method
     :return:
     """
-    high_score_list = bot.get_highest_score(355526480094113792)
-    assert isinstance(high_score_list, list)
+    high_score_list = bot.get_highest_score(fixture_league, 1, logger)
+    low_score_list = bot.get_lowest_score(fixture_league, 1, logger)
     assert isinstance(high_score_list[0], float)
     assert isinstance(high_score_list[1], str)
+    assert high_score_list[0] >= low_score_list[0]
+
+
+def test_get_best_and_worst(fixture_league):
+    best_and_worst = bot.render_text(
+        bot.get_best_and_worst_report(fixture_league, "2022", 1, logger)
+    )
+    assert "Highest Scorer" in best_and_worst
+    assert "Most points left on the bench" in best_and_worst
 
 
-def test_get_best_and_worst():
-    best_and_worst = bot.get_best_and_worst_string(442724598706860032)
-    print(best_and_worst)
+def test_get_bench_points(fixture_league, league_payloads):
+    """
+    Tests that every team gets the sum of its bench
+    :return:
+    """
+    week_payloads = league_payloads["weeks"]["1"]
+
+    bench_points = bot.get_bench_points(fixture_league, "2022", 1, logger)
 
+    assert sorted(score for _, score in bench_points) == sorted(
+        bot.get_bench_scores(
+            week_payloads["matchups"], week_payloads["stats"]
+        ).values()
+    )
+    assert len({team_name for team_name, _ in bench_points}) == len(
+        league_payloads["rosters"]
+    )
 
-def test_get_current_week(api_key):
+
+def test_get_current_week():
     """
     Tests the get_current_week method
     :return:
     """
-    current_week = bot.get_current_week(api_key)
-    assert current_week > 0
-    assert current_week < 16
+    session = FakeSession(5)
+    current_week = bot.get_current_week("api-key", session, logger)
+    assert current_week == 5
+    assert session.urls[0].endswith("/CurrentWeek")
+
+
+def test_get_games_over():
+    """
+    Tests that only the teams of the games over are returned
+    :return:
+    """
+    session = FakeSession(
+        [
+            {"HomeTeam": "KC", "AwayTeam": "LV", "IsOver": True},
+            {"HomeTeam": "BUF", "AwayTeam": "MIA", "IsOver": False},
+        ]
+    )
+    games_over = bot.get_games_over("2022", 3, "api-key", session, logger)
+    assert games_over == {"KC", "LV"}
+    assert session.urls[0].endswith("/ScoresByWeek/2022/3")
+
+
+def test_render_report(fixture_league):
+    """
+    Tests that the report is rendered once by format of the platforms,
+    without an image for the text ones
+    :return:
+    """
+    report = bot.get_standings_report(fixture_league, 3, 4, logger)
+
+    rendered = bot.render_report(report, {"slack_blocks", "telegram_html"})
+
+    assert sorted(rendered) == ["slack_blocks", "telegram_html"]
+    assert rendered["telegram_html"][0].startswith(
+        "<b>League Standings - Week 3</b>"
+    )
+
+
+def test_create_bot(monkeypatch):
+    """
+    Tests that several platforms in BOT_TYPE are broadcast to
+    :return:
+    """
+    monkeypatch.setenv("DISCORD_WEBHOOK", "https://discord.com/api/1")
+    monkeypatch.setenv("TELEGRAM_WEBHOOK", "https://api.telegram.org/bot1")
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "1")
+    monkeypatch.setenv("TELEGRAM_CHAT_ID", "1")
+
+    assert type(bot.create_bot("discord")).__name__ == "Discord"
+
+    broadcast = bot.create_bot("telegram, discord")
+    assert broadcast.output_formats == {"photo", "discord_embeds"}
+    broadcast.close()
+
+
+def test_get_sleep_seconds():
+    """
+    Tests that the phase loop wakes up for the next job and prefetch
+    :return:
+    """
+
+    class Scheduler:
+        idle_seconds = 30.0
+
+    class Prefetcher:
+        def idle_seconds(self, scheduler):
+            return 10.0
+
+    assert bot.get_sleep_seconds(None) == bot.LOOP_SLEEP_SECONDS
+    assert bot.get_sleep_seconds(Scheduler()) == 30.0
+    assert bot.get_sleep_seconds(Scheduler(), Prefetcher()) == 10.0
+    Scheduler.idle_seconds = -1.0
+    assert bot.get_sleep_seconds(Scheduler()) == 0
+
+    class DraftTracker:
+        def idle_seconds(self):
+            return 5.0
+
+    assert bot.get_sleep_seconds(None, draft_tracker=DraftTracker()) == 5.0
+
+
+def test_draft_reports():
+    """
+    Tests the announcement of the picks and the board of the draft
+    :return:
+    """
+    draft = {"slot_to_roster_id": {"1": 2, "2": 1}}
+    picks = [
+        {
+            "round": 1,
+            "pick_no": 1,
+            "draft_slot": 1,
+            "roster_id": 2,
+            "metadata": {
+                "first_name": "Justin",
+                "last_name": "Jefferson",
+                "position": "WR",
+                "team": "MIN",
+            },
+        },
+        {
+            "round": 1,
+            "pick_no": 2,
+            "draft_slot": 2,
+            "roster_id": 1,
+            "player_id": "DAL",
+        },
+        {"round": 2, "pick_no": 3, "draft_slot": 2, "roster_id": 1},
+    ]
+    team_names = {"1": "Tacos", "2": "Nachos"}
+
+    report = bot.get_draft_picks_report(picks[:1], team_names, logger)
+    assert report.title == "Draft - Pick 1"
+    assert report.tables[0].rows == [
+        [1, 1, "Nachos", "Justin Jefferson (WR MIN)"]
+    ]
+
+    board = bot.get_draft_board_report(draft, picks, team_names, logger)
+    assert board.title == "Draft Board - Round 2"
+    assert board.tables[0].field_names == ["Round", "Nachos", "Tacos"]
+    assert board.tables[0].rows == [
+        [1, "Justin Jefferson (WR MIN)", "DAL"],
+        [2, "", ""],
+    ]
+
+
+def test_transactions_reports():
+    """
+    Tests the trades, the waiver results and the FAAB efficiency
+    :return:
+    """
+    players = {"4046": {"first_name": "Joe", "last_name": "Burrow"}}
+    team_names = {"1": "Tacos", "2": "Nachos"}
+    trade = {
+        "type": "trade",
+        "status": "complete",
+        "leg": 3,
+        "roster_ids": [1, 2],
+        "adds": {"4046": 2},
+        "draft_picks": [{"season": "2023", "round": 1, "owner_id": 1}],
+        "waiver_budget": [{"sender": 1, "receiver": 2, "amount": 5}],
+    }
+    waiver = {
+        "type": "waiver",
+        "status": "complete",
+        "leg": 3,
+        "roster_ids": [1],
+        "adds": {"4046": 1},
+        "drops": None,
+        "settings": {"waiver_bid": 12},
+    }
+
+    trades = bot.get_trades_report([trade], team_names, players, logger)
+    assert trades.tables[0].rows == [
+        ["Tacos", "2023 Round 1 pick"],
+        ["Nachos", "Joe Burrow (-), $5 FAAB"],
+    ]
+
+    faab = bot.get_faab_report([waiver], team_names, "2022", logger)
+    assert faab.tables[0].rows == [["Tacos", 1, 0, 12, 12.0, 100]]
+
+    waivers = bot.get_waivers_report(
+        [waiver], team_names, players, faab, logger
+    )
+    assert waivers.title == "Waivers - Week 3"
+    assert waivers.tables[0].rows == [
+        ["Tacos", "Joe Burrow (-)", 12, "Won", "-"]
+    ]
+    assert waivers.tables[1] is faab.tables[0]
+
+
+class FakePlatform(BotInterface):
+    def __init__(self, name, up=True):
+        self.name = name
+        self.up = up
+        self.sent = []
+
+    @property
+    def platforms(self):
+        return {self.name}
+
+    def send_message(self, message):
+        if not self.up:
+            raise requests.exceptions.ConnectionError("down")
+        self.sent.append(message)
+
+
+def test_send_report_records_every_platform(tmp_path, monkeypatch):
+    """
+    Tests that a report delivered to some platforms only is not recorded,
+    and that it is sent again to the other ones only
+    :return:
+    """
+    monkeypatch.setattr(bot_interface, "SEND_RETRY_BACKOFF_SECONDS", 0)
+    groupme = FakePlatform("groupme")
+    slack = FakePlatform("slack", up=False)
+    for name, value in {
+        "bot": Broadcast([groupme, slack]),
+        "bundle": None,
+        "ledger": Ledger(str(tmp_path / "ledger.sqlite")),
+        "league": SimpleNamespace(league_id="1"),
+        "week": 3,
+    }.items():
+        monkeypatch.setattr(bot, name, value, raising=False)
+    report = Report("Week Scores", highlights=["Tacos 120.5"])
+
+    bot.send_report("scores", report, logger)
+    assert not bot.ledger.was_sent("scores", "1", 3)
+    assert bot.ledger.was_sent("scores@groupme", "1", 3)
+
+    slack.up = True
+    bot.send_report("scores", report, logger)
+    bot.send_report("scores", report, logger)
+    bot.bot.close()
+
+    assert bot.ledger.was_sent("scores", "1", 3)
+    assert len(groupme.sent) == 1
+    assert groupme.sent == slack.sent
+
+
+def test_send_pdf_report_link_records_delivery(tmp_path, monkeypatch):
+    """
+    Tests that the PDF report link is recorded only for the platforms it
+    was delivered to, and that a new link is not sent again to them
+    :return:
+    """
+    monkeypatch.setattr(bot_interface, "SEND_RETRY_BACKOFF_SECONDS", 0)
+    groupme = FakePlatform("groupme")
+    slack = FakePlatform("slack", up=False)
+    links = iter(["https://example.com/1.pdf", "https://example.com/2.pdf"])
+    for name, value in {
+        "bot": Broadcast([groupme, slack]),
+        "bundle": None,
+        "ledger": Ledger(str(tmp_path / "ledger.sqlite")),
+        "league": SimpleNamespace(league_id="1"),
+        "season": "2022",
+        "week": 3,
+        "get_pdf_report_link": lambda *args: next(links),
+    }.items():
+        monkeypatch.setattr(bot, name, value, raising=False)
+
+    bot.send_pdf_report_link(logger)
+    assert not bot.ledger.was_sent("pdf_report", "1", 3)
+    assert bot.ledger.was_sent("pdf_report@groupme", "1", 3)
+
+    slack.up = True
+    bot.send_pdf_report_link(logger)
+    bot.bot.close()
+
+    assert bot.ledger.was_sent("pdf_report", "1", 3)
+    assert groupme.sent == ["https://example.com/1.pdf"]
+    assert slack.sent == ["https://example.com/2.pdf"]
+
+
+def test_cold_start(tmp_path):
+    """
+    Tests that a fresh process reaches the first tick within the startup
+    budget, without loading the report dependencies nor creating the
+    request cache, and that a restart boots from the warm snapshot
+    without calling sportsdata.io
+    :return:
+    """
+    payloads = generate_payloads(
+        teams=8, weeks=2, players_num=500, stats_num=200
+    )
+    season_start = pendulum.datetime(2022, 9, 8, tz="America/Chicago")
+    cassette_path = str(tmp_path / "cassette.jsonl")
+    build_cassette(payloads, season_start, Cassette(cassette_path))
+    environ = dict(
+        os.environ,
+        PYTHONPATH=REPO_PATH,
+        BOT_TYPE="telegram",
+        TELEGRAM_WEBHOOK="test",
+        TELEGRAM_BOT_TOKEN="test",
+        TELEGRAM_CHAT_ID="test",
+        API_KEY="test",
+        DEBUG="",
+        LEAGUE_ID=payloads["league"]["league_id"],
+        STORE_PATH=str(tmp_path / "store.sqlite"),
+        QUOTA_PATH=str(tmp_path / "quota.sqlite"),
+    )
+
+    # Away from the job times, no report runs on the first tick
+    boot_at = season_start.add(days=1, hours=9)
+
+    def start():
+        completed = subprocess.run(
+            [sys.executable, "-c", COLD_START_SCRIPT, cassette_path]
+            + [boot_at.to_iso8601_string()]
+            + LAZY_MODULES,
+            cwd=str(tmp_path),
+            env=environ,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return json.loads(completed.stdout.splitlines()[-1])
+
+    cold = start()
+    boot_at = boot_at.add(hours=1)
+    warm = start()
+
+    assert cold["imported"] == []
+    assert cold["seconds"] < STARTUP_BUDGET_SECONDS
+    assert cold["sportsdata_calls"] == 4
+    assert warm["sportsdata_calls"] == 0
+    assert not os.path.exists(tmp_path / "api_cache.sqlite")
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+import requests
+
+from sleeper_stats_bot import bot_interface
+from sleeper_stats_bot.bot_interface import BotInterface
+from sleeper_stats_bot.broadcast import Broadcast
+
+RENDERED = {"photo": b"PNG", "text": "| Team | Pts |"}
+
+
+class FakeBot(BotInterface):
+    def __init__(self, output_format, failures=0, seconds=0, name="fake"):
+        self.output_format = output_format
+        self.name = name
+        self.failures = failures
+        self.seconds = seconds
+        self.sent = []
+        self.threads = set()
+
+    @property
+    def platforms(self):
+        return {self.name}
+
+    def _deliver(self, content):
+        self.threads.add(threading.get_ident())
+        time.sleep(self.seconds)
+        if self.failures:
+            self.failures -= 1
+            raise requests.exceptions.ConnectionError("down")
+        self.sent.append(content)
+
+    def send_photo(self, photo):
+        self._deliver(photo)
+
+    def send_message(self, message):
+        self._deliver(message)
+
+
+def test_broadcast_delivers_every_format_concurrently():
+    """
+    Tests that every target gets the report in its format, at the same
+    time as the others
+    :return:
+    """
+    photo = FakeBot("photo", seconds=0.3, name="telegram")
+    text = FakeBot("text", seconds=0.3, name="groupme")
+    broadcast = Broadcast([photo, text])
+
+    start = time.perf_counter()
+    assert broadcast.send_report(RENDERED)
+    elapsed = time.perf_counter() - start
+    broadcast.close()
+
+    assert broadcast.output_formats == {"photo", "text"}
+    assert photo.sent == [b"PNG"]
+    assert text.sent == ["| Team | Pts |"]
+    assert photo.threads != text.threads
+    assert elapsed < 0.5
+
+
+def test_broadcast_retries_every_target_independently(monkeypatch):
+    """
+    Tests that a failing target is retried without posting twice to the
+    others, and that a report is delivered only when every target has it
+    :return:
+    """
+    monkeypatch.setattr(bot_interface, "SEND_RETRY_BACKOFF_SECONDS", 0)
+    flaky = FakeBot("text", failures=2, name="groupme")
+    down = FakeBot("text", failures=10, name="slack")
+    steady = FakeBot("photo", name="telegram")
+    broadcast = Broadcast([flaky, down, steady])
+
+    assert not broadcast.send_report(RENDERED, attempts=3)
+
+    assert flaky.sent == ["| Team | Pts |"]
+    assert down.sent == []
+    assert steady.sent == [b"PNG"]
+    assert not down.send_report(RENDERED, attempts=2)
+
+    # The retry skips the platforms that already have the report
+    down.failures = 0
+    skip = {"groupme", "telegram"}
+    assert broadcast.deliver_report(RENDERED, skip=skip) == {"slack"}
+    broadcast.close()
+
+    assert flaky.sent == ["| Team | Pts |"]
+    assert down.sent == ["| Team | Pts |"]
+    assert steady.sent == [b"PNG"]
+
+
+def test_report_of_several_messages_is_posted_in_order(monkeypatch):
+    """
+    Tests that the messages of a report are posted one by one, and that
+    a message not delivered stops the report
+    :return:
+    """
+    monkeypatch.setattr(bot_interface, "SEND_RETRY_BACKOFF_SECONDS", 0)
+    flaky = FakeBot("text", failures=1)
+
+    assert flaky.send_report({"text": ["one", "two"]}, attempts=2)
+    assert flaky.sent == ["one", "two"]
+
+    flaky.failures = 2
+    assert not flaky.send_report({"text": ["three", "four"]}, attempts=2)
+    assert flaky.sent == ["one", "two"]
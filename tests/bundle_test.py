@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+import pendulum
+import schedule
+
+from sleeper_stats_bot.bot_interface import BotInterface
+from sleeper_stats_bot.bundle import ReportBundle
+from sleeper_stats_bot.clock import VirtualClock
+from sleeper_stats_bot.report import Report
+
+# A Tuesday
+START = pendulum.datetime(2022, 9, 13, 11, 0, tz="America/Chicago")
+
+
+class FakeBot(BotInterface):
+    def __init__(self):
+        self.bundles = []
+
+    def send_bundle(self, items, **kwargs):
+        self.bundles.append(items)
+        return [item != "down" for item in items]
+
+
+def test_bundle_is_due_after_the_last_job_of_the_window():
+    """
+    Tests that the bundle waits for the jobs due before its window closes
+    :return:
+    """
+    clock = VirtualClock(START)
+
+    with clock:
+        scheduler = schedule.Scheduler()
+        scheduler.every().tuesday.at("11:10").do(print).tag("standings")
+        scheduler.every().tuesday.at("11:30").do(print).tag("luck")
+        bundle = ReportBundle(15 * 60, lambda report: {"photo": b"PNG"})
+
+        assert not bundle.is_due(scheduler)
+        bundle.add("scores:Week Scores", Report("Week Scores"), "1")
+        assert not bundle.is_due(scheduler)
+
+        clock.sleep(10 * 60, scheduler)
+        scheduler.run_pending()
+        assert bundle.is_due(scheduler)
+        assert bundle.is_due(None)
+
+
+def test_bundle_renders_in_parallel_and_keeps_the_order():
+    """
+    Tests that the reports are rendered concurrently and posted with the
+    notes in the order they were added
+    :return:
+    """
+    threads = set()
+
+    def render(report):
+        threads.add(threading.get_ident())
+        time.sleep(0.2)
+        return {"photo": report.title}
+
+    bot = FakeBot()
+    bundle = ReportBundle(900, render)
+    bundle.add("scores", Report("Scores"), "1")
+    bundle.add("standings", Report("Standings"), "2")
+    bundle.add("pdf_report", "down", "3")
+    bundle.add("luck", Report("Luck"), "4")
+
+    start = time.perf_counter()
+    assert bundle.send(bot) == [
+        ("scores", "1", True),
+        ("standings", "2", True),
+        ("pdf_report", "3", False),
+        ("luck", "4", True),
+    ]
+    assert time.perf_counter() - start < 0.5
+    assert len(threads) == 3
+    assert bot.bundles == [
+        [
+            {"photo": "Scores"},
+            {"photo": "Standings"},
+            "down",
+            {"photo": "Luck"},
+        ]
+    ]
+    assert len(bundle) == 0
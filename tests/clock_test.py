@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+import pendulum
+import schedule
+
+from sleeper_stats_bot.clock import VirtualClock
+
+START = pendulum.datetime(2022, 9, 8, 10, tz="America/Chicago")
+
+
+def test_virtual_clock_drives_schedule_and_pendulum():
+    """
+    Tests that pendulum and schedule follow the virtual time
+    :return:
+    """
+    runs = []
+    scheduler = schedule.Scheduler()
+
+    with VirtualClock(START) as clock:
+        scheduler.every().day.at("17:00").do(
+            lambda: runs.append(pendulum.now("America/Chicago"))
+        )
+        assert pendulum.today("UTC") == START.in_timezone("UTC").start_of(
+            "day"
+        )
+
+        clock.set(START.add(hours=7))
+        scheduler.run_pending()
+
+    assert runs == [START.add(hours=7)]
+    assert pendulum.now() > START.add(years=1)
+
+
+def test_virtual_sleep_skips_idle_time():
+    """
+    Tests that sleeping jumps to the next job, but not over midnight
+    :return:
+    """
+    scheduler = schedule.Scheduler()
+
+    with VirtualClock(START) as clock:
+        scheduler.every().day.at("17:00").do(lambda: None)
+        clock.sleep(50, scheduler)
+        assert clock.now() == START.add(hours=7)
+
+        clock.sleep(50, scheduler)
+        assert clock.now() == START.add(hours=7, seconds=50)
+
+        scheduler.run_pending()
+        clock.sleep(50, scheduler)
+        assert clock.now() == START.add(days=1).start_of("day")
+
+        clock.sleep(50)
+        assert clock.now() == START.add(days=1).start_of("day").add(seconds=50)
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import hmac
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+import pytest
+import requests
+
+from sleeper_stats_bot.command_server import (
+    RATE_LIMITED_MESSAGE,
+    ChatRateLimiter,
+    CommandHandler,
+    CommandServer,
+    RenderCache,
+    start_command_server,
+)
+from sleeper_stats_bot.constants import COMMAND_MAX_BODY_BYTES
+from sleeper_stats_bot.renderers import TELEGRAM_MESSAGE_CHARS
+
+logger = logging.getLogger("command_server_test")
+
+SLACK_SECRET = "slack-secret"
+TELEGRAM_SECRET = "telegram-secret"
+
+
+class FakeLeague:
+    """
+    Commands counting the builds of their answers
+    """
+
+    def __init__(self):
+        self.builds = []
+        self._lock = threading.Lock()
+
+    def scores(self, argument):
+        with self._lock:
+            self.builds.append(("scores", argument))
+        time.sleep(0.2)
+        return "Team A 100 - Team B 90"
+
+    def matchup(self, argument):
+        with self._lock:
+            self.builds.append(("matchup", argument))
+        return "Team {} 100".format(argument)
+
+    def standings(self, argument):
+        raise requests.exceptions.ConnectionError("down")
+
+    def players(self, argument):
+        return "\n".join("Player {} <Tacos>".format(i) for i in range(1000))
+
+
+@pytest.fixture
+def league():
+    return FakeLeague()
+
+
+@pytest.fixture
+def server(league):
+    handler = CommandHandler(
+        {
+            "scores": league.scores,
+            "matchup": league.matchup,
+            "standings": league.standings,
+            "players": league.players,
+        },
+        logger,
+        limiter=ChatRateLimiter(per_minute=5),
+    )
+    server = CommandServer(
+        ("127.0.0.1", 0),
+        handler,
+        telegram_secret=TELEGRAM_SECRET,
+        slack_signing_secret=SLACK_SECRET,
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post_telegram(server, chat_id, text, secret=TELEGRAM_SECRET):
+    # Same update as the Telegram webhook
+    return requests.post(
+        "http://127.0.0.1:{}/telegram".format(server.server_port),
+        json={
+            "update_id": 1,
+            "message": {"chat": {"id": chat_id}, "text": text},
+        },
+        headers={"X-Telegram-Bot-Api-Secret-Token": secret},
+        timeout=5,
+    )
+
+
+def test_telegram_commands_are_answered_from_the_cache(server, league):
+    """
+    Tests that concurrent commands build their answer once, answered in
+    the webhook response
+    :return:
+    """
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        responses = list(
+            executor.map(
+                lambda chat_id: post_telegram(server, chat_id, "/scores"),
+                range(4),
+            )
+        )
+
+    start = time.perf_counter()
+    cached = post_telegram(server, 9, "/scores@StatsBot")
+    assert time.perf_counter() - start < 0.2
+
+    assert league.builds == [("scores", "")]
+    for chat_id, response in enumerate(responses):
+        assert response.json() == {
+            "method": "sendMessage",
+            "chat_id": chat_id,
+            "text": "<pre>Team A 100 - Team B 90</pre>",
+            "parse_mode": "HTML",
+        }
+    assert cached.json()["text"] == "<pre>Team A 100 - Team B 90</pre>"
+
+
+def test_telegram_arguments_errors_and_other_messages(server, league):
+    """
+    Tests the arguments, the failed commands and the other messages
+    :return:
+    """
+    response = post_telegram(server, 1, "/matchup <Tacos>")
+    assert response.json()["text"] == "<pre>Team &lt;Tacos&gt; 100</pre>"
+
+    response = post_telegram(server, 1, "/standings")
+    assert "not available" in response.json()["text"]
+
+    assert post_telegram(server, 1, "hello").content == b""
+    assert post_telegram(server, 1, "/unknown").content == b""
+    assert "/matchup" in post_telegram(server, 1, "/help").json()["text"]
+    assert post_telegram(server, 1, "/scores", "wrong").status_code == 403
+
+
+def test_long_telegram_answers_are_split(server, monkeypatch):
+    """
+    Tests that an answer longer than a Telegram message is sent message
+    by message with the bot token, cut to its first message without it
+    :return:
+    """
+    sent = []
+    monkeypatch.setattr(
+        server, "send_telegram", lambda *args: sent.append(args)
+    )
+
+    response = post_telegram(server, 1, "/players")
+    assert response.json()["text"].startswith("<pre>Player 0 &lt;Tacos&gt;")
+    assert len(response.json()["text"]) <= TELEGRAM_MESSAGE_CHARS
+    assert sent == []
+
+    server.telegram_token = "token"
+    assert post_telegram(server, 1, "/players").content == b""
+    assert len(sent) > 1
+    assert all(
+        chat_id == 1
+        and len(message) <= TELEGRAM_MESSAGE_CHARS
+        and message.startswith("<pre>")
+        and message.endswith("</pre>")
+        for chat_id, message in sent
+    )
+    text = "".join(message for _, message in sent)
+    assert text.count("Player ") == 1000
+
+
+def test_commands_are_rate_limited_by_chat(server):
+    """
+    Tests that a chat over its limit is told so, the others still answered
+    :return:
+    """
+    texts = [
+        post_telegram(server, 1, "/matchup A").json()["text"] for _ in range(6)
+    ]
+
+    assert texts[:5] == ["<pre>Team A 100</pre>"] * 5
+    assert texts[5] == "<pre>{}</pre>".format(RATE_LIMITED_MESSAGE)
+    assert post_telegram(server, 2, "/matchup A").json()["text"] == (
+        "<pre>Team A 100</pre>"
+    )
+
+
+def post_slack(server, body, secret=SLACK_SECRET, timestamp=None):
+    timestamp = str(int(timestamp or time.time()))
+    signature = (
+        "v0="
+        + hmac.new(
+            secret.encode(),
+            "v0:{}:{}".format(timestamp, body).encode(),
+            hashlib.sha256,
+        ).hexdigest()
+    )
+    return requests.post(
+        "http://127.0.0.1:{}/slack".format(server.server_port),
+        data=body,
+        headers={
+            "Content-Type": "application/x-www-form-urlencoded",
+            "X-Slack-Request-Timestamp": timestamp,
+            "X-Slack-Signature": signature,
+        },
+        timeout=5,
+    )
+
+
+def test_slack_slash_commands_are_signed(server):
+    """
+    Tests that the signed slash commands are answered, the others refused
+    :return:
+    """
+    body = urlencode(
+        {"command": "/matchup", "text": "Tacos", "channel_id": "C1"}
+    )
+
+    response = post_slack(server, body)
+    assert response.json() == {
+        "response_type": "in_channel",
+        "text": "```\nTeam Tacos 100\n```",
+    }
+    assert post_slack(server, body, secret="wrong").status_code == 403
+    assert post_slack(server, body, timestamp=1).status_code == 403
+
+
+def test_malformed_and_unauthenticated_requests_are_refused(server):
+    """
+    Tests that the bodies that are not JSON or too large, and the
+    endpoints without their secret, are refused
+    :return:
+    """
+    url = "http://127.0.0.1:{}/telegram".format(server.server_port)
+    headers = {"X-Telegram-Bot-Api-Secret-Token": TELEGRAM_SECRET}
+
+    response = requests.post(url, data=b"{not json", headers=headers)
+    assert response.status_code == 400
+    response = requests.post(url, data=b"[]", headers=headers)
+    assert response.status_code == 400
+    response = requests.post(
+        url, data=b" " * (COMMAND_MAX_BODY_BYTES + 1), headers=headers
+    )
+    assert response.status_code == 413
+
+    server.telegram_secret = None
+    assert post_telegram(server, 1, "/matchup A").status_code == 403
+    assert post_telegram(server, 1, "/matchup A", secret="").status_code == (
+        403
+    )
+
+
+def test_command_server_needs_a_secret():
+    """
+    Tests that the server does not start without any secret
+    :return:
+    """
+    assert start_command_server(0, {}, logger) is None
+
+    server = start_command_server(
+        0, {}, logger, host="127.0.0.1", slack_signing_secret=SLACK_SECRET
+    )
+    server.shutdown()
+    server.server_close()
+    assert server.telegram_secret is None
+
+
+def test_render_cache_expires():
+    """
+    Tests that the answers are rebuilt after ttl_seconds
+    :return:
+    """
+    now = [0.0]
+    cache = RenderCache(ttl_seconds=60, now=lambda: now[0])
+    builds = []
+
+    def build():
+        builds.append(now[0])
+        return "answer {}".format(len(builds))
+
+    assert cache.get(("scores", ""), build) == "answer 1"
+    now[0] = 59
+    assert cache.get(("scores", ""), build) == "answer 1"
+    now[0] = 60
+    assert cache.get(("scores", ""), build) == "answer 2"
+    assert builds == [0.0, 60]
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from tests.league_fixtures import (
+    FixtureLeague,
+    FixturePlayers,
+    FixtureStats,
+    generate_payloads,
+)
+
+
+@pytest.fixture(scope="session")
+def league_payloads():
+    return generate_payloads(teams=8, weeks=3, players_num=1000, stats_num=300)
+
+
+@pytest.fixture
+def fixture_league(league_payloads, monkeypatch):
+    """
+    A FixtureLeague, with the Stats and Players used by the bot serving
+    the same payloads and the image sizing replaced, no font needed.
+    """
+    from sleeper_stats_bot import bot
+
+    monkeypatch.setattr(bot, "Stats", lambda: FixtureStats(league_payloads))
+    monkeypatch.setattr(
+        bot, "Players", lambda: FixturePlayers(league_payloads)
+    )
+    monkeypatch.setattr(bot, "get_table_size", lambda text, *args: (550, 100))
+    return FixtureLeague(league_payloads)
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+
+from sleeper_stats_bot import decoding
+
+STATS_JSON = json.dumps(
+    {
+        "4034": {
+            "pts_half_ppr": 20.5,
+            "rec_fd": 4,
+            "rec_yd": 112.0,
+            "off_snp": 61,
+        },
+        "TB": {"pts_half_ppr": -2.0, "def_td": 0},
+        "1234": None,
+    }
+).encode("utf-8")
+
+EXPECTED_STATS = {
+    "4034": {"pts_half_ppr": 20.5, "rec_fd": 4},
+    "TB": {"pts_half_ppr": -2.0},
+    "1234": None,
+}
+
+
+@pytest.mark.parametrize("parser", ["json", "orjson"])
+def test_decode_keeps_known_fields(parser, monkeypatch):
+    """
+    Tests that only the fields read by the reports are kept
+    :return:
+    """
+    if parser == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(decoding, "orjson", None)
+    monkeypatch.setattr(decoding, "msgspec", None)
+    decoder = decoding.RecordsDecoder(
+        "StatsRecord", decoding.STAT_FIELDS, float
+    )
+
+    assert decoder.decode(STATS_JSON) == EXPECTED_STATS
+
+
+def test_msgspec_decode_is_typed():
+    """
+    Tests the typed decoding, which rejects values of the wrong type
+    :return:
+    """
+    msgspec = pytest.importorskip("msgspec")
+    decoder = decoding.RecordsDecoder(
+        "StatsRecord", decoding.STAT_FIELDS, float
+    )
+
+    assert decoder.decode(STATS_JSON) == EXPECTED_STATS
+    with pytest.raises(msgspec.ValidationError):
+        decoder.decode(b'{"4034": {"pts_half_ppr": "twenty"}}')
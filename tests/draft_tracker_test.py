@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+import logging
+
+import requests
+
+from sleeper_stats_bot import draft_tracker
+from sleeper_stats_bot.draft_tracker import DraftTracker, get_poll_seconds
+from sleeper_stats_bot.store import Store
+
+logger = logging.getLogger("draft_tracker_test")
+
+DRAFT_URL = "https://api.sleeper.app/v1/draft/42"
+
+
+class FakeClient:
+    def __init__(self):
+        self.draft = {
+            "status": "drafting",
+            "last_picked": None,
+            "settings": {"pick_timer": 90, "teams": 2},
+        }
+        self.picks = []
+        self.calls = []
+
+    def fetch(self, url, refresh=False):
+        self.calls.append((url, refresh))
+        if url == DRAFT_URL:
+            return self.draft
+        return self.picks
+
+    def pick(self, pick_no):
+        self.picks.append({"pick_no": pick_no, "round": 1})
+        self.draft["last_picked"] = pick_no * 1000
+
+
+class Clock:
+    now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_draft_tracker_fetches_only_the_new_picks(monkeypatch, tmp_path):
+    """
+    Tests that the picks are fetched once the draft has a new one, only
+    the ones after the cursor announced, even after a restart
+    :return:
+    """
+    client = FakeClient()
+    monkeypatch.setattr(draft_tracker, "get_client", lambda: client)
+    store = Store(str(tmp_path / "store.sqlite"))
+    announced = []
+
+    def announce(draft, new, picks):
+        announced.append(new)
+        return True
+
+    tracker = DraftTracker("42", announce, logger, store)
+
+    assert tracker.poll() == []
+    assert client.calls == [(DRAFT_URL, True)]
+
+    client.pick(1)
+    client.pick(2)
+    assert [pick["pick_no"] for pick in tracker.poll()] == [1, 2]
+    assert tracker.poll() == []
+    assert len(client.calls) == 4
+
+    client.pick(3)
+    tracker = DraftTracker("42", announce, logger, store)
+    assert [pick["pick_no"] for pick in tracker.poll()] == [3]
+    assert [[pick["pick_no"] for pick in new] for new in announced] == [
+        [1, 2],
+        [3],
+    ]
+    store.close()
+
+
+def test_draft_tracker_retries_the_picks_not_delivered(monkeypatch):
+    """
+    Tests that the cursor stays on the picks not delivered, announced
+    again at the next poll
+    :return:
+    """
+    client = FakeClient()
+    monkeypatch.setattr(draft_tracker, "get_client", lambda: client)
+    delivered = [False]
+    announced = []
+
+    def announce(draft, new, picks):
+        announced.append([pick["pick_no"] for pick in new])
+        return delivered[0]
+
+    tracker = DraftTracker("42", announce, logger)
+    tracker.poll()
+    client.pick(1)
+    assert tracker.poll() == []
+    assert tracker.cursor == 0
+
+    client.pick(2)
+    delivered[0] = True
+    assert [pick["pick_no"] for pick in tracker.poll()] == [1, 2]
+    assert announced == [[1], [1, 2]]
+    assert tracker.cursor == 2
+
+
+def test_draft_tracker_started_during_the_draft(monkeypatch, tmp_path):
+    """
+    Tests that a tracker without a cursor does not announce the picks
+    made before its first poll, only the next ones
+    :return:
+    """
+    client = FakeClient()
+    monkeypatch.setattr(draft_tracker, "get_client", lambda: client)
+    store = Store(str(tmp_path / "store.sqlite"))
+    announced = []
+
+    def announce(draft, new, picks):
+        announced.append([pick["pick_no"] for pick in new])
+        return True
+
+    client.pick(1)
+    client.pick(2)
+    tracker = DraftTracker("42", announce, logger, store)
+    assert tracker.poll() == []
+    assert store.get("draft_cursor", "42") == 2
+
+    client.pick(3)
+    assert [pick["pick_no"] for pick in tracker.poll()] == [3]
+    assert announced == [[3]]
+    store.close()
+
+
+def test_get_poll_seconds():
+    """
+    Tests that the polls follow the pick clock and the start of the draft
+    :return:
+    """
+    drafting = {"status": "drafting", "settings": {"pick_timer": 90}}
+    assert get_poll_seconds(drafting, 0) == 15
+    drafting["settings"]["pick_timer"] = 10
+    assert get_poll_seconds(drafting, 0) == 5
+    drafting["settings"]["pick_timer"] = 8 * 3600
+    assert get_poll_seconds(drafting, 0) == 60
+
+    pre_draft = {"status": "pre_draft", "start_time": 600 * 1000}
+    assert get_poll_seconds(pre_draft, 0) == 600
+    assert get_poll_seconds(pre_draft, -7200) == 3600
+    assert get_poll_seconds({"status": "complete"}, 0) is None
+
+
+def test_draft_tracker_backs_off_and_stops(monkeypatch):
+    """
+    Tests that a failed poll is retried later and that the tracker stops
+    once the draft is complete
+    :return:
+    """
+    client = FakeClient()
+    failures = [requests.exceptions.ConnectionError("down")]
+
+    def fetch(url, refresh=False):
+        if failures:
+            raise failures.pop()
+        return FakeClient.fetch(client, url, refresh)
+
+    client.fetch = fetch
+    monkeypatch.setattr(draft_tracker, "get_client", lambda: client)
+    clock = Clock()
+    tracker = DraftTracker("42", None, logger, now=clock)
+
+    assert tracker.idle_seconds() == 0
+    assert tracker.run_due() == []
+    assert tracker.idle_seconds() == 10
+    assert tracker.run_due() == []
+    assert client.calls == []
+
+    clock.now += 10
+    tracker.run_due()
+    assert tracker.idle_seconds() == 15
+
+    client.draft["status"] = "complete"
+    clock.now += 15
+    tracker.run_due()
+    assert tracker.done
+    assert tracker.idle_seconds() is None
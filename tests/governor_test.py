@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+import requests
+
+from sleeper_stats_bot.governor import (
+    LOW,
+    GovernedAdapter,
+    Governor,
+    QuotaExceeded,
+    low_priority,
+)
+
+BUDGETS = {
+    "sportsdata": {"month": (100, 30 * 86400)},
+    "sleeper": {"minute": (10, 60)},
+}
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def get_governor(path, fake_time, **kwargs):
+    return Governor(
+        path,
+        BUDGETS,
+        now=fake_time.time,
+        sleep=fake_time.sleep,
+        **kwargs,
+    )
+
+
+def take_calls(path, provider, calls):
+    governor = Governor(path, BUDGETS)
+    for _ in range(calls):
+        governor.acquire(provider)
+    governor.close()
+
+
+def test_quota_is_shared_through_the_file(tmp_path):
+    """
+    Tests that the calls of every process take the same budget
+    :return:
+    """
+    path = str(tmp_path / "quota.sqlite")
+    Governor(path, BUDGETS).close()
+
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        futures = [
+            pool.submit(take_calls, path, "sportsdata", 10) for _ in range(2)
+        ]
+        for future in futures:
+            future.result()
+
+    # A restart keeps the accounting
+    assert Governor(path, BUDGETS).remaining("sportsdata") == {"month": 80}
+
+
+def test_short_budget_defers_the_call(tmp_path):
+    """
+    Tests that a call waits for the refill of a per minute budget
+    :return:
+    """
+    fake_time = FakeTime()
+    governor = get_governor(str(tmp_path / "quota.sqlite"), fake_time)
+
+    for _ in range(11):
+        governor.acquire("sleeper")
+
+    assert fake_time.sleeps == [pytest.approx(6.0)]
+    assert governor.remaining("sleeper") == {"minute": 0}
+
+    fake_time.now += 60
+    assert governor.remaining("sleeper") == {"minute": 10}
+
+
+def test_exhausted_budget_refuses_the_call(tmp_path):
+    """
+    Tests that a call is refused when the budget refills too late
+    :return:
+    """
+    fake_time = FakeTime()
+    governor = get_governor(str(tmp_path / "quota.sqlite"), fake_time)
+    for _ in range(100):
+        governor.acquire("sportsdata")
+
+    with pytest.raises(QuotaExceeded):
+        governor.acquire("sportsdata")
+
+    assert fake_time.sleeps == []
+    # Unknown providers are not governed
+    governor.acquire("telegram")
+
+
+def test_low_priority_leaves_the_reserve(tmp_path):
+    """
+    Tests that the low priority calls are refused first
+    :return:
+    """
+    fake_time = FakeTime()
+    governor = get_governor(
+        str(tmp_path / "quota.sqlite"), fake_time, reserve=0.2
+    )
+    for _ in range(80):
+        governor.acquire("sportsdata", LOW)
+
+    with low_priority():
+        with pytest.raises(QuotaExceeded):
+            governor.acquire("sportsdata")
+    governor.acquire("sportsdata")
+
+    assert governor.remaining("sportsdata") == {"month": 19}
+
+
+def test_governed_adapter_refuses_before_sending(tmp_path):
+    """
+    Tests that a refused call never reaches the network
+    :return:
+    """
+    fake_time = FakeTime()
+    governor = get_governor(
+        str(tmp_path / "quota.sqlite"), fake_time, max_wait=0
+    )
+    for _ in range(10):
+        governor.acquire("sleeper")
+    session = requests.Session()
+    session.mount("http://", GovernedAdapter(governor, "sleeper"))
+
+    # Nothing listens on the discard port
+    with pytest.raises(QuotaExceeded):
+        session.get("http://127.0.0.1:9/v1/state/nfl")
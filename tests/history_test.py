@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+from sleeper_stats_bot import history
+from sleeper_stats_bot.store import Store
+
+LEAGUES = {
+    "2022": {
+        "league_id": "2022",
+        "season": "2022",
+        "previous_league_id": "2021",
+        "settings": {"playoff_week_start": 3},
+    },
+    "2021": {
+        "league_id": "2021",
+        "season": "2021",
+        "previous_league_id": "2020",
+        "settings": {"playoff_week_start": 3},
+    },
+    "2020": {
+        "league_id": "2020",
+        "season": "2020",
+        "previous_league_id": None,
+        "settings": {"playoff_week_start": 2},
+    },
+}
+
+ROSTERS = [
+    {"roster_id": 1, "owner_id": "ann"},
+    {"roster_id": 2, "owner_id": "bob"},
+]
+
+CALLS = []
+
+
+class FakeLeague:
+    def __init__(self, league_id):
+        self.league_id = league_id
+
+    def get_league(self):
+        CALLS.append(("league", self.league_id))
+        return LEAGUES[self.league_id]
+
+    def get_rosters(self):
+        return ROSTERS
+
+    def get_matchups(self, week):
+        CALLS.append(("matchups", self.league_id, week))
+        # ann wins the odd weeks, bob the even ones
+        return [
+            {"roster_id": 1, "matchup_id": 1, "points": 100 + week % 2},
+            {"roster_id": 2, "matchup_id": 1, "points": 100 + 1 - week % 2},
+        ]
+
+
+def test_build_history_index(tmp_path, monkeypatch):
+    """
+    Tests the all-time record across the league chain and the current
+    season completed weeks
+    :return:
+    """
+    monkeypatch.setattr(history, "League", FakeLeague)
+    CALLS.clear()
+
+    history_index = history.build_history_index(
+        FakeLeague("2022"), 2, Store(str(tmp_path / "store.sqlite"))
+    )
+
+    # 2020: week 1, 2021: weeks 1-2, 2022: week 1
+    assert history_index.get_record("ann", "bob") == [3, 1, 0, 403.0, 401.0]
+    assert history_index.get_record("bob", "ann")[:3] == [1, 3, 0]
+    assert history_index.get_record("ann", "nobody") == [0, 0, 0, 0.0, 0.0]
+    assert history_index.get_franchise("bob") == {
+        "2020": [0, 1, 0, 100.0],
+        "2021": [1, 1, 0, 201.0],
+        "2022": [0, 1, 0, 100.0],
+    }
+
+
+def test_past_seasons_are_fetched_once(tmp_path, monkeypatch):
+    """
+    Tests that past seasons are served from the store
+    :return:
+    """
+    monkeypatch.setattr(history, "League", FakeLeague)
+    store = Store(str(tmp_path / "store.sqlite"))
+    CALLS.clear()
+
+    history.get_past_seasons(FakeLeague("2022"), store)
+    first_calls = len(CALLS)
+    seasons = history.get_past_seasons(FakeLeague("2022"), store)
+
+    assert len(CALLS) == first_calls + 1
+    assert sorted(season["season"] for season in seasons) == ["2020", "2021"]
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+import gzip
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from requests_cache.policy.expiration import get_url_expiration
+from sleeper_wrapper.base_api import BaseApi
+
+from sleeper_stats_bot import http_client
+from sleeper_stats_bot.constants import SLEEPER_REVALIDATE_SECONDS
+
+PLAYERS = {"4034": {"first_name": "Christian", "last_name": "McCaffrey"}}
+
+
+class CompressedHandler(BaseHTTPRequestHandler):
+    # Keeps the connections alive between requests
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        self.server.encodings.append(self.headers.get("Accept-Encoding"))
+        if self.path == "/slow":
+            time.sleep(0.3)
+        if self.path == "/missing":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = gzip.compress(json.dumps(PLAYERS).encode("utf-8"))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CompressedHandler)
+    server.connections = set()
+    server.encodings = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def installed_client(monkeypatch):
+    # Restored after the test, the wrapper calls requests.get again
+    monkeypatch.setattr(BaseApi, "_call", BaseApi._call)
+    monkeypatch.setattr(http_client, "_client", http_client.SleeperClient())
+    # Without the request cache, every call reaches the server
+    monkeypatch.setattr(
+        http_client.requests, "Session", requests.sessions.Session
+    )
+    client = http_client.install_sleeper_client(pool_size=2, timeout=5)
+    yield client
+    client.close()
+
+
+def test_wrapper_calls_reuse_one_compressed_connection(
+    server, installed_client
+):
+    """
+    Tests that sleeper_wrapper calls share a kept alive connection and
+    accept compressed responses
+    :return:
+    """
+    url = "http://127.0.0.1:{}/players/nfl".format(server.server_port)
+
+    for _ in range(3):
+        assert BaseApi()._call(url) == PLAYERS
+
+    assert len(server.connections) == 1
+    assert all("gzip" in encoding for encoding in server.encodings)
+    assert http_client.get_client() is installed_client
+
+
+def test_wrapper_calls_return_http_errors(server, installed_client):
+    """
+    Tests that the HTTP errors are returned, like sleeper_wrapper does
+    :return:
+    """
+    url = "http://127.0.0.1:{}/missing".format(server.server_port)
+
+    assert isinstance(BaseApi()._call(url), requests.exceptions.HTTPError)
+
+
+def test_concurrent_wrapper_calls_share_one_request(server, installed_client):
+    """
+    Tests that the concurrent calls of the same URL send one request and
+    share its decoded payload
+    :return:
+    """
+    url = "http://127.0.0.1:{}/slow".format(server.server_port)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        payloads = list(executor.map(lambda _: BaseApi()._call(url), range(8)))
+
+    assert len(server.encodings) == 1
+    assert payloads[0] == PLAYERS
+    assert all(payload is payloads[0] for payload in payloads)
+
+    assert BaseApi()._call(url) == PLAYERS
+    assert len(server.encodings) == 2
+
+
+def test_client_bounds_the_pool(installed_client):
+    """
+    Tests that the connections are bounded and the requests time out
+    :return:
+    """
+    adapter = installed_client.session.get_adapter(
+        "https://api.sleeper.app/v1/state/nfl"
+    )
+
+    assert adapter._pool_maxsize == 2
+    assert adapter._pool_block
+    assert installed_client.timeout == 5
+    assert installed_client.session is installed_client.session
+
+
+@pytest.mark.parametrize(
+    "path,revalidated",
+    [
+        ("league/1", True),
+        ("league/1/users", True),
+        ("league/1/rosters", True),
+        ("league/1/drafts", True),
+        ("draft/2/picks", True),
+        ("players/nfl", True),
+        ("league/1/matchups/3", True),
+        ("league/1/transactions/3", True),
+        ("stats/nfl/regular/2022/3", False),
+        ("state/nfl", False),
+    ],
+)
+def test_revalidated_urls(path, revalidated):
+    """
+    Tests which Sleeper endpoints the request cache revalidates often
+    :return:
+    """
+    url = "https://api.sleeper.app/v1/" + path
+
+    expire_after = get_url_expiration(url, http_client.REVALIDATED_URLS)
+
+    assert (expire_after == SLEEPER_REVALIDATE_SECONDS) == revalidated
+
+
+def test_refreshing_revalidates_the_wrapper_calls(
+    monkeypatch, installed_client
+):
+    """
+    Tests that the wrapper calls made while refreshing revalidate their
+    cached response, and only those
+    :return:
+    """
+    refreshed = []
+    monkeypatch.setattr(
+        installed_client,
+        "fetch",
+        lambda url, refresh=False: refreshed.append(refresh),
+    )
+
+    BaseApi()._call("https://api.sleeper.app/v1/league/1/matchups/3")
+    with http_client.refreshing():
+        BaseApi()._call("https://api.sleeper.app/v1/league/1/matchups/3")
+    BaseApi()._call("https://api.sleeper.app/v1/league/1/matchups/3")
+
+    assert refreshed == [False, True, False]
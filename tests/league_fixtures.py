@@ -0,0 +1,601 @@
+# -*- coding: utf-8 -*-
+"""
+League payloads for the tests and the benchmarks, either generated by
+generate_payloads or recorded from a live league with record_fixture.
+Both share the same JSON layout:
+
+    {
+        "league": {...}, "users": [...], "rosters": [...],
+        "players": {player_id: {...}}, "season": "2022", "week": 14,
+        "weeks": {"1": {"matchups": [...], "stats": {...},
+                        "projections": {...}}, ...}
+    }
+"""
+
+import json
+import random
+
+PLAYERS_NUM = 10000
+STATS_NUM = 2000
+WEEKS_NUM = 14
+PLAYOFF_WEEK_START = 15
+
+STARTER_POSITIONS = ["QB", "RB", "RB", "WR", "WR", "TE", "FLEX", "K", "DEF"]
+BENCH_NUM = 7
+FLEX_POSITIONS = ["RB", "WR", "TE"]
+
+# Share of the player pool and (mean, stddev) half PPR points by position
+POSITIONS = {
+    "QB": (0.12, 17.0, 7.0),
+    "RB": (0.22, 9.0, 6.5),
+    "WR": (0.32, 9.5, 6.5),
+    "TE": (0.14, 6.0, 4.5),
+    "K": (0.08, 7.5, 4.0),
+    "DEF": (0.12, 6.5, 6.0),
+}
+
+# Counting stats of a Sleeper stat sheet, besides the points
+STAT_KEYS = [
+    "gp",
+    "gs",
+    "off_snp",
+    "tm_off_snp",
+    "tm_def_snp",
+    "tm_st_snp",
+    "pass_att",
+    "pass_cmp",
+    "pass_inc",
+    "pass_yd",
+    "pass_td",
+    "pass_int",
+    "pass_fd",
+    "pass_sack",
+    "rush_att",
+    "rush_yd",
+    "rush_td",
+    "rush_fd",
+    "rush_lng",
+    "rec_tgt",
+    "rec",
+    "rec_yd",
+    "rec_td",
+    "rec_fd",
+    "rec_lng",
+    "bonus_rec_te",
+    "fum",
+    "fum_lost",
+    "ff",
+    "fgm",
+    "fga",
+    "xpm",
+    "xpa",
+    "def_td",
+    "sack",
+    "int",
+]
+
+FIRST_NAMES = [
+    "Aaron",
+    "Baker",
+    "Cooper",
+    "Dalvin",
+    "Ezekiel",
+    "Frank",
+    "George",
+    "Hunter",
+    "Isaiah",
+    "Jalen",
+    "Kyler",
+    "Lamar",
+    "Mike",
+    "Najee",
+    "Odell",
+    "Patrick",
+]
+
+LAST_NAMES = [
+    "Adams",
+    "Brown",
+    "Chase",
+    "Diggs",
+    "Evans",
+    "Fields",
+    "Godwin",
+    "Henry",
+    "Irving",
+    "Jones",
+    "Kelce",
+    "Lockett",
+    "Mixon",
+    "Njoku",
+    "Olave",
+    "Pitts",
+]
+
+
+def generate_players(rand, players_num):
+    players = {}
+    positions = list(POSITIONS)
+    weights = [POSITIONS[position][0] for position in positions]
+
+    for number in range(players_num):
+        player_id = str(1000 + number)
+        position = rand.choices(positions, weights)[0]
+        players[player_id] = {
+            "player_id": player_id,
+            "first_name": rand.choice(FIRST_NAMES),
+            "last_name": rand.choice(LAST_NAMES),
+            "full_name": None,
+            "position": position,
+            "fantasy_positions": [position],
+            "team": "T{:02d}".format(rand.randrange(32)),
+            "number": rand.randrange(1, 100),
+            "age": rand.randrange(21, 38),
+            "years_exp": rand.randrange(0, 16),
+            "height": str(rand.randrange(68, 80)),
+            "weight": str(rand.randrange(170, 320)),
+            "college": "College {}".format(rand.randrange(120)),
+            "status": "Active",
+            "injury_status": rand.choice([None, None, None, "Questionable"]),
+            "depth_chart_order": rand.randrange(1, 4),
+            "search_rank": rand.randrange(1, 9999999),
+            "sport": "nfl",
+        }
+        players[player_id]["full_name"] = "{} {}".format(
+            players[player_id]["first_name"], players[player_id]["last_name"]
+        )
+
+    return players
+
+
+def generate_stat_sheet(rand, position):
+    stat_sheet = {key: float(rand.randrange(0, 40)) for key in STAT_KEYS}
+    stat_sheet["bonus_rec_te"] = float(
+        stat_sheet["rec"] if position == "TE" else 0
+    )
+    _, mean, stddev = POSITIONS[position]
+    half_ppr = round(rand.gauss(mean, stddev), 2)
+    stat_sheet["pts_half_ppr"] = half_ppr
+    stat_sheet["pts_ppr"] = round(half_ppr + stat_sheet["rec"] * 0.5, 2)
+    stat_sheet["pts_std"] = round(half_ppr - stat_sheet["rec"] * 0.5, 2)
+    return stat_sheet
+
+
+def get_round_robin(roster_ids, week):
+    """
+    get_round_robin Returns the pairs of a week with the circle method.
+
+    :param roster_ids: Roster ids, an even number of them
+    :type roster_ids: list
+    :param week: Week number
+    :type week: int
+    :return: List of (roster_id, roster_id) pairs
+    :rtype: list
+    """
+    rest = roster_ids[1:]
+    shift = (week - 1) % len(rest)
+    circle = roster_ids[:1] + rest[shift:] + rest[:shift]
+    half = len(circle) // 2
+    return list(zip(circle[:half], reversed(circle[half:])))
+
+
+def generate_payloads(
+    teams=12,
+    weeks=WEEKS_NUM,
+    players_num=PLAYERS_NUM,
+    stats_num=STATS_NUM,
+    seed=0,
+):
+    """
+    generate_payloads Generates the payloads of a synthetic league, with
+                      a full-size players dump and full stat sheets.
+
+    :param teams: Number of teams, an even number
+    :type teams: int
+    :param weeks: Number of played weeks
+    :type weeks: int
+    :param players_num: Size of the players dump
+    :type players_num: int
+    :param stats_num: Number of players with a stat sheet every week
+    :type stats_num: int
+    :param seed: Random seed, the same seed gives the same league
+    :type seed: int
+    :return: League payloads
+    :rtype: dict
+    """
+    rand = random.Random(seed)
+    season = "2022"
+    players = generate_players(rand, players_num)
+
+    by_position = {position: [] for position in POSITIONS}
+    for player_id, player in players.items():
+        by_position[player["position"]].append(player_id)
+    for player_ids in by_position.values():
+        rand.shuffle(player_ids)
+
+    users = []
+    rosters = []
+    for roster_id in range(1, teams + 1):
+        user_id = str(700000 + roster_id)
+        user = {"user_id": user_id, "display_name": "user{}".format(roster_id)}
+        # Some owners never set a team name
+        if roster_id % 5:
+            user["metadata"] = {"team_name": "Team {}".format(roster_id)}
+        users.append(user)
+
+        starters = []
+        for slot in STARTER_POSITIONS:
+            position = rand.choice(FLEX_POSITIONS) if slot == "FLEX" else slot
+            starters.append(by_position[position].pop())
+        bench = [
+            by_position[rand.choice(FLEX_POSITIONS + ["QB"])].pop()
+            for _ in range(BENCH_NUM)
+        ]
+        rosters.append(
+            {
+                "roster_id": roster_id,
+                "owner_id": user_id,
+                "starters": starters,
+                "players": starters + bench,
+                "settings": {"wins": 0, "losses": 0, "ties": 0, "fpts": 0},
+            }
+        )
+
+    rostered = [
+        player_id for roster in rosters for player_id in roster["players"]
+    ]
+    rostered_set = set(rostered)
+    unrostered = [
+        player_id for player_id in players if player_id not in rostered_set
+    ]
+
+    payloads_weeks = {}
+    for week in range(1, weeks + 1):
+        with_stats = rostered + rand.sample(
+            unrostered, max(min(stats_num - len(rostered), len(unrostered)), 0)
+        )
+        stats = {
+            player_id: generate_stat_sheet(
+                rand, players[player_id]["position"]
+            )
+            for player_id in with_stats
+        }
+        projections = {
+            player_id: {
+                "pts_half_ppr": round(
+                    rand.gauss(*POSITIONS[players[player_id]["position"]][1:]),
+                    2,
+                ),
+                "rec": float(rand.randrange(0, 10)),
+                "rush_yd": float(rand.randrange(0, 100)),
+            }
+            for player_id in with_stats
+        }
+
+        matchups = []
+        pairs = get_round_robin(
+            [roster["roster_id"] for roster in rosters], week
+        )
+        for matchup_id, pair in enumerate(pairs, 1):
+            points = []
+            for roster_id in pair:
+                roster = rosters[roster_id - 1]
+                starters_points = [
+                    stats[player_id]["pts_half_ppr"]
+                    for player_id in roster["starters"]
+                ]
+                points.append(round(sum(starters_points), 2))
+                matchups.append(
+                    {
+                        "roster_id": roster_id,
+                        "matchup_id": matchup_id,
+                        "starters": roster["starters"],
+                        "players": roster["players"],
+                        "starters_points": starters_points,
+                        "points": points[-1],
+                        "custom_points": None,
+                    }
+                )
+                roster["settings"]["fpts"] += int(points[-1])
+
+            winner, loser = pair if points[0] >= points[1] else pair[::-1]
+            rosters[winner - 1]["settings"]["wins"] += 1
+            rosters[loser - 1]["settings"]["losses"] += 1
+
+        payloads_weeks[str(week)] = {
+            "matchups": matchups,
+            "stats": stats,
+            "projections": projections,
+        }
+
+    return {
+        "league": {
+            "league_id": str(900000 + teams),
+            "name": "Synthetic League",
+            "season": season,
+            "total_rosters": teams,
+            "previous_league_id": None,
+            "roster_positions": STARTER_POSITIONS + ["BN"] * BENCH_NUM,
+            "settings": {"playoff_week_start": PLAYOFF_WEEK_START},
+        },
+        "users": users,
+        "rosters": rosters,
+        "players": players,
+        "season": season,
+        "week": weeks,
+        "weeks": payloads_weeks,
+    }
+
+
+class FixtureStats:
+    """
+    Serves the stats of the payloads with the sleeper_wrapper Stats API.
+    """
+
+    def __init__(self, payloads):
+        self.payloads = payloads
+
+    def get_week_stats(self, season_type, season, week):
+        return self.payloads["weeks"][str(week)]["stats"]
+
+    def get_week_projections(self, season_type, season, week):
+        return self.payloads["weeks"][str(week)]["projections"]
+
+    def get_player_week_stats(self, stats, player_id):
+        return stats.get(player_id)
+
+
+class FixturePlayers:
+    """
+    Serves the players dump of the payloads with the sleeper_wrapper
+    Players API.
+    """
+
+    def __init__(self, payloads):
+        self.payloads = payloads
+
+    def get_all_players(self):
+        return self.payloads["players"]
+
+
+class FixtureLeague:
+    """
+    Serves the payloads with the sleeper_wrapper League API used by the
+    bot. get_scoreboards and get_standings follow the wrapper: the team
+    scores are the sum of the starters week stats.
+    """
+
+    def __init__(self, payloads):
+        self.payloads = payloads
+        self.league_id = payloads["league"]["league_id"]
+
+    def get_league(self):
+        return self.payloads["league"]
+
+    def get_users(self):
+        return self.payloads["users"]
+
+    def get_rosters(self):
+        return self.payloads["rosters"]
+
+    def get_matchups(self, week):
+        week_payloads = self.payloads["weeks"].get(str(week))
+        return week_payloads["matchups"] if week_payloads else []
+
+    def map_users_to_team_name(self, users):
+        users_dict = {}
+        for user in users:
+            try:
+                users_dict[user["user_id"]] = user["metadata"]["team_name"]
+            except KeyError:
+                users_dict[user["user_id"]] = user["display_name"]
+        return users_dict
+
+    def get_team_score(self, starters, score_type, week):
+        stats = FixtureStats(self.payloads)
+        week_stats = stats.get_week_stats("regular", None, week)
+        total_score = 0
+        for starter in starters:
+            player_stats = stats.get_player_week_stats(week_stats, starter)
+            if player_stats is not None:
+                total_score += player_stats.get(score_type, 0)
+        return total_score
+
+    def get_scoreboards(self, rosters, matchups, users, score_type, week):
+        if len(matchups) == 0:
+            return None
+
+        roster_id_dict = {
+            roster["roster_id"]: roster["owner_id"] for roster in rosters
+        }
+        users_dict = self.map_users_to_team_name(users)
+        scoreboards_dict = {}
+        for team in matchups:
+            owner_id = roster_id_dict[team["roster_id"]]
+            if owner_id is not None:
+                team_name = users_dict[owner_id]
+            else:
+                team_name = "Team name not available"
+            team_score = self.get_team_score(
+                team["starters"], score_type, week
+            )
+            scoreboards_dict.setdefault(team["matchup_id"], []).append(
+                (team_name, team_score)
+            )
+        return scoreboards_dict
+
+    def get_standings(self, rosters, users):
+        users_dict = self.map_users_to_team_name(users)
+        standings = sorted(
+            (
+                (
+                    roster["settings"]["wins"],
+                    roster["settings"]["losses"],
+                    roster["settings"]["fpts"],
+                    users_dict.get(roster["owner_id"]),
+                )
+                for roster in rosters
+            ),
+            key=lambda standing: standing[:3],
+            reverse=True,
+        )
+        return [
+            (name, str(wins), str(losses), str(points))
+            for wins, losses, points, name in standings
+        ]
+
+
+def load_fixture(path):
+    with open(path) as fixture_file:
+        return json.load(fixture_file)
+
+
+def record_fixture(league_id, weeks, path):
+    """
+    record_fixture Records the payloads of a live league, to benchmark
+                   the reports against a real one.
+
+    :param league_id: Sleeper league id
+    :type league_id: str
+    :param weeks: Number of weeks to record, from week 1
+    :type weeks: int
+    :param path: Fixture file path
+    :type path: str
+    :return: League payloads
+    :rtype: dict
+    """
+    from sleeper_wrapper import League, Players, Stats
+
+    league = League(league_id)
+    stats = Stats()
+    season = league.get_league()["season"]
+    payloads = {
+        "league": league.get_league(),
+        "users": league.get_users(),
+        "rosters": league.get_rosters(),
+        "players": Players().get_all_players(),
+        "season": season,
+        "week": weeks,
+        "weeks": {
+            str(week): {
+                "matchups": league.get_matchups(week),
+                "stats": stats.get_week_stats("regular", season, week),
+                "projections": stats.get_week_projections(
+                    "regular", season, week
+                ),
+            }
+            for week in range(1, weeks + 1)
+        },
+    }
+
+    with open(path, "w") as fixture_file:
+        json.dump(payloads, fixture_file)
+
+    return payloads
+
+
+SLEEPER_URL = "https://api.sleeper.app/v1"
+SPORTSDATA_URL = "https://api.sportsdata.io/v3/nfl/scores/json"
+
+
+def get_season_dates(season_start, weeks):
+    """
+    get_season_dates Returns the dates of a synthetic season starting at
+                     season_start and lasting weeks weeks.
+
+    :return: Start date by phase, as returned by bot.init
+    :rtype: dict
+    """
+    return {
+        "pre_season": season_start.subtract(days=30),
+        "draft": season_start.subtract(days=10),
+        "season": season_start,
+        "post_season": season_start.add(weeks=weeks),
+        "off_season": season_start.add(weeks=weeks + 5),
+    }
+
+
+def build_cassette(payloads, season_start, cassette=None):
+    """
+    build_cassette Records the payloads as the Sleeper and sportsdata.io
+                   responses of a season starting at season_start, the
+                   current week moving forward every week.
+
+    :param payloads: League payloads
+    :type payloads: dict
+    :param season_start: First day of the regular season
+    :type season_start: pendulum.DateTime
+    :param cassette: Cassette to record into, a new one by default
+    :type cassette: replay.Cassette
+    :return: The cassette
+    :rtype: replay.Cassette
+    """
+    from sleeper_stats_bot.replay import Cassette
+
+    cassette = cassette or Cassette()
+    dates = get_season_dates(season_start, payloads["week"])
+    recorded_at = dates["pre_season"].subtract(days=1).timestamp()
+    league_url = "{}/league/{}".format(
+        SLEEPER_URL, payloads["league"]["league_id"]
+    )
+    season = payloads["season"]
+
+    def add(url, payload, at=recorded_at):
+        cassette.add(
+            "GET",
+            url,
+            200,
+            {"Content-Type": "application/json"},
+            json.dumps(payload).encode("utf-8"),
+            at,
+        )
+
+    schedule = [
+        {"Date": dates["season"].add(hours=game).to_iso8601_string()}
+        for game in range(304)
+    ]
+    schedule[240]["Date"] = dates["post_season"].to_iso8601_string()
+    schedule[303]["Date"] = dates["off_season"].to_iso8601_string()
+    add("{}/CurrentSeason".format(SPORTSDATA_URL), int(season))
+    add(
+        "{}/Schedules/{}PRE".format(SPORTSDATA_URL, season),
+        [{"Date": dates["pre_season"].to_iso8601_string()}],
+    )
+    add("{}/Schedules/{}".format(SPORTSDATA_URL, season), schedule)
+    for week in range(1, payloads["week"] + 1):
+        add(
+            "{}/CurrentWeek".format(SPORTSDATA_URL),
+            week,
+            season_start.add(weeks=week - 1).timestamp(),
+        )
+
+    add(league_url, payloads["league"])
+    add(
+        "{}/drafts".format(league_url),
+        [{"start_time": dates["draft"].int_timestamp * 1000}],
+    )
+    add("{}/users".format(league_url), payloads["users"])
+    add("{}/rosters".format(league_url), payloads["rosters"])
+    add("{}/players/nfl".format(SLEEPER_URL), payloads["players"])
+    for week, week_payloads in payloads["weeks"].items():
+        add(
+            "{}/matchups/{}".format(league_url, week),
+            week_payloads["matchups"],
+        )
+        add(
+            "{}/stats/nfl/regular/{}/{}".format(SLEEPER_URL, season, week),
+            week_payloads["stats"],
+        )
+        add(
+            "{}/projections/nfl/regular/{}/{}".format(
+                SLEEPER_URL, season, week
+            ),
+            week_payloads["projections"],
+        )
+        # Without game states, the players with stats count as playing
+        add(
+            "{}/ScoresByWeek/{}/{}".format(SPORTSDATA_URL, season, week),
+            [],
+        )
+
+    return cassette
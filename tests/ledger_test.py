@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import pendulum
+import schedule
+
+from sleeper_stats_bot.clock import VirtualClock
+from sleeper_stats_bot.ledger import Ledger, get_content_hash, get_missed_jobs
+
+# A Thursday
+START = pendulum.datetime(2022, 9, 8, 12, tz="America/Chicago")
+
+
+def test_deliveries_survive_reopening(tmp_path):
+    """
+    Tests that the deliveries are kept by job, league, week and content
+    :return:
+    """
+    path = str(tmp_path / "store.sqlite")
+    ledger = Ledger(path)
+    ledger.record("standings", "1", 2, get_content_hash("table"), 100.0)
+    ledger.close()
+
+    ledger = Ledger(path)
+    assert ledger.was_sent("standings", "1", 2, get_content_hash("table"))
+    assert ledger.was_sent("standings", "1", 2)
+    assert not ledger.was_sent("standings", "1", 2, get_content_hash("new"))
+    assert not ledger.was_sent("standings", "1", 3)
+    assert not ledger.was_sent("standings", "2", 2)
+    assert ledger.last_sent_at("standings", "1") == 100.0
+    assert ledger.last_sent_at("luck", "1") is None
+
+
+def test_get_missed_jobs(tmp_path):
+    """
+    Tests that a job is missed when its time passed during the restart,
+    within the grace period and without a delivery since
+    :return:
+    """
+    ledger = Ledger(str(tmp_path / "store.sqlite"))
+    clock = VirtualClock(START)
+
+    with clock:
+        scheduler = schedule.Scheduler()
+        scheduler.every().thursday.at("11:00").do(print).tag("scores")
+        scheduler.every().thursday.at("11:30").do(print).tag("standings")
+        scheduler.every().thursday.at("08:00").do(print).tag("luck")
+        scheduler.every().thursday.at("13:00").do(print).tag("matchups")
+        scheduler.every().thursday.at("11:45").do(print)
+        ledger.record(
+            "standings", "1", 1, "hash", START.add(minutes=-30).timestamp()
+        )
+        # Sent the week before, missed this week
+        ledger.record(
+            "scores", "1", 0, "hash", START.add(weeks=-1).timestamp()
+        )
+
+        missed = get_missed_jobs(scheduler, ledger, "1", grace_seconds=3600)
+
+    assert [min(job.tags) for job in missed] == ["scores"]
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import logging
+
+import pytest
+
+from sleeper_stats_bot import log
+
+
+class CountedPayload:
+    renders = 0
+
+    def __repr__(self):
+        CountedPayload.renders += 1
+        return "CountedPayload()"
+
+    __str__ = __repr__
+
+
+@pytest.mark.parametrize(
+    "debug,level",
+    [
+        (None, logging.INFO),
+        ("", logging.INFO),
+        ("false", logging.INFO),
+        ("False", logging.INFO),
+        ("0", logging.INFO),
+        ("true", logging.DEBUG),
+        ("1", logging.DEBUG),
+        ("TRACE", log.TRACE),
+    ],
+)
+def test_get_log_level(debug, level):
+    """
+    Tests that DEBUG=false disables debug, not any non-empty value
+    :return:
+    """
+    assert log.get_log_level(debug) == level
+
+
+def test_payload_is_rendered_only_when_logged(caplog):
+    """
+    Tests the lazy rendering and the summary of the bulk payloads
+    :return:
+    """
+    logger = logging.getLogger("log_test")
+    value = [{"player_id": str(i)} for i in range(100)]
+
+    with caplog.at_level(logging.INFO, logger="log_test"):
+        logger.debug("STATS: %s", log.payload(logger, CountedPayload()))
+    assert CountedPayload.renders == 0
+    assert caplog.records == []
+
+    # Rendered on emit, while the level is set
+    with caplog.at_level(logging.DEBUG, logger="log_test"):
+        logger.debug("STATS: %s", log.payload(logger, value))
+        message = caplog.messages[-1]
+    assert message == (
+        "STATS: [{'player_id': '0'}, {'player_id': '1'}, "
+        "{'player_id': '2'}, ...] (100 items)"
+    )
+
+    with caplog.at_level(log.TRACE, logger="log_test"):
+        logger.debug("STATS: %s", log.payload(logger, value))
+        message = caplog.messages[-1]
+    assert message == "STATS: " + str(value)
+
+
+def test_get_debug_sink_path(tmp_path, monkeypatch):
+    """
+    Tests that the debug files are written only with DEBUG_SINK_DIR
+    :return:
+    """
+    monkeypatch.delenv("DEBUG_SINK_DIR", raising=False)
+    assert log.get_debug_sink_path("stats.txt") is None
+
+    monkeypatch.setenv("DEBUG_SINK_DIR", str(tmp_path / "sink"))
+    assert log.get_debug_sink_path("stats.txt") == str(
+        tmp_path / "sink" / "stats.txt"
+    )
+    assert (tmp_path / "sink").is_dir()
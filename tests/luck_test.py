@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+import numpy as nmp
+import pytest
+
+from sleeper_stats_bot import luck
+
+MATCHUPS_BY_WEEK = {
+    1: [
+        {"roster_id": 1, "matchup_id": 1, "starters": ["a"], "points": 90},
+        {"roster_id": 2, "matchup_id": 1, "starters": ["b"], "points": 100},
+        {"roster_id": 3, "matchup_id": 2, "starters": ["c"], "points": 80},
+        {"roster_id": 4, "matchup_id": 2, "starters": ["d"], "points": 10},
+    ],
+    2: [
+        {"roster_id": 1, "matchup_id": 1, "starters": ["a"], "points": 50},
+        {"roster_id": 3, "matchup_id": 1, "starters": ["c"], "points": 60},
+        {"roster_id": 2, "matchup_id": 2, "starters": ["b"], "points": 40},
+        {"roster_id": 4, "matchup_id": 2, "starters": ["d"], "points": 30},
+    ],
+}
+
+STATS_BY_WEEK = {
+    1: {
+        "a": {"pts_half_ppr": 90},
+        "b": {"pts_half_ppr": 100},
+        "c": {"pts_half_ppr": 80},
+        "d": {"pts_half_ppr": 10},
+    },
+    2: {
+        "a": {"pts_half_ppr": 50},
+        "b": {"pts_half_ppr": 40},
+        "c": {"pts_half_ppr": 60},
+        "d": {"pts_half_ppr": 30},
+    },
+}
+
+PROJECTIONS_BY_WEEK = {
+    1: {"a": {"pts_half_ppr": 70}, "d": {"pts_half_ppr": 50}},
+    2: {"a": {"pts_half_ppr": 70}, "d": {"pts_half_ppr": 50}},
+}
+
+
+def test_build_season_arrays():
+    """
+    Tests the teams by weeks arrays
+    :return:
+    """
+    arrays = luck.build_season_arrays(
+        MATCHUPS_BY_WEEK, STATS_BY_WEEK, PROJECTIONS_BY_WEEK
+    )
+
+    assert arrays["roster_ids"] == [1, 2, 3, 4]
+    assert arrays["actual"][:, 0].tolist() == [90, 100, 80, 10]
+    assert arrays["projected"][0].tolist() == [70, 70]
+    assert arrays["opponent"][:, 1].tolist() == [2, 3, 0, 1]
+
+
+def test_get_team_luck():
+    """
+    Tests wins against all-play expected wins
+    :return:
+    """
+    arrays = luck.build_season_arrays(
+        MATCHUPS_BY_WEEK, STATS_BY_WEEK, PROJECTIONS_BY_WEEK
+    )
+    teams = {team[0]: team[1:] for team in luck.get_team_luck(arrays)}
+
+    # Team 1 scored second best in both weeks but lost both games
+    assert teams[1] == (140, 140, 0, pytest.approx(4 / 3))
+    assert teams[3][2] == 2
+    assert sum(team[3] for team in teams.values()) == pytest.approx(4)
+
+
+def test_team_points_are_the_league_ones():
+    """
+    Tests that with the scoring settings of the league, the teams are
+    scored like the results of the league and the projections with the
+    same settings
+    :return:
+    """
+    scoring_settings = {"rec": 1.0, "rec_yd": 0.1, "rec_td": 6.0}
+    matchups_by_week = {
+        1: [
+            {"roster_id": 1, "matchup_id": 1, "starters": ["a"], "points": 20},
+            {
+                "roster_id": 2,
+                "matchup_id": 1,
+                "starters": ["b"],
+                "points": 14.5,
+                "players_points": {"b": 14.5},
+            },
+        ]
+    }
+    stats_by_week = {
+        1: {
+            "a": {"rec": 5, "rec_yd": 90, "rec_td": 1, "pts_half_ppr": 17.5},
+            "b": {"rec": 2, "rec_yd": 65, "pts_half_ppr": 7.5},
+        }
+    }
+    projections_by_week = {
+        1: {
+            "a": {"rec": 6, "rec_yd": 80, "pts_half_ppr": 11},
+            "b": {"rec": 4, "rec_yd": 50, "rec_td": 0.5, "pts_half_ppr": 10},
+        }
+    }
+    arrays = luck.build_season_arrays(
+        matchups_by_week, stats_by_week, projections_by_week, scoring_settings
+    )
+    teams = {team[0]: team[1:] for team in luck.get_team_luck(arrays)}
+
+    assert arrays["actual"][:, 0].tolist() == [20, 14.5]
+    assert arrays["projected"][:, 0].tolist() == pytest.approx([14, 12])
+    assert arrays["player_actual"].tolist() == pytest.approx([20, 14.5])
+    assert teams[1][2] == 1
+
+
+def test_points_are_scored_with_score_type():
+    """
+    Tests that without the scoring settings of the league, the actual and
+    projected points are both scored with the score type
+    :return:
+    """
+    matchups_by_week = {
+        week: [dict(matchup) for matchup in matchups]
+        for week, matchups in MATCHUPS_BY_WEEK.items()
+    }
+    matchups_by_week[1][3]["points"] = 110.5
+    arrays = luck.build_season_arrays(
+        matchups_by_week, STATS_BY_WEEK, PROJECTIONS_BY_WEEK
+    )
+
+    assert arrays["actual"][:, 0].tolist() == [90, 100, 80, 10]
+
+
+def test_get_player_luck():
+    """
+    Tests the over/under performance of the players
+    :return:
+    """
+    arrays = luck.build_season_arrays(
+        MATCHUPS_BY_WEEK, STATS_BY_WEEK, PROJECTIONS_BY_WEEK
+    )
+    players = luck.get_player_luck(arrays)
+
+    assert players[0] == ("b", 140, 0)
+    assert players[-1] == ("d", 40, 100)
+
+
+def test_get_expected_wins_skips_teams_without_game():
+    """
+    Tests that teams on bye count neither as rival nor as games
+    :return:
+    """
+    actual = nmp.array([[10.0], [20.0], [0.0]])
+    opponent = nmp.array([[1], [0], [-1]])
+
+    assert luck.get_expected_wins(actual, opponent).tolist() == [0, 1, 0]
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+import urllib.request
+
+import pytest
+
+from sleeper_stats_bot import metrics
+
+
+class FakeRequest:
+    def __init__(self, url, body=None):
+        self.url = url
+        self.body = body
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, from_cache=False):
+        self.status_code = status_code
+        self.from_cache = from_cache
+
+
+def test_render_prometheus_format():
+    """
+    Tests the text exposition of counters and histograms
+    :return:
+    """
+    registry = metrics.Registry()
+    counter = registry.counter("calls_total", "Calls.", ["host"])
+    histogram = registry.histogram("latency_seconds", "Latency.", [], (1, 5))
+
+    counter.inc(host="a")
+    counter.inc(2, host="a")
+    histogram.observe(0.5)
+    histogram.observe(3)
+
+    assert registry.render().splitlines() == [
+        "# HELP calls_total Calls.",
+        "# TYPE calls_total counter",
+        'calls_total{host="a"} 3',
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="1"} 1',
+        'latency_seconds_bucket{le="5"} 2',
+        'latency_seconds_bucket{le="+Inf"} 2',
+        "latency_seconds_sum 3.5",
+        "latency_seconds_count 2",
+    ]
+
+
+def test_get_endpoint():
+    """
+    Tests that ids and tokens do not end up in the endpoint label
+    :return:
+    """
+    assert metrics.get_endpoint(
+        "https://api.sleeper.app/v1/league/442724598706860032/matchups/3"
+    ) == ("api.sleeper.app", "/v1/league/:id/matchups/:id")
+    assert metrics.get_endpoint(
+        "https://api.telegram.org/bot123:SECRET/sendPhoto?chat_id=1"
+    ) == ("api.telegram.org", "/bot:token/sendPhoto")
+
+
+def test_timed_job_labels_http_calls():
+    """
+    Tests that HTTP calls made inside a job carry its label
+    :return:
+    """
+
+    @metrics.timed_job("test_job")
+    def job():
+        metrics.record_http_call(
+            FakeRequest("https://api.sportsdata.io/v3/nfl/CurrentWeek"),
+            FakeResponse(),
+            0.1,
+        )
+        metrics.record_http_call(
+            FakeRequest("https://api.sportsdata.io/v3/nfl/CurrentWeek"),
+            FakeResponse(from_cache=True),
+            0.001,
+        )
+
+    quota = metrics.SPORTSDATA_QUOTA.get()
+    job()
+
+    assert metrics.JOB_SECONDS.get_count(job="test_job") == 1
+    assert (
+        metrics.HTTP_REQUESTS.get(
+            job="test_job",
+            host="api.sportsdata.io",
+            endpoint="/v3/nfl/CurrentWeek",
+            status=200,
+        )
+        == 2
+    )
+    assert metrics.SPORTSDATA_QUOTA.get() == quota + 1
+
+
+def test_timed_job_counts_errors():
+    """
+    Tests that failing jobs are counted and still raise
+    :return:
+    """
+
+    @metrics.timed_job("failing_job")
+    def job():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        job()
+
+    assert metrics.JOB_ERRORS.get(job="failing_job") == 1
+
+
+def test_http_server():
+    """
+    Tests the local /metrics endpoint
+    :return:
+    """
+    server = metrics.start_http_server(0)
+    try:
+        url = "http://127.0.0.1:{}/metrics".format(server.server_address[1])
+        body = urllib.request.urlopen(url).read().decode("utf-8")
+    finally:
+        server.shutdown()
+
+    assert "# TYPE sleeper_bot_job_duration_seconds histogram" in body
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+import logging
+
+import pendulum
+import schedule
+
+from sleeper_stats_bot.clock import VirtualClock
+from sleeper_stats_bot.prefetch import Prefetcher
+
+logger = logging.getLogger("prefetch_test")
+
+# A Tuesday
+START = pendulum.datetime(2022, 9, 13, 10, 50, tz="America/Chicago")
+
+
+def test_prefetch_runs_once_before_the_job():
+    """
+    Tests that the data of a job is fetched once within the lead time
+    before it, and only for the jobs with fetches
+    :return:
+    """
+    fetched = []
+    clock = VirtualClock(START)
+
+    with clock:
+        scheduler = schedule.Scheduler()
+        scheduler.every().tuesday.at("11:00").do(print).tag("scores:Week")
+        scheduler.every().tuesday.at("11:10").do(print).tag("standings")
+        scheduler.every().tuesday.at("11:01").do(print).tag("pdf_report")
+        prefetcher = Prefetcher(
+            {
+                "scores": lambda: fetched.append(("scores", clock.now())),
+                "standings": lambda: fetched.append(("standings", None)),
+            },
+            logger,
+            lead_seconds=120,
+        )
+
+        assert prefetcher.run_due(scheduler) == []
+        assert prefetcher.idle_seconds(scheduler) == 8 * 60
+
+        clock.set(START.add(minutes=8, seconds=30))
+        assert prefetcher.run_due(scheduler) == ["scores"]
+        assert prefetcher.run_due(scheduler) == []
+        assert prefetcher.idle_seconds(scheduler) == 9 * 60 + 30
+        prefetcher.close()
+
+    assert fetched == [("scores", START.add(minutes=8, seconds=30))]
+
+
+def test_failed_prefetch_is_logged(caplog):
+    """
+    Tests that a failed fetch is logged and left to the job
+    :return:
+    """
+
+    def fail():
+        raise ConnectionError("down")
+
+    clock = VirtualClock(START)
+    with clock:
+        scheduler = schedule.Scheduler()
+        scheduler.every().tuesday.at("10:51").do(print).tag("luck")
+        prefetcher = Prefetcher({"luck": fail}, logger, lead_seconds=120)
+
+        with caplog.at_level(logging.WARNING):
+            assert prefetcher.run_due(scheduler) == ["luck"]
+            prefetcher.close()
+
+    assert "Prefetch of luck failed" in caplog.text
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import os
+import pstats
+
+from sleeper_stats_bot import profiling
+
+
+def allocate():
+    return [str(i) * 10 for i in range(10000)]
+
+
+def test_profiling_disabled(tmp_path, monkeypatch):
+    """
+    Tests that nothing is written unless PROFILE_JOBS is enabled
+    :return:
+    """
+    monkeypatch.delenv("PROFILE_JOBS", raising=False)
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+
+    assert len(profiling.profiled_job("job")(allocate)()) == 10000
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_profiling_enabled(tmp_path, monkeypatch):
+    """
+    Tests the written profile and allocations summary
+    :return:
+    """
+    monkeypatch.setenv("PROFILE_JOBS", "true")
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+
+    profiling.profiled_job("job")(allocate)()
+
+    files = sorted(os.listdir(str(tmp_path)))
+    assert [os.path.splitext(name)[1] for name in files] == [".prof", ".txt"]
+
+    stats = pstats.Stats(str(tmp_path / files[0]))
+    assert any(key[2] == "allocate" for key in stats.stats)
+
+    with open(str(tmp_path / files[1])) as summary:
+        assert "Top 30 allocations" in summary.read()
+
+
+def test_profiles_of_the_same_second(tmp_path, monkeypatch):
+    """
+    Tests that runs of a job in the same second keep their own profiles
+    :return:
+    """
+    monkeypatch.setenv("PROFILE_JOBS", "true")
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+
+    for _ in range(3):
+        profiling.profiled_job("job")(allocate)()
+
+    assert len(os.listdir(str(tmp_path))) == 6
+
+
+def test_rotate_profiles(tmp_path):
+    """
+    Tests that only the newest runs of a job are kept
+    :return:
+    """
+    for run in ("job-1", "job-2", "job-3", "other-1"):
+        for extension in (".prof", ".txt"):
+            (tmp_path / (run + extension)).write_text("")
+
+    profiling.rotate_profiles(str(tmp_path), "job", 2)
+
+    assert sorted(os.listdir(str(tmp_path))) == [
+        "job-2.prof",
+        "job-2.txt",
+        "job-3.prof",
+        "job-3.txt",
+        "other-1.prof",
+        "other-1.txt",
+    ]
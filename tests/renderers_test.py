@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+import re
+
+from sleeper_stats_bot.renderers import (
+    DISCORD_DESCRIPTION_CHARS,
+    DISCORD_MESSAGE_CHARS,
+    DISCORD_MESSAGE_EMBEDS,
+    GROUPME_MESSAGE_CHARS,
+    SLACK_MESSAGE_BLOCKS,
+    SLACK_SECTION_CHARS,
+    TELEGRAM_MESSAGE_CHARS,
+    render_caption,
+    render_discord_embeds,
+    render_groupme_text,
+    render_slack_blocks,
+    render_telegram_html,
+    render_text,
+)
+from sleeper_stats_bot.report import Report, Table
+
+
+def get_report():
+    table = Table("Standings - Week 3", ["Team", "Wins"])
+    table.add_row(["<Tacos>", 3])
+    players = Table(field_names=["Player", "Pts"])
+    players.add_row(["Justin Jefferson", 30.5])
+    return Report(table.title, [table, players], ["🏆 Tacos & co lead"])
+
+
+def test_render_text():
+    """
+    Tests that the text has the titled tables and the highlights
+    :return:
+    """
+    text = render_text(get_report())
+
+    assert text.startswith("+")
+    assert text.count("Standings - Week 3") == 1
+    assert "Justin Jefferson" in text
+    assert text.endswith("🏆 Tacos & co lead")
+    assert render_text(Report("Hello", highlights=["Hi"])) == "Hello\nHi"
+
+
+def test_render_telegram_html():
+    """
+    Tests that the title is bold, the tables preformatted and escaped
+    :return:
+    """
+    [html] = render_telegram_html(get_report())
+
+    assert html.startswith("<b>Standings - Week 3</b>\n<pre>")
+    assert "&lt;Tacos&gt;" in html
+    assert html.count("Standings - Week 3") == 1
+    assert html.endswith("Tacos &amp; co lead")
+
+
+def test_render_slack_blocks_and_discord_embeds():
+    """
+    Tests the Block Kit and the embed payloads
+    :return:
+    """
+    [slack] = render_slack_blocks(get_report())
+    [discord] = render_discord_embeds(get_report())
+
+    assert slack["text"] == "Standings - Week 3"
+    assert [block["type"] for block in slack["blocks"]] == [
+        "header",
+        "section",
+        "section",
+        "section",
+    ]
+    assert slack["blocks"][1]["text"]["text"].startswith("```+")
+    assert "&lt;Tacos&gt;" in slack["blocks"][1]["text"]["text"]
+    assert slack["blocks"][3]["text"]["text"] == "🏆 Tacos &amp; co lead"
+    assert discord["embeds"][0]["title"] == "Standings - Week 3"
+    assert discord["embeds"][0]["description"].count("```") == 4
+
+
+def get_long_report():
+    table = Table("Players - Week 3", ["Player", "Team", "Pts"])
+    for index in range(1000):
+        table.add_row(["Player {}".format(index), "<Tacos>", index])
+    return Report(table.title, [table], ["Tacos lead"])
+
+
+def get_rows(text):
+    return re.findall(r"Player \d+ ", text)
+
+
+def test_long_reports_are_split_between_rows():
+    """
+    Tests that the tables past the limits of the platforms are split
+    between their rows, every part in its own code block, no row lost
+    :return:
+    """
+    report = get_long_report()
+
+    messages = render_telegram_html(report)
+    assert len(messages) > 1
+    assert all(len(message) <= TELEGRAM_MESSAGE_CHARS for message in messages)
+    assert all(
+        message.count("<pre>") == message.count("</pre>") >= 1
+        for message in messages
+    )
+    assert len(get_rows("\n".join(messages))) == 1000
+    assert messages[-1].endswith("Tacos lead")
+
+    sections = [
+        block["text"]["text"]
+        for message in render_slack_blocks(report)
+        for block in message["blocks"]
+        if block["type"] == "section"
+    ]
+    assert len(sections) > 1
+    assert all(len(section) <= SLACK_SECTION_CHARS for section in sections)
+    assert all(
+        section.startswith("```") and section.endswith("```")
+        for section in sections[:-1]
+    )
+    assert len(get_rows("\n".join(sections))) == 1000
+
+    messages = render_groupme_text(report)
+    assert len(messages) > 1
+    assert all(len(message) <= GROUPME_MESSAGE_CHARS for message in messages)
+    assert len(get_rows("\n".join(messages))) == 1000
+    assert messages[-1].endswith("Tacos lead")
+
+    messages = render_discord_embeds(report)
+    embeds = [embed for message in messages for embed in message["embeds"]]
+    assert [embed.get("title") for embed in embeds[:2]] == [report.title, None]
+    assert all(
+        len(embed["description"]) <= DISCORD_DESCRIPTION_CHARS
+        and embed["description"].count("```") % 2 == 0
+        for embed in embeds
+    )
+    assert all(
+        len(message["embeds"]) <= DISCORD_MESSAGE_EMBEDS
+        and sum(
+            len(embed.get("title", "")) + len(embed["description"])
+            for embed in message["embeds"]
+        )
+        <= DISCORD_MESSAGE_CHARS
+        for message in messages
+    )
+    assert len(get_rows("\n".join(e["description"] for e in embeds))) == 1000
+
+
+def test_slack_messages_have_at_most_50_blocks():
+    """
+    Tests that a report of more sections than a message holds is posted
+    as several messages
+    :return:
+    """
+    table = Table(field_names=["Player"])
+    for index in range(20000):
+        table.add_row(["Player {}".format(index)])
+
+    messages = render_slack_blocks(Report("Players", [table]))
+
+    assert len(messages) > 1
+    assert all(
+        len(message["blocks"]) <= SLACK_MESSAGE_BLOCKS for message in messages
+    )
+
+
+def test_render_caption():
+    """
+    Tests that the caption of the image has the title and the highlights
+    :return:
+    """
+    assert render_caption(get_report()) == (
+        "Standings - Week 3\n🏆 Tacos & co lead"
+    )
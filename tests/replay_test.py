@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pendulum
+import pytest
+import requests
+
+from sleeper_stats_bot import replay
+from sleeper_stats_bot.clock import VirtualClock
+
+START = pendulum.datetime(2022, 9, 8, tz="America/Chicago")
+URL = "https://api.sleeper.app/v1/league/1/matchups/1"
+
+
+class WeekHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b"3"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_cassette_replays_by_time(tmp_path):
+    """
+    Tests that the last response recorded before the replay time is used
+    :return:
+    """
+    path = str(tmp_path / "cassette.jsonl")
+    cassette = replay.Cassette(path)
+    for week in (2, 1):
+        cassette.add(
+            "GET",
+            URL,
+            200,
+            {"Content-Type": "application/json", "Date": "ignored"},
+            str(week).encode("utf-8"),
+            START.add(weeks=week - 1).timestamp(),
+        )
+
+    loaded = replay.Cassette.load(path)
+    at = START.add(days=8).timestamp()
+
+    assert loaded.find("GET", URL, at)["body"] == "2"
+    assert loaded.find("GET", URL, START.add(days=3).timestamp())["body"] == (
+        "1"
+    )
+    assert loaded.find("GET", URL, 0)["body"] == "1"
+    assert loaded.find("GET", URL, at)["headers"] == {
+        "Content-Type": "application/json"
+    }
+    assert loaded.find("POST", URL, at) is None
+
+
+def test_record_then_replay_offline(tmp_path):
+    """
+    Tests a response recorded from a server and replayed without it
+    :return:
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), WeekHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = "http://127.0.0.1:{}/CurrentWeek".format(server.server_address[1])
+    clock = VirtualClock(START)
+    cassette = replay.Cassette(str(tmp_path / "cassette.jsonl"))
+
+    try:
+        with replay.recording(cassette, clock):
+            assert requests.get(url).json() == 3
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    messenger = replay.FakeMessenger(clock)
+    with replay.replaying(
+        replay.Cassette.load(cassette.path), clock, messenger
+    ):
+        assert requests.get(url).json() == 3
+        response = requests.post(
+            "https://api.telegram.org/botTOKEN/sendPhoto?chat_id=1",
+            files={"photo": b"png"},
+        )
+        with pytest.raises(replay.ReplayError):
+            requests.get(url + "?week=4")
+
+    assert response.json() == {"ok": True}
+    assert [delivery["host"] for delivery in messenger.deliveries] == [
+        "api.telegram.org"
+    ]
+
+
+def test_replay_revalidates_cached_responses():
+    """
+    Tests that an expired cached response is revalidated with its ETag and
+    refreshed by the 304, without a body
+    :return:
+    """
+    from sleeper_stats_bot.metrics import (
+        CACHE_REQUESTS,
+        InstrumentedCachedSession,
+    )
+
+    users_url = "https://api.sleeper.app/v1/league/1/users"
+    clock = VirtualClock(START)
+    cassette = replay.Cassette()
+    cassette.add(
+        "GET",
+        users_url,
+        200,
+        {"Content-Type": "application/json", "ETag": '"users-v1"'},
+        b'[{"user_id": "1"}]',
+        START.timestamp(),
+    )
+    # Every cached response is expired, so revalidated on the next call
+    session = InstrumentedCachedSession(backend="memory", expire_after=0)
+    revalidated = CACHE_REQUESTS.get(
+        host="api.sleeper.app", result="revalidated"
+    )
+
+    with replay.replaying(cassette, clock, replay.FakeMessenger(clock)):
+        first = session.get(users_url)
+        second = session.get(users_url)
+
+    assert not first.from_cache
+    assert second.from_cache and second.revalidated
+    assert second.json() == [{"user_id": "1"}]
+    assert (
+        CACHE_REQUESTS.get(host="api.sleeper.app", result="revalidated")
+        == revalidated + 1
+    )
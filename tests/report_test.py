@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+from sleeper_stats_bot.report import Report, Table
+
+
+def get_scores(points):
+    table = Table("Week Scores - Week 2", ["Matchup", "Teams", "Points"])
+    table.add_row([1, "Team A", points])
+    table.add_row([1, "Team B", 90.5])
+    return Report(table.title, [table], ["Close game!"])
+
+
+def test_report_round_trip_and_hash():
+    """
+    Tests that a report survives its dict form and is hashed by content
+    :return:
+    """
+    report = get_scores(100.0)
+
+    assert Report.from_dict(report.to_dict()) == report
+    assert report.get_content_hash() == get_scores(100.0).get_content_hash()
+    assert report.get_content_hash() != get_scores(101.0).get_content_hash()
+
+
+def test_report_diff():
+    """
+    Tests that the diff has the rows changed since the previous version
+    :return:
+    """
+    assert get_scores(101.0).diff(get_scores(100.0)) == [
+        ("Week Scores - Week 2", [1, "Team A", 101.0])
+    ]
+    assert len(get_scores(100.0).diff(None)) == 2
+
+
+def test_table_columns():
+    """
+    Tests that a table is built by columns like a PrettyTable
+    :return:
+    """
+    table = Table("Standings")
+    table.add_column("Rank", [1, 2])
+    table.add_column("Team", ["A", "B"])
+
+    assert table.field_names == ["Rank", "Team"]
+    assert table.rows == [[1, "A"], [2, "B"]]
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from sleeper_stats_bot import roster_index
+
+PLAYERS = {
+    "1": {"first_name": "Qb", "last_name": "Starter", "position": "QB"},
+    "2": {"first_name": "Qb", "last_name": "Bench", "position": "QB"},
+    "3": {"first_name": "Rb", "last_name": "One", "position": "RB"},
+    "4": {"first_name": "Rb", "last_name": "Two", "position": "RB"},
+    "5": {"first_name": "Rb", "last_name": "Bench", "position": "RB"},
+    "6": {"first_name": "Wr", "last_name": "Bench", "position": "WR"},
+}
+
+WEEK_STATS = {
+    "1": {"pts_half_ppr": 20.0},
+    "2": {"pts_half_ppr": 8.0},
+    "3": {"pts_half_ppr": 4.5},
+    "4": {"pts_half_ppr": 12.0},
+    "5": {"pts_half_ppr": 15.0},
+    "6": {"pts_half_ppr": 30.0},
+}
+
+MATCHUPS = [
+    {
+        "roster_id": 1,
+        "starters": ["1", "3", "4", "0"],
+        "players": ["1", "2", "3", "4", "5", "6"],
+    }
+]
+
+
+def test_build_roster_index():
+    """
+    Tests that the index is keyed by (roster, position) and sorted
+    :return:
+    """
+    index = roster_index.build_roster_index(MATCHUPS, PLAYERS, WEEK_STATS)
+
+    assert index[(1, "RB")]["starters"] == [(4.5, "Rb One"), (12.0, "Rb Two")]
+    assert index[(1, "RB")]["bench"] == [(15.0, "Rb Bench")]
+    assert index[(1, "WR")]["starters"] == []
+
+
+def test_find_bench_beats_starters():
+    """
+    Tests that only bench players outscoring a starter at the same
+    position are reported
+    :return:
+    """
+    index = roster_index.build_roster_index(MATCHUPS, PLAYERS, WEEK_STATS)
+    result = roster_index.find_bench_beats_starters(index)
+
+    assert result == {
+        1: [
+            ("RB", (15.0, "Rb Bench"), (4.5, "Rb One")),
+            ("RB", (15.0, "Rb Bench"), (12.0, "Rb Two")),
+        ]
+    }
+
+
+def test_merge_bench_beats_starters_finds_every_pair():
+    """
+    Tests the merge against the pairwise comparison
+    :return:
+    """
+    starters = sorted([(float(i), str(i)) for i in (3, 7, 7, 10, 21)])
+    bench = sorted([(float(i), "b" + str(i)) for i in (1, 7, 8, 22)])
+
+    expected = sorted((b, s) for b in bench for s in starters if b[0] > s[0])
+
+    assert (
+        sorted(roster_index.merge_bench_beats_starters(starters, bench))
+        == expected
+    )
+
+
+def test_get_player_score_missing_stats():
+    """
+    Tests that players without stats score zero
+    :return:
+    """
+    assert roster_index.get_player_score({}, "99") == 0.0
+    assert roster_index.get_player_score({"99": {}}, "99") == 0.0
+
+
+def test_get_bench_scores():
+    """
+    Tests the bench sums with the league bonuses
+    :return:
+    """
+    week_stats = dict(WEEK_STATS)
+    week_stats["2"] = {"pts_half_ppr": 8.0, "pass_int": 1}
+    week_stats["6"] = {"pts_half_ppr": 30.0, "rec_fd": 4, "bonus_rec_te": 2}
+
+    bench_scores = roster_index.get_bench_scores(MATCHUPS, week_stats)
+
+    # 8 - 4 for the interception, 15, 30 + 2 + 1
+    assert bench_scores == {1: 52.0}
+
+
+def test_find_negative_starters():
+    """
+    Tests that only starters with negative points are returned
+    :return:
+    """
+    week_stats = dict(WEEK_STATS)
+    week_stats["3"] = {"pts_half_ppr": -1.5}
+    week_stats["5"] = {"pts_half_ppr": -3.0}
+    matchups = MATCHUPS + [
+        {"roster_id": 2, "starters": ["6"], "players": ["6"]},
+    ]
+
+    assert roster_index.find_negative_starters(matchups, week_stats) == {
+        1: [("3", -1.5)]
+    }
+
+
+def test_get_score_type():
+    """
+    Tests the scoring column of the points by reception of the league
+    :return:
+    """
+    assert roster_index.get_score_type({"rec": 1.0}) == "pts_ppr"
+    assert roster_index.get_score_type({"rec": 0}) == "pts_std"
+    assert roster_index.get_score_type({"rec": 0.5}) == "pts_half_ppr"
+    assert roster_index.get_score_type({"rec": 0.25}) == "pts_half_ppr"
+    assert roster_index.get_score_type(None) == "pts_half_ppr"
+
+
+def test_get_league_score():
+    """
+    Tests that every stat is scored with the settings of the league
+    :return:
+    """
+    week_stats = {"1": {"rec": 3, "rec_yd": 42, "fum_lost": 1}}
+    scoring_settings = {"rec": 0.5, "rec_yd": 0.1, "fum_lost": -2}
+
+    assert roster_index.get_league_score(
+        week_stats, "1", scoring_settings
+    ) == pytest.approx(3.7)
+    assert (
+        roster_index.get_league_score(week_stats, "2", scoring_settings) == 0
+    )
+
+
+def test_build_roster_index_flex_slots():
+    """
+    Tests that starters are keyed on the slot they fill and bench players
+    on every slot they are eligible to
+    :return:
+    """
+    players = dict(PLAYERS)
+    players["7"] = {
+        "first_name": "Wr",
+        "last_name": "Flex",
+        "position": "WR",
+        "fantasy_positions": ["WR"],
+    }
+    week_stats = dict(WEEK_STATS)
+    week_stats["7"] = {"pts_half_ppr": 10.0}
+    matchups = [
+        {
+            "roster_id": 1,
+            "starters": ["1", "3", "4", "7"],
+            "players": ["1", "2", "3", "4", "5", "6", "7"],
+        }
+    ]
+    roster_positions = ["QB", "RB", "RB", "FLEX", "BN", "BN", "BN"]
+
+    index = roster_index.build_roster_index(
+        matchups, players, week_stats, roster_positions=roster_positions
+    )
+    result = roster_index.find_bench_beats_starters(index)
+
+    assert index[(1, "FLEX")]["starters"] == [(10.0, "Wr Flex")]
+    assert index[(1, "FLEX")]["bench"] == [
+        (15.0, "Rb Bench"),
+        (30.0, "Wr Bench"),
+    ]
+    assert (1, "WR") not in index
+    assert result[1] == [
+        ("FLEX", (15.0, "Rb Bench"), (10.0, "Wr Flex")),
+        ("FLEX", (30.0, "Wr Bench"), (10.0, "Wr Flex")),
+        ("RB", (15.0, "Rb Bench"), (4.5, "Rb One")),
+        ("RB", (15.0, "Rb Bench"), (12.0, "Rb Two")),
+    ]
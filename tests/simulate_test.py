@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+import importlib
+import inspect
+import io
+import logging
+
+import pendulum
+
+from sleeper_stats_bot.replay import Cassette
+from tests.league_fixtures import (
+    build_cassette,
+    generate_payloads,
+    get_season_dates,
+)
+
+SEASON_START = pendulum.datetime(2022, 9, 8, tz="America/Chicago")
+
+
+def patch_simulated_bot(bot, monkeypatch):
+    """
+    Images are not rendered, no font needed, and the scoreboards are read
+    with the signature of the sleeper-api-wrapper fork when the installed
+    one differs.
+    """
+    monkeypatch.setattr(bot, "get_table_size", lambda text, *args: (550, 100))
+    monkeypatch.setattr(
+        bot,
+        "create_image_from_string",
+        lambda text, width, height: io.BytesIO(text.encode("utf-8")),
+    )
+    if "season" in inspect.signature(bot.League.get_scoreboards).parameters:
+
+        class League(bot.League):
+            def get_scoreboards(self, rosters, matchups, users, type, week):
+                return super().get_scoreboards(
+                    rosters,
+                    matchups,
+                    users,
+                    type,
+                    self.get_league()["season"],
+                    week,
+                )
+
+        monkeypatch.setattr(bot, "League", League)
+
+
+def test_simulate_season_weeks(tmp_path, monkeypatch):
+    """
+    Tests two replayed weeks of a season, restarting every day
+    :return:
+    """
+    payloads = generate_payloads(
+        teams=8, weeks=2, players_num=500, stats_num=200
+    )
+    for name, value in {
+        "BOT_TYPE": "telegram",
+        "TELEGRAM_WEBHOOK": "simulation",
+        "TELEGRAM_BOT_TOKEN": "simulation",
+        "TELEGRAM_CHAT_ID": "simulation",
+        "API_KEY": "simulation",
+        "DEBUG": "",
+        "LEAGUE_ID": payloads["league"]["league_id"],
+        "STORE_PATH": str(tmp_path / "store.sqlite"),
+        "QUOTA_PATH": str(tmp_path / "quota.sqlite"),
+    }.items():
+        monkeypatch.setenv(name, value)
+
+    # simulate drives the flat bot module, not sleeper_stats_bot.bot
+    simulate = importlib.import_module("simulate")
+    patch_simulated_bot(simulate.bot, monkeypatch)
+
+    cassette = build_cassette(
+        payloads, SEASON_START, Cassette(str(tmp_path / "season.jsonl"))
+    )
+    start = SEASON_START.add(days=1)
+    end = SEASON_START.add(weeks=2)
+    result = simulate.simulate(
+        Cassette.load(cassette.path),
+        start,
+        end,
+        logging.getLogger("simulation"),
+    )
+
+    runs = result["runs"]
+    assert [run for run in runs if run["error"] is not None] == []
+    jobs = [run["job"] for run in runs]
+    assert jobs.count("send_week_matchups_photo_to_telegram") == 1
+    assert jobs.count("send_scores_photo_to_telegram") > 1
+    assert all(start <= run["at"] < end for run in runs)
+    assert len(result["deliveries"]) >= len(runs)
+    assert {delivery["host"] for delivery in result["deliveries"]} == {
+        "api.telegram.org"
+    }
+    assert get_season_dates(SEASON_START, 2)["post_season"] == end
+    assert "deliveries over 13 days" in simulate.format_report(
+        result, start, end
+    )
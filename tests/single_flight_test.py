@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from sleeper_stats_bot.single_flight import CoalescingAdapter, SingleFlight
+
+
+def run_concurrently(function, count=8):
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        futures = [executor.submit(function) for _ in range(count)]
+    return futures
+
+
+def test_concurrent_calls_run_once():
+    """
+    Tests that the concurrent calls with a key run once and share the
+    result, and that the next call runs again
+    :return:
+    """
+    flights = SingleFlight("test")
+    calls = []
+
+    def fetch():
+        calls.append(threading.get_ident())
+        time.sleep(0.3)
+        return {"week": 1}
+
+    futures = run_concurrently(lambda: flights.do("state", fetch))
+
+    results = [future.result() for future in futures]
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+    flights.do("state", fetch)
+    assert len(calls) == 2
+
+
+def test_concurrent_calls_share_the_error():
+    """
+    Tests that the error of the call in flight is raised by every caller
+    :return:
+    """
+    flights = SingleFlight("test")
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.3)
+        raise requests.exceptions.ConnectionError("down")
+
+    futures = run_concurrently(lambda: flights.do("state", fetch))
+
+    for future in futures:
+        with pytest.raises(requests.exceptions.ConnectionError):
+            future.result()
+    assert len(calls) == 1
+
+
+def test_adapter_coalesces_identical_get_requests():
+    """
+    Tests that the adapter sends the concurrent identical GET requests
+    once, but not the requests with other headers or methods
+    :return:
+    """
+    sent = []
+
+    class CountingAdapter(CoalescingAdapter):
+        def send_once(self, request, **kwargs):
+            sent.append((request.method, request.url))
+            time.sleep(0.3)
+            response = requests.Response()
+            response.status_code = 200
+            response.raw = io.BytesIO(b'{"week": 3}')
+            return response
+
+    adapter = CountingAdapter()
+
+    def send(method="GET", key="a"):
+        request = requests.Request(
+            method,
+            "https://api.sportsdata.io/v3/nfl/scores/json/CurrentWeek",
+            headers={"Ocp-Apim-Subscription-Key": key},
+        ).prepare()
+        return adapter.send(request)
+
+    responses = [future.result() for future in run_concurrently(send)]
+    assert len(sent) == 1
+    assert all(response.json() == {"week": 3} for response in responses)
+    assert len({id(response) for response in responses}) == len(responses)
+
+    run_concurrently(lambda: send(key="b"), count=2)
+    run_concurrently(lambda: send(method="POST"), count=2)
+    assert len(sent) == 4
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+import json
+import time
+
+import pendulum
+import pytest
+import requests
+
+from sleeper_stats_bot import replay, sleeper_data
+from sleeper_stats_bot.clock import VirtualClock
+from sleeper_stats_bot.store import Store
+
+
+def test_final_payload_is_fetched_once(tmp_path):
+    """
+    Tests that completed weeks are only fetched the first time
+    :return:
+    """
+    store = Store(str(tmp_path / "store.sqlite"))
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {"4034": {"pts_half_ppr": 20.5}}
+
+    for _ in range(3):
+        payload = sleeper_data.get_payload(
+            "week_stats", "2022:1", True, fetch, store
+        )
+
+    assert payload == {"4034": {"pts_half_ppr": 20.5}}
+    assert len(calls) == 1
+
+
+def test_current_payload_is_not_stored(tmp_path):
+    """
+    Tests that the current week is always fetched
+    :return:
+    """
+    store = Store(str(tmp_path / "store.sqlite"))
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {"4034": {"pts_half_ppr": len(calls)}}
+
+    sleeper_data.get_payload("week_stats", "2022:5", False, fetch, store)
+    payload = sleeper_data.get_payload(
+        "week_stats", "2022:5", False, fetch, store
+    )
+
+    assert payload == {"4034": {"pts_half_ppr": 2}}
+    assert store.get("week_stats", "2022:5") is None
+
+
+def test_http_error_is_raised(tmp_path):
+    """
+    Tests that errors returned by sleeper_wrapper are not stored
+    :return:
+    """
+    store = Store(str(tmp_path / "store.sqlite"))
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        sleeper_data.get_payload(
+            "week_stats",
+            "2022:1",
+            True,
+            lambda: requests.exceptions.HTTPError("404"),
+            store,
+        )
+    assert store.get("week_stats", "2022:1") is None
+
+
+def test_get_weeks():
+    """
+    Tests that every week is fetched
+    :return:
+    """
+    assert sleeper_data.get_weeks(lambda week: week * 2, range(1, 5)) == {
+        1: 2,
+        2: 4,
+        3: 6,
+        4: 8,
+    }
+    assert sleeper_data.is_week_final(3, 4)
+    assert not sleeper_data.is_week_final(4, 4)
+
+
+def test_rate_limiter_spaces_calls():
+    """
+    Tests that the limiter bounds the request rate
+    :return:
+    """
+    rate_limiter = sleeper_data.RateLimiter(per_second=100)
+    start = time.monotonic()
+
+    sleeper_data.get_weeks(lambda week: week, range(11), 4, rate_limiter)
+
+    assert time.monotonic() - start >= 0.1
+
+
+def test_get_season_data_uses_store(tmp_path, monkeypatch):
+    """
+    Tests that a backfilled season is served from the store
+    :return:
+    """
+    store = Store(str(tmp_path / "store.sqlite"))
+    calls = []
+
+    class FakeLeague:
+        league_id = "1"
+
+        def get_matchups(self, week):
+            calls.append(("matchups", week))
+            return [{"roster_id": 1, "matchup_id": 1, "starters": []}]
+
+    class FakeStats:
+        def get_week_stats(self, season_type, season, week):
+            calls.append(("stats", week))
+            return {"1": {"pts_half_ppr": week}}
+
+        def get_week_projections(self, season_type, season, week):
+            calls.append(("projections", week))
+            return {"1": {"pts_half_ppr": week}}
+
+    monkeypatch.setattr(sleeper_data, "Stats", FakeStats)
+
+    for _ in range(2):
+        matchups, stats, projections = sleeper_data.get_season_data(
+            FakeLeague(), "2022", range(1, 4), 4, store
+        )
+
+    assert len(calls) == 9
+    assert stats[3] == {"1": {"pts_half_ppr": 3}}
+    assert sorted(projections) == [1, 2, 3]
+
+
+def test_stats_and_players_decode_used_fields():
+    """
+    Tests that the players dump and the week stats keep only the fields
+    read by the reports
+    :return:
+    """
+    clock = VirtualClock(pendulum.datetime(2022, 9, 13))
+    cassette = replay.Cassette()
+    for url, payload in (
+        (
+            "https://api.sleeper.app/v1/players/nfl",
+            {
+                "4034": {
+                    "first_name": "Christian",
+                    "last_name": "McCaffrey",
+                    "position": "RB",
+                    "college": "Stanford",
+                    "fantasy_positions": ["RB"],
+                }
+            },
+        ),
+        (
+            "https://api.sleeper.app/v1/stats/nfl/regular/2022/1",
+            {"4034": {"pts_half_ppr": 20.5, "rush_yd": 41.0}},
+        ),
+    ):
+        cassette.add(
+            "GET",
+            url,
+            200,
+            {"Content-Type": "application/json"},
+            json.dumps(payload).encode("utf-8"),
+            clock.now().timestamp(),
+        )
+
+    with replay.replaying(cassette, clock, replay.FakeMessenger(clock)):
+        players = sleeper_data.Players().get_all_players()
+        week_stats = sleeper_data.Stats().get_week_stats("regular", 2022, 1)
+
+    assert players == {
+        "4034": {
+            "first_name": "Christian",
+            "last_name": "McCaffrey",
+            "position": "RB",
+        }
+    }
+    assert week_stats == {"4034": {"pts_half_ppr": 20.5}}
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+import pendulum
+
+from sleeper_stats_bot.snapshot import load_snapshot, save_snapshot
+from sleeper_stats_bot.store import Store
+
+NOW = pendulum.datetime(2022, 9, 13, 11, tz="America/Chicago")
+DATES = {
+    "pre_season": pendulum.datetime(2022, 8, 4, tz="America/Chicago"),
+    "season": pendulum.datetime(2022, 9, 8, tz="America/Chicago"),
+    "post_season": pendulum.datetime(2023, 1, 14, tz="America/Chicago"),
+    "off_season": pendulum.datetime(2023, 2, 12, tz="America/Chicago"),
+}
+
+
+def test_snapshot_expiry(tmp_path):
+    """
+    Tests that the calendar is reused for the season and the week for the
+    day it was fetched
+    :return:
+    """
+    store = Store(str(tmp_path / "store.sqlite"))
+    assert load_snapshot(store, "1", NOW) is None
+
+    save_snapshot(store, "1", "2022", DATES, 2, NOW)
+
+    assert load_snapshot(store, "1", NOW.add(hours=6)) == {
+        "season": "2022",
+        "dates": DATES,
+        "week": 2,
+    }
+    assert load_snapshot(store, "1", NOW.add(days=1))["week"] is None
+    assert load_snapshot(store, "1", DATES["off_season"]) is None
+    assert load_snapshot(store, "2", NOW) is None
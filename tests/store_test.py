@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from sleeper_stats_bot.store import Store
+
+
+def test_put_and_get(tmp_path):
+    """
+    Tests that payloads survive reopening the store
+    :return:
+    """
+    store = Store(str(tmp_path / "store.sqlite"))
+    store.put("week_stats", "2022:1", {"4034": {"pts_half_ppr": 20.5}})
+    store.close()
+
+    store = Store(str(tmp_path / "store.sqlite"))
+    assert store.get("week_stats", "2022:1") == {
+        "4034": {"pts_half_ppr": 20.5}
+    }
+    assert store.get("week_stats", "2022:2") is None
+    assert store.keys("week_stats") == ["2022:1"]
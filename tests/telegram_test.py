@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+import json
+
+from sleeper_stats_bot import telegram
+from sleeper_stats_bot.telegram import Telegram
+
+
+class Response:
+    def raise_for_status(self):
+        pass
+
+
+def get_telegram(monkeypatch, posts):
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "1")
+    monkeypatch.setenv("TELEGRAM_CHAT_ID", "2")
+    monkeypatch.setenv("TELEGRAM_BUNDLE_SECONDS", "900")
+    monkeypatch.setattr(
+        telegram.requests,
+        "post",
+        lambda url, **kwargs: posts.append((url, kwargs)) or Response(),
+    )
+    return Telegram("https://api.telegram.org/bot1")
+
+
+def test_send_bundle_as_album(monkeypatch):
+    """
+    Tests that the images of a bundle are posted as one captioned album,
+    the link in the caption of the first one
+    :return:
+    """
+    posts = []
+    bot = get_telegram(monkeypatch, posts)
+    items = [
+        {"photo": b"1", "caption": "Week Scores"},
+        {"photo": b"2", "caption": "Standings"},
+        "https://example.com/report.pdf",
+    ]
+
+    assert bot.output_formats == {"photo", "caption"}
+    assert bot.send_bundle(items) == [True, True, True]
+
+    assert len(posts) == 1
+    url, kwargs = posts[0]
+    assert url.endswith("/sendMediaGroup")
+    media = json.loads(kwargs["data"]["media"])
+    assert [photo["caption"] for photo in media] == [
+        "https://example.com/report.pdf\nWeek Scores",
+        "Standings",
+    ]
+    assert kwargs["files"] == {"photo0": b"1", "photo1": b"2"}
+
+
+def test_send_bundle_splits_albums(monkeypatch):
+    """
+    Tests that albums have 10 photos at most, a single photo being sent
+    by itself
+    :return:
+    """
+    posts = []
+    bot = get_telegram(monkeypatch, posts)
+    items = [{"photo": b"1", "caption": str(i)} for i in range(11)]
+
+    assert bot.send_bundle(items) == [True] * 11
+    assert [url.rsplit("/", 1)[1] for url, _ in posts] == [
+        "sendMediaGroup",
+        "sendPhoto?chat_id=2",
+    ]
+    assert posts[1][1]["data"] == {"caption": "10"}
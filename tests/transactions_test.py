@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+import logging
+
+from sleeper_stats_bot import transactions
+from sleeper_stats_bot.store import Store
+from sleeper_stats_bot.transactions import (
+    TransactionIndex,
+    TransactionPoller,
+    get_faab_stats,
+)
+
+logger = logging.getLogger("transactions_test")
+
+URL = "https://api.sleeper.app/v1/league/1/transactions/{}"
+
+
+def get_waiver(transaction_id, status, roster_id, bid, status_updated):
+    return {
+        "transaction_id": transaction_id,
+        "type": "waiver",
+        "status": status,
+        "roster_ids": [roster_id],
+        "settings": {"waiver_bid": bid},
+        "status_updated": status_updated,
+    }
+
+
+class FakeClient:
+    def __init__(self):
+        self.weeks = {}
+        self.calls = []
+
+    def fetch(self, url, refresh=False):
+        self.calls.append(url)
+        week = int(url.rsplit("/", 1)[1])
+        return self.weeks.get(week, [])
+
+
+def test_index_keeps_a_high_water_mark_by_week(tmp_path):
+    """
+    Tests that only the final transactions past the mark are new
+    :return:
+    """
+    store = Store(str(tmp_path / "store.sqlite"))
+    index = TransactionIndex(store, "1", "2022")
+    pending = get_waiver("3", "pending", 1, 5, 30)
+    week = [get_waiver("1", "complete", 1, 10, 10), pending]
+
+    new = index.get_new(2, week)
+    assert [t["transaction_id"] for t in new] == ["1"]
+    assert index.get_new(2, week) == new
+    index.add(2, new)
+    assert index.get_new(2, week) == []
+    assert index.get_week(2)["mark"] == 10
+
+    pending["status"] = "failed"
+    pending["status_updated"] = 40
+    new = index.get_new(2, week)
+    assert [t["transaction_id"] for t in new] == ["3"]
+    index.add(2, new)
+    assert index.get_weeks() == [2]
+    assert len(index.get_season()) == 2
+    store.close()
+
+
+def test_poller_announces_the_new_transactions(monkeypatch, tmp_path):
+    """
+    Tests that the first poll fills the index silently, that the weeks
+    over are closed, and that the next polls announce the new ones of
+    the current week only
+    :return:
+    """
+    client = FakeClient()
+    monkeypatch.setattr(transactions, "get_client", lambda: client)
+    store = Store(str(tmp_path / "store.sqlite"))
+    client.weeks[1] = [get_waiver("1", "complete", 1, 10, 10)]
+    announced = []
+    poller = TransactionPoller(
+        "1",
+        TransactionIndex(store, "1", "2022"),
+        lambda: 2,
+        lambda week, new: announced.append((week, new)) or True,
+        logger,
+    )
+
+    assert poller.poll() == {}
+    assert client.calls == [URL.format(1), URL.format(2)]
+
+    client.weeks[2] = [get_waiver("2", "failed", 2, 50, 20)]
+    assert list(poller.poll()) == [2]
+    assert client.calls[2:] == [URL.format(2)]
+    assert announced == [(2, client.weeks[2])]
+    assert poller.idle_seconds() == 0
+    store.close()
+
+
+def test_poller_announces_again_the_transactions_not_delivered(
+    monkeypatch, tmp_path
+):
+    """
+    Tests that the transactions of a failed announcement are not indexed,
+    and announced again at the next poll
+    :return:
+    """
+    client = FakeClient()
+    monkeypatch.setattr(transactions, "get_client", lambda: client)
+    store = Store(str(tmp_path / "store.sqlite"))
+    index = TransactionIndex(store, "1", "2022")
+    results = [RuntimeError("down"), False, True]
+    announced = []
+
+    def announce(week, new):
+        announced.append([t["transaction_id"] for t in new])
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    now = [0]
+    poller = TransactionPoller(
+        "1", index, lambda: 1, announce, logger, 120, lambda: now[0]
+    )
+    poller.poll()
+
+    client.weeks[1] = [get_waiver("1", "complete", 1, 10, 10)]
+    assert poller.run_due() == {}
+    now[0] += 120
+    assert poller.run_due() == {}
+    assert index.get_week(1)["transactions"] == {}
+
+    assert list(poller.poll()) == [1]
+    assert announced == [["1"], ["1"], ["1"]]
+    assert list(index.get_week(1)["transactions"]) == ["1"]
+    assert poller.poll() == {}
+    store.close()
+
+
+def test_get_faab_stats():
+    """
+    Tests the claims and the FAAB of every team
+    :return:
+    """
+    stats = get_faab_stats(
+        [
+            get_waiver("1", "complete", 1, 10, 10),
+            get_waiver("2", "failed", 1, 30, 10),
+            get_waiver("3", "complete", 2, 0, 10),
+            {"transaction_id": "4", "type": "trade", "roster_ids": [1, 2]},
+        ]
+    )
+
+    assert stats == {
+        1: {"won": 1, "lost": 1, "spent": 10, "bids": 40},
+        2: {"won": 1, "lost": 0, "spent": 0, "bids": 0},
+    }
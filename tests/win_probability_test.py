@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from sleeper_stats_bot import win_probability
+
+WEEK_STATS = {
+    "1": {"pts_half_ppr": 20.0, "gp": 1},
+    "2": {"pts_half_ppr": 10.0, "gp": 1},
+    "3": {"pts_half_ppr": 0.0, "gp": 0},
+}
+
+WEEK_PROJECTIONS = {
+    "3": {"pts_half_ppr": 12.0},
+    "4": {"pts_half_ppr": 8.0},
+}
+
+PLAYER_TEAMS = {"1": "KC", "2": "LV", "3": "BUF", "4": "MIA"}
+GAMES_OVER = {"KC", "LV"}
+
+MATCHUPS = [
+    {
+        "roster_id": 1,
+        "matchup_id": 1,
+        "starters": ["1", "3", "0"],
+        "points": 21.0,
+    },
+    {"roster_id": 2, "matchup_id": 1, "starters": ["2", "4"], "points": 11.0},
+]
+
+
+def test_get_team_distribution():
+    """
+    Tests that the team starts from the league points, and that only the
+    starters yet to play add their projection
+    :return:
+    """
+    points, mean, variance, remaining = win_probability.get_team_distribution(
+        ["1", "3"],
+        21.0,
+        WEEK_STATS,
+        WEEK_PROJECTIONS,
+        player_teams=PLAYER_TEAMS,
+        games_over=GAMES_OVER,
+    )
+
+    assert points == 21.0
+    assert mean == 33.0
+    assert variance == pytest.approx((12.0 * 0.5) ** 2)
+    assert remaining == 1
+
+
+def test_players_still_playing_add_their_remaining_projection():
+    """
+    Tests that a starter whose game is not over adds what is left of his
+    projection, and nothing once past it
+    :return:
+    """
+    week_stats = {"1": {"pts_half_ppr": 5.0, "gp": 1}}
+    projections = {"1": {"pts_half_ppr": 15.0}}
+
+    _, mean, variance, remaining = win_probability.get_team_distribution(
+        ["1"], 5.0, week_stats, projections, player_teams=PLAYER_TEAMS
+    )
+    assert mean == 15.0
+    assert variance == pytest.approx((10.0 * 0.5) ** 2)
+    assert remaining == 1
+
+    _, mean, variance, remaining = win_probability.get_team_distribution(
+        ["1"], 5.0, week_stats, projections, {}, PLAYER_TEAMS, {"KC"}
+    )
+    assert (mean, variance, remaining) == (5.0, 0.0, 0)
+
+    week_stats["1"]["pts_half_ppr"] = 20.0
+    _, mean, _, remaining = win_probability.get_team_distribution(
+        ["1"], 20.0, week_stats, projections
+    )
+    assert (mean, remaining) == (20.0, 1)
+
+
+def test_win_probability():
+    """
+    Tests the closed form probability
+    :return:
+    """
+    assert win_probability.win_probability(10, 4, 10, 4) == 0.5
+    assert win_probability.win_probability(20, 0, 10, 0) == 1.0
+    assert win_probability.win_probability(10, 0, 20, 0) == 0.0
+    assert win_probability.win_probability(12, 2, 10, 2) == pytest.approx(
+        0.841, abs=1e-3
+    )
+
+
+def test_get_matchup_win_probabilities():
+    """
+    Tests that both teams probabilities add up to one
+    :return:
+    """
+    result = win_probability.get_matchup_win_probabilities(
+        MATCHUPS, WEEK_STATS, WEEK_PROJECTIONS, "pts_half_ppr", PLAYER_TEAMS
+    )
+    team_a, team_b = result[1]
+
+    assert team_a["win_probability"] + team_b["win_probability"] == 1
+    assert team_a["win_probability"] > team_b["win_probability"]
+
+
+def test_get_close_games():
+    """
+    Tests the probability threshold for live games and the margin for
+    finished games
+    :return:
+    """
+    live = win_probability.get_matchup_win_probabilities(
+        MATCHUPS, WEEK_STATS, WEEK_PROJECTIONS
+    )
+    underdog = live[1][1]["win_probability"]
+
+    assert win_probability.get_close_games(live, underdog, 10) == live
+    assert win_probability.get_close_games(live, underdog + 0.01, 100) == {}
+
+    finished = win_probability.get_matchup_win_probabilities(
+        MATCHUPS, WEEK_STATS, {}
+    )
+    for team in finished[1]:
+        team["players_remaining"] = 0
+
+    assert win_probability.get_close_games(finished, 0.3, 10) == {}
+    assert win_probability.get_close_games(finished, 0.3, 11) == finished